@@ -0,0 +1,114 @@
+"""
+Бенчмарк пропускной способности `@audit_event` с разными бэкендами аудита.
+
+Для `FileBackend` и `SqliteBackend` замеряется запись по одной (`batch_size=1`)
+и групповая фиксация (`batch_size=100`) на пустом журнале и на журнале, где уже
+есть PREFILL записей. Строка «файл, поиск хэша чтением всего файла» воспроизводит
+прежнюю схему `FileBackend`, которая перечитывала весь файл перед каждой записью:
+её скорость падает с ростом журнала, у остальных — нет.
+
+Запуск: python benchmarks/audit_throughput.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.audit import FileBackend, SqliteBackend, audit_event
+from chutils.audit.backends.base import BaseAuditBackend
+
+EVENTS = 2000
+PREFILL = 20_000
+
+
+class _FullScanFileBackend(FileBackend):
+    """FileBackend, который, как прежде, перед каждой записью ищет последний хэш чтением всего файла."""
+
+    def _load_last_hash(self) -> str:
+        if not self._path.exists():
+            return ""
+        last_line = b""
+        with open(self._path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    last_line = line
+        return str(json.loads(last_line)["hash"]) if last_line else ""
+
+    def log(self, *args: Any, **kwargs: Any) -> str:
+        """Сбрасывает известный размер файла, чтобы запись перечитала последний хэш, и записывает событие.
+
+        Args:
+            *args: Позиционные аргументы `FileBackend.log`.
+            **kwargs: Именованные аргументы `FileBackend.log`.
+
+        Returns:
+            UUID созданной записи.
+        """
+        self._known_size = None
+        return super().log(*args, **kwargs)
+
+
+def throughput(backend: BaseAuditBackend) -> float:
+    """Замеряет скорость записи событий через `@audit_event`.
+
+    Args:
+        backend: Бэкенд аудита.
+
+    Returns:
+        Событий в секунду.
+    """
+
+    @audit_event(action="order.pay", actor="user_1", target="invoice", backend=backend)
+    def pay(amount: int) -> int:
+        return amount
+
+    started = time.perf_counter()
+    for n in range(EVENTS):
+        pay(n)
+    backend.flush()
+    return EVENTS / (time.perf_counter() - started)
+
+
+def prefill(path: Path) -> None:
+    """Заполняет журнал PREFILL записями.
+
+    Args:
+        path: Путь к журналу (`.jsonl` — файловый бэкенд, иначе SQLite).
+    """
+    backend = FileBackend(path, batch_size=1000) if path.suffix == ".jsonl" else SqliteBackend(path, batch_size=1000)
+    for n in range(PREFILL):
+        backend.log("seed", "system", details={"n": n})
+    backend.close()
+
+
+def main() -> None:
+    """Печатает пропускную способность бэкендов на пустом и заполненном журнале."""
+    directory = Path(tempfile.mkdtemp())
+    cases: list[tuple[str, str, Callable[[Path], BaseAuditBackend]]] = [
+        ("файл, поиск хэша чтением всего файла", "jsonl", _FullScanFileBackend),
+        ("файл, batch_size=1", "jsonl", FileBackend),
+        ("файл, batch_size=100", "jsonl", lambda path: FileBackend(path, batch_size=100)),
+        ("файл, batch_size=100, fsync", "jsonl", lambda path: FileBackend(path, batch_size=100, fsync=True)),
+        ("sqlite, batch_size=1", "db", SqliteBackend),
+        ("sqlite, batch_size=100", "db", lambda path: SqliteBackend(path, batch_size=100)),
+    ]
+    # Импорт pydantic, построение схемы AuditEvent и прочие разовые затраты не должны попасть в замер
+    throughput(FileBackend(directory / "warmup.jsonl"))
+
+    print(f"{'бэкенд':<40} {'пустой журнал, соб./с':>22} {f'после {PREFILL} записей, соб./с':>30}")
+    for n, (name, suffix, factory) in enumerate(cases):
+        empty = throughput(factory(directory / f"empty_{n}.{suffix}"))
+        path = directory / f"full_{n}.{suffix}"
+        prefill(path)
+        full = throughput(factory(path))
+        print(f"{name:<40} {empty:>22.0f} {full:>30.0f}")
+
+
+if __name__ == "__main__":
+    main()
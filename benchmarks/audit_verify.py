@@ -0,0 +1,116 @@
+"""
+Бенчмарк проверки целостности журнала аудита.
+
+Для SQLite-журнала из RECORDS записей сравниваются: прежняя схема (`fetchall()`
+всей таблицы и последовательный пересчёт), потоковая проверка курсором,
+потоковая проверка в WORKERS процессах и повторная проверка с подписанной
+отметкой после добавления TAIL новых записей. Для каждого варианта выводится
+время и пик памяти Python (tracemalloc) в основном процессе.
+
+Запуск: python benchmarks/audit_verify.py
+"""
+import json
+import os
+import secrets
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.audit import SqliteBackend
+from chutils.audit._hash import compute_record_hash
+
+RECORDS = 50_000
+TAIL = 1_000
+WORKERS = max(2, os.cpu_count() or 1)
+
+
+def fetchall_verify(path: Path) -> None:
+    """Прежняя схема: вся таблица в памяти, последовательный пересчёт.
+
+    Args:
+        path: Путь к SQLite-журналу.
+    """
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        "SELECT id, actor, action, target, status, details, env, "
+        "timestamp, prev_hash, hash FROM audit_log ORDER BY rowid"
+    ).fetchall()
+    conn.close()
+    prev_hash = ""
+    for rid, actor, action, target, status, details, env, timestamp, stored_prev, stored_hash in rows:
+        data = {
+            "id": rid, "timestamp": timestamp, "actor": actor, "action": action, "target": target,
+            "status": status, "details": json.loads(details), "env": json.loads(env), "prev_hash": stored_prev,
+        }
+        assert compute_record_hash(data) == stored_hash and stored_prev == prev_hash
+        prev_hash = stored_hash
+
+
+def measure(run: Callable[[], object]) -> tuple[float, float]:
+    """Замеряет время и пик памяти прогона.
+
+    Время замеряется без tracemalloc, который замедляет только основной процесс.
+
+    Args:
+        run: Функция, выполняющая одну проверку.
+
+    Returns:
+        Время в секундах и пик памяти в МиБ.
+    """
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main() -> None:
+    """Создает журнал и печатает время и пик памяти для каждой схемы проверки."""
+    # Ключ подписи отметки генерируется на каждый прогон и нигде не хранится
+    checkpoint_key = secrets.token_bytes(32)
+    path = Path(tempfile.mkdtemp()) / "audit.db"
+    writer = SqliteBackend(path, batch_size=1000, checkpoint_key=checkpoint_key)
+    for n in range(RECORDS):
+        writer.log("order.pay", "user", details={"n": n})
+    writer.flush()
+    writer.verify_integrity()
+    conn = sqlite3.connect(path)
+    marker = conn.execute("SELECT position, hash, signature FROM audit_checkpoint").fetchone()
+    conn.close()
+    for n in range(TAIL):
+        writer.log("order.pay", "user", details={"n": n})
+    writer.close()
+    plain = SqliteBackend(path)
+
+    def tail_only() -> None:
+        # Отметка ставится заново перед каждым прогоном: проверяется ровно TAIL новых записей
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("UPDATE audit_checkpoint SET position = ?, hash = ?, signature = ?", marker)
+        conn.close()
+        SqliteBackend(path, checkpoint_key=checkpoint_key).verify_integrity()
+
+    print(f"{RECORDS + TAIL} записей, процессов: {WORKERS}")
+    print(f"{'схема':<38} {'время, с':>9} {'пик памяти, МиБ':>16}")
+    cases: list[tuple[str, Callable[[], object]]] = [
+        ("fetchall + последовательно", lambda: fetchall_verify(path)),
+        ("поток курсором", plain.verify_integrity),
+        (f"поток, {WORKERS} процесса", lambda: plain.verify_integrity(workers=WORKERS)),
+        (f"с отметкой, новых записей {TAIL}", tail_only),
+    ]
+    for name, run in cases:
+        elapsed, peak = measure(run)
+        print(f"{name:<38} {elapsed:>9.2f} {peak:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
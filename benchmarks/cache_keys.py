@@ -0,0 +1,103 @@
+"""
+Бенчмарк построителей ключей кэша для разных форм аргументов.
+
+Сравнивает прежний MD5-ключ, текущий "hash" (xxhash/blake2b), кортежный "tuple"
+и пользовательский `key=` в `cache_with_ttl`, а также полную стоимость попадания в кэш.
+
+Запуск: python benchmarks/cache_keys.py
+"""
+import hashlib
+import os
+import sys
+import timeit
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.cache import InMemoryCacheBackend, cache_with_ttl
+from chutils.cache.utils import generate_cache_key, generate_tuple_key
+
+NUMBER = 50_000
+
+ARG_SHAPES: dict[str, tuple[tuple[Any, ...], dict[str, Any]]] = {
+    "1 int": ((42,), {}),
+    "3 ints + kwarg": ((1, 2, 3), {"flag": "x"}),
+    "str 1 KB": (("x" * 1024,), {}),
+    "list[1000]": ((list(range(1000)),), {}),
+    "nested dict": (({"user": {"id": 1, "roles": ["a", "b"], "meta": {"k": "v"}}},), {}),
+}
+
+
+def legacy_md5_key(func_name: str, args: tuple[Any, ...], kwargs: dict[str, Any], prefix: str = "") -> str:
+    """Прежняя реализация ключа (repr + MD5) для сравнения.
+
+    Args:
+        func_name: Имя функции.
+        args: Позиционные аргументы.
+        kwargs: Именованные аргументы.
+        prefix: Префикс ключа.
+
+    Returns:
+        Строковый ключ кэша.
+    """
+    base_str = f"{prefix}:{func_name}:args:{args!r}|kwargs:{sorted(kwargs.items())!r}"
+    return f"cache:{hashlib.md5(base_str.encode('utf-8')).hexdigest()}"
+
+
+def bench_builders() -> None:
+    """Печатает время построения ключа (мкс на вызов) для каждой формы аргументов."""
+    builders = {
+        "md5 (legacy)": legacy_md5_key,
+        "hash": generate_cache_key,
+        "tuple": generate_tuple_key,
+    }
+    print(f"{'args':>16} | " + " | ".join(f"{name:>12}" for name in builders))
+    print("-" * (19 + 15 * len(builders)))
+    for shape, (args, kwargs) in ARG_SHAPES.items():
+        timings = []
+        for builder in builders.values():
+            seconds = timeit.timeit(
+                lambda b=builder, a=args, kw=kwargs: b("mod.func", a, kw, ""), number=NUMBER
+            )
+            timings.append(seconds / NUMBER * 1e6)
+        print(f"{shape:>16} | " + " | ".join(f"{t:>10.2f}us" for t in timings))
+
+
+def bench_cache_hits() -> None:
+    """Печатает стоимость попадания в кэш через декоратор для разных стратегий ключа."""
+    backend = InMemoryCacheBackend()
+    payload = {"id": 1, "data": list(range(100))}
+
+    @cache_with_ttl(ttl=600, backend=backend, sliding=False)
+    def by_hash(user: dict[str, Any]) -> int:
+        return int(user["id"])
+
+    @cache_with_ttl(ttl=600, backend=backend, sliding=False, key_builder="tuple", key=lambda user: user["id"])
+    def by_custom_key(user: dict[str, Any]) -> int:
+        return int(user["id"])
+
+    @cache_with_ttl(ttl=600, backend=backend, sliding=False, key_builder="tuple")
+    def by_tuple(user_id: int) -> int:
+        return user_id
+
+    @cache_with_ttl(ttl=600, backend=backend, sliding=False)
+    def by_hash_int(user_id: int) -> int:
+        return user_id
+
+    cases = {
+        "dict arg, hash": lambda: by_hash(payload),
+        "dict arg, key=": lambda: by_custom_key(payload),
+        "int arg, hash": lambda: by_hash_int(1),
+        "int arg, tuple": lambda: by_tuple(1),
+    }
+    print(f"\n{'cache hit':>16} | {'us/call':>10}")
+    print("-" * 30)
+    for name, call in cases.items():
+        call()
+        seconds = timeit.timeit(call, number=NUMBER)
+        print(f"{name:>16} | {seconds / NUMBER * 1e6:>8.2f}us")
+
+
+if __name__ == "__main__":
+    bench_builders()
+    bench_cache_hits()
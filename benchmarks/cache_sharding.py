@@ -0,0 +1,70 @@
+"""
+Микробенчмарк масштабирования in-memory кэша по числу потоков.
+
+Сравнивает `InMemoryCacheBackend` (одна блокировка) и `ShardedInMemoryCacheBackend`
+(N сегментов со своими блокировками и чтением без блокировки) на смеси 90% чтений / 10% записей.
+
+Запуск: python benchmarks/cache_sharding.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.cache import (
+    BaseCacheBackend,
+    InMemoryCacheBackend,
+    ShardedInMemoryCacheBackend,
+)
+
+KEYS = [f"key:{i}" for i in range(10_000)]
+OPS_PER_THREAD = 50_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+def run_workload(backend: BaseCacheBackend[int], threads: int) -> float:
+    """Запускает смешанную нагрузку в нескольких потоках.
+
+    Args:
+        backend: Тестируемый бэкенд кэша.
+        threads: Количество потоков.
+
+    Returns:
+        Пропускная способность в операциях в секунду.
+    """
+    for i, key in enumerate(KEYS):
+        backend.set(key, i, ttl=600)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        keys = [rnd.choice(KEYS) for _ in range(OPS_PER_THREAD)]
+        writes = [rnd.random() < 0.1 for _ in range(OPS_PER_THREAD)]
+        barrier.wait()
+        for key, is_write in zip(keys, writes):
+            if is_write:
+                backend.set(key, 1, ttl=600)
+            else:
+                backend.get(key)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return threads * OPS_PER_THREAD / elapsed
+
+
+if __name__ == "__main__":
+    print(f"{'threads':>8} | {'single-lock ops/s':>18} | {'sharded ops/s':>14} | {'speedup':>7}")
+    print("-" * 58)
+    for count in THREAD_COUNTS:
+        single = run_workload(InMemoryCacheBackend(), count)
+        sharded = run_workload(ShardedInMemoryCacheBackend(shards=32), count)
+        print(f"{count:>8} | {single:>18,.0f} | {sharded:>14,.0f} | {sharded / single:>6.2f}x")
@@ -0,0 +1,184 @@
+"""
+Бенчмарк стоимости разрешения зависимостей DI-контейнера по scope.
+
+Граф: Handler -> (Service -> Repository -> Settings, Settings). Для каждого
+варианта scope замеряется `Container.resolve(Handler)` и вызов функции под
+`@inject`. Строки «прежняя схема» воспроизводят контейнер, который при каждом
+разрешении заново разбирает сигнатуры и аннотации провайдеров (план
+сбрасывается перед каждым resolve), и обёртку `@inject` с `sig.bind_partial()`
+на каждый вызов.
+
+Запуск: python benchmarks/di_resolve.py
+"""
+import functools
+import inspect
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.di import Container, Inject, inject
+
+CALLS = 20_000
+
+
+class Settings:
+    """Лист графа без зависимостей."""
+
+
+class Repository:
+    """Зависит от `Settings`."""
+
+    def __init__(self, settings: Settings) -> None:
+        """Сохраняет зависимость.
+
+        Args:
+            settings: Настройки.
+        """
+        self.settings = settings
+
+
+class Service:
+    """Зависит от `Repository` и имеет параметр со значением по умолчанию."""
+
+    def __init__(self, repository: Repository, retries: int = 3) -> None:
+        """Сохраняет зависимость и параметр.
+
+        Args:
+            repository: Репозиторий.
+            retries: Число повторов, не разрешается контейнером.
+        """
+        self.repository = repository
+        self.retries = retries
+
+
+class Handler:
+    """Корень графа: зависит от `Service` и `Settings`."""
+
+    def __init__(self, service: Service, settings: Settings) -> None:
+        """Сохраняет зависимости.
+
+        Args:
+            service: Сервис.
+            settings: Настройки.
+        """
+        self.service = service
+        self.settings = settings
+
+
+class _PerCallContainer(Container):
+    """Контейнер, который, как прежде, разбирает сигнатуры провайдеров при каждом разрешении."""
+
+    def resolve(self, dependency_type: Any) -> Any:
+        """Сбрасывает планы и разрешает зависимость.
+
+        Args:
+            dependency_type: Тип или имя зависимости.
+
+        Returns:
+            Экземпляр зависимости.
+        """
+        self._plans = {}
+        return super().resolve(dependency_type)
+
+
+def _bind_partial_inject(container: Container) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Прежняя обёртка @inject: bind_partial() и resolve() на каждый вызов.
+
+    Args:
+        container: Контейнер, из которого разрешаются зависимости.
+
+    Returns:
+        Декоратор функции.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        sig = inspect.signature(func)
+        injectable = [(name, param) for name, param in sig.parameters.items() if param.default is not param.empty]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = sig.bind_partial(*args, **kwargs)
+            for name, param in injectable:
+                if name not in bound.arguments:
+                    bound.arguments[name] = container.resolve(param.annotation)
+            return func(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def build(container: Container, scopes: dict[type, str]) -> Container:
+    """Регистрирует граф в контейнере.
+
+    Args:
+        container: Пустой контейнер.
+        scopes: Scope по классам; не указанные регистрируются как "transient".
+
+    Returns:
+        Тот же контейнер.
+    """
+    for cls in (Settings, Repository, Service, Handler):
+        container.register(cls, scope=scopes.get(cls, "transient"))
+    return container
+
+
+def per_call_us(run: Callable[[], object]) -> float:
+    """Замеряет среднее время вызова после одного прогревочного.
+
+    Args:
+        run: Замеряемый вызов.
+
+    Returns:
+        Время одного вызова в микросекундах.
+    """
+    run()
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        run()
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+def measure(container: Container, decorator: Callable[..., Any]) -> tuple[float, float]:
+    """Замеряет `resolve(Handler)` и вызов функции под декоратором внедрения.
+
+    Args:
+        container: Контейнер с зарегистрированным графом.
+        decorator: Декоратор `@inject` для этого контейнера.
+
+    Returns:
+        Время resolve и время вызова под `@inject` в микросекундах.
+    """
+
+    @decorator
+    def handle(request_id: int, handler: Handler = Inject()) -> Handler:
+        return handler
+
+    return per_call_us(lambda: container.resolve(Handler)), per_call_us(lambda: handle(1))
+
+
+def main() -> None:
+    """Печатает стоимость resolve и @inject для каждого варианта scope."""
+    cases: list[tuple[str, dict[type, str]]] = [
+        ("всё singleton", {cls: "singleton" for cls in (Settings, Repository, Service, Handler)}),
+        ("всё transient", {}),
+        ("transient, Settings singleton", {Settings: "singleton"}),
+    ]
+    print(f"{'scope':<32} {'схема':<16} {'resolve, мкс':>13} {'@inject, мкс':>13}")
+    for name, scopes in cases:
+        variants: list[tuple[str, Container, Callable[..., Any]]] = []
+        legacy = build(_PerCallContainer(), scopes)
+        variants.append(("прежняя схема", legacy, _bind_partial_inject(legacy)))
+        current = build(Container(), scopes)
+        variants.append(("план", current, inject(container=current)))
+        for label, container, decorator in variants:
+            resolve_us, inject_us = measure(container, decorator)
+            print(f"{name:<32} {label:<16} {resolve_us:>13.2f} {inject_us:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
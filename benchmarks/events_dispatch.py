@@ -0,0 +1,123 @@
+"""
+Бенчмарк фоновой доставки EventBus.
+
+1. Всплеск из 100 000 `publish()` с асинхронным подписчиком: прежняя схема
+   (`run_coroutine_threadsafe` на каждое событие) против ограниченной очереди
+   с `workers` обработчиками. Измеряются время до доставки всех событий и
+   пик памяти (tracemalloc).
+2. `publish_async()` с тремя синхронными подписчиками: `asyncio.to_thread` на
+   каждый обработчик против одной задачи пула шины на событие.
+
+Запуск: python benchmarks/events_dispatch.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.events import EventBus
+from chutils.events.core import _run_and_log_errors, _start_background_loop
+
+BURST = 100_000
+ASYNC_EVENTS = 5_000
+
+
+def measure(run: Callable[[], None]) -> tuple[float, float]:
+    """Замеряет длительность и пик памяти прогона.
+
+    Args:
+        run: Функция, выполняющая один прогон.
+
+    Returns:
+        Длительность в секундах и пик памяти в МБ.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def burst_legacy() -> None:
+    """Доставляет всплеск событий прежней схемой: `run_coroutine_threadsafe` на каждое событие."""
+    loop = _start_background_loop()
+    done = threading.Event()
+    received = 0
+
+    async def handler(n: int) -> None:
+        nonlocal received
+        received += 1
+        if received == BURST:
+            done.set()
+
+    for n in range(BURST):
+        asyncio.run_coroutine_threadsafe(_run_and_log_errors(handler(n), "tick"), loop)
+    done.wait()
+
+
+def burst_queued(bus: EventBus) -> None:
+    """Доставляет всплеск событий через ограниченную очередь шины.
+
+    Args:
+        bus: Шина событий с настроенной очередью фоновой доставки.
+    """
+    received = 0
+
+    @bus.subscribe("tick")
+    async def handler(n: int) -> None:
+        nonlocal received
+        received += 1
+
+    for n in range(BURST):
+        bus.publish("tick", n)
+    bus.join()
+    assert received == BURST
+
+
+async def publish_async_legacy() -> None:
+    """Публикует события прежней схемой: `asyncio.to_thread` на каждый синхронный обработчик."""
+    handlers = [lambda n: None for _ in range(3)]
+    for n in range(ASYNC_EVENTS):
+        await asyncio.gather(*(asyncio.to_thread(handler, n) for handler in handlers))
+
+
+async def publish_async_bus() -> None:
+    """Публикует события через `EventBus.publish_async` с пулом потоков шины."""
+    bus = EventBus()
+    for _ in range(3):
+        bus.subscribe("tick")(lambda n: None)
+    for n in range(ASYNC_EVENTS):
+        await bus.publish_async("tick", n)
+
+
+def main() -> None:
+    """Печатает пропускную способность и пик памяти для каждой схемы доставки."""
+    _start_background_loop()
+    rows: list[tuple[str, Any, Any]] = []
+    elapsed, peak = measure(burst_legacy)
+    rows.append(("publish: на каждое событие", f"{BURST / elapsed:,.0f}", f"{peak:.1f}"))
+    elapsed, peak = measure(lambda: burst_queued(EventBus(max_queue_size=10_000)))
+    rows.append(("publish: очередь 10k", f"{BURST / elapsed:,.0f}", f"{peak:.1f}"))
+
+    print(f"{'вариант':<32} {'событий/с':>12} {'пик, МБ':>9}")
+    for name, rate, peak_mb in rows:
+        print(f"{name:<32} {rate:>12} {peak_mb:>9}")
+
+    print()
+    print(f"{'publish_async, 3 sync-обработчика':<36} {'событий/с':>12}")
+    for name, factory in (("to_thread на обработчик", publish_async_legacy), ("пул шины", publish_async_bus)):
+        started = time.perf_counter()
+        asyncio.run(factory())
+        print(f"{name:<36} {ASYNC_EVENTS / (time.perf_counter() - started):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Бенчмарк диспетчеризации публикаций EventBus.
+
+1. Горячий путь `publish()` с пятью синхронными подписчиками: прежняя схема
+   (блокировка, копия списка и `is_async_callable` на каждый обработчик при
+   каждой публикации) против закэшированной таблицы диспетчеризации.
+2. Поиск подписок по шаблонам тем при 5 000 шаблонов: линейная проверка
+   каждого шаблона против префиксного дерева.
+
+Запуск: python benchmarks/events_routing.py
+"""
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.events import EventBus
+from chutils.events.core import is_async_callable
+from chutils.events.routing import _TopicTrie
+
+PUBLISHES = 200_000
+HANDLERS = 5
+PATTERNS = 5_000
+LOOKUPS = 20_000
+
+
+def rate(run: Callable[[], None], count: int) -> float:
+    """Замеряет скорость прогона.
+
+    Args:
+        run: Функция, выполняющая прогон.
+        count: Число операций в прогоне.
+
+    Returns:
+        Операций в секунду.
+    """
+    started = time.perf_counter()
+    run()
+    return count / (time.perf_counter() - started)
+
+
+def publish_legacy() -> None:
+    """Публикует события прежней схемой: блокировка и копия списка обработчиков на каждый вызов."""
+    lock = threading.Lock()
+    subscribers = {"tick": [lambda n: None for _ in range(HANDLERS)]}
+    for n in range(PUBLISHES):
+        with lock:
+            handlers = list(subscribers.get("tick", []))
+        for func in handlers:
+            if not is_async_callable(func):
+                func(n)
+
+
+def publish_bus() -> None:
+    """Публикует события через `EventBus.publish` с таблицей диспетчеризации."""
+    bus = EventBus()
+    for _ in range(HANDLERS):
+        bus.subscribe("tick")(lambda n: None)
+    for n in range(PUBLISHES):
+        bus.publish("tick", n)
+
+
+def _patterns() -> list[str]:
+    """Возвращает набор шаблонов тем для сравнения поиска.
+
+    Returns:
+        Шаблоны с сегментами `*` и `#`.
+    """
+    return [f"svc{n % 50}.{'*' if n % 2 else 'region' + str(n % 7)}.event{n}.#" for n in range(PATTERNS)]
+
+
+def _linear_match(pattern: list[str], topic: list[str]) -> bool:
+    """Проверяет тему по одному шаблону рекурсивным сравнением сегментов.
+
+    Args:
+        pattern: Сегменты шаблона.
+        topic: Сегменты темы.
+
+    Returns:
+        True, если тема подходит под шаблон.
+    """
+    if not pattern:
+        return not topic
+    head, rest = pattern[0], pattern[1:]
+    if head == "#":
+        return any(_linear_match(rest, topic[i:]) for i in range(len(topic) + 1))
+    if not topic or head not in ("*", topic[0]):
+        return False
+    return _linear_match(rest, topic[1:])
+
+
+def lookup_linear(topics: list[str]) -> None:
+    """Ищет подходящие шаблоны для каждой темы перебором всех шаблонов.
+
+    Args:
+        topics: Темы для поиска.
+    """
+    patterns = [pattern.split(".") for pattern in _patterns()]
+    for topic in topics:
+        parts = topic.split(".")
+        [pattern for pattern in patterns if _linear_match(pattern, parts)]
+
+
+def lookup_trie(topics: list[str]) -> None:
+    """Ищет подходящие шаблоны для каждой темы по префиксному дереву.
+
+    Args:
+        topics: Темы для поиска.
+    """
+    trie = _TopicTrie()
+    for pattern in _patterns():
+        trie.add(pattern)
+    for topic in topics:
+        trie.match(topic)
+
+
+def main() -> None:
+    """Печатает скорость публикации и поиска шаблонов для прежней и текущей схем."""
+    print(f"{'publish, 5 sync-обработчиков':<36} {'событий/с':>12}")
+    for name, run in (("блокировка и копия списка", publish_legacy), ("таблица диспетчеризации", publish_bus)):
+        print(f"{name:<36} {rate(run, PUBLISHES):>12,.0f}")
+
+    topics = [f"svc{n % 50}.region{n % 7}.event{n % PATTERNS}.created" for n in range(LOOKUPS)]
+    print()
+    print(f"{f'поиск среди {PATTERNS:,} шаблонов':<36} {'тем/с':>12}")
+    linear_topics = topics[: LOOKUPS // 20]
+    print(f"{'линейная проверка':<36} {rate(lambda: lookup_linear(linear_topics), len(linear_topics)):>12,.0f}")
+    print(f"{'префиксное дерево':<36} {rate(lambda: lookup_trie(topics), LOOKUPS):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Симуляция адаптивного лимита конкурентности `ResiliencePolicy`: 200 клиентов
+обращаются к поддельному медленному сервису, который обрабатывает ограниченное
+число запросов одновременно, держит короткую очередь и отвечает ошибкой при ее
+переполнении. В середине прогона емкость сервиса падает с 16 до 4 обработчиков.
+
+Запуск: python benchmarks/http_adaptive_concurrency.py
+"""
+import asyncio
+import os
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.http import AdaptiveLimiter, ResiliencePolicy
+
+CLIENTS = 200
+PHASE_SECONDS = 1.5
+SERVICE_TIME = 0.005
+QUEUE_LIMIT = 32
+
+
+class Overloaded(Exception):
+    """Сервис отклонил запрос из-за переполненной очереди."""
+
+
+class FakeService:
+    """Сервис с `capacity` обработчиками и очередью не длиннее QUEUE_LIMIT."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.active = 0
+        self.waiting = 0
+        self._cond = asyncio.Condition()
+
+    async def handle(self) -> None:
+        """Обслуживает один запрос за `SERVICE_TIME`.
+
+        Raises:
+            Overloaded: Если очередь ожидания уже заполнена.
+        """
+        async with self._cond:
+            if self.waiting >= QUEUE_LIMIT:
+                raise Overloaded
+            self.waiting += 1
+            await self._cond.wait_for(lambda: self.active < self.capacity)
+            self.waiting -= 1
+            self.active += 1
+        try:
+            await asyncio.sleep(SERVICE_TIME)
+        finally:
+            async with self._cond:
+                self.active -= 1
+                self._cond.notify_all()
+
+
+async def simulate(policy: ResiliencePolicy) -> dict[str, Any]:
+    """Прогоняет нагрузку через политику.
+
+    Args:
+        policy: Политика, через которую клиенты вызывают сервис.
+
+    Returns:
+        Пропускная способность, доля ошибок, p99 успешных вызовов и итоговый лимит.
+    """
+    service = FakeService(16)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.monotonic() + 2 * PHASE_SECONDS
+
+    async def client() -> None:
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                await policy.apply_async(service.handle)
+                latencies.append(time.monotonic() - started)
+            except Overloaded:
+                errors += 1
+                await asyncio.sleep(SERVICE_TIME)
+
+    async def degrade() -> None:
+        await asyncio.sleep(PHASE_SECONDS)
+        service.capacity = 4
+
+    await asyncio.gather(degrade(), *(client() for _ in range(CLIENTS)))
+    latencies.sort()
+    total = len(latencies) + errors
+    return {
+        "rps": len(latencies) / (2 * PHASE_SECONDS),
+        "errors": errors / total if total else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else 0.0,
+        "limit": policy.limiter.limit if policy.limiter is not None else policy.max_concurrency,
+    }
+
+
+def make_policy(**kwargs: Any) -> ResiliencePolicy:
+    """Создает политику без повторов с фактически отключенным Circuit Breaker.
+
+    Circuit Breaker отключен, чтобы сравнивать только ограничение конкурентности.
+
+    Args:
+        **kwargs: Параметры ограничения конкурентности для `ResiliencePolicy`.
+
+    Returns:
+        Настроенная политика.
+    """
+    return ResiliencePolicy(retries=0, cb_failure_threshold=10**9, **kwargs)
+
+
+def main() -> None:
+    """Печатает пропускную способность, долю ошибок, p99 и лимит для каждого варианта."""
+    variants = {
+        "без лимита": lambda: make_policy(),
+        "max_concurrency=64": lambda: make_policy(max_concurrency=64),
+        "aimd": lambda: make_policy(adaptive_concurrency="aimd"),
+        "gradient": lambda: make_policy(adaptive_concurrency=AdaptiveLimiter(algorithm="gradient")),
+    }
+    print(f"{'вариант':<20} {'успешных/с':>11} {'ошибок':>8} {'p99, мс':>9} {'лимит':>7}")
+    for name, factory in variants.items():
+        result = asyncio.run(simulate(factory()))
+        print(
+            f"{name:<20} {result['rps']:>11.0f} {result['errors']:>8.1%} "
+            f"{result['p99']:>9.1f} {result['limit']!s:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Бенчмарк общего пула соединений chutils.http: запросы в секунду к локальному
+`http.server` с keep-alive при новом соединении на каждый запрос (прежнее
+поведение standalone-функций) и через общий пул процесса.
+
+Запуск: python benchmarks/http_pool.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils import http
+
+REQUESTS = 200
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Обработчик локального сервера: отвечает коротким JSON с keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        """Отправляет фиксированный JSON-ответ с `Content-Length`."""
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        """Отключает журнал запросов `http.server`, чтобы он не искажал замер.
+
+        Args:
+            *args: Формат и аргументы сообщения `http.server`, игнорируются.
+        """
+        pass
+
+
+def bench_sync(call: Callable[[], object]) -> float:
+    """Замеряет пропускную способность синхронных запросов.
+
+    Args:
+        call: Функция, выполняющая один запрос.
+
+    Returns:
+        Запросов в секунду.
+    """
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        call()
+    return REQUESTS / (time.perf_counter() - started)
+
+
+def bench_async(url: str, pooled: bool) -> float:
+    """Замеряет пропускную способность async-запросов (по 10 одновременно).
+
+    Args:
+        url: Адрес локального сервера.
+        pooled: Использовать общий пул соединений.
+
+    Returns:
+        Запросов в секунду.
+    """
+
+    async def run() -> float:
+        client = http.AsyncHttpClient(pooled=pooled)
+        started = time.perf_counter()
+        for _ in range(REQUESTS // 10):
+            await asyncio.gather(*(client.get(url) for _ in range(10)))
+        elapsed = time.perf_counter() - started
+        await http.aclose_pool()
+        return REQUESTS / elapsed
+
+    return asyncio.run(run())
+
+
+def per_call_client(url: str) -> object:
+    """Выполняет запрос через новый `HttpClient`, как standalone-функции до общего пула.
+
+    Args:
+        url: Адрес локального сервера.
+
+    Returns:
+        Ответ сервера.
+    """
+    with http.HttpClient() as client:
+        return client.get(url)
+
+
+def main() -> None:
+    """Запускает локальный сервер и печатает запросы в секунду для каждого варианта."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        rows = [
+            ("sync: HttpClient на каждый вызов", bench_sync(lambda: per_call_client(url))),
+            ("sync: HttpClient(pooled=False)", bench_sync(lambda: http.HttpClient(pooled=False).get(url))),
+            ("sync: http.get (общий пул)", bench_sync(lambda: http.get(url))),
+            ("async: AsyncHttpClient(pooled=False)", bench_async(url, pooled=False)),
+            ("async: AsyncHttpClient (общий пул)", bench_async(url, pooled=True)),
+        ]
+    finally:
+        http.close_pool()
+        server.shutdown()
+        server.server_close()
+    print(f"{'вариант':<40} {'запросов/с':>12}")
+    for name, rps in rows:
+        print(f"{name:<40} {rps:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Бенчмарк JSON-форматтеров логов: `ChutilsJsonFormatter` (python-json-logger)
+против `FastJsonFormatter` (stdlib json и orjson), записей в секунду.
+
+Запуск: python benchmarks/log_json_formatter.py
+"""
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.logger.formatters import (
+    JSON_LOGGER_AVAILABLE,
+    ORJSON_AVAILABLE,
+    ChutilsJsonFormatter,
+    FastJsonFormatter,
+)
+
+RECORDS = 50_000
+STATIC_FIELDS = {"service": "billing", "env": "prod"}
+
+
+def make_record() -> logging.LogRecord:
+    """Создает типичную запись с контекстом, как после `ContextFilter`.
+
+    Returns:
+        Запись лога с `context_dict` и дополнительными атрибутами.
+    """
+    record = logging.LogRecord("app.http", logging.INFO, __file__, 42, "GET %s -> %d", ("/api/v1/users", 200), None)
+    record.context_dict = {"trace_id": "4bf92f3577b34da6", "request_id": "req-123", "user_id": 7}
+    record.request_id = "req-123"
+    record.user_id = 7
+    record.context = "[trace_id=4bf92f3577b34da6 request_id=req-123 user_id=7] "
+    return record
+
+
+def bench(formatter: logging.Formatter) -> float:
+    """Замеряет пропускную способность форматтера.
+
+    Args:
+        formatter: Тестируемый форматтер.
+
+    Returns:
+        Записей в секунду.
+    """
+    record = make_record()
+    started = time.perf_counter()
+    for _ in range(RECORDS):
+        formatter.format(record)
+    return RECORDS / (time.perf_counter() - started)
+
+
+def main() -> None:
+    """Печатает пропускную способность каждого доступного JSON-форматтера."""
+    formatters: list[tuple[str, logging.Formatter]] = []
+    if JSON_LOGGER_AVAILABLE:
+        formatters.append(("ChutilsJsonFormatter", ChutilsJsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")))
+    formatters.append(("FastJsonFormatter (json)", FastJsonFormatter(STATIC_FIELDS, use_orjson=False)))
+    if ORJSON_AVAILABLE:
+        formatters.append(("FastJsonFormatter (orjson)", FastJsonFormatter(STATIC_FIELDS, use_orjson=True)))
+
+    print(f"{'форматтер':<28} {'записей/с':>12}")
+    for name, formatter in formatters:
+        print(f"{name:<28} {bench(formatter):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
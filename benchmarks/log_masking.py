@@ -0,0 +1,76 @@
+"""
+Бенчмарк маскирования секретов в логах: поиск литералов `_LiteralMatcher` против
+прежней единой альтернации regex из всех секретов.
+
+Запуск: python benchmarks/log_masking.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.logger.masking import _LiteralMatcher
+
+SECRET_COUNTS = (10, 100, 1000)
+ROUNDS = 2000
+MESSAGE = (
+    "GET /api/v1/users?id=12345&page=2 took 0.123s from 10.0.0.1 "
+    "user-agent Mozilla/5.0 (X11; Linux x86_64) status=200 bytes=51234 "
+) * 2
+
+
+def make_secrets(count: int) -> set[str]:
+    """Генерирует случайные секреты длиной 8-32 символа.
+
+    Args:
+        count: Количество секретов.
+
+    Returns:
+        Множество секретов.
+    """
+    rng = random.Random(count)
+    alphabet = string.ascii_letters + string.digits
+    return {"".join(rng.choices(alphabet, k=rng.randint(8, 32))) for _ in range(count)}
+
+
+def bench(count: int) -> tuple[float, float]:
+    """Сравнивает время маскирования одного сообщения.
+
+    Args:
+        count: Количество зарегистрированных секретов.
+
+    Returns:
+        Время в микросекундах: (альтернация regex, `_LiteralMatcher`).
+    """
+    secrets = make_secrets(count)
+    alternation = re.compile("|".join(re.escape(s) for s in sorted(secrets, key=len, reverse=True)))
+    matcher = _LiteralMatcher(secrets)
+    # Половина сообщений содержит секрет
+    messages = [MESSAGE, MESSAGE + next(iter(secrets))]
+
+    started = time.perf_counter()
+    for i in range(ROUNDS):
+        alternation.sub("[MASKED]", messages[i % 2])
+    regex_us = (time.perf_counter() - started) / ROUNDS * 1e6
+
+    started = time.perf_counter()
+    for i in range(ROUNDS):
+        matcher.sub("[MASKED]", messages[i % 2])
+    matcher_us = (time.perf_counter() - started) / ROUNDS * 1e6
+    return regex_us, matcher_us
+
+
+def main() -> None:
+    """Печатает время маскирования одного сообщения для каждого числа секретов."""
+    print(f"{'секретов':>10} {'regex, мкс':>12} {'matcher, мкс':>14}")
+    for count in SECRET_COUNTS:
+        regex_us, matcher_us = bench(count)
+        print(f"{count:>10} {regex_us:>12.1f} {matcher_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
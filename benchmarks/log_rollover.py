@@ -0,0 +1,58 @@
+"""
+Бенчмарк задержки ротации `CompressingRotatingFileHandler`: время `doRollover`
+(блокировка логгера) и полное время фонового сжатия для файлов разного размера.
+
+Запуск: python benchmarks/log_rollover.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.logger.handlers import CompressingRotatingFileHandler
+
+SIZES_MB = (1, 16, 64)
+LINE = "2024-01-01 00:00:00 INFO app: request handled in 12ms status=200 path=/api/v1/users\n"
+
+
+def bench(size_mb: int, codec: str) -> tuple[float, float]:
+    """Замеряет ротацию файла заданного размера.
+
+    Args:
+        size_mb: Размер ротируемого файла в мегабайтах.
+        codec: Кодек сжатия.
+
+    Returns:
+        Время в миллисекундах: (doRollover, doRollover + завершение сжатия).
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.log")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(LINE * (size_mb * 1024 * 1024 // len(LINE)))
+        handler = CompressingRotatingFileHandler(path, maxBytes=1, backupCount=3, codec=codec)  # type: ignore[arg-type]
+        started = time.perf_counter()
+        handler.acquire()
+        try:
+            handler.doRollover()
+        finally:
+            handler.release()
+        rollover_ms = (time.perf_counter() - started) * 1e3
+        handler.wait_for_compression()
+        total_ms = (time.perf_counter() - started) * 1e3
+        handler.close()
+    return rollover_ms, total_ms
+
+
+def main() -> None:
+    """Печатает время ротации и полного сжатия для каждого размера файла и кодека."""
+    print(f"{'размер, МБ':>10} {'кодек':>6} {'doRollover, мс':>16} {'со сжатием, мс':>16}")
+    for size_mb in SIZES_MB:
+        for codec in ("gzip", "xz"):
+            rollover_ms, total_ms = bench(size_mb, codec)
+            print(f"{size_mb:>10} {codec:>6} {rollover_ms:>16.2f} {total_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Бенчмарк гистограмм InMemoryMetricsProvider: стоимость `observe` и `generate_latest`.
+
+Запуск: python benchmarks/metrics_histogram.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+
+OBSERVATIONS = (10_000, 100_000, 1_000_000)
+SERIES = 10
+
+
+def bench(observations: int, summary: bool) -> tuple[float, float]:
+    """Замеряет запись наблюдений и экспорт.
+
+    Args:
+        observations: Общее количество наблюдений.
+        summary: Использовать summary (DDSketch) вместо бакетов.
+
+    Returns:
+        Время одного `observe` в микросекундах и время `generate_latest` в миллисекундах.
+    """
+    provider = InMemoryMetricsProvider()
+    if summary:
+        provider.configure_summary("latency")
+    labels = [{"route": f"/r{i}"} for i in range(SERIES)]
+
+    started = time.perf_counter()
+    for i in range(observations):
+        provider.observe("latency", (i % 1000) / 100, labels[i % SERIES])
+    observe_us = (time.perf_counter() - started) / observations * 1e6
+
+    started = time.perf_counter()
+    provider.generate_latest()
+    export_ms = (time.perf_counter() - started) * 1e3
+    return observe_us, export_ms
+
+
+def main() -> None:
+    """Печатает таблицу стоимости observe и экспорта для гистограмм и summary."""
+    print(f"{'наблюдений':>12} {'тип':>10} {'observe, мкс':>14} {'export, мс':>12}")
+    for observations in OBSERVATIONS:
+        for summary in (False, True):
+            observe_us, export_ms = bench(observations, summary)
+            kind = "summary" if summary else "histogram"
+            print(f"{observations:>12} {kind:>10} {observe_us:>14.2f} {export_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
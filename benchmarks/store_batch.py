@@ -0,0 +1,78 @@
+"""
+Бенчмарк пакетных операций chutils.store против цикла по одному ключу.
+
+По умолчанию замеряет `MemoryStore` (стоимость спанов, метрик и блокировок на каждый ключ).
+Если задана переменная окружения `REDIS_URL` и установлен пакет `redis`, дополнительно
+замеряет `RedisStore`, где основную разницу дают сетевые round trip.
+
+Запуск: python benchmarks/store_batch.py
+        REDIS_URL=redis://localhost:6379/15 python benchmarks/store_batch.py
+"""
+import os
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.store.backends.memory import MemoryStore
+from chutils.store.manager import StoreManager
+
+BATCH_SIZES = (10, 100, 500)
+ROUNDS = 200
+
+
+def bench(manager: StoreManager, size: int, rounds: int) -> tuple[float, float]:
+    """Сравнивает чтение `size` ключей циклом `get` и одним `get_many`.
+
+    Args:
+        manager: Тестируемый менеджер хранилища.
+        size: Количество ключей в пакете.
+        rounds: Количество повторов.
+
+    Returns:
+        Время одного пакета в миллисекундах: (цикл, get_many).
+    """
+    keys = [f"bench:{i}" for i in range(size)]
+    payload: dict[str, Any] = {key: {"id": i, "name": f"user-{i}"} for i, key in enumerate(keys)}
+    manager.set_many(payload, ttl=600)
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for key in keys:
+            manager.get(key)
+    loop_ms = (time.perf_counter() - started) / rounds * 1e3
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        manager.get_many(keys)
+    batch_ms = (time.perf_counter() - started) / rounds * 1e3
+
+    manager.delete_many(keys)
+    return loop_ms, batch_ms
+
+
+def report(title: str, manager: StoreManager, rounds: int) -> None:
+    """Печатает таблицу результатов для одного бэкенда.
+
+    Args:
+        title: Заголовок таблицы.
+        manager: Менеджер хранилища с замеряемым бэкендом.
+        rounds: Число повторов на каждый размер пачки.
+    """
+    print(f"\n{title}")
+    print(f"{'keys':>6} | {'loop get':>10} | {'get_many':>10} | {'speedup':>7}")
+    print("-" * 44)
+    for size in BATCH_SIZES:
+        loop_ms, batch_ms = bench(manager, size, rounds)
+        print(f"{size:>6} | {loop_ms:>8.3f}ms | {batch_ms:>8.3f}ms | {loop_ms / batch_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    report("MemoryStore", StoreManager(backend=MemoryStore()), ROUNDS)
+
+    redis_url = os.environ.get("REDIS_URL")  # chutils: ignore[ChutilsIntegrationRule]
+    if redis_url:
+        from chutils.store.backends.redis import RedisStore
+
+        report(f"RedisStore ({redis_url})", StoreManager(backend=RedisStore(url=redis_url)), ROUNDS // 10)
@@ -0,0 +1,69 @@
+"""
+Бенчмарк сериализаторов и сжатия chutils.store.
+
+Для каждого сериализатора (json, orjson, msgpack, pickle) и кодека сжатия (zlib, zstd, lz4)
+печатает число операций dumps/loads в секунду и размер результата на типичном JSON-документе.
+Отсутствующие опциональные пакеты пропускаются.
+
+Запуск: python benchmarks/store_serializers.py
+"""
+import os
+import sys
+import timeit
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils.exceptions import OptionalDependencyError
+from chutils.store.compression import CompressingSerializer
+from chutils.store.manager import _get_serializer
+
+NUMBER = 2_000
+
+PAYLOAD: dict[str, Any] = {
+    "users": [
+        {
+            "id": i,
+            "name": f"Пользователь {i}",
+            "email": f"user{i}@example.com",
+            "roles": ["reader", "writer"] if i % 3 else ["admin"],
+            "active": i % 2 == 0,
+            "score": i * 1.5,
+        }
+        for i in range(200)
+    ],
+    "meta": {"page": 1, "total": 200},
+}
+
+
+def measure(serializer: Any) -> tuple[float, float, int]:
+    """Замеряет сериализатор на PAYLOAD.
+
+    Args:
+        serializer: Объект с методами dumps/loads.
+
+    Returns:
+        (операций dumps в секунду, операций loads в секунду, размер результата в байтах).
+    """
+    raw = serializer.dumps(PAYLOAD)
+    size = len(raw.encode("utf-8") if isinstance(raw, str) else raw)
+    dumps_s = timeit.timeit(lambda: serializer.dumps(PAYLOAD), number=NUMBER)
+    loads_s = timeit.timeit(lambda: serializer.loads(raw), number=NUMBER)
+    return NUMBER / dumps_s, NUMBER / loads_s, size
+
+
+if __name__ == "__main__":
+    print(f"{'serializer':>18} | {'dumps/s':>10} | {'loads/s':>10} | {'bytes':>8}")
+    print("-" * 56)
+    for name in ("json", "orjson", "msgpack", "pickle"):
+        for codec in (None, "zlib", "zstd", "lz4"):
+            label = name if codec is None else f"{name}+{codec}"
+            try:
+                serializer = _get_serializer(name)
+                if codec is not None:
+                    serializer = CompressingSerializer(serializer, codec=codec, threshold=0)
+            except OptionalDependencyError:
+                print(f"{label:>18} | {'не установлен':>36}")
+                continue
+            dumps_rate, loads_rate, size = measure(serializer)
+            print(f"{label:>18} | {dumps_rate:>10,.0f} | {loads_rate:>10,.0f} | {size:>8}")
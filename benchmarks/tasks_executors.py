@@ -0,0 +1,111 @@
+"""
+Бенчмарк пулов выполнения периодических задач.
+
+Четыре CPU-bound задачи (чистый Python) запускаются планировщиком одновременно
+через `asyncio.to_thread`, пул потоков `"thread"` и пул процессов `"process"`.
+Параллельно асинхронная задача каждые 10 мс замеряет, насколько поздно event
+loop её будит: задачи в потоках конкурируют за GIL с циклом и друг с другом,
+задачи в процессах — нет. Также выводится время до завершения всех запусков.
+
+Запуск: python benchmarks/tasks_executors.py
+"""
+import asyncio
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import os
+import statistics
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils import metrics
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+from chutils.tasks import (
+    clear_tasks_registry,
+    configure_executor,
+    periodic_task,
+    shutdown_executors,
+)
+from chutils.tasks.core import TaskScheduler
+from chutils.tasks.executors import get_executor
+
+JOBS = 4
+WORK = 3_000_000
+TICK = 0.01
+
+
+def crunch() -> None:
+    """CPU-bound задача: сумма квадратов WORK чисел."""
+    total = 0
+    for n in range(WORK):
+        total += n * n
+
+
+def noop() -> None:
+    """Пустая задача для прогрева пулов."""
+
+
+def _finished(provider: InMemoryMetricsProvider) -> int:
+    """Считает завершенные запуски задач по гистограмме длительности.
+
+    Args:
+        provider: Провайдер метрик бенчмарка.
+
+    Returns:
+        Число завершенных запусков.
+    """
+    series = provider.get_metrics()["histograms"].get("scheduler_task_duration_seconds", [])
+    return sum(item["count"] for item in series)
+
+
+async def run(executor: str | None, provider: InMemoryMetricsProvider) -> dict[str, Any]:
+    """Выполняет JOBS задач `crunch` и замеряет задержку event loop планировщика.
+
+    Args:
+        executor: Имя пула или None для `asyncio.to_thread`.
+        provider: Провайдер метрик бенчмарка.
+
+    Returns:
+        Словарь с общим временем `elapsed` (с) и задержкой цикла `p50`/`max` (мс).
+    """
+    clear_tasks_registry()
+    provider.clear()
+    if executor is not None:
+        # Исполнители запускаются заранее: старт процессов не должен попасть в замер
+        pool = get_executor(executor)
+        await asyncio.gather(*(pool.run(pool.prepare(noop)) for _ in range(JOBS)))
+    for n in range(JOBS):
+        periodic_task(interval_seconds=3600, run_immediately=True, executor=executor, name=f"crunch_{n}")(crunch)
+
+    lags: list[float] = []
+    scheduler = TaskScheduler()
+    started = time.perf_counter()
+    await scheduler.start()
+    while _finished(provider) < JOBS:
+        expected = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - expected)
+    elapsed = time.perf_counter() - started
+    await scheduler.stop()
+    return {"elapsed": elapsed, "p50": statistics.median(lags) * 1e3, "max": max(lags) * 1e3}
+
+
+def main() -> None:
+    """Печатает время и задержку цикла для каждого пула исполнения задач."""
+    logging.getLogger("chutils.tasks").setLevel(logging.ERROR)
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    configure_executor("thread", max_workers=JOBS)
+    configure_executor("process", "process", max_workers=JOBS)
+    print(f"{'пул':<20} {'время, с':>9} {'задержка цикла p50, мс':>23} {'max, мс':>9}")
+    try:
+        for name, executor in (("asyncio.to_thread", None), ("thread", "thread"), ("process", "process")):
+            result = asyncio.run(run(executor, provider))
+            print(f"{name:<20} {result['elapsed']:>9.2f} {result['p50']:>23.1f} {result['max']:>9.1f}")
+    finally:
+        shutdown_executors()
+
+
+if __name__ == "__main__":
+    main()
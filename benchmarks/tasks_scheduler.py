@@ -0,0 +1,135 @@
+"""
+Бенчмарк планировщика периодических задач.
+
+500 асинхронных задач с интервалом 100 мс, каждая выполняется 20 мс, прогон
+3 секунды. Прежняя схема (корутина на задачу, `asyncio.sleep(interval)` после
+выполнения) сравнивается с единым циклом `TaskScheduler` по числу запусков
+относительно идеального расписания, дрейфу последнего
+запуска относительно первого и минимальному числу задач asyncio
+(то, что живёт между запусками).
+
+Запуск: python benchmarks/tasks_scheduler.py
+"""
+import asyncio
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from chutils import metrics
+from chutils.tasks import clear_tasks_registry, periodic_task
+from chutils.tasks.core import TaskScheduler
+
+TASKS = 500
+INTERVAL = 0.1
+WORK = 0.02
+DURATION = 3.0
+
+
+def _make_job(starts: list[float]) -> Callable[[], Awaitable[None]]:
+    """Создает задачу, которая записывает время запуска и работает WORK секунд.
+
+    Args:
+        starts: Список, в который добавляется время каждого запуска.
+
+    Returns:
+        Асинхронная функция задачи.
+    """
+
+    async def job() -> None:
+        starts.append(time.monotonic())
+        await asyncio.sleep(WORK)
+
+    return job
+
+
+async def _min_tasks() -> int:
+    """Ждёт DURATION секунд и возвращает минимальное число прочих задач asyncio за это время."""
+    deadline = time.monotonic() + DURATION
+    fewest = len(asyncio.all_tasks())
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.005)
+        fewest = min(fewest, len(asyncio.all_tasks()) - 1)
+    return fewest
+
+
+async def legacy(runs: list[list[float]]) -> int:
+    """Запускает задачи прежней схемой: корутина с `asyncio.sleep(INTERVAL)` на каждую задачу.
+
+    Args:
+        runs: Списки времен запуска, по одному на задачу.
+
+    Returns:
+        Минимальное число прочих задач asyncio за прогон.
+    """
+
+    async def loop_task(job: Callable[[], Awaitable[None]]) -> None:
+        while True:
+            await job()
+            await asyncio.sleep(INTERVAL)
+
+    jobs = [asyncio.create_task(loop_task(_make_job(starts))) for starts in runs]
+    idle = await _min_tasks()
+    for job in jobs:
+        job.cancel()
+    await asyncio.gather(*jobs, return_exceptions=True)
+    return idle
+
+
+async def scheduler(runs: list[list[float]]) -> int:
+    """Запускает задачи через единый цикл `TaskScheduler`.
+
+    Args:
+        runs: Списки времен запуска, по одному на задачу.
+
+    Returns:
+        Минимальное число прочих задач asyncio за прогон.
+    """
+    clear_tasks_registry()
+    for n, starts in enumerate(runs):
+        periodic_task(interval_seconds=INTERVAL, run_immediately=True, name=f"job_{n}")(_make_job(starts))
+    instance = TaskScheduler()
+    await instance.start()
+    idle = await _min_tasks()
+    await instance.stop()
+    return idle
+
+
+def measure(run: Callable[[list[list[float]]], Awaitable[int]]) -> dict[str, Any]:
+    """Прогоняет схему и считает долю запусков от плана, дрейф и число задач asyncio.
+
+    Args:
+        run: Схема запуска (`legacy` или `scheduler`).
+
+    Returns:
+        Словарь с ключами `runs`, `drift` (мс) и `tasks`.
+    """
+    runs: list[list[float]] = [[] for _ in range(TASKS)]
+    idle = asyncio.run(run(runs))
+    ideal = int(DURATION / INTERVAL)
+    drift = [starts[-1] - starts[0] - (len(starts) - 1) * INTERVAL for starts in runs]
+    return {
+        "runs": sum(map(len, runs)) / (TASKS * ideal),
+        "drift": sum(drift) / len(drift) * 1e3,
+        "tasks": idle,
+    }
+
+
+def main() -> None:
+    """Печатает сравнение прежней схемы и единого цикла планировщика."""
+    logging.getLogger("chutils.tasks").setLevel(logging.ERROR)
+    # Разовая инициализация провайдера метрик и серий по задачам не должна попасть в замер
+    metrics.get_provider()
+    measure(scheduler)
+    print(f"{'схема':<28} {'запусков от плана':>18} {'дрейф, мс':>10} {'задач asyncio':>14}")
+    for name, run in (("корутина на задачу", legacy), ("единый цикл (heap)", scheduler)):
+        result = measure(run)
+        print(f"{name:<28} {result['runs']:>18.0%} {result['drift']:>10.1f} {result['tasks']:>14}")
+
+
+if __name__ == "__main__":
+    main()
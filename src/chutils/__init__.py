@@ -81,13 +81,18 @@ _LAZY_MAPPING = {
     'MemoryStore': ('.store.backends.memory', 'MemoryStore'),
     'RedisStore': ('.store.backends.redis', 'RedisStore'),
     'MemcachedStore': ('.store.backends.memcached', 'MemcachedStore'),
+    'TieredStore': ('.store.backends.tiered', 'TieredStore'),
     'store_cache': ('.store.decorator', 'store_cache'),
 
     # http
     'HttpClient': ('.http', 'HttpClient'),
     'AsyncHttpClient': ('.http', 'AsyncHttpClient'),
     'HttpResponse': ('.http', 'HttpResponse'),
+    'StreamingResponse': ('.http', 'StreamingResponse'),
+    'AsyncStreamingResponse': ('.http', 'AsyncStreamingResponse'),
     'ResiliencePolicy': ('.http', 'ResiliencePolicy'),
+    'AdaptiveLimiter': ('.http', 'AdaptiveLimiter'),
+    'RetryBudget': ('.http', 'RetryBudget'),
     'UrllibFallbackClient': ('.http', 'UrllibFallbackClient'),
     'inject_trace_headers': ('.http', 'inject_trace_headers'),
     'create_http_span': ('.http', 'create_http_span'),
@@ -171,6 +176,7 @@ _LAZY_MAPPING = {
     'cache_with_ttl': ('.cache', 'cache_with_ttl'),
     'BaseCacheBackend': ('.cache', 'BaseCacheBackend'),
     'InMemoryCacheBackend': ('.cache', 'InMemoryCacheBackend'),
+    'ShardedInMemoryCacheBackend': ('.cache', 'ShardedInMemoryCacheBackend'),
 
     # context
     'bind_context': ('.context', 'bind_context'),
@@ -229,6 +235,7 @@ _LAZY_MAPPING = {
     'CacheError': ('.exceptions', 'CacheError'),
     'EventBusError': ('.exceptions', 'EventBusError'),
     'EventBusExceptionGroup': ('.exceptions', 'EventBusExceptionGroup'),
+    'EventBusQueueFullError': ('.exceptions', 'EventBusQueueFullError'),
     'ChutilsValidationError': ('.exceptions', 'ChutilsValidationError'),
     'EnvValidationError': ('.exceptions', 'EnvValidationError'),
     'HttpClientError': ('.exceptions', 'HttpClientError'),
@@ -244,6 +251,7 @@ _LAZY_MAPPING = {
     'periodic_task': ('.tasks', 'periodic_task'),
     'start_scheduler': ('.tasks', 'start_scheduler'),
     'stop_scheduler': ('.tasks', 'stop_scheduler'),
+    'configure_executor': ('.tasks', 'configure_executor'),
 
     # di
     'di': ('.di', None),
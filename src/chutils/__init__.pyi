@@ -2,7 +2,7 @@
 from abc import ABC
 import datetime
 import logging
-from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
 from enum import Enum
 from pathlib import Path
 from typing import Any, TypeVar, Literal
@@ -405,6 +405,9 @@ class EventBusExceptionGroup(EventBusError):
     ) -> None: ...
 
 
+class EventBusQueueFullError(EventBusError): ...
+
+
 class RateLimitExceededError(ChutilsException): ...
 
 
@@ -439,22 +442,41 @@ class ErrorStrategy(str, Enum):
 
 class EventBus:
     error_strategy: ErrorStrategy
+    max_queue_size: int
+    workers: int
+    overflow: Literal["block", "drop", "raise"]
+    block_timeout: float | None
 
     def __init__(
-            self, error_strategy: ErrorStrategy = ErrorStrategy.IGNORE
+            self,
+            error_strategy: ErrorStrategy = ErrorStrategy.IGNORE,
+            *,
+            max_queue_size: int = 10_000,
+            workers: int = 4,
+            overflow: Literal["block", "drop", "raise"] = "block",
+            block_timeout: float | None = None,
     ) -> None: ...
 
     def subscribe(
-            self, event_name: str
+            self,
+            event_name: str,
+            *,
+            batch_size: int | None = None,
+            max_wait: float = 0.1,
     ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
 
     def unsubscribe(self, event_name: str, func: Callable[..., Any]) -> None: ...
 
+    def queue_depths(self) -> dict[str, int]: ...
+
+    def join(self, timeout: float | None = None) -> bool: ...
+
     def publish(
             self,
             event_name: str,
             *args: Any,
             error_strategy: ErrorStrategy | None = None,
+            overflow: Literal["block", "drop", "raise"] | None = None,
             **kwargs: Any,
     ) -> None: ...
 
@@ -463,12 +485,16 @@ class EventBus:
             event_name: str,
             *args: Any,
             error_strategy: ErrorStrategy | None = None,
+            overflow: Literal["block", "drop", "raise"] | None = None,
             **kwargs: Any,
     ) -> None: ...
 
 
 def subscribe(
         event_name: str,
+        *,
+        batch_size: int | None = None,
+        max_wait: float = 0.1,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
 
 
@@ -476,6 +502,7 @@ def publish(
         event_name: str,
         *args: Any,
         error_strategy: ErrorStrategy | None = None,
+        overflow: Literal["block", "drop", "raise"] | None = None,
         **kwargs: Any,
 ) -> None: ...
 
@@ -484,26 +511,35 @@ async def publish_async(
         event_name: str,
         *args: Any,
         error_strategy: ErrorStrategy | None = None,
+        overflow: Literal["block", "drop", "raise"] | None = None,
         **kwargs: Any,
 ) -> None: ...
 
 
 # --- tasks ---
 def periodic_task(
-        interval_seconds: int | float | Callable[[], int | float] | str,
+        interval_seconds: int | float | Callable[[], int | float] | str | None = None,
         run_immediately: bool = False,
         overlap: bool = False,
         error_strategy: Any = ...,
         name: str = "",
+        *,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        executor: str | None = None,
+        timeout: float | None = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
 
 
-def start_scheduler() -> None: ...
+def start_scheduler(max_concurrency: int | None = None) -> None: ...
 
 
 async def stop_scheduler() -> None: ...
 
 
+def configure_executor(name: str, kind: Literal["thread", "process"] = "thread", *, max_workers: int | None = None) -> None: ...
+
+
 # --- di ---
 class Container:
     def __init__(self) -> None: ...
@@ -906,17 +942,42 @@ class BaseAuditBackend:
 
     def verify_integrity(self) -> bool: ...
 
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
 
 class FileBackend(BaseAuditBackend):
-    def __init__(self, path: str | Path) -> None: ...
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            batch_size: int = 1,
+            flush_interval: float = 1.0,
+            fsync: bool = False,
+            checkpoint_key: str | bytes | None = None,
+    ) -> None: ...
+
+    def verify_integrity(self, *, full: bool = False, workers: int = 1) -> bool: ...
 
 
 class SqliteBackend(BaseAuditBackend):
-    def __init__(self, path: str | Path) -> None: ...
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            batch_size: int = 1,
+            flush_interval: float = 1.0,
+            checkpoint_key: str | bytes | None = None,
+    ) -> None: ...
+
+    def verify_integrity(self, *, full: bool = False, workers: int = 1) -> bool: ...
 
 
 class PostgresBackend(BaseAuditBackend):
-    def __init__(self, connection: Any) -> None: ...
+    def __init__(self, connection: Any, *, batch_size: int = 1, flush_interval: float = 1.0) -> None: ...
+
+    def verify_integrity(self, *, workers: int = 1) -> bool: ...
 
 
 class _AuditContextState:
@@ -959,6 +1020,97 @@ class HttpResponse:
     def raise_for_status(self) -> None: ...
 
 
+class StreamingResponse:
+    status_code: int
+    headers: Mapping[str, str]
+    url: str
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]: ...
+
+    def __iter__(self) -> Iterator[bytes]: ...
+
+    def read(self) -> bytes: ...
+
+    def raise_for_status(self) -> None: ...
+
+    def download_to(self, path: str | Path, *, chunk_size: int | None = ...) -> Path: ...
+
+
+class AsyncStreamingResponse:
+    status_code: int
+    headers: Mapping[str, str]
+    url: str
+
+    def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]: ...
+
+    def __aiter__(self) -> AsyncIterator[bytes]: ...
+
+    async def aread(self) -> bytes: ...
+
+    def raise_for_status(self) -> None: ...
+
+    async def download_to(self, path: str | Path, *, chunk_size: int | None = ...) -> Path: ...
+
+
+class AdaptiveLimiter:
+    algorithm: Literal["aimd", "gradient"]
+    min_limit: int
+    max_limit: int
+    name: str
+
+    def __init__(
+            self,
+            *,
+            algorithm: Literal["aimd", "gradient"] = "aimd",
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            backoff_ratio: float = 0.9,
+            latency_threshold: float | None = None,
+            tolerance: float = 1.5,
+            smoothing: float = 0.2,
+            long_window: int = 600,
+            name: str = "default",
+    ) -> None: ...
+
+    @property
+    def limit(self) -> int: ...
+
+    @property
+    def in_flight(self) -> int: ...
+
+    def try_acquire(self) -> bool: ...
+
+    def acquire(self, timeout: float | None = None) -> bool: ...
+
+    async def aacquire(self) -> None: ...
+
+    def release(self, latency: float, *, dropped: bool = False) -> None: ...
+
+
+class RetryBudget:
+    ratio: float
+    min_retries_per_second: float
+    capacity: float
+    name: str
+
+    def __init__(
+            self,
+            *,
+            ratio: float = 0.1,
+            min_retries_per_second: float = 1.0,
+            capacity: float = 100.0,
+            name: str = "default",
+    ) -> None: ...
+
+    @property
+    def tokens(self) -> float: ...
+
+    def deposit(self) -> None: ...
+
+    def try_withdraw(self) -> bool: ...
+
+
 class ResiliencePolicy:
     retries: int
     retry_delay: float
@@ -968,6 +1120,13 @@ class ResiliencePolicy:
     max_concurrency: int | None
     cb_failure_threshold: int
     cb_recovery_timeout: float
+    limiter: AdaptiveLimiter | None
+    hedging: bool
+    hedge_quantile: float
+    hedge_min_delay: float
+    max_hedges: int
+    retry_budget: RetryBudget | None
+    name: str
 
     def __init__(
             self,
@@ -982,6 +1141,13 @@ class ResiliencePolicy:
             max_concurrency: int | None = None,
             cb_failure_threshold: int = 5,
             cb_recovery_timeout: float = 30.0,
+            adaptive_concurrency: Literal["aimd", "gradient"] | AdaptiveLimiter | None = None,
+            hedging: bool = False,
+            hedge_quantile: float = 0.95,
+            hedge_min_delay: float = 0.005,
+            max_hedges: int = 1,
+            retry_budget: float | RetryBudget | None = None,
+            name: str = "default",
     ) -> None: ...
 
     def apply_sync(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any: ...
@@ -993,6 +1159,7 @@ class HttpClient:
     base_url: str
     timeout: float | None
     policy: ResiliencePolicy | None
+    pooled: bool
 
     def __init__(
             self,
@@ -1002,11 +1169,19 @@ class HttpClient:
             timeout: float | None = 30.0,
             policy: ResiliencePolicy | None = None,
             sensitive_headers: set[str] | None = None,
+            pooled: bool = True,
     ) -> None: ...
 
     def request(self, method: str, path: str, *, headers: dict[str, str] | None = None, json_data: Any | None = None,
                 data: bytes | str | None = None, timeout: float | None = None) -> HttpResponse: ...
 
+    def stream(self, method: str, path: str, *, headers: dict[str, str] | None = None, json_data: Any | None = None,
+               data: bytes | str | None = None,
+               timeout: float | None = None) -> contextlib.AbstractContextManager[StreamingResponse]: ...
+
+    def download(self, path: str, dest: str | Path, *, headers: dict[str, str] | None = None,
+                 timeout: float | None = None, resume: bool = False, chunk_size: int | None = ...) -> Path: ...
+
     def get(self, path: str, *, headers: dict[str, str] | None = None,
             timeout: float | None = None) -> HttpResponse: ...
 
@@ -1033,6 +1208,7 @@ class AsyncHttpClient:
     base_url: str
     timeout: float | None
     policy: ResiliencePolicy | None
+    pooled: bool
 
     def __init__(
             self,
@@ -1042,12 +1218,21 @@ class AsyncHttpClient:
             timeout: float | None = 30.0,
             policy: ResiliencePolicy | None = None,
             sensitive_headers: set[str] | None = None,
+            pooled: bool = True,
     ) -> None: ...
 
     async def request(self, method: str, path: str, *, headers: dict[str, str] | None = None,
                       json_data: Any | None = None, data: bytes | str | None = None,
                       timeout: float | None = None) -> HttpResponse: ...
 
+    def stream(self, method: str, path: str, *, headers: dict[str, str] | None = None,
+               json_data: Any | None = None, data: bytes | str | None = None,
+               timeout: float | None = None) -> contextlib.AbstractAsyncContextManager[AsyncStreamingResponse]: ...
+
+    async def download(self, path: str, dest: str | Path, *, headers: dict[str, str] | None = None,
+                       timeout: float | None = None, resume: bool = False,
+                       chunk_size: int | None = ...) -> Path: ...
+
     async def get(self, path: str, *, headers: dict[str, str] | None = None,
                   timeout: float | None = None) -> HttpResponse: ...
 
@@ -1130,6 +1315,13 @@ class UrllibFallbackClient:
                  timeout: float | None = 30.0, policy: ResiliencePolicy | None = None,
                  sensitive_headers: set[str] | None = None) -> None: ...
 
+    def stream(self, method: str, path: str, *, headers: dict[str, str] | None = None, json_data: Any | None = None,
+               data: bytes | str | None = None,
+               timeout: float | None = None) -> contextlib.AbstractContextManager[StreamingResponse]: ...
+
+    def download(self, path: str, dest: str | Path, *, headers: dict[str, str] | None = None,
+                 timeout: float | None = None, resume: bool = False, chunk_size: int | None = ...) -> Path: ...
+
     def get(self, path: str, *, headers: dict[str, str] | None = None,
             timeout: float | None = None) -> HttpResponse: ...
 
@@ -1177,6 +1369,10 @@ def patch(url: str, *, headers: dict[str, str] | None = None, json_data: Any | N
           policy: ResiliencePolicy | None = None) -> HttpResponse: ...
 
 
+def download(url: str, dest: str | Path, *, headers: dict[str, str] | None = None, timeout: float | None = None,
+             resume: bool = False, policy: ResiliencePolicy | None = None) -> Path: ...
+
+
 # store
 class BaseStoreBackend(ABC):
     def get(self, key: str, default: Any = None) -> Any: ...
@@ -1189,10 +1385,19 @@ class BaseStoreBackend(ABC):
     async def adelete(self, key: str) -> bool: ...
     async def aexists(self, key: str) -> bool: ...
     async def aclear(self) -> bool: ...
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+    def set_many(self, items: dict[str, Any], ttl: int | float | None = None) -> bool: ...
+    def delete_many(self, keys: Iterable[str]) -> int: ...
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+    async def aset_many(self, items: dict[str, Any], ttl: int | float | None = None) -> bool: ...
+    async def adelete_many(self, keys: Iterable[str]) -> int: ...
 
 
 class MemoryStore(BaseStoreBackend):
-    def __init__(self) -> None: ...
+    def __init__(self, max_entries: int | None = None, eviction: Literal["lru", "lfu", "tinylfu"] = "lru") -> None: ...
+    def purge_expired(self) -> int: ...
+    def start_reaper(self, interval: float = 1.0) -> None: ...
+    def stop_reaper(self) -> None: ...
 
 
 class RedisStore(BaseStoreBackend):
@@ -1203,8 +1408,20 @@ class MemcachedStore(BaseStoreBackend):
     def __init__(self, host: str = "127.0.0.1", port: int = 11211, **kwargs: Any) -> None: ...
 
 
+class TieredStore(BaseStoreBackend):
+    def __init__(self, remote: BaseStoreBackend, local_ttl: float = 5.0, local_max_entries: int = 10_000,
+                 local: MemoryStore | None = None, invalidation: Any | None = None, name: str = "tiered") -> None: ...
+    @property
+    def local(self) -> MemoryStore: ...
+    @property
+    def remote(self) -> BaseStoreBackend: ...
+    def close(self) -> None: ...
+
+
 class StoreManager:
-    def __init__(self, backend: BaseStoreBackend | None = None, serializer: str | Any = "json", prefix: str = "") -> None: ...
+    def __init__(self, backend: BaseStoreBackend | None = None, serializer: str | Any = "json", prefix: str = "",
+                 compression: Literal["zlib", "zstd", "lz4"] | None = None, compression_threshold: int = 1024,
+                 compression_level: int | None = None) -> None: ...
     @classmethod
     def from_config(cls, config: dict[str, Any] | None = None) -> StoreManager: ...
     def get(self, key: str, default: Any = None) -> Any: ...
@@ -1212,11 +1429,19 @@ class StoreManager:
     def delete(self, key: str) -> bool: ...
     def exists(self, key: str) -> bool: ...
     def clear(self) -> bool: ...
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+    def set_many(self, items: dict[str, Any], ttl: int | float | None = None) -> bool: ...
+    def delete_many(self, keys: Iterable[str]) -> int: ...
     async def aget(self, key: str, default: Any = None) -> Any: ...
     async def aset(self, key: str, value: Any, ttl: int | float | None = None) -> bool: ...
     async def adelete(self, key: str) -> bool: ...
     async def aexists(self, key: str) -> bool: ...
     async def aclear(self) -> bool: ...
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+    async def aset_many(self, items: dict[str, Any], ttl: int | float | None = None) -> bool: ...
+    async def adelete_many(self, keys: Iterable[str]) -> int: ...
 
 
-def store_cache(store: StoreManager | None = None, ttl: int | float = 60, key_prefix: str = "cache:") -> Callable[..., Any]: ...
+def store_cache(store: StoreManager | None = None, ttl: int | float = 60, key_prefix: str = "cache:",
+                key_builder: Literal["repr", "hash"] | Callable[..., str] = "repr",
+                key: Callable[..., str] | None = None) -> Callable[..., Any]: ...
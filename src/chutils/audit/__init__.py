@@ -4,6 +4,7 @@ chutils.audit — Неизменяемый журнал событий ауди
 Предоставляет:
 - AuditEvent: Pydantic-схема записи аудита с криптографической цепочкой.
 - BaseAuditBackend, FileBackend, SqliteBackend, PostgresBackend: бэкенды хранения.
+- BufferedAuditBackend: основа бэкендов с кэшем последнего хэша и групповой фиксацией.
 - audit_event: декоратор для автоматической регистрации событий.
 - audit_context: контекстный менеджер для блока операций.
 
@@ -16,7 +17,7 @@ chutils.audit — Неизменяемый журнал событий ауди
     def login(user_id: str) -> None:
         ...
 """
-from chutils.audit.backends.base import BaseAuditBackend
+from chutils.audit.backends.base import BaseAuditBackend, BufferedAuditBackend
 from chutils.audit.backends.file import FileBackend
 from chutils.audit.backends.sqlite import SqliteBackend
 from chutils.audit.schema import AuditEvent
@@ -36,6 +37,7 @@ except ImportError:
 __all__ = [
     "AuditEvent",
     "BaseAuditBackend",
+    "BufferedAuditBackend",
     "FileBackend",
     "SqliteBackend",
     "PostgresBackend",
@@ -0,0 +1,224 @@
+"""Потоковая, параллельная и инкрементальная проверка цепочки хэшей журнала аудита.
+
+Записи читаются потоком и проверяются пачками по `_CHUNK_SIZE`: хэш каждой
+записи пересчитывается (последовательно или в пуле процессов), после чего
+связность цепочки (`prev_hash` = `hash` предыдущей записи) проверяется в
+исходном порядке в основном процессе. В памяти одновременно находится не
+больше нескольких пачек на процесс.
+"""
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import hmac
+import itertools
+import json
+import multiprocessing
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, TypeVar
+
+from chutils.audit._hash import compute_record_hash
+
+T = TypeVar("T")
+
+_CHUNK_SIZE = 2000
+"""Число записей в пачке, отправляемой на проверку в процесс."""
+
+_CHUNKS_IN_FLIGHT = 2
+"""Сколько пачек на процесс может ожидать проверки одновременно."""
+
+_Checked = tuple[str, str, str, bool]
+"""Результат проверки записи: (id, prev_hash, hash, hash совпадает с пересчитанным)."""
+
+
+def decode_jsonl(line: bytes) -> dict[str, Any]:
+    """Разбирает строку JSONL-журнала в словарь записи.
+
+    Args:
+        line: Строка журнала.
+
+    Returns:
+        Словарь записи.
+    """
+    record: dict[str, Any] = json.loads(line)
+    return record
+
+
+def decode_row(row: tuple[Any, ...]) -> dict[str, Any]:
+    """Строит словарь записи из строки таблицы audit_log.
+
+    Ожидаемый порядок колонок: id, actor, action, target, status, details, env,
+    timestamp, prev_hash, hash. Ключи идут в порядке `AuditEvent.model_dump(mode="json")`.
+
+    Args:
+        row: Строка таблицы audit_log.
+
+    Returns:
+        Словарь записи.
+    """
+    (rid, actor, action, target, status, details_str,
+     env_str, timestamp, prev_hash, stored_hash) = row[:10]
+    return {
+        "id": rid,
+        "timestamp": timestamp,
+        "actor": actor,
+        "action": action,
+        "target": target,
+        "status": status,
+        "details": json.loads(details_str),
+        "env": json.loads(env_str),
+        "prev_hash": prev_hash,
+        "hash": stored_hash,
+    }
+
+
+def _check_chunk(decode: Callable[[Any], dict[str, Any]], items: list[Any]) -> list[_Checked]:
+    checked: list[_Checked] = []
+    for item in items:
+        record = decode(item)
+        stored_hash = str(record.get("hash", ""))
+        checked.append((
+            str(record.get("id", "unknown")),
+            str(record.get("prev_hash", "")),
+            stored_hash,
+            stored_hash == compute_record_hash(record),
+        ))
+    return checked
+
+
+def _chunks(items: Iterable[T]) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, _CHUNK_SIZE)):
+        yield chunk
+
+
+def _checked_in_processes(
+        check: Callable[[list[Any]], list[_Checked]],
+        items: Iterable[Any],
+        workers: int,
+) -> Iterator[list[_Checked]]:
+    pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: collections.deque[concurrent.futures.Future[list[_Checked]]] = collections.deque()
+    try:
+        for chunk in _chunks(items):
+            pending.append(pool.submit(check, chunk))
+            if len(pending) >= workers * _CHUNKS_IN_FLIGHT:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def verify_chain(
+        items: Iterable[T],
+        decode: Callable[[T], dict[str, Any]],
+        *,
+        prev_hash: str = "",
+        workers: int = 1,
+) -> str:
+    """Проверяет поток записей журнала и возвращает hash последней из них.
+
+    Args:
+        items: Записи в порядке цепочки (строки файла или строки таблицы).
+        decode: Функция уровня модуля, превращающая элемент `items` в словарь записи.
+        prev_hash: Ожидаемый prev_hash первой записи.
+        workers: Число процессов для пересчёта хэшей; 1 — в текущем процессе.
+
+    Returns:
+        hash последней проверенной записи (`prev_hash`, если записей нет).
+
+    Raises:
+        AuditIntegrityError: При обнаружении повреждённой записи.
+        ValueError: Если workers < 1.
+    """
+    from chutils.exceptions import AuditIntegrityError
+
+    if workers < 1:
+        raise ValueError(f"workers должен быть положительным, получено: {workers}")
+    check = functools.partial(_check_chunk, decode)
+    results = map(check, _chunks(items)) if workers == 1 else _checked_in_processes(check, items, workers)
+    for chunk in results:
+        for rid, stored_prev_hash, stored_hash, hash_ok in chunk:
+            if not hash_ok:
+                raise AuditIntegrityError(
+                    "Нарушена целостность записи: hash не совпадает.",
+                    record_id=rid,
+                )
+            if stored_prev_hash != prev_hash:
+                raise AuditIntegrityError(
+                    "Нарушена целостность записи: prev_hash не совпадает с предыдущим hash.",
+                    record_id=rid,
+                )
+            prev_hash = stored_hash
+    return prev_hash
+
+
+def sign_checkpoint(key: bytes, position: int, record_hash: str) -> str:
+    """Подписывает отметку «проверено до позиции position с hash record_hash» (HMAC-SHA256).
+
+    Args:
+        key: Ключ HMAC.
+        position: Позиция последней проверенной записи.
+        record_hash: Hash последней проверенной записи.
+
+    Returns:
+        Подпись в шестнадцатеричном виде.
+    """
+    message = f"{position}:{record_hash}".encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def check_checkpoint(key: bytes, position: int, record_hash: str, signature: str) -> None:
+    """Проверяет подпись отметки проверки.
+
+    Args:
+        key: Ключ HMAC.
+        position: Позиция из отметки.
+        record_hash: Hash из отметки.
+        signature: Сохраненная подпись отметки.
+
+    Raises:
+        AuditIntegrityError: Если подпись не совпадает.
+    """
+    from chutils.exceptions import AuditIntegrityError
+
+    if not hmac.compare_digest(sign_checkpoint(key, position, record_hash), signature):
+        raise AuditIntegrityError(
+            "Нарушена целостность отметки проверки: подпись не совпадает.",
+            position=position,
+        )
+
+
+def check_resume_record(record: dict[str, Any] | None, record_hash: str, position: int) -> None:
+    """Проверяет, что запись, на которой завершилась прошлая проверка, не изменена.
+
+    Args:
+        record: Запись на отмеченной позиции или None, если ее нет.
+        record_hash: Hash из отметки.
+        position: Позиция из отметки.
+
+    Raises:
+        AuditIntegrityError: Если записи нет или её hash отличается от отмеченного.
+    """
+    from chutils.exceptions import AuditIntegrityError
+
+    if record is None or record.get("hash") != record_hash or compute_record_hash(record) != record_hash:
+        raise AuditIntegrityError(
+            "Нарушена целостность журнала: запись, на которой завершилась прошлая проверка, изменена или удалена.",
+            position=position,
+        )
+
+
+def as_checkpoint_key(key: str | bytes | None) -> bytes | None:
+    """Приводит ключ подписи отметок проверки к байтам.
+
+    Args:
+        key: Ключ в виде строки или байтов.
+
+    Returns:
+        Ключ в байтах или None, если ключ не задан.
+    """
+    return key.encode("utf-8") if isinstance(key, str) else key
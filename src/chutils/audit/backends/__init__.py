@@ -1,6 +1,6 @@
 """Бэкенды хранения журнала аудита."""
-from chutils.audit.backends.base import BaseAuditBackend
+from chutils.audit.backends.base import BaseAuditBackend, BufferedAuditBackend
 from chutils.audit.backends.file import FileBackend
 from chutils.audit.backends.sqlite import SqliteBackend
 
-__all__ = ["BaseAuditBackend", "FileBackend", "SqliteBackend"]
+__all__ = ["BaseAuditBackend", "BufferedAuditBackend", "FileBackend", "SqliteBackend"]
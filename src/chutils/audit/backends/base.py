@@ -1,7 +1,13 @@
-"""Абстрактный базовый класс для бэкендов хранения журнала аудита."""
+"""Абстрактные базовые классы для бэкендов хранения журнала аудита."""
 from __future__ import annotations
 
+import json
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import threading
 from abc import ABC, abstractmethod
+from typing import Any
+
+logger = logging.getLogger("chutils.audit")
 
 
 class BaseAuditBackend(ABC):
@@ -44,3 +50,191 @@ class BaseAuditBackend(ABC):
         Raises:
             AuditIntegrityError: Если обнаружено нарушение целостности.
         """
+
+    def flush(self) -> None:
+        """Сохраняет накопленные в буфере записи (для бэкендов с групповой фиксацией)."""
+
+    def close(self) -> None:
+        """Сохраняет накопленные записи и освобождает ресурсы бэкенда."""
+        self.flush()
+
+
+class BufferedAuditBackend(BaseAuditBackend):
+    """Бэкенд с кэшем последнего хэша и опциональной групповой фиксацией.
+
+    Хэш последней сохранённой записи хранится в памяти, чтобы `log()` не обращался
+    к хранилищу. Кэш не предполагает единственного писателя: `_write()` под блокировкой
+    хранилища сверяет фактический последний хэш с началом пачки и при расхождении
+    (первая запись экземпляра, запись другого процесса, откат транзакции приложением)
+    перестраивает цепочку пачки от него (см. `_rechain`).
+
+    При `batch_size=1` каждая запись сохраняется сразу (поведение по умолчанию).
+    При `batch_size > 1` записи копятся в буфере и сохраняются пачкой — одной
+    транзакцией или одной записью в файл — когда буфер заполнен, через
+    `flush_interval` секунд после первой несохранённой записи или при вызове
+    `flush()`/`close()`. Хэш каждой записи вычисляется сразу в `log()`, так что
+    цепочка не зависит от момента сохранения.
+
+    Если сохранение пачки завершилось ошибкой, пачка отбрасывается, а хэш последней
+    записи перечитывается из хранилища, чтобы следующие записи продолжали цепочку
+    с фактически сохранённой записи.
+
+    Подклассы реализуют `_load_last_hash()` и `_write()`.
+
+    Args:
+        batch_size: Размер пачки.
+        flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+    """
+
+    def __init__(self, *, batch_size: int = 1, flush_interval: float = 1.0) -> None:
+        """Инициализирует буфер и кэш последнего хэша.
+
+        Args:
+            batch_size: Размер пачки; 1 — сохранять каждую запись сразу.
+            flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+
+        Raises:
+            ValueError: Если batch_size < 1 или flush_interval <= 0.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, получено: {batch_size}")
+        if flush_interval <= 0:
+            raise ValueError(f"flush_interval должен быть положительным, получено: {flush_interval}")
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._last_hash: str | None = None
+        self._pending: list[Any] = []
+        self._timer: threading.Timer | None = None
+        if batch_size > 1:
+            from chutils.lifecycle import register_cleanup
+
+            register_cleanup(self.close)
+
+    @abstractmethod
+    def _load_last_hash(self) -> str:
+        """Читает из хранилища hash последней записи или '' если записей нет."""
+
+    @abstractmethod
+    def _write(self, events: list[Any]) -> str:
+        """Сохраняет пачку событий AuditEvent в хранилище в заданном порядке.
+
+        Реализация должна под блокировкой хранилища сверить его последний хэш
+        с `events[0].prev_hash` и сохранить результат `_rechain`.
+
+        Args:
+            events: Пачка событий, связанных в цепочку.
+
+        Returns:
+            hash последней сохранённой записи.
+        """
+
+    @staticmethod
+    def _rechain(events: list[Any], prev_hash: str) -> list[Any]:
+        """Связывает пачку с фактическим последним хэшем хранилища.
+
+        Args:
+            events: Пачка событий, связанных в цепочку.
+            prev_hash: hash последней записи в хранилище.
+
+        Returns:
+            Исходная пачка, если она уже продолжает `prev_hash`, иначе копии событий
+            с теми же id и данными и пересчитанными prev_hash и hash.
+        """
+        if not events or events[0].prev_hash == prev_hash:
+            return events
+        rechained: list[Any] = []
+        for event in events:
+            event = type(event)(**{**event.model_dump(), "prev_hash": prev_hash, "hash": ""})
+            rechained.append(event)
+            prev_hash = event.hash
+        return rechained
+
+    def log(
+            self,
+            action: str,
+            actor: str,
+            *,
+            target: str | None = None,
+            status: str = "success",
+            details: dict[str, object] | None = None,
+    ) -> str:
+        """Добавляет событие в журнал.
+
+        Args:
+            action: Название операции.
+            actor: Субъект действия.
+            target: Объект операции (опционально).
+            status: Результат — 'success' или 'failed'.
+            details: Произвольные детали события.
+
+        Returns:
+            UUID созданной записи.
+        """
+        from chutils.audit.schema import AuditEvent
+
+        with self._lock:
+            event = AuditEvent(
+                actor=actor,
+                action=action,
+                target=target,
+                status=status,
+                details=details or {},
+                # До первой записи цепочка строится от '' и связывается с хранилищем в _write()
+                prev_hash=self._last_hash or "",
+            )
+            self._pending.append(event)
+            self._last_hash = event.hash
+            if len(self._pending) >= self._batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._flush_interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+            return str(event.id)
+
+    def flush(self) -> None:
+        """Сохраняет накопленные в буфере записи.
+
+        Raises:
+            Exception: Ошибка хранилища; несохранённая пачка при этом отбрасывается.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        events, self._pending = self._pending, []
+        try:
+            self._last_hash = self._write(events)
+        except Exception:
+            self._last_hash = None
+            raise
+
+    def _flush_on_timer(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Не удалось сохранить пачку записей аудита (%s)", type(self).__name__)
+
+
+def _event_row(event: Any) -> tuple[object, ...]:
+    """Возвращает строку таблицы audit_log для события AuditEvent (в порядке колонок INSERT)."""
+    # model_dump(mode="json") даёт timestamp в том же формате, что использовался при вычислении hash
+    dumped = event.model_dump(mode="json")
+    return (
+        event.id,
+        dumped["timestamp"],
+        event.actor,
+        event.action,
+        event.target,
+        event.status,
+        json.dumps(event.details, default=str),
+        json.dumps(event.env, default=str),
+        event.prev_hash,
+        event.hash,
+    )
@@ -2,122 +2,208 @@
 from __future__ import annotations
 
 import json
-import threading
+import os
+import sys
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any, BinaryIO
 
-from chutils.audit._hash import compute_record_hash
-from chutils.audit.backends.base import BaseAuditBackend
-from chutils.fs import ensure_dir
+from chutils.audit._verify import (
+    as_checkpoint_key,
+    check_checkpoint,
+    check_resume_record,
+    decode_jsonl,
+    sign_checkpoint,
+    verify_chain,
+)
+from chutils.audit.backends.base import BufferedAuditBackend
+from chutils.fs import atomic_write, ensure_dir
 
+_TAIL_CHUNK = 64 * 1024
+"""Размер блока при поиске последней строки с конца файла."""
 
-class FileBackend(BaseAuditBackend):
+if sys.platform != "win32":
+    import fcntl
+
+    def _lock_file(f: BinaryIO) -> None:
+        """Берёт эксклюзивную блокировку файла до его закрытия.
+
+        Args:
+            f: Открытый файл журнала.
+        """
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+else:
+    def _lock_file(f: BinaryIO) -> None:
+        """На Windows межпроцессная блокировка не используется.
+
+        Args:
+            f: Открытый файл журнала.
+        """
+
+
+def _read_last_line(path: Path) -> bytes:
+    """Читает последнюю непустую строку файла, просматривая его с конца блоками."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        tail = b""
+        while end > 0:
+            start = max(0, end - _TAIL_CHUNK)
+            f.seek(start)
+            tail = f.read(end - start) + tail
+            end = start
+            stripped = tail.rstrip()
+            newline = stripped.rfind(b"\n")
+            if newline != -1:
+                return stripped[newline + 1:].strip()
+        return tail.strip()
+
+
+class FileBackend(BufferedAuditBackend):
     """Бэкенд хранения событий аудита в JSONL-файле.
 
     Каждая строка файла — одна запись в формате JSON.
     Записи связаны в криптографическую цепочку через поле prev_hash.
-    Запись и вычисление хэшей потокобезопасны.
+    Запись и вычисление хэшей потокобезопасны. При `batch_size > 1` пачка
+    записей дописывается в файл одной операцией (см. `BufferedAuditBackend`).
+    Перед дозаписью бэкенд берёт блокировку файла (`flock`, кроме Windows) и, если
+    файл вырос после его последней записи, перечитывает последний хэш, поэтому
+    несколько процессов могут писать в один журнал.
 
     Args:
         path: Путь к файлу журнала (будет создан при первой записи).
+        batch_size: Размер пачки; 1 — дописывать каждую запись сразу.
+        flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+        fsync: Вызывать `os.fsync` после каждой записи в файл (после каждой пачки).
+        checkpoint_key: Ключ HMAC для подписи отметок проверки целостности; без него
+            `verify_integrity()` всегда проверяет файл целиком.
     """
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            batch_size: int = 1,
+            flush_interval: float = 1.0,
+            fsync: bool = False,
+            checkpoint_key: str | bytes | None = None,
+    ) -> None:
         """Инициализирует FileBackend с указанным путём к файлу журнала.
 
         Args:
             path: Путь к JSONL-файлу журнала (будет создан при первой записи).
+            batch_size: Размер пачки; 1 — дописывать каждую запись сразу.
+            flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+            fsync: Сбрасывать данные на диск через `os.fsync` после каждой записи в файл.
+            checkpoint_key: Ключ HMAC для подписи отметок проверки целостности. Отметка
+                хранится рядом с журналом в файле `<имя журнала>.checkpoint`.
         """
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
         self._path = Path(path)
-        self._lock = threading.Lock()
-
-    def _get_last_hash(self) -> str:
+        self._fsync = fsync
+        self._checkpoint_key = as_checkpoint_key(checkpoint_key)
+        self._checkpoint_path = self._path.with_name(self._path.name + ".checkpoint")
+        # Размер файла и hash его последней записи; при другом размере hash перечитывается
+        self._known_size: int | None = None
+        self._tail_hash = ""
+
+    def _load_last_hash(self) -> str:
         """Возвращает hash последней записи или '', если файл пуст."""
         if not self._path.exists():
+            self._known_size = 0
             return ""
-        with open(self._path, "rb") as f:
-            last_line = b""
-            for line in f:
-                stripped = line.strip()
-                if stripped:
-                    last_line = stripped
+        self._known_size = self._path.stat().st_size
+        last_line = _read_last_line(self._path)
         if not last_line:
             return ""
         record = json.loads(last_line)
         return str(record.get("hash", ""))
 
-    def log(
-            self,
-            action: str,
-            actor: str,
-            *,
-            target: str | None = None,
-            status: str = "success",
-            details: dict[str, object] | None = None,
-    ) -> str:
-        """Добавляет событие в JSONL-файл.
+    def _write(self, events: list[Any]) -> str:
+        ensure_dir(self._path.parent)
+        with open(self._path, "ab") as f:
+            _lock_file(f)
+            if f.seek(0, os.SEEK_END) != self._known_size:
+                # Файл дописал другой писатель (или он ещё не читался) — берём его последнюю запись
+                self._tail_hash = self._load_last_hash()
+            events = self._rechain(events, self._tail_hash)
+            f.write("".join(event.to_jsonl() + "\n" for event in events).encode("utf-8"))
+            f.flush()
+            if self._fsync:
+                os.fsync(f.fileno())
+            self._known_size = f.tell()
+        self._tail_hash = str(events[-1].hash)
+        return self._tail_hash
+
+    def verify_integrity(self, *, full: bool = False, workers: int = 1) -> bool:
+        """Проверяет целостность цепочки хэшей в JSONL-файле, читая его потоком.
+
+        Если задан `checkpoint_key`, проверка продолжается с подписанной отметки
+        предыдущей успешной проверки (смещение в файле и hash последней записи),
+        а после успешной проверки отметка обновляется.
 
         Args:
-            action: Название операции.
-            actor: Субъект действия.
-            target: Объект операции (опционально).
-            status: Результат — 'success' или 'failed'.
-            details: Произвольные детали события.
-
-        Returns:
-            UUID созданной записи.
-        """
-        from chutils.audit.schema import AuditEvent
-
-        with self._lock:
-            prev_hash = self._get_last_hash()
-            event = AuditEvent(
-                actor=actor,
-                action=action,
-                target=target,
-                status=status,
-                details=details or {},
-                prev_hash=prev_hash,
-            )
-            ensure_dir(self._path.parent)
-            with open(self._path, "a", encoding="utf-8") as f:
-                f.write(event.to_jsonl() + "\n")
-            return str(event.id)
-
-    def verify_integrity(self) -> bool:
-        """Проверяет целостность цепочки хэшей в JSONL-файле.
+            full: Проверить весь файл, игнорируя отметку.
+            workers: Число процессов для пересчёта хэшей; 1 — в текущем процессе.
 
         Returns:
             True если цепочка не нарушена.
 
         Raises:
-            AuditIntegrityError: При обнаружении повреждённой записи.
+            AuditIntegrityError: При обнаружении повреждённой записи или отметки.
         """
-        from chutils.exceptions import AuditIntegrityError
-
+        self.flush()
         if not self._path.exists():
             return True
 
-        prev_hash = ""
-        with open(self._path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                record = json.loads(line)
-                stored_hash = record.get("hash", "")
-
-                expected_hash = compute_record_hash(record)
-
-                if stored_hash != expected_hash:
-                    raise AuditIntegrityError(
-                        "Нарушена целостность записи: hash не совпадает.",
-                        record_id=record.get("id", "unknown"),
-                    )
-                if record.get("prev_hash", "") != prev_hash:
-                    raise AuditIntegrityError(
-                        "Нарушена целостность записи: prev_hash не совпадает с предыдущим hash.",
-                        record_id=record.get("id", "unknown"),
-                    )
-                prev_hash = stored_hash
-
+        key = self._checkpoint_key
+        with open(self._path, "rb") as f:
+            start, prev_hash = (0, "") if key is None or full else self._resume_point(f, key)
+            f.seek(start)
+            # Начало и конец последней непустой строки — для новой отметки
+            last_line = [start, start]
+
+            def lines() -> Iterator[bytes]:
+                position = start
+                for line in f:
+                    begin, position = position, position + len(line)
+                    if line.strip():
+                        last_line[:] = [begin, position]
+                        yield line
+
+            last_hash = verify_chain(lines(), decode_jsonl, prev_hash=prev_hash, workers=workers)
+
+        if key is not None and last_line[1] > start:
+            line_start, offset = last_line
+            atomic_write(self._checkpoint_path, json.dumps({
+                "offset": offset,
+                "line_start": line_start,
+                "hash": last_hash,
+                "signature": sign_checkpoint(key, offset, last_hash),
+            }))
         return True
+
+    def _resume_point(self, f: BinaryIO, key: bytes) -> tuple[int, str]:
+        """Возвращает смещение и hash, с которых продолжается проверка, по подписанной отметке."""
+        from chutils.exceptions import AuditIntegrityError
+
+        if not self._checkpoint_path.exists():
+            return 0, ""
+        try:
+            marker = json.loads(self._checkpoint_path.read_text(encoding="utf-8"))
+            offset, line_start, record_hash = int(marker["offset"]), int(marker["line_start"]), str(marker["hash"])
+            signature = str(marker["signature"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise AuditIntegrityError(
+                "Нарушена целостность отметки проверки: файл отметки повреждён.",
+                path=str(self._checkpoint_path),
+            ) from e
+        check_checkpoint(key, offset, record_hash, signature)
+
+        f.seek(line_start)
+        line = f.read(offset - line_start) if 0 <= line_start < offset else b""
+        try:
+            record = decode_jsonl(line) if line.strip() else None
+        except ValueError:
+            record = None
+        check_resume_record(record, record_hash, offset)
+        return offset, record_hash
@@ -6,15 +6,13 @@ DBAPI-совместимый объект). Импорт бэкенда безо
 """
 from __future__ import annotations
 
-import json
-import threading
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from chutils.audit._hash import compute_record_hash
-from chutils.audit.backends.base import BaseAuditBackend
+from chutils.audit._verify import decode_row, verify_chain
+from chutils.audit.backends.base import BufferedAuditBackend, _event_row
 
 if TYPE_CHECKING:
-    from typing import Protocol, Any
+    from typing import Protocol
 
 
     class _DBAPICursor(Protocol):
@@ -30,6 +28,18 @@ if TYPE_CHECKING:
             """
             ...
 
+        def executemany(self, query: str, params: list[tuple[Any, ...]]) -> Any:
+            """Выполняет SQL-запрос для каждого набора параметров.
+
+            Args:
+                query: Строка SQL-запроса.
+                params: Наборы параметров запроса.
+
+            Returns:
+                Результат выполнения запроса.
+            """
+            ...
+
         def fetchone(self) -> Any:
             """Возвращает одну строку результата.
 
@@ -118,98 +128,89 @@ _INSERT = """
 
 _SELECT_LAST_HASH = "SELECT hash FROM audit_log ORDER BY id DESC LIMIT 1"
 
+_LOCK_CHAIN = "SELECT pg_advisory_xact_lock(hashtext('chutils.audit_log'))"
+"""Блокировка писателей цепочки до конца транзакции."""
+
 _SELECT_ALL = (
     "SELECT id, actor, action, target, status, details, env, "
     "timestamp, prev_hash, hash FROM audit_log ORDER BY id"
 )
 
 
-class PostgresBackend(BaseAuditBackend):
+class PostgresBackend(BufferedAuditBackend):
     """Бэкенд хранения событий аудита в PostgreSQL.
 
     Принимает DBAPI2-совместимый объект соединения (psycopg2, psycopg и т.д.).
     Не импортирует драйвер самостоятельно — управление соединением
-    остаётся на стороне приложения.
+    остаётся на стороне приложения. При `batch_size > 1` пачка записей
+    вставляется через `executemany` и фиксируется одним `commit()`
+    (см. `BufferedAuditBackend`); при `batch_size=1` фиксация транзакций,
+    как и прежде, остаётся за приложением.
+
+    Перед вставкой бэкенд берёт транзакционную advisory-блокировку и перечитывает
+    последний хэш, поэтому в таблицу могут писать несколько процессов, а откат
+    транзакции приложением не рвёт цепочку. Блокировка держится до фиксации
+    транзакции; для соединения в режиме autocommit вставка выполняется в отдельной
+    транзакции.
 
     Args:
         connection: Открытое DBAPI2-соединение с PostgreSQL.
+        batch_size: Размер пачки; 1 — вставлять каждую запись сразу.
+        flush_interval: Максимальное время (сек.) нахождения записи в буфере.
     """
     _conn: _DBAPIConnection
 
-    def __init__(self, connection: _DBAPIConnection) -> None:
+    def __init__(self, connection: _DBAPIConnection, *, batch_size: int = 1, flush_interval: float = 1.0) -> None:
         """Инициализирует PostgresBackend и создаёт таблицу audit_log.
 
         Args:
             connection: Открытое DBAPI2-соединение с PostgreSQL.
+            batch_size: Размер пачки; 1 — вставлять каждую запись сразу.
+            flush_interval: Максимальное время (сек.) нахождения записи в буфере.
         """
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
         self._conn = connection
-        self._lock = threading.Lock()
         self._ensure_table()
 
     def _ensure_table(self) -> None:
         with self._conn.cursor() as cur:
             cur.execute(_CREATE_TABLE)
 
-    def _get_last_hash(self) -> str:
+    def _load_last_hash(self) -> str:
         with self._conn.cursor() as cur:
             cur.execute(_SELECT_LAST_HASH)
             row = cur.fetchone()
         return row[0] if row else ""
 
-    def log(
-            self,
-            action: str,
-            actor: str,
-            *,
-            target: str | None = None,
-            status: str = "success",
-            details: dict[str, object] | None = None,
-    ) -> str:
-        """Добавляет событие в таблицу audit_log PostgreSQL.
+    def _write(self, events: list[Any]) -> str:
+        # В autocommit блокировка снялась бы сразу после SELECT, поэтому нужна явная транзакция
+        own_transaction = getattr(self._conn, "autocommit", False) is True
+        with self._conn.cursor() as cur:
+            if own_transaction:
+                cur.execute("BEGIN")
+            try:
+                cur.execute(_LOCK_CHAIN)
+                events = self._rechain(events, self._load_last_hash())
+                rows = [_event_row(event) for event in events]
+                if len(rows) == 1:
+                    cur.execute(_INSERT, rows[0])
+                else:
+                    cur.executemany(_INSERT, rows)
+            except Exception:
+                if own_transaction:
+                    cur.execute("ROLLBACK")
+                raise
+            if own_transaction:
+                cur.execute("COMMIT")
+        if self._batch_size > 1 and not own_transaction:
+            self._conn.commit()
+        return str(events[-1].hash)
+
+    def verify_integrity(self, *, workers: int = 1) -> bool:
+        """Проверяет целостность цепочки хэшей в таблице PostgreSQL.
 
         Args:
-            action: Название операции.
-            actor: Субъект действия.
-            target: Объект операции (опционально).
-            status: Результат — 'success' или 'failed'.
-            details: Произвольные детали события.
-
-        Returns:
-            UUID созданной записи.
-        """
-        from chutils.audit.schema import AuditEvent
-
-        with self._lock:
-            prev_hash = self._get_last_hash()
-            event = AuditEvent(
-                actor=actor,
-                action=action,
-                target=target,
-                status=status,
-                details=details or {},
-                prev_hash=prev_hash,
-            )
-            dumped = event.model_dump(mode="json")
-            with self._conn.cursor() as cur:
-                cur.execute(
-                    _INSERT,
-                    (
-                        event.id,
-                        dumped["timestamp"],
-                        event.actor,
-                        event.action,
-                        event.target,
-                        event.status,
-                        json.dumps(event.details, default=str),
-                        json.dumps(event.env, default=str),
-                        event.prev_hash,
-                        event.hash,
-                    ),
-                )
-            return str(event.id)
-
-    def verify_integrity(self) -> bool:
-        """Проверяет целостность цепочки хэшей в таблице PostgreSQL.
+            workers: Число процессов для пересчёта хэшей; 1 — в текущем процессе.
 
         Returns:
             True если цепочка не нарушена.
@@ -217,40 +218,10 @@ class PostgresBackend(BaseAuditBackend):
         Raises:
             AuditIntegrityError: При обнаружении повреждённой записи.
         """
-        from chutils.exceptions import AuditIntegrityError
-
+        self.flush()
         with self._conn.cursor() as cur:
             cur.execute(_SELECT_ALL)
             rows = cur.fetchall()
 
-        prev_hash = ""
-        for row in rows:
-            (rid, actor, action, target, status, details_str,
-             env_str, timestamp, stored_prev_hash, stored_hash) = row
-
-            data: dict[str, object] = {
-                "id": rid,
-                "timestamp": timestamp,
-                "actor": actor,
-                "action": action,
-                "target": target,
-                "status": status,
-                "details": json.loads(details_str),
-                "env": json.loads(env_str),
-                "prev_hash": stored_prev_hash,
-            }
-            expected_hash = compute_record_hash(data)
-
-            if stored_hash != expected_hash:
-                raise AuditIntegrityError(
-                    "Нарушена целостность записи: hash не совпадает.",
-                    record_id=rid,
-                )
-            if stored_prev_hash != prev_hash:
-                raise AuditIntegrityError(
-                    "Нарушена целостность записи: prev_hash не совпадает.",
-                    record_id=rid,
-                )
-            prev_hash = stored_hash
-
+        verify_chain(rows, decode_row, workers=workers)
         return True
@@ -1,13 +1,21 @@
 """SqliteBackend — хранение журнала аудита в SQLite через стандартную библиотеку sqlite3."""
 from __future__ import annotations
 
-import json
 import sqlite3
-import threading
+from collections.abc import Iterator
+from contextlib import closing
 from pathlib import Path
-
-from chutils.audit._hash import compute_record_hash
-from chutils.audit.backends.base import BaseAuditBackend
+from typing import Any
+
+from chutils.audit._verify import (
+    as_checkpoint_key,
+    check_checkpoint,
+    check_resume_record,
+    decode_row,
+    sign_checkpoint,
+    verify_chain,
+)
+from chutils.audit.backends.base import BufferedAuditBackend, _event_row
 from chutils.fs import ensure_dir
 
 _CREATE_TABLE = """
@@ -54,147 +62,148 @@ _CREATE_TABLE = """
                 ) \
                 """
 
+_INSERT = """
+          INSERT INTO audit_log
+          (id, timestamp, actor, action, target, status, details, env, prev_hash, hash)
+          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) \
+          """
+
+_COLUMNS = "id, actor, action, target, status, details, env, timestamp, prev_hash, hash"
+
+_SELECT_AFTER = f"SELECT {_COLUMNS}, rowid FROM audit_log WHERE rowid > ? ORDER BY rowid"
+
+_SELECT_ONE = f"SELECT {_COLUMNS} FROM audit_log WHERE rowid = ?"
+
+_CREATE_CHECKPOINT_TABLE = """
+                           CREATE TABLE IF NOT EXISTS audit_checkpoint
+                           (
+                               id        INTEGER PRIMARY KEY CHECK (id = 1),
+                               position  INTEGER NOT NULL,
+                               hash      TEXT    NOT NULL,
+                               signature TEXT    NOT NULL
+                           ) \
+                           """
+
 
-class SqliteBackend(BaseAuditBackend):
+class SqliteBackend(BufferedAuditBackend):
     """Бэкенд хранения событий аудита в таблице SQLite.
 
     Использует только стандартную библиотеку sqlite3 — без SQLAlchemy.
     Записи связаны в криптографическую цепочку через поле prev_hash.
-    Запись потокобезопасна (threading.Lock + WAL режим SQLite).
+    Запись идёт через одно постоянное соединение в режиме WAL и потокобезопасна.
+    Несколько экземпляров и процессов могут писать в один файл БД: пачка
+    вставляется в транзакции `BEGIN IMMEDIATE` после сверки последнего хэша.
+    При `batch_size > 1` пачка записей фиксируется одной транзакцией
+    (см. `BufferedAuditBackend`).
 
     Args:
         path: Путь к файлу БД (будет создан при первой записи).
+        batch_size: Размер пачки; 1 — фиксировать каждую запись сразу.
+        flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+        checkpoint_key: Ключ HMAC для подписи отметок проверки целостности; без него
+            `verify_integrity()` всегда проверяет таблицу целиком.
     """
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(
+            self,
+            path: str | Path,
+            *,
+            batch_size: int = 1,
+            flush_interval: float = 1.0,
+            checkpoint_key: str | bytes | None = None,
+    ) -> None:
         """Инициализирует SqliteBackend и создаёт таблицу audit_log если она отсутствует.
 
         Args:
             path: Путь к файлу SQLite БД (будет создан автоматически).
+            batch_size: Размер пачки; 1 — фиксировать каждую запись сразу.
+            flush_interval: Максимальное время (сек.) нахождения записи в буфере.
+            checkpoint_key: Ключ HMAC для подписи отметок проверки целостности. Отметка
+                хранится в таблице audit_checkpoint той же БД.
         """
+        super().__init__(batch_size=batch_size, flush_interval=flush_interval)
         self._path = Path(path)
-        self._lock = threading.Lock()
-        self._ensure_table()
+        self._checkpoint_key = as_checkpoint_key(checkpoint_key)
+        ensure_dir(self._path.parent)
+        self._conn = self._connect()
+        with self._conn:
+            self._conn.execute(_CREATE_TABLE)
+            if self._checkpoint_key is not None:
+                self._conn.execute(_CREATE_CHECKPOINT_TABLE)
 
     def _connect(self) -> sqlite3.Connection:
         conn = sqlite3.connect(self._path, check_same_thread=False)
         conn.execute("PRAGMA journal_mode=WAL")
         return conn
 
-    def _ensure_table(self) -> None:
-        ensure_dir(self._path.parent)
-        with self._connect() as conn:
-            conn.execute(_CREATE_TABLE)
-
-    def _get_last_hash(self, conn: sqlite3.Connection) -> str:
+    def _load_last_hash(self) -> str:
         """Возвращает hash последней записи или '' если таблица пуста."""
-        row = conn.execute(
+        row = self._conn.execute(
             "SELECT hash FROM audit_log ORDER BY rowid DESC LIMIT 1"
         ).fetchone()
         return row[0] if row else ""
 
-    def log(
-            self,
-            action: str,
-            actor: str,
-            *,
-            target: str | None = None,
-            status: str = "success",
-            details: dict[str, object] | None = None,
-    ) -> str:
-        """Добавляет событие в таблицу audit_log.
+    def _write(self, events: list[Any]) -> str:
+        with self._conn:
+            # BEGIN IMMEDIATE блокирует других писателей до фиксации, поэтому последний
+            # хэш, прочитанный внутри транзакции, не изменится до вставки пачки.
+            self._conn.execute("BEGIN IMMEDIATE")
+            events = self._rechain(events, self._load_last_hash())
+            self._conn.executemany(_INSERT, [_event_row(event) for event in events])
+        return str(events[-1].hash)
+
+    def close(self) -> None:
+        """Сохраняет накопленные записи и закрывает соединение с БД."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
 
-        Args:
-            action: Название операции.
-            actor: Субъект действия.
-            target: Объект операции (опционально).
-            status: Результат — 'success' или 'failed'.
-            details: Произвольные детали события.
+    def verify_integrity(self, *, full: bool = False, workers: int = 1) -> bool:
+        """Проверяет целостность цепочки хэшей в таблице audit_log, читая её курсором.
 
-        Returns:
-            UUID созданной записи.
-        """
-        from chutils.audit.schema import AuditEvent
+        Если задан `checkpoint_key`, проверка продолжается с подписанной отметки
+        предыдущей успешной проверки (rowid и hash последней записи), а после
+        успешной проверки отметка обновляется.
 
-        with self._lock:
-            with self._connect() as conn:
-                prev_hash = self._get_last_hash(conn)
-                event = AuditEvent(
-                    actor=actor,
-                    action=action,
-                    target=target,
-                    status=status,
-                    details=details or {},
-                    prev_hash=prev_hash,
-                )
-                # Используем model_dump(mode="json") чтобы timestamp
-                # имел тот же формат что был использован при вычислении hash
-                dumped = event.model_dump(mode="json")
-                conn.execute(
-                    """INSERT INTO audit_log
-                       (id, timestamp, actor, action, target, status, details, env, prev_hash, hash)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        event.id,
-                        dumped["timestamp"],
-                        event.actor,
-                        event.action,
-                        event.target,
-                        event.status,
-                        json.dumps(event.details, default=str),
-                        json.dumps(event.env, default=str),
-                        event.prev_hash,
-                        event.hash,
-                    ),
-                )
-            return str(event.id)
-
-    def verify_integrity(self) -> bool:
-        """Проверяет целостность цепочки хэшей в таблице audit_log.
+        Args:
+            full: Проверить всю таблицу, игнорируя отметку.
+            workers: Число процессов для пересчёта хэшей; 1 — в текущем процессе.
 
         Returns:
             True если цепочка не нарушена.
 
         Raises:
-            AuditIntegrityError: При обнаружении повреждённой записи.
+            AuditIntegrityError: При обнаружении повреждённой записи или отметки.
         """
-        from chutils.exceptions import AuditIntegrityError
-
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT id, actor, action, target, status, details, env, "
-                "timestamp, prev_hash, hash FROM audit_log ORDER BY rowid"
-            ).fetchall()
-
-        prev_hash = ""
-        for row in rows:
-            (rid, actor, action, target, status, details_str,
-             env_str, timestamp, stored_prev_hash, stored_hash) = row
-
-            # Строим dict в том же порядке что AuditEvent.model_dump(mode="json")
-            data: dict[str, object] = {
-                "id": rid,
-                "timestamp": timestamp,
-                "actor": actor,
-                "action": action,
-                "target": target,
-                "status": status,
-                "details": json.loads(details_str),
-                "env": json.loads(env_str),
-                "prev_hash": stored_prev_hash,
-            }
-            expected_hash = compute_record_hash(data)
-
-            if stored_hash != expected_hash:
-                raise AuditIntegrityError(
-                    "Нарушена целостность записи: hash не совпадает.",
-                    record_id=rid,
-                )
-            if stored_prev_hash != prev_hash:
-                raise AuditIntegrityError(
-                    "Нарушена целостность записи: prev_hash не совпадает с предыдущим hash.",
-                    record_id=rid,
-                )
-            prev_hash = stored_hash
-
+        self.flush()
+        key = self._checkpoint_key
+        with closing(self._connect()) as conn:
+            after, prev_hash = (0, "") if key is None or full else self._resume_point(conn, key)
+            last_rowid = after
+
+            def rows() -> Iterator[tuple[Any, ...]]:
+                nonlocal last_rowid
+                for row in conn.execute(_SELECT_AFTER, (after,)):
+                    last_rowid = row[10]
+                    yield row
+
+            last_hash = verify_chain(rows(), decode_row, prev_hash=prev_hash, workers=workers)
+            if key is not None and last_rowid > after:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO audit_checkpoint (id, position, hash, signature) VALUES (1, ?, ?, ?)",
+                        (last_rowid, last_hash, sign_checkpoint(key, last_rowid, last_hash)),
+                    )
         return True
+
+    @staticmethod
+    def _resume_point(conn: sqlite3.Connection, key: bytes) -> tuple[int, str]:
+        """Возвращает rowid и hash, с которых продолжается проверка, по подписанной отметке."""
+        marker = conn.execute("SELECT position, hash, signature FROM audit_checkpoint WHERE id = 1").fetchone()
+        if marker is None:
+            return 0, ""
+        position, record_hash, signature = marker
+        check_checkpoint(key, position, record_hash, signature)
+        row = conn.execute(_SELECT_ONE, (position,)).fetchone()
+        check_resume_record(decode_row(row) if row else None, record_hash, position)
+        return position, record_hash
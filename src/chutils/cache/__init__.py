@@ -1,5 +1,13 @@
-from .base import BaseCacheBackend
-from .decorator import cache_with_ttl
+from .base import BaseCacheBackend, CacheStats
+from .decorator import cache_with_ttl, get_default_cache_backend
 from .in_memory import InMemoryCacheBackend
+from .sharded import ShardedInMemoryCacheBackend
 
-__all__ = ['BaseCacheBackend', 'InMemoryCacheBackend', 'cache_with_ttl']
+__all__ = [
+    'BaseCacheBackend',
+    'CacheStats',
+    'InMemoryCacheBackend',
+    'ShardedInMemoryCacheBackend',
+    'cache_with_ttl',
+    'get_default_cache_backend',
+]
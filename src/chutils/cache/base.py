@@ -1,9 +1,38 @@
 from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from dataclasses import dataclass
 from typing import TypeVar, Generic
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class CacheStats:
+    """Снимок счетчиков бэкенда кэширования.
+
+    Attributes:
+        hits: Количество успешных чтений.
+        misses: Количество промахов (ключ отсутствует или просрочен).
+        evictions: Количество записей, вытесненных из-за лимитов размера.
+        expirations: Количество записей, удаленных по истечении TTL.
+        entries: Текущее число записей.
+        size_bytes: Оценка занимаемой памяти (0, если `max_bytes` не задан).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий среди всех чтений (0.0, если чтений не было)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 class BaseCacheBackend(ABC, Generic[T]):
     """
     Базовый абстрактный класс для всех бэкендов кэширования.
@@ -12,12 +41,12 @@ class BaseCacheBackend(ABC, Generic[T]):
     """
 
     @abstractmethod
-    def get(self, key: str) -> T | None:
+    def get(self, key: Hashable) -> T | None:
         """
         Получить значение из кэша.
         
         Args:
-            key (str): Ключ кэша.
+            key: Ключ кэша.
             
         Returns:
             Значение или None, если ключ не найден или просрочен.
@@ -27,7 +56,7 @@ class BaseCacheBackend(ABC, Generic[T]):
     @abstractmethod
     def set(
         self,
-        key: str,
+        key: Hashable,
         value: T,
         ttl: int | None = None,
         tags: list[str] | None = None,
@@ -36,7 +65,7 @@ class BaseCacheBackend(ABC, Generic[T]):
         Сохранить значение в кэше.
 
         Args:
-            key (str): Ключ кэша.
+            key: Ключ кэша.
             value: Значение для сохранения.
             ttl (Optional[int]): Время жизни в секундах. Если None, используется вечное хранение.
             tags (Optional[list[str]]): Список тегов для связывания с ключом.
@@ -44,22 +73,22 @@ class BaseCacheBackend(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def delete(self, key: str) -> None:
+    def delete(self, key: Hashable) -> None:
         """
         Удалить ключ из кэша.
 
         Args:
-            key (str): Ключ кэша.
+            key: Ключ кэша.
         """
         pass
 
     @abstractmethod
-    def exists(self, key: str) -> bool:
+    def exists(self, key: Hashable) -> bool:
         """
         Проверить наличие ключа в кэше.
 
         Args:
-            key (str): Ключ кэша.
+            key: Ключ кэша.
 
         Returns:
             bool: True, если ключ существует и не просрочен.
@@ -81,9 +110,25 @@ class BaseCacheBackend(ABC, Generic[T]):
         """
         pass
 
+    def touch(self, key: Hashable, ttl: int | None = None) -> bool:
+        """
+        Продлить срок жизни существующей записи, не перезаписывая значение и теги.
+
+        Реализация по умолчанию не поддерживает продление и возвращает False;
+        в этом случае вызывающий код может перезаписать значение через `set`.
+
+        Args:
+            key: Ключ кэша.
+            ttl (Optional[int]): Новое время жизни в секундах. Если None, запись становится вечной.
+
+        Returns:
+            bool: True, если срок записи обновлен.
+        """
+        return False
+
     # --- Асинхронные методы (по умолчанию вызывают синхронные) ---
 
-    async def aget(self, key: str) -> T | None:
+    async def aget(self, key: Hashable) -> T | None:
         """Асинхронное получение значения из кэша.
 
         Args:
@@ -96,7 +141,7 @@ class BaseCacheBackend(ABC, Generic[T]):
 
     async def aset(
         self,
-        key: str,
+        key: Hashable,
         value: T,
         ttl: int | None = None,
         tags: list[str] | None = None,
@@ -111,7 +156,19 @@ class BaseCacheBackend(ABC, Generic[T]):
         """
         self.set(key, value, ttl, tags)
 
-    async def adelete(self, key: str) -> None:
+    async def atouch(self, key: Hashable, ttl: int | None = None) -> bool:
+        """Асинхронное продление срока жизни записи.
+
+        Args:
+            key: Ключ кэша.
+            ttl: Новое время жизни в секундах.
+
+        Returns:
+            True, если срок записи обновлен.
+        """
+        return self.touch(key, ttl)
+
+    async def adelete(self, key: Hashable) -> None:
         """Асинхронное удаление значения из кэша.
 
         Args:
@@ -119,7 +176,7 @@ class BaseCacheBackend(ABC, Generic[T]):
         """
         self.delete(key)
 
-    async def aexists(self, key: str) -> bool:
+    async def aexists(self, key: Hashable) -> bool:
         """Асинхронная проверка наличия ключа в кэше.
 
         Args:
@@ -1,24 +1,100 @@
+import asyncio
 import functools
 import inspect
-from collections.abc import Callable
-from typing import Any
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import math
+import random
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
 
+from .base import BaseCacheBackend
 from .in_memory import InMemoryCacheBackend
-from .utils import generate_cache_key, LockManager, AsyncLockManager
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .utils import (
+    KeyBuilder,
+    KeyBuilderName,
+    resolve_key_builder,
+)
 
 _default_backend: InMemoryCacheBackend[Any] = InMemoryCacheBackend()
 """Бэкенд кэширования в памяти по умолчанию."""
 
-_sync_lock_manager = LockManager()
-_async_lock_manager = AsyncLockManager()
+_sync_flight = SingleFlight()
+_async_flight = AsyncSingleFlight()
+
+logger = logging.getLogger(__name__)
+
+_REFRESH_WORKERS = 4
+"""Число потоков для фонового обновления синхронных функций."""
+
+_refresh_executor: ThreadPoolExecutor | None = None
+_refresh_executor_lock = threading.Lock()
+
+
+class _StaleEntry(NamedTuple):
+    """Запись кэша в режимах `stale_ttl`/`refresh_ahead`.
+
+    Attributes:
+        value: Результат функции.
+        fresh_until: Момент (`time.time()`), после которого значение считается устаревшим.
+        delta: Длительность последнего вычисления в секундах (для XFetch).
+    """
+
+    value: Any
+    fresh_until: float
+    delta: float
+
+
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Лениво создает общий пул потоков для фонового обновления записей."""
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=_REFRESH_WORKERS, thread_name_prefix="ChutilsCacheRefresh"
+            )
+        return _refresh_executor
+
+
+def _needs_refresh(entry: _StaleEntry, beta: float | None, now: float) -> bool:
+    """Решает, пора ли обновлять запись.
+
+    Устаревшая запись обновляется всегда. Если задан `beta`, свежая запись обновляется
+    досрочно с вероятностью, растущей по мере приближения к `fresh_until` (XFetch):
+    `now - delta * beta * ln(rand) >= fresh_until`.
+    """
+    if now >= entry.fresh_until:
+        return True
+    if beta is None:
+        return False
+    return now - entry.delta * beta * math.log(1.0 - random.random()) >= entry.fresh_until
+
+
+def get_default_cache_backend() -> InMemoryCacheBackend[Any]:
+    """Возвращает бэкенд, используемый `cache_with_ttl` по умолчанию.
+
+    По умолчанию он не ограничен по размеру. Чтобы задать лимиты для всего процесса,
+    вызовите `get_default_cache_backend().configure(max_entries=..., eviction="lru")`.
+
+    Returns:
+        Общий экземпляр InMemoryCacheBackend.
+    """
+    return _default_backend
 
 
 def cache_with_ttl(
         ttl: int = 60,
         key_prefix: str = "",
         sliding: bool = True,
-        backend: InMemoryCacheBackend[Any] | None = None,
-        tags: list[str] | Callable[..., list[str] | str] | None = None
+        backend: BaseCacheBackend[Any] | None = None,
+        tags: list[str] | Callable[..., list[str] | str] | None = None,
+        key_builder: KeyBuilderName | KeyBuilder = "hash",
+        key: Callable[..., Hashable] | None = None,
+        stale_ttl: int = 0,
+        refresh_ahead: float | None = None,
 ) -> Callable[..., Any]:
     """
     Декоратор для кэширования результатов выполнения функций с поддержкой TTL.
@@ -31,15 +107,43 @@ def cache_with_ttl(
     Args:
         ttl (int): Время жизни закэшированного значения в секундах. По умолчанию 60.
         key_prefix (str): Префикс для ключа кэша.
-        sliding (bool): Если True, TTL продлевается при каждом успешном чтении из кэша.
+        sliding (bool): Если True, TTL продлевается при каждом успешном чтении из кэша (обновляется
+              только срок записи, значение и теги не перезаписываются). Не применяется в режимах
+              `stale_ttl` и `refresh_ahead`.
         backend: Инстанс бэкенда для хранения (по умолчанию InMemoryCacheBackend).
         tags: Статические теги (list[str]) или вызываемый объект (callable), принимающий те же
               аргументы, что и декорируемая функция, и генерирующий тег или список тегов.
+        key_builder: Способ построения ключа: "hash" (строковый хеш repr аргументов, подходит для
+              любого бэкенда), "tuple" (кортеж без форматирования и хеширования для аргументов
+              int/str/bytes/None; только для in-memory бэкендов) или собственная функция
+              `(func_name, args, kwargs, prefix) -> ключ`.
+        key: Вызываемый объект с сигнатурой декорируемой функции, возвращающий hashable-значение,
+              однозначно определяющее вызов (например, `lambda user, **_: user.id`). Вместо всех
+              аргументов в `key_builder` передается только это значение: с "hash" ключ остается
+              строкой, с "tuple" для значений int/str/bytes/None получается кортеж без хеширования.
+        stale_ttl: Сколько секунд после истечения `ttl` отдавать устаревшее значение
+              (stale-while-revalidate). Вызов сразу получает старое значение, а функция
+              пересчитывается в фоне: в пуле потоков для синхронных функций и в отдельной задаче
+              для корутин. 0 — режим выключен.
+        refresh_ahead: Коэффициент beta вероятностного досрочного обновления (XFetch). Чем ближе
+              истечение `ttl` и чем дольше вычисляется функция, тем выше шанс, что очередное чтение
+              запустит фоновое обновление заранее. 1.0 — рекомендуемое значение, None — выключено.
 
     Returns:
         Callable: Обернутая функция со встроенными методами инвалидации.
+
+    Raises:
+        ValueError: Если `stale_ttl` отрицателен или `refresh_ahead` не положителен.
     """
-    cache: InMemoryCacheBackend[Any] = backend or _default_backend
+    if stale_ttl < 0:
+        raise ValueError(f"stale_ttl не может быть отрицательным, получено: {stale_ttl}")
+    if refresh_ahead is not None and refresh_ahead <= 0:
+        raise ValueError(f"refresh_ahead должен быть положительным, получено: {refresh_ahead}")
+    cache: BaseCacheBackend[Any] = backend or _default_backend
+    # В фоновых режимах значение хранится в _StaleEntry дольше ttl на stale_ttl секунд
+    background = stale_ttl > 0 or refresh_ahead is not None
+    store_ttl = ttl + stale_ttl
+    build_key = resolve_key_builder(key_builder)
 
     def _resolve_tags(args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[str] | None:
         if not tags:
@@ -65,84 +169,151 @@ def cache_with_ttl(
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         func_name = f"{func.__module__}.{func.__name__}"
         is_async = inspect.iscoroutinefunction(func)
-        generated_keys: set[str] = set()
+        generated_keys: set[Hashable] = set()
+
+        if key is not None:
+            key_func = key
+
+            def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+                # Значение key= проходит через key_builder, чтобы тип ключа соответствовал бэкенду
+                return build_key(func_name, (key_func(*args, **kwargs),), {}, key_prefix)
+        else:
+            def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+                return build_key(func_name, args, kwargs, key_prefix)
 
         if is_async:
+            refresh_tasks: dict[Hashable, asyncio.Task[Any]] = {}
+
+            async def acompute(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+                started = time.perf_counter()
+                result = await func(*args, **kwargs)
+                if not background:
+                    await cache.aset(cache_key, result, ttl=ttl, tags=_resolve_tags(args, kwargs))
+                elif result is not None:
+                    entry = _StaleEntry(result, time.time() + ttl, time.perf_counter() - started)
+                    await cache.aset(cache_key, entry, ttl=store_ttl, tags=_resolve_tags(args, kwargs))
+                return result
+
+            def schedule_refresh(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+                if cache_key in refresh_tasks:
+                    return
+
+                async def refresh() -> None:
+                    try:
+                        await _async_flight.do(cache_key, lambda: acompute(cache_key, args, kwargs))
+                    except Exception as e:
+                        logger.warning("Фоновое обновление кэша %s завершилось ошибкой: %s", func_name, e)
+
+                task = asyncio.get_running_loop().create_task(refresh())
+                refresh_tasks[cache_key] = task
+                task.add_done_callback(lambda _: refresh_tasks.pop(cache_key, None))
+
             @functools.wraps(func)
             async def wrapper(*args: Any, **kwargs: Any) -> Any:
-                key = generate_cache_key(func_name, args, kwargs, prefix=key_prefix)
-                generated_keys.add(key)
-                resolved_tags = _resolve_tags(args, kwargs)
+                cache_key = make_key(args, kwargs)
+                generated_keys.add(cache_key)
 
                 # 1. Пробуем получить из кэша
-                value = await cache.aget(key)
+                value = await cache.aget(cache_key)
                 if value is not None:
-                    if sliding:
-                        await cache.aset(key, value, ttl=ttl, tags=resolved_tags)
+                    if background:
+                        if _needs_refresh(value, refresh_ahead, time.time()):
+                            schedule_refresh(cache_key, args, kwargs)
+                        return value.value
+                    if sliding and not await cache.atouch(cache_key, ttl):
+                        await cache.aset(cache_key, value, ttl=ttl, tags=_resolve_tags(args, kwargs))
                     return value
 
-                # 2. Защита от Stampede (асинхронная блокировка на ключ)
-                lock = _async_lock_manager.get_lock(key)
-                async with lock:
-                    # Double-checked locking
-                    value = await cache.aget(key)
+                # 2. Защита от Stampede: одновременные промахи ждут одно вычисление
+                async def load() -> Any:
+                    # Повторная проверка: значение могло появиться до начала вычисления
+                    value = await cache.aget(cache_key)
                     if value is not None:
-                        return value
+                        return value.value if background else value
+                    return await acompute(cache_key, args, kwargs)
 
-                    # 3. Вычисляем значение
-                    result = await func(*args, **kwargs)
-
-                    # 4. Сохраняем в кэш
-                    await cache.aset(key, result, ttl=ttl, tags=resolved_tags)
-                    return result
+                return await _async_flight.do(cache_key, load)
         else:
+            refreshing: set[Hashable] = set()
+            refreshing_lock = threading.Lock()
+
+            def compute(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+                started = time.perf_counter()
+                result = func(*args, **kwargs)
+                if not background:
+                    cache.set(cache_key, result, ttl=ttl, tags=_resolve_tags(args, kwargs))
+                elif result is not None:
+                    entry = _StaleEntry(result, time.time() + ttl, time.perf_counter() - started)
+                    cache.set(cache_key, entry, ttl=store_ttl, tags=_resolve_tags(args, kwargs))
+                return result
+
+            def schedule_refresh(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+                with refreshing_lock:
+                    if cache_key in refreshing:
+                        return
+                    refreshing.add(cache_key)
+
+                def refresh() -> None:
+                    try:
+                        _sync_flight.do(cache_key, lambda: compute(cache_key, args, kwargs))
+                    except Exception as e:
+                        logger.warning("Фоновое обновление кэша %s завершилось ошибкой: %s", func_name, e)
+                    finally:
+                        with refreshing_lock:
+                            refreshing.discard(cache_key)
+
+                try:
+                    _get_refresh_executor().submit(refresh)
+                except RuntimeError:
+                    # Пул уже остановлен (завершение интерпретатора) — обновим при следующем промахе
+                    with refreshing_lock:
+                        refreshing.discard(cache_key)
+
             @functools.wraps(func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
-                key = generate_cache_key(func_name, args, kwargs, prefix=key_prefix)
-                generated_keys.add(key)
-                resolved_tags = _resolve_tags(args, kwargs)
+                cache_key = make_key(args, kwargs)
+                generated_keys.add(cache_key)
 
                 # 1. Пробуем получить из кэша
-                value = cache.get(key)
+                value = cache.get(cache_key)
                 if value is not None:
-                    if sliding:
-                        cache.set(key, value, ttl=ttl, tags=resolved_tags)
+                    if background:
+                        if _needs_refresh(value, refresh_ahead, time.time()):
+                            schedule_refresh(cache_key, args, kwargs)
+                        return value.value
+                    if sliding and not cache.touch(cache_key, ttl):
+                        cache.set(cache_key, value, ttl=ttl, tags=_resolve_tags(args, kwargs))
                     return value
 
-                # 2. Защита от Stampede (синхронная блокировка на ключ)
-                lock = _sync_lock_manager.get_lock(key)
-                with lock:
-                    # Double-checked locking
-                    value = cache.get(key)
+                # 2. Защита от Stampede: одновременные промахи ждут одно вычисление
+                def load() -> Any:
+                    # Повторная проверка: значение могло появиться до начала вычисления
+                    value = cache.get(cache_key)
                     if value is not None:
-                        return value
-
-                    # 3. Вычисляем значение
-                    result = func(*args, **kwargs)
+                        return value.value if background else value
+                    return compute(cache_key, args, kwargs)
 
-                    # 4. Сохраняем в кэш
-                    cache.set(key, result, ttl=ttl, tags=resolved_tags)
-                    return result
+                return _sync_flight.do(cache_key, load)
 
         # Внедрение методов инвалидации
         def invalidate(*args: Any, **kwargs: Any) -> None:
-            key = generate_cache_key(func_name, args, kwargs, prefix=key_prefix)
-            cache.delete(key)
-            generated_keys.discard(key)
+            cache_key = make_key(args, kwargs)
+            cache.delete(cache_key)
+            generated_keys.discard(cache_key)
 
         async def ainvalidate(*args: Any, **kwargs: Any) -> None:
-            key = generate_cache_key(func_name, args, kwargs, prefix=key_prefix)
-            await cache.adelete(key)
-            generated_keys.discard(key)
+            cache_key = make_key(args, kwargs)
+            await cache.adelete(cache_key)
+            generated_keys.discard(cache_key)
 
         def invalidate_all() -> None:
-            for key in list(generated_keys):
-                cache.delete(key)
+            for cache_key in list(generated_keys):
+                cache.delete(cache_key)
             generated_keys.clear()
 
         async def ainvalidate_all() -> None:
-            for key in list(generated_keys):
-                await cache.adelete(key)
+            for cache_key in list(generated_keys):
+                await cache.adelete(cache_key)
             generated_keys.clear()
 
         def invalidate_tag(tag: str) -> None:
@@ -161,5 +332,3 @@ def cache_with_ttl(
         return wrapper
 
     return decorator
-
-    return decorator
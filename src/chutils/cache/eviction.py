@@ -0,0 +1,380 @@
+"""
+Политики вытеснения для ограниченного `InMemoryCacheBackend`.
+
+Каждая политика хранит только ключи и отвечает на один вопрос: какой ключ
+вытеснить следующим. Все операции выполняются за O(1) (LFU — амортизированно)
+и вызываются бэкендом под его блокировкой, поэтому сами политики не потокобезопасны.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Literal
+
+EvictionPolicyName = Literal["lru", "lfu", "tinylfu"]
+"""Имена поддерживаемых политик вытеснения."""
+
+
+class EvictionPolicy(ABC):
+    """Базовый интерфейс политики вытеснения."""
+
+    @abstractmethod
+    def record_insert(self, key: Hashable) -> None:
+        """Регистрирует новый ключ в кэше.
+
+        Args:
+            key: Добавленный ключ.
+        """
+
+    @abstractmethod
+    def record_access(self, key: Hashable) -> None:
+        """Регистрирует обращение к существующему ключу (чтение или перезапись).
+
+        Args:
+            key: Ключ, к которому обратились.
+        """
+
+    @abstractmethod
+    def record_remove(self, key: Hashable) -> None:
+        """Удаляет ключ из учета политики.
+
+        Args:
+            key: Удаленный ключ.
+        """
+
+    @abstractmethod
+    def select_victim(self) -> Hashable | None:
+        """Выбирает ключ для вытеснения, не удаляя его из учета.
+
+        Returns:
+            Ключ-кандидат на вытеснение или None, если политика пуста.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Сбрасывает состояние политики."""
+
+
+class LRUPolicy(EvictionPolicy):
+    """Вытесняет ключ, к которому дольше всего не обращались."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустую LRU-очередь."""
+        self._order: OrderedDict[Hashable, None] = OrderedDict()
+
+    def record_insert(self, key: Hashable) -> None:
+        """Добавляет ключ в конец очереди.
+
+        Args:
+            key: Добавленный ключ.
+        """
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def record_access(self, key: Hashable) -> None:
+        """Перемещает ключ в конец очереди.
+
+        Args:
+            key: Ключ, к которому обратились.
+        """
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def record_remove(self, key: Hashable) -> None:
+        """Удаляет ключ из очереди.
+
+        Args:
+            key: Удаленный ключ.
+        """
+        self._order.pop(key, None)
+
+    def select_victim(self) -> Hashable | None:
+        """Возвращает самый старый по обращению ключ.
+
+        Returns:
+            Ключ-кандидат на вытеснение или None, если очередь пуста.
+        """
+        return next(iter(self._order), None)
+
+    def clear(self) -> None:
+        """Очищает очередь."""
+        self._order.clear()
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Вытесняет наименее часто используемый ключ.
+
+    Реализация на корзинах частот: `{частота: OrderedDict ключей}`. При равной
+    частоте вытесняется ключ, дольше всех находящийся в корзине (LRU внутри частоты).
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустые корзины частот."""
+        self._freq: dict[Hashable, int] = {}
+        self._buckets: dict[int, OrderedDict[Hashable, None]] = {}
+        self._min_freq = 0
+
+    def _unlink(self, key: Hashable, freq: int) -> None:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def record_insert(self, key: Hashable) -> None:
+        """Добавляет ключ с частотой 1.
+
+        Args:
+            key: Добавленный ключ.
+        """
+        if key in self._freq:
+            self.record_access(key)
+            return
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def record_access(self, key: Hashable) -> None:
+        """Увеличивает частоту обращений к ключу.
+
+        Args:
+            key: Ключ, к которому обратились.
+        """
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        self._unlink(key, freq)
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+        if self._min_freq == freq and freq not in self._buckets:
+            self._min_freq = freq + 1
+
+    def record_remove(self, key: Hashable) -> None:
+        """Удаляет ключ из корзины его частоты.
+
+        Args:
+            key: Удаленный ключ.
+        """
+        freq = self._freq.pop(key, None)
+        if freq is not None:
+            self._unlink(key, freq)
+
+    def select_victim(self) -> Hashable | None:
+        """Возвращает самый старый ключ из корзины с минимальной частотой.
+
+        Returns:
+            Ключ-кандидат на вытеснение или None, если ключей нет.
+        """
+        if not self._freq:
+            return None
+        if self._min_freq not in self._buckets:
+            # Корзину опустошили удаление или истечение TTL — пересчитываем минимум.
+            self._min_freq = min(self._buckets)
+        return next(iter(self._buckets[self._min_freq]))
+
+    def clear(self) -> None:
+        """Очищает корзины частот."""
+        self._freq.clear()
+        self._buckets.clear()
+        self._min_freq = 0
+
+
+class _FrequencySketch:
+    """
+    Count-Min Sketch с 4-битными счетчиками и периодическим «старением».
+
+    После `sample_size` инкрементов все счетчики делятся пополам, чтобы старая
+    популярность не мешала новым горячим ключам.
+    """
+
+    _DEPTH = 4
+    _MAX_COUNT = 15
+    _MASK64 = (1 << 64) - 1
+    # Нечетные множители для multiply-shift хеширования: независимые индексы в каждой строке.
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, capacity: int) -> None:
+        # Ширина с запасом относительно числа записей снижает число коллизий.
+        bits = 4
+        while (1 << bits) < capacity * 8:
+            bits += 1
+        self._shift = 64 - bits
+        self._table = [[0] * (1 << bits) for _ in range(self._DEPTH)]
+        self._sample_size = 10 * max(capacity, 16)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        h = hash(key) & self._MASK64
+        return [((h * seed) & self._MASK64) >> self._shift for seed in self._SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        """Увеличивает оценку частоты ключа.
+
+        Args:
+            key: Ключ, к которому обратились.
+        """
+        added = False
+        for row, idx in zip(self._table, self._indexes(key)):
+            if row[idx] < self._MAX_COUNT:
+                row[idx] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def frequency(self, key: Hashable) -> int:
+        """Возвращает оценку частоты ключа (минимум по строкам).
+
+        Args:
+            key: Ключ.
+
+        Returns:
+            Оценка числа обращений к ключу.
+        """
+        return min(row[idx] for row, idx in zip(self._table, self._indexes(key)))
+
+    def _reset(self) -> None:
+        for row in self._table:
+            for i, count in enumerate(row):
+                row[i] = count >> 1
+        self._additions //= 2
+
+    def clear(self) -> None:
+        """Обнуляет все счетчики."""
+        for row in self._table:
+            row[:] = [0] * len(row)
+        self._additions = 0
+
+
+class TinyLFUPolicy(EvictionPolicy):
+    """
+    W-TinyLFU: небольшое LRU-окно перед сегментированным LRU основной области.
+
+    Новые ключи попадают в окно. Когда окно переполнено, его самый старый ключ
+    соревнуется с жертвой основной области по оценке частоты из Count-Min Sketch:
+    в кэше остается тот, к кому обращались чаще. Это защищает горячие ключи от
+    вымывания однократными сканированиями.
+    """
+
+    def __init__(
+            self,
+            capacity: int = 1024,
+            window_ratio: float = 0.01,
+            protected_ratio: float = 0.8,
+    ) -> None:
+        """Инициализирует W-TinyLFU.
+
+        Args:
+            capacity: Ожидаемое число записей (определяет размер sketch).
+            window_ratio: Доля окна от общего числа записей.
+            protected_ratio: Доля защищенного сегмента в основной области.
+        """
+        self._window: OrderedDict[Hashable, None] = OrderedDict()
+        self._probation: OrderedDict[Hashable, None] = OrderedDict()
+        self._protected: OrderedDict[Hashable, None] = OrderedDict()
+        self._sketch = _FrequencySketch(capacity)
+        self._window_ratio = window_ratio
+        self._protected_ratio = protected_ratio
+
+    def _main_victim(self) -> Hashable | None:
+        if self._probation:
+            return next(iter(self._probation))
+        return next(iter(self._protected), None)
+
+    def record_insert(self, key: Hashable) -> None:
+        """Помещает новый ключ в окно, перенося переполнение окна в probation.
+
+        Args:
+            key: Добавленный ключ.
+        """
+        self._sketch.increment(key)
+        if key in self._window or key in self._probation or key in self._protected:
+            self.record_access(key)
+            return
+        self._window[key] = None
+        total = len(self._window) + len(self._probation) + len(self._protected)
+        window_limit = max(1, int(total * self._window_ratio))
+        while len(self._window) > window_limit:
+            # Кэш еще не заполнен (иначе бэкенд сначала вызвал бы select_victim),
+            # поэтому ключ переходит в основную область без фильтра допуска.
+            moved, _ = self._window.popitem(last=False)
+            self._probation[moved] = None
+
+    def record_access(self, key: Hashable) -> None:
+        """Учитывает обращение и продвигает ключ из probation в protected.
+
+        Args:
+            key: Ключ, к которому обратились.
+        """
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            main_size = len(self._probation) + len(self._protected)
+            if len(self._protected) > max(1, int(main_size * self._protected_ratio)):
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+
+    def record_remove(self, key: Hashable) -> None:
+        """Удаляет ключ из всех сегментов.
+
+        Args:
+            key: Удаленный ключ.
+        """
+        self._window.pop(key, None)
+        self._probation.pop(key, None)
+        self._protected.pop(key, None)
+
+    def select_victim(self) -> Hashable | None:
+        """Выбирает жертву с учетом фильтра допуска TinyLFU.
+
+        Returns:
+            Ключ-кандидат на вытеснение или None, если политика пуста.
+        """
+        main_victim = self._main_victim()
+        if not self._window:
+            return main_victim
+        candidate = next(iter(self._window))
+        if main_victim is None:
+            return candidate
+        if self._sketch.frequency(candidate) > self._sketch.frequency(main_victim):
+            # Кандидат допущен в основную область, вытесняется жертва.
+            del self._window[candidate]
+            self._probation[candidate] = None
+            return main_victim
+        return candidate
+
+    def clear(self) -> None:
+        """Очищает сегменты и sketch."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self._sketch.clear()
+
+
+def create_eviction_policy(name: EvictionPolicyName, capacity: int | None = None) -> EvictionPolicy:
+    """Создает политику вытеснения по имени.
+
+    Args:
+        name: Имя политики: "lru", "lfu" или "tinylfu".
+        capacity: Ожидаемое число записей (используется W-TinyLFU).
+
+    Returns:
+        Экземпляр политики вытеснения.
+
+    Raises:
+        ValueError: Если имя политики неизвестно.
+    """
+    if name == "lru":
+        return LRUPolicy()
+    if name == "lfu":
+        return LFUPolicy()
+    if name == "tinylfu":
+        return TinyLFUPolicy(capacity=capacity or 1024)
+    raise ValueError(f"Неизвестная политика вытеснения: {name!r}. Допустимо: 'lru', 'lfu', 'tinylfu'.")
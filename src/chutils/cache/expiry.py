@@ -0,0 +1,167 @@
+"""
+Индекс сроков жизни записей и фоновый «сборщик» просроченных ключей.
+
+Используется `InMemoryCacheBackend` и `chutils.store.MemoryStore` вместо сканирования
+всех ключей: просроченные записи извлекаются из min-heap по `expires_at`, поэтому
+очистка стоит O(log n) на запись и не зависит от общего числа ключей.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import threading
+import weakref
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ExpiryIndex(Generic[K]):
+    """
+    Min-heap ключей, упорядоченный по времени истечения.
+
+    Перезапись и удаление не ищут элемент в куче: устаревшие записи остаются в ней
+    и отбрасываются при извлечении (ленивое удаление). Когда устаревших записей
+    становится больше, чем актуальных, куча перестраивается — амортизированно O(1).
+    Класс не потокобезопасен и вызывается под блокировкой владельца.
+    """
+
+    _COMPACT_MIN_SIZE = 64
+
+    def __init__(self) -> None:
+        """Инициализирует пустой индекс."""
+        self._heap: list[tuple[float, int, K]] = []
+        self._deadlines: dict[K, float] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: K, expires_at: float | None) -> None:
+        """Регистрирует (или переносит) срок истечения ключа.
+
+        Args:
+            key: Ключ записи.
+            expires_at: Момент истечения (`time.time()`). None — запись бессрочная.
+        """
+        if expires_at is None:
+            self.discard(key)
+            return
+        if self._deadlines.get(key) == expires_at:
+            return
+        self._deadlines[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, next(self._counter), key))
+        self._maybe_compact()
+
+    def discard(self, key: K) -> None:
+        """Убирает ключ из индекса.
+
+        Args:
+            key: Ключ записи.
+        """
+        if self._deadlines.pop(key, None) is not None:
+            self._maybe_compact()
+
+    def pop_expired(self, now: float, limit: int | None = None) -> list[K]:
+        """Извлекает ключи, срок которых истек к моменту `now`.
+
+        Args:
+            now: Текущее время (`time.time()`).
+            limit: Максимальное число извлекаемых ключей. None — без ограничения.
+
+        Returns:
+            Список просроченных ключей (уже удаленных из индекса).
+        """
+        expired: list[K] = []
+        heap = self._heap
+        while heap and heap[0][0] < now:
+            if limit is not None and len(expired) >= limit:
+                break
+            expires_at, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) != expires_at:
+                continue  # Устаревшая запись: ключ удален или получил новый срок
+            del self._deadlines[key]
+            expired.append(key)
+        return expired
+
+    def next_expiry(self) -> float | None:
+        """Возвращает ближайший срок истечения, попутно отбрасывая устаревшие записи кучи.
+
+        Returns:
+            Время истечения (`time.time()`) или None, если индекс пуст.
+        """
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def clear(self) -> None:
+        """Очищает индекс."""
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > self._COMPACT_MIN_SIZE and len(self._heap) > 2 * len(self._deadlines):
+            self._heap = [(exp, next(self._counter), key) for key, exp in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+
+class ExpiryReaper:
+    """
+    Фоновый поток, периодически вызывающий `purge_expired()` владельца.
+
+    Хранит слабую ссылку на метод: если владелец собран сборщиком мусора,
+    поток завершается сам.
+    """
+
+    def __init__(self, purge: Callable[[], int], interval: float, name: str) -> None:
+        """Инициализирует сборщик.
+
+        Args:
+            purge: Связанный метод, удаляющий просроченные записи и возвращающий их число.
+            interval: Интервал между проходами в секундах.
+            name: Имя фонового потока.
+
+        Raises:
+            ValueError: Если интервал не положителен.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval должен быть положительным, получено: {interval}")
+        self._purge = weakref.WeakMethod(purge)
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    @property
+    def is_running(self) -> bool:
+        """Возвращает True, если поток запущен."""
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        """Запускает фоновый поток."""
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Останавливает поток и дожидается его завершения.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            purge = self._purge()
+            if purge is None:
+                break
+            try:
+                purge()
+            except Exception as e:
+                logger.error("Ошибка фоновой очистки просроченных записей: %s", e, exc_info=True)
+            del purge
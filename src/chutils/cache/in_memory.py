@@ -1,9 +1,12 @@
-import asyncio
+import sys
 import threading
 import time
+from collections.abc import Callable, Hashable
 from typing import TypeVar
 
-from .base import BaseCacheBackend
+from .base import BaseCacheBackend, CacheStats
+from .eviction import EvictionPolicy, EvictionPolicyName, create_eviction_policy
+from .expiry import ExpiryIndex, ExpiryReaper
 
 T = TypeVar("T")
 
@@ -12,24 +15,121 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
     """
     Реализация кэша в оперативной памяти на базе словаря.
 
-    Поддерживает TTL, потокобезопасность и ленивую очистку просроченных записей.
+    Поддерживает TTL, потокобезопасность и очистку просроченных записей через индекс сроков
+    (min-heap): при каждой записи удаляются уже истекшие ключи, а фоновый поток
+    (`start_reaper`) освобождает память от ключей, которые больше никто не читает.
+    Асинхронные методы наследуются от `BaseCacheBackend` и вызывают синхронные: критические
+    секции короткие и не содержат `await`, поэтому отдельная `asyncio.Lock` не нужна.
+    Если задан `max_entries` и/или `max_bytes`, кэш становится ограниченным:
+    при превышении лимита записи вытесняются выбранной политикой (LRU, LFU или W-TinyLFU)
+    за O(1), а индекс тегов обновляется синхронно с вытеснением.
     """
 
-    def __init__(self) -> None:
-        """Инициализирует бэкенд кэширования в памяти."""
+    def __init__(
+            self,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            eviction: EvictionPolicyName = "lru",
+            sizeof: Callable[[T], int] | None = None,
+    ) -> None:
+        """Инициализирует бэкенд кэширования в памяти.
+
+        Args:
+            max_entries: Максимальное число записей. None — без ограничения.
+            max_bytes: Максимальный суммарный размер значений в байтах. None — без ограничения.
+            eviction: Политика вытеснения: "lru", "lfu" или "tinylfu".
+            sizeof: Функция оценки размера значения. По умолчанию `sys.getsizeof`
+                (поверхностная оценка, без учета вложенных объектов).
+
+        Raises:
+            ValueError: Если лимиты не положительны или политика неизвестна.
+        """
         # Структура: {key: (value, expires_at)}
-        self._cache: dict[str, tuple[T, float | None]] = {}
+        self._cache: dict[Hashable, tuple[T, float | None]] = {}
         self._lock = threading.Lock()
-        self._async_lock: asyncio.Lock | None = None
-        self._key_to_tags: dict[str, set[str]] = {}
-        self._tag_to_keys: dict[str, set[str]] = {}
+        self._key_to_tags: dict[Hashable, set[str]] = {}
+        self._tag_to_keys: dict[str, set[Hashable]] = {}
+        self._sizes: dict[Hashable, int] = {}
+        self._total_bytes = 0
+        self._sizeof: Callable[[T], int] = sizeof or sys.getsizeof
+        self._max_entries: int | None = None
+        self._max_bytes: int | None = None
+        self._eviction: EvictionPolicyName = eviction
+        self._policy: EvictionPolicy | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._expiry: ExpiryIndex[Hashable] = ExpiryIndex()
+        self._reaper: ExpiryReaper | None = None
+        self._apply_limits(max_entries, max_bytes, eviction)
+
+    def _apply_limits(
+            self,
+            max_entries: int | None,
+            max_bytes: int | None,
+            eviction: EvictionPolicyName,
+    ) -> None:
+        """Проверяет лимиты и пересоздает политику вытеснения (вызывается под блокировкой)."""
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"max_entries должен быть положительным, получено: {max_entries}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes должен быть положительным, получено: {max_bytes}")
+
+        policy: EvictionPolicy | None = None
+        if max_entries is not None or max_bytes is not None:
+            policy = create_eviction_policy(eviction, capacity=max_entries)
+            for key in self._cache:
+                policy.record_insert(key)
+
+        if max_bytes is not None and self._max_bytes is None:
+            self._sizes = {key: self._sizeof(value) for key, (value, _) in self._cache.items()}
+            self._total_bytes = sum(self._sizes.values())
+        elif max_bytes is None:
+            self._sizes.clear()
+            self._total_bytes = 0
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._eviction = eviction
+        self._policy = policy
+        self._enforce_limits()
+
+    def configure(
+            self,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            eviction: EvictionPolicyName | None = None,
+    ) -> None:
+        """Меняет лимиты уже созданного кэша, вытесняя лишние записи.
 
-    def _get_async_lock(self) -> asyncio.Lock:
-        if self._async_lock is None:
-            self._async_lock = asyncio.Lock()
-        return self._async_lock
+        Полезно для бэкенда по умолчанию `cache_with_ttl`, который создается при импорте.
 
-    def _remove_key_associations(self, key: str) -> None:
+        Args:
+            max_entries: Новый лимит числа записей. None — без ограничения.
+            max_bytes: Новый лимит размера в байтах. None — без ограничения.
+            eviction: Политика вытеснения. None — оставить текущую.
+        """
+        with self._lock:
+            self._apply_limits(max_entries, max_bytes, eviction or self._eviction)
+
+    def stats(self) -> CacheStats:
+        """Возвращает снимок счетчиков попаданий, промахов и вытеснений.
+
+        Returns:
+            CacheStats: Текущие значения счетчиков.
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._cache),
+                size_bytes=self._total_bytes,
+            )
+
+    def _remove_key_associations(self, key: Hashable) -> None:
         """Внутренний метод для удаления ассоциаций ключа с тегами."""
         tags = self._key_to_tags.pop(key, None)
         if tags:
@@ -39,7 +139,48 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
                     if not self._tag_to_keys[tag]:
                         del self._tag_to_keys[tag]
 
-    def get(self, key: str) -> T | None:
+    def _remove_entry(self, key: Hashable) -> None:
+        """Удаляет запись вместе с тегами, учетом размера и состоянием политики."""
+        if self._cache.pop(key, None) is None:
+            return
+        self._remove_key_associations(key)
+        self._expiry.discard(key)
+        if self._sizes:
+            self._total_bytes -= self._sizes.pop(key, 0)
+        if self._policy is not None:
+            self._policy.record_remove(key)
+
+    def _is_over_limit(self) -> bool:
+        if self._max_entries is not None and len(self._cache) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._total_bytes > self._max_bytes
+
+    def _make_room(self, incoming_bytes: int) -> None:
+        """Вытесняет записи перед вставкой нового ключа, чтобы он поместился в лимиты."""
+        if self._policy is None:
+            return
+        while self._cache and (
+                (self._max_entries is not None and len(self._cache) >= self._max_entries)
+                or (self._max_bytes is not None and self._total_bytes + incoming_bytes > self._max_bytes)
+        ):
+            victim = self._policy.select_victim()
+            if victim is None:
+                break
+            self._remove_entry(victim)
+            self._evictions += 1
+
+    def _enforce_limits(self) -> None:
+        """Вытесняет записи, пока кэш не уложится в лимиты."""
+        if self._policy is None:
+            return
+        while self._is_over_limit():
+            victim = self._policy.select_victim()
+            if victim is None:
+                break
+            self._remove_entry(victim)
+            self._evictions += 1
+
+    def get(self, key: Hashable) -> T | None:
         """Получает значение по ключу. Если значение просрочено - удаляет его.
 
         Args:
@@ -51,22 +192,76 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
         with self._lock:
             return self._get_without_lock(key)
 
-    def _get_without_lock(self, key: str) -> T | None:
-        """Внутренний метод получения без блокировки (для использования внутри других методов)."""
-        if key not in self._cache:
+    def _get_without_lock(self, key: Hashable, track: bool = True) -> T | None:
+        """Внутренний метод получения без блокировки (для использования внутри других методов).
+
+        Args:
+            key: Ключ кэша.
+            track: Учитывать ли обращение в счетчиках и политике вытеснения.
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            if track:
+                self._misses += 1
             return None
 
-        value, expires_at = self._cache[key]
+        value, expires_at = entry
         if expires_at is not None and expires_at < time.time():
-            del self._cache[key]
-            self._remove_key_associations(key)
+            self._remove_entry(key)
+            self._expirations += 1
+            if track:
+                self._misses += 1
             return None
 
+        if track:
+            self._hits += 1
+            if self._policy is not None:
+                self._policy.record_access(key)
         return value
 
+    def _set_without_lock(
+            self,
+            key: Hashable,
+            value: T,
+            expires_at: float | None,
+            tags: list[str] | None,
+    ) -> None:
+        """Внутренний метод сохранения без блокировки."""
+        size = 0
+        if self._max_bytes is not None:
+            size = self._sizeof(value)
+            if size > self._max_bytes:
+                # Значение больше всего кэша — не сохраняем, но и не оставляем старое.
+                self._remove_entry(key)
+                return
+
+        existed = key in self._cache
+        if existed:
+            self._remove_key_associations(key)
+        else:
+            self._make_room(size)
+        self._cache[key] = (value, expires_at)
+        self._expiry.schedule(key, expires_at)
+        if self._max_bytes is not None:
+            self._total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+        if tags:
+            self._key_to_tags[key] = set(tags)
+            for tag in tags:
+                self._tag_to_keys.setdefault(tag, set()).add(key)
+        if self._policy is not None:
+            if existed:
+                self._policy.record_access(key)
+                # Перезапись могла увеличить размер значения
+                self._enforce_limits()
+            else:
+                self._policy.record_insert(key)
+        # При каждой вставке удаляем часть уже истекших ключей
+        self._evict_expired()
+
     def set(
         self,
-        key: str,
+        key: Hashable,
         value: T,
         ttl: int | None = None,
         tags: list[str] | None = None,
@@ -81,27 +276,42 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
         """
         expires_at = time.time() + ttl if ttl is not None else None
         with self._lock:
-            if key in self._cache:
-                self._remove_key_associations(key)
-            self._cache[key] = (value, expires_at)
-            if tags:
-                self._key_to_tags[key] = set(tags)
-                for tag in tags:
-                    self._tag_to_keys.setdefault(tag, set()).add(key)
-            # При каждой вставке пробуем удалить несколько просроченных ключей
-            self._lazy_evict()
-
-    def delete(self, key: str) -> None:
+            self._set_without_lock(key, value, expires_at, tags)
+
+    def touch(self, key: Hashable, ttl: int | None = None) -> bool:
+        """Продлевает срок жизни записи без перезаписи значения, тегов и учета размера.
+
+        Args:
+            key: Ключ кэша.
+            ttl: Новое время жизни в секундах. None — запись становится вечной.
+
+        Returns:
+            True, если запись существует и ее срок обновлен.
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False
+            if entry[1] is not None and entry[1] < now:
+                self._remove_entry(key)
+                self._expirations += 1
+                return False
+            self._cache[key] = (entry[0], expires_at)
+            self._expiry.schedule(key, expires_at)
+            return True
+
+    def delete(self, key: Hashable) -> None:
         """Удаляет запись из кэша по ключу.
 
         Args:
             key: Ключ для удаления.
         """
         with self._lock:
-            self._cache.pop(key, None)
-            self._remove_key_associations(key)
+            self._remove_entry(key)
 
-    def exists(self, key: str) -> bool:
+    def exists(self, key: Hashable) -> bool:
         """Проверить наличие ключа в кэше.
 
         Args:
@@ -111,14 +321,26 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
             bool: True, если ключ существует и не просрочен.
         """
         with self._lock:
-            return self._get_without_lock(key) is not None
+            return self._get_without_lock(key, track=False) is not None
+
+    def _clear_without_lock(self) -> None:
+        self._cache.clear()
+        self._key_to_tags.clear()
+        self._tag_to_keys.clear()
+        self._expiry.clear()
+        self._sizes.clear()
+        self._total_bytes = 0
+        if self._policy is not None:
+            self._policy.clear()
 
     def clear(self) -> None:
         """Полная очистка."""
         with self._lock:
-            self._cache.clear()
-            self._key_to_tags.clear()
-            self._tag_to_keys.clear()
+            self._clear_without_lock()
+
+    def _invalidate_tag_without_lock(self, tag: str) -> None:
+        for key in list(self._tag_to_keys.get(tag, set())):
+            self._remove_entry(key)
 
     def invalidate_tag(self, tag: str) -> None:
         """Удаляет все ключи, связанные с указанным тегом.
@@ -127,105 +349,43 @@ class InMemoryCacheBackend(BaseCacheBackend[T]):
             tag: Тег для инвалидации.
         """
         with self._lock:
-            keys = list(self._tag_to_keys.get(tag, set()))
-            for key in keys:
-                self._cache.pop(key, None)
-                self._remove_key_associations(key)
+            self._invalidate_tag_without_lock(tag)
 
-    def _lazy_evict(self, limit: int = 5) -> None:
+    def _evict_expired(self, limit: int | None = 32) -> int:
         """
-        Ленивая очистка просроченных ключей.
-        Проверяет ограниченное количество ключей, чтобы не блокировать поток надолго.
+        Удаляет истекшие записи, извлекая их из индекса сроков.
+        Ограничение `limit` не дает одной вставке надолго заблокировать поток.
         """
-        now = time.time()
-        keys_to_check = list(self._cache.keys())[:limit]
-        for k in keys_to_check:
-            _, expires_at = self._cache[k]
-            if expires_at is not None and expires_at < now:
-                del self._cache[k]
-                self._remove_key_associations(k)
-
-    async def aget(self, key: str) -> T | None:
-        """Асинхронно получает значение по ключу.
+        expired = self._expiry.pop_expired(time.time(), limit=limit)
+        for k in expired:
+            self._remove_entry(k)
+        self._expirations += len(expired)
+        return len(expired)
 
-        Args:
-            key: Ключ кэша.
+    def purge_expired(self) -> int:
+        """Удаляет все просроченные записи.
 
         Returns:
-            Значение из кэша или None, если оно отсутствует или просрочено.
-        """
-        async with self._get_async_lock():
-            with self._lock:
-                return self._get_without_lock(key)
-
-    async def aset(
-        self,
-        key: str,
-        value: T,
-        ttl: int | None = None,
-        tags: list[str] | None = None,
-    ) -> None:
-        """Асинхронно сохраняет значение с TTL и тегами.
-
-        Args:
-            key: Ключ кэша.
-            value: Сохраняемое значение.
-            ttl: Время жизни записи в секундах.
-            tags: Список тегов для связывания с ключом.
+            Количество удаленных записей.
         """
-        expires_at = time.time() + ttl if ttl is not None else None
-        async with self._get_async_lock():
-            with self._lock:
-                if key in self._cache:
-                    self._remove_key_associations(key)
-                self._cache[key] = (value, expires_at)
-                if tags:
-                    self._key_to_tags[key] = set(tags)
-                    for tag in tags:
-                        self._tag_to_keys.setdefault(tag, set()).add(key)
-                self._lazy_evict()
-
-    async def adelete(self, key: str) -> None:
-        """Асинхронно удаляет запись из кэша по ключу.
-
-        Args:
-            key: Ключ для удаления.
-        """
-        async with self._get_async_lock():
-            with self._lock:
-                self._cache.pop(key, None)
-                self._remove_key_associations(key)
+        with self._lock:
+            return self._evict_expired(limit=None)
 
-    async def aexists(self, key: str) -> bool:
-        """Асинхронно проверяет существование ключа в кэше.
+    def start_reaper(self, interval: float = 1.0) -> None:
+        """Запускает фоновый поток, периодически вызывающий `purge_expired()`.
 
         Args:
-            key: Ключ для проверки.
-
-        Returns:
-            True, если ключ существует и не просрочен, иначе False.
+            interval: Интервал между проходами в секундах.
         """
-        async with self._get_async_lock():
-            with self._lock:
-                return self._get_without_lock(key) is not None
-
-    async def aclear(self) -> None:
-        """Асинхронная очистка кэша."""
-        async with self._get_async_lock():
-            with self._lock:
-                self._cache.clear()
-                self._key_to_tags.clear()
-                self._tag_to_keys.clear()
-
-    async def ainvalidate_tag(self, tag: str) -> None:
-        """Асинхронно удаляет все ключи, связанные с указанным тегом.
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_running:
+                return
+            self._reaper = ExpiryReaper(self.purge_expired, interval, name="ChutilsCacheReaper")
+            self._reaper.start()
 
-        Args:
-            tag: Тег для инвалидации.
-        """
-        async with self._get_async_lock():
-            with self._lock:
-                keys = list(self._tag_to_keys.get(tag, set()))
-                for key in keys:
-                    self._cache.pop(key, None)
-                    self._remove_key_associations(key)
+    def stop_reaper(self) -> None:
+        """Останавливает фоновый поток очистки, если он запущен."""
+        with self._lock:
+            reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.stop()
@@ -0,0 +1,220 @@
+import math
+import time
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
+from .base import BaseCacheBackend, CacheStats
+from .eviction import EvictionPolicyName
+from .expiry import ExpiryReaper
+from .in_memory import InMemoryCacheBackend
+
+T = TypeVar("T")
+
+
+class _CacheShard(InMemoryCacheBackend[T]):
+    """Сегмент шардированного кэша с чтением без блокировки для неограниченного режима."""
+
+    def __init__(
+            self,
+            max_entries: int | None,
+            max_bytes: int | None,
+            eviction: EvictionPolicyName,
+            sizeof: Callable[[T], int] | None,
+    ) -> None:
+        super().__init__(max_entries=max_entries, max_bytes=max_bytes, eviction=eviction, sizeof=sizeof)
+        self._fast_hits = 0
+
+    def get_fast(self, key: Hashable) -> T | None:
+        """Читает значение без блокировки, если политика вытеснения не требует учета обращений.
+
+        Чтение элемента словаря атомарно под GIL, а записи `(value, expires_at)` неизменяемы,
+        поэтому свежую запись можно вернуть, не захватывая блокировку сегмента.
+        Промахи и просроченные записи обрабатываются обычным путем под блокировкой.
+
+        Args:
+            key: Ключ кэша.
+
+        Returns:
+            Значение или None, если ключа нет или срок его жизни истек.
+        """
+        if self._policy is None:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[1] is None or entry[1] >= time.time()):
+                # Счетчик без блокировки: при гонке возможна потеря единичных инкрементов.
+                self._fast_hits += 1
+                return entry[0]
+        return self.get(key)
+
+    def stats(self) -> CacheStats:
+        """Возвращает счетчики сегмента с учетом попаданий быстрого пути.
+
+        Returns:
+            Статистика сегмента.
+        """
+        stats = super().stats()
+        return CacheStats(
+            hits=stats.hits + self._fast_hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            expirations=stats.expirations,
+            entries=stats.entries,
+            size_bytes=stats.size_bytes,
+        )
+
+
+class ShardedInMemoryCacheBackend(BaseCacheBackend[T]):
+    """
+    Кэш в памяти, распределяющий ключи по N независимым сегментам.
+
+    Каждый сегмент — отдельный `InMemoryCacheBackend` со своей блокировкой, поэтому
+    потоки, работающие с разными ключами, не конкурируют за одну блокировку.
+    В неограниченном режиме чтение свежих записей выполняется вовсе без блокировки.
+    Лимиты `max_entries`/`max_bytes` делятся между сегментами поровну.
+    Инвалидация по тегу обходит все сегменты.
+    """
+
+    def __init__(
+            self,
+            shards: int = 16,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            eviction: EvictionPolicyName = "lru",
+            sizeof: Callable[[T], int] | None = None,
+    ) -> None:
+        """Инициализирует шардированный бэкенд.
+
+        Args:
+            shards: Количество сегментов.
+            max_entries: Общий лимит числа записей. None — без ограничения.
+            max_bytes: Общий лимит размера значений в байтах. None — без ограничения.
+            eviction: Политика вытеснения внутри сегмента: "lru", "lfu" или "tinylfu".
+            sizeof: Функция оценки размера значения (см. `InMemoryCacheBackend`).
+
+        Raises:
+            ValueError: Если число сегментов не положительно или лимиты некорректны.
+        """
+        if shards <= 0:
+            raise ValueError(f"shards должен быть положительным, получено: {shards}")
+        shard_entries = math.ceil(max_entries / shards) if max_entries is not None else None
+        shard_bytes = math.ceil(max_bytes / shards) if max_bytes is not None else None
+        self._shards: tuple[_CacheShard[T], ...] = tuple(
+            _CacheShard(shard_entries, shard_bytes, eviction, sizeof) for _ in range(shards)
+        )
+        self._reaper: ExpiryReaper | None = None
+
+    def _shard(self, key: Hashable) -> _CacheShard[T]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: Hashable) -> T | None:
+        """Получает значение по ключу.
+
+        Args:
+            key: Ключ кэша.
+
+        Returns:
+            Значение из кэша или None, если оно отсутствует или просрочено.
+        """
+        return self._shard(key).get_fast(key)
+
+    def set(
+        self,
+        key: Hashable,
+        value: T,
+        ttl: int | None = None,
+        tags: list[str] | None = None,
+    ) -> None:
+        """Сохраняет значение с заданным TTL и тегами.
+
+        Args:
+            key: Ключ кэша.
+            value: Сохраняемое значение.
+            ttl: Время жизни записи в секундах.
+            tags: Список тегов для связывания с ключом.
+        """
+        self._shard(key).set(key, value, ttl, tags)
+
+    def touch(self, key: Hashable, ttl: int | None = None) -> bool:
+        """Продлевает срок жизни записи без перезаписи значения и тегов.
+
+        Args:
+            key: Ключ кэша.
+            ttl: Новое время жизни в секундах.
+
+        Returns:
+            True, если запись существует и ее срок обновлен.
+        """
+        return self._shard(key).touch(key, ttl)
+
+    def delete(self, key: Hashable) -> None:
+        """Удаляет запись из кэша по ключу.
+
+        Args:
+            key: Ключ для удаления.
+        """
+        self._shard(key).delete(key)
+
+    def exists(self, key: Hashable) -> bool:
+        """Проверить наличие ключа в кэше.
+
+        Args:
+            key: Ключ кэша.
+
+        Returns:
+            bool: True, если ключ существует и не просрочен.
+        """
+        return self._shard(key).exists(key)
+
+    def clear(self) -> None:
+        """Очищает все сегменты."""
+        for shard in self._shards:
+            shard.clear()
+
+    def invalidate_tag(self, tag: str) -> None:
+        """Удаляет все ключи, связанные с тегом, во всех сегментах.
+
+        Args:
+            tag: Тег для инвалидации.
+        """
+        for shard in self._shards:
+            shard.invalidate_tag(tag)
+
+    def stats(self) -> CacheStats:
+        """Возвращает суммарные счетчики всех сегментов.
+
+        Returns:
+            CacheStats: Агрегированные значения счетчиков.
+        """
+        parts = [shard.stats() for shard in self._shards]
+        return CacheStats(
+            hits=sum(p.hits for p in parts),
+            misses=sum(p.misses for p in parts),
+            evictions=sum(p.evictions for p in parts),
+            expirations=sum(p.expirations for p in parts),
+            entries=sum(p.entries for p in parts),
+            size_bytes=sum(p.size_bytes for p in parts),
+        )
+
+    def purge_expired(self) -> int:
+        """Удаляет просроченные записи во всех сегментах.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        return sum(shard.purge_expired() for shard in self._shards)
+
+    def start_reaper(self, interval: float = 1.0) -> None:
+        """Запускает один фоновый поток очистки для всех сегментов.
+
+        Args:
+            interval: Интервал между проходами в секундах.
+        """
+        if self._reaper is not None and self._reaper.is_running:
+            return
+        self._reaper = ExpiryReaper(self.purge_expired, interval, name="ChutilsShardedCacheReaper")
+        self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Останавливает фоновый поток очистки, если он запущен."""
+        reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.stop()
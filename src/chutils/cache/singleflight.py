@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import typing as t
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+
+R = t.TypeVar("R")
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вычислений по ключу (single-flight) для синхронного кода.
+
+    Первый вызов `do(key, fn)` выполняет `fn`, остальные потоки с тем же ключом ждут
+    его результата (или исключения) вместо повторного вычисления. Запись о вычислении
+    удаляется сразу после его завершения.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует SingleFlight."""
+        self._calls: dict[Hashable, Future[t.Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], R]) -> R:
+        """Выполняет `fn` или дожидается уже идущего вычисления с тем же ключом.
+
+        Args:
+            key: Ключ вычисления.
+            fn: Функция без аргументов, вычисляющая значение.
+
+        Returns:
+            Результат `fn` (общий для всех одновременных вызовов).
+
+        Raises:
+            Exception: Исключение, выброшенное `fn`, пробрасывается всем ожидающим.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return t.cast(R, future.result())
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Объединение одновременных вычислений по ключу (single-flight) для корутин.
+
+    Ожидающие получают результат общего `asyncio.Future`. Если ведущая корутина
+    отменена, ожидающие не отменяются, а повторяют попытку сами.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует AsyncSingleFlight."""
+        self._calls: dict[Hashable, asyncio.Future[t.Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], t.Awaitable[R]]) -> R:
+        """Выполняет `await fn()` или дожидается уже идущего вычисления с тем же ключом.
+
+        Args:
+            key: Ключ вычисления.
+            fn: Функция без аргументов, возвращающая awaitable со значением.
+
+        Returns:
+            Результат `fn` (общий для всех одновременных вызовов).
+
+        Raises:
+            Exception: Исключение, выброшенное `fn`, пробрасывается всем ожидающим.
+        """
+        loop = asyncio.get_running_loop()
+        future = self._calls.get(key)
+        # Future привязан к циклу событий: вызовы из другого цикла вычисляют значение сами
+        if future is not None and future.get_loop() is loop:
+            try:
+                return t.cast(R, await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if future.cancelled() and not _current_task_cancelling():
+                    return await self.do(key, fn)
+                raise
+
+        future = loop.create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Помечаем исключение полученным, если ожидающих нет
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+def _current_task_cancelling() -> bool:
+    """Возвращает True, если отмена запрошена для текущей задачи (Python 3.11+)."""
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)
+    return bool(cancelling()) if cancelling is not None else False
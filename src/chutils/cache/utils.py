@@ -2,6 +2,43 @@ import asyncio
 import hashlib
 import threading
 import typing as t
+import weakref
+from collections.abc import Callable, Hashable
+
+# Безопасный импорт xxhash (опционально, быстрее blake2b)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+KeyBuilder = Callable[[str, tuple[t.Any, ...], dict[str, t.Any], str], Hashable]
+"""Сигнатура построителя ключа: (func_name, args, kwargs, prefix) -> ключ кэша."""
+
+KeyBuilderName = t.Literal["hash", "tuple"]
+"""Имена встроенных построителей ключей."""
+
+_FAST_KEY_TYPES = frozenset({int, str, bytes, type(None)})
+"""Типы аргументов, для которых ключ строится без форматирования и хеширования.
+
+bool и float исключены намеренно: `1 == True == 1.0`, и кортежные ключи таких вызовов совпали бы.
+"""
+
+
+def digest_key(data: str) -> str:
+    """Возвращает короткий детерминированный хеш строки для ключа кэша.
+
+    Использует xxh3-128, если установлен пакет `xxhash`, иначе blake2b (16 байт).
+
+    Args:
+        data: Исходная строка.
+
+    Returns:
+        Шестнадцатеричный дайджест.
+    """
+    raw = data.encode('utf-8')
+    if xxhash is not None:
+        return str(xxhash.xxh3_128_hexdigest(raw))
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
 
 def generate_cache_key(
@@ -24,43 +61,211 @@ def generate_cache_key(
     sorted_kwargs = sorted(kwargs.items())
     args_repr = f"args:{repr(args)}|kwargs:{repr(sorted_kwargs)}"
     base_str = f"{prefix}:{func_name}:{args_repr}"
-    key_hash = hashlib.md5(base_str.encode('utf-8')).hexdigest()
 
-    return f"cache:{key_hash}"
+    return f"cache:{digest_key(base_str)}"
 
 
-class LockManager:
-    """Менеджер блокировок для синхронных вызовов."""
+def generate_tuple_key(
+        func_name: str,
+        args: tuple[t.Any, ...],
+        kwargs: dict[str, t.Any],
+        prefix: str = ""
+) -> Hashable:
+    """Строит кортежный ключ без форматирования строк и хеширования.
+
+    Быстрый путь работает, если все аргументы — `int`, `str`, `bytes` или `None`.
+    Для остальных аргументов используется `generate_cache_key`.
+    Такие ключи подходят только для бэкендов, принимающих любые hashable-ключи
+    (`InMemoryCacheBackend`, `ShardedInMemoryCacheBackend`).
+
+    Args:
+        func_name: Имя функции.
+        args: Позиционные аргументы.
+        kwargs: Именованные аргументы.
+        prefix: Опциональный префикс для ключа.
+
+    Returns:
+        Кортеж `(prefix, func_name, args[, kwargs])` или строковый хеш-ключ.
+    """
+    for arg in args:
+        if type(arg) not in _FAST_KEY_TYPES:
+            return generate_cache_key(func_name, args, kwargs, prefix)
+    if not kwargs:
+        return prefix, func_name, args
+    for value in kwargs.values():
+        if type(value) not in _FAST_KEY_TYPES:
+            return generate_cache_key(func_name, args, kwargs, prefix)
+    return prefix, func_name, args, tuple(sorted(kwargs.items()))
+
+
+_KEY_BUILDERS: dict[str, KeyBuilder] = {
+    "hash": generate_cache_key,
+    "tuple": generate_tuple_key,
+}
+
+
+def resolve_key_builder(key_builder: KeyBuilderName | KeyBuilder) -> KeyBuilder:
+    """Возвращает построитель ключа по имени или сам переданный callable.
+
+    Args:
+        key_builder: Имя встроенного построителя ("hash", "tuple") или собственная функция.
+
+    Returns:
+        Функция построения ключа.
+
+    Raises:
+        ValueError: Если имя построителя неизвестно.
+    """
+    if callable(key_builder):
+        return key_builder
+    try:
+        return _KEY_BUILDERS[key_builder]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный построитель ключей: {key_builder!r}. Допустимо: {', '.join(_KEY_BUILDERS)}."
+        ) from None
+
+
+class _KeyLock:
+    """Блокировка `threading.Lock`, на которую можно ссылаться слабой ссылкой.
+
+    Экземпляры `_thread.lock` не поддерживают weakref, поэтому таблица блокировок
+    хранит эту обертку.
+    """
+
+    __slots__ = ("__weakref__", "_lock")
 
     def __init__(self) -> None:
-        """Инициализирует LockManager."""
-        self._locks: dict[str, threading.Lock] = {}
-        self._global_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Захватывает блокировку (семантика `threading.Lock.acquire`).
+
+        Args:
+            blocking: Ждать освобождения блокировки, если она занята.
+            timeout: Максимальное время ожидания в секундах; -1 — без ограничения.
 
-    def get_lock(self, key: str) -> threading.Lock:
+        Returns:
+            True, если блокировка захвачена.
+        """
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self) -> None:
+        """Освобождает блокировку."""
+        self._lock.release()
+
+    def locked(self) -> bool:
+        """Проверяет, захвачена ли блокировка.
+
+        Returns:
+            True, если блокировка захвачена.
+        """
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self._lock.acquire()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._lock.release()
+
+
+L = t.TypeVar("L")
+
+
+class _LockTable(t.Generic[L]):
+    """
+    Таблица блокировок по ключам, разбитая на сегменты (lock striping).
+
+    Блокировки хранятся в `WeakValueDictionary`: пока блокировку держит или ждет хотя бы
+    один вызывающий, она остается в таблице и все получают один и тот же объект;
+    как только ссылок не остается, запись удаляется автоматически. Размер таблицы
+    ограничен числом ключей, которые используются в данный момент.
+    Каждый сегмент защищен своей блокировкой, поэтому обращения к разным ключам
+    почти не конкурируют.
+    """
+
+    def __init__(self, factory: Callable[[], L], stripes: int) -> None:
+        if stripes <= 0:
+            raise ValueError(f"stripes должен быть положительным, получено: {stripes}")
+        self._factory = factory
+        self._stripes: tuple[tuple[threading.Lock, weakref.WeakValueDictionary[Hashable, t.Any]], ...] = tuple(
+            (threading.Lock(), weakref.WeakValueDictionary()) for _ in range(stripes)
+        )
+
+    def get(self, key: Hashable) -> L:
+        """Возвращает блокировку ключа, создавая ее, если в таблице ее нет.
+
+        Args:
+            key: Ключ для блокировки.
+
+        Returns:
+            Блокировка, общая для всех, кто сейчас держит ссылку на нее.
+        """
+        guard, locks = self._stripes[hash(key) % len(self._stripes)]
+        with guard:
+            lock: L | None = locks.get(key)
+            if lock is None:
+                lock = self._factory()
+                locks[key] = lock
+            return lock
+
+    def __len__(self) -> int:
+        return sum(len(locks) for _, locks in self._stripes)
+
+
+class LockManager:
+    """
+    Менеджер блокировок для синхронных вызовов.
+
+    Блокировка ключа живет, пока на нее есть ссылки, и освобождается сборщиком мусора
+    после использования, поэтому таблица не растет с числом уникальных ключей.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        """Инициализирует LockManager.
+
+        Args:
+            stripes: Количество сегментов таблицы блокировок.
+        """
+        self._table: _LockTable[_KeyLock] = _LockTable(_KeyLock, stripes)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def get_lock(self, key: Hashable) -> _KeyLock:
         """Получить (или создать) блокировку для конкретного ключа.
 
+        Вызывающий должен удерживать ссылку на блокировку на все время ее использования
+        (например, `with manager.get_lock(key): ...`).
+
         Args:
             key: Ключ для блокировки.
 
         Returns:
-            Экземпляр threading.Lock для данного ключа.
+            Блокировка с интерфейсом threading.Lock для данного ключа.
         """
-        with self._global_lock:
-            if key not in self._locks:
-                self._locks[key] = threading.Lock()
-            return self._locks[key]
+        return self._table.get(key)
 
 
 class AsyncLockManager:
-    """Менеджер блокировок для асинхронных вызовов."""
+    """
+    Менеджер блокировок для асинхронных вызовов.
 
-    def __init__(self) -> None:
-        """Инициализирует AsyncLockManager."""
-        self._locks: dict[str, asyncio.Lock] = {}
-        self._global_lock = threading.Lock()  # Используем threading.Lock для защиты словаря
+    Как и `LockManager`, не хранит блокировки неиспользуемых ключей.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        """Инициализирует AsyncLockManager.
+
+        Args:
+            stripes: Количество сегментов таблицы блокировок.
+        """
+        self._table: _LockTable[asyncio.Lock] = _LockTable(asyncio.Lock, stripes)
+
+    def __len__(self) -> int:
+        return len(self._table)
 
-    def get_lock(self, key: str) -> asyncio.Lock:
+    def get_lock(self, key: Hashable) -> asyncio.Lock:
         """Получить (или создать) асинхронную блокировку для ключа.
 
         Args:
@@ -69,7 +274,4 @@ class AsyncLockManager:
         Returns:
             Экземпляр asyncio.Lock для данного ключа.
         """
-        with self._global_lock:
-            if key not in self._locks:
-                self._locks[key] = asyncio.Lock()
-            return self._locks[key]
+        return self._table.get(key)
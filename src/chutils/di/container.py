@@ -1,8 +1,9 @@
 import functools
 import inspect
 import threading
+import typing
 from collections.abc import Callable
-from typing import Any, TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 from chutils.exceptions import DependencyNotFoundError, DependencyResolutionError
 
@@ -27,6 +28,66 @@ def Inject() -> Any:
     return InjectMarker()
 
 
+_MISSING: Any = object()
+_NOT_INJECTED: Any = object()
+"""Тип параметра провайдера, который берётся из значения по умолчанию, а не из контейнера."""
+
+
+class _Step(NamedTuple):
+    """Шаг плана разрешения: вызов провайдера с аргументами из предыдущих шагов."""
+
+    key: Any
+    """Ключ, под которым зарегистрирован провайдер."""
+    provider: Callable[..., Any]
+    singleton: bool
+    args: tuple[tuple[str, int, Any], ...]
+    """Аргументы вызова: (имя, индекс шага-источника или -1, значение по умолчанию)."""
+    separate: bool
+    """Синглтон внутри графа: разрешается собственным планом через кэш инстансов."""
+
+
+def _provider_parameters(provider: Callable[..., Any]) -> list[tuple[str, Any, Any]]:
+    """Разбирает сигнатуру провайдера.
+
+    Returns:
+        Список (имя, тип зависимости или _NOT_INJECTED, значение по умолчанию).
+
+    Raises:
+        DependencyResolutionError: Если у внедряемого параметра нет аннотации типа.
+    """
+    # Получаем типы параметров с разрешением строковых аннотаций
+    target = provider.__init__ if inspect.isclass(provider) else provider
+    try:
+        type_hints = typing.get_type_hints(target)
+    except Exception:
+        type_hints = {}
+
+    parameters = list(inspect.signature(target).parameters.values())
+    if inspect.isclass(provider):
+        # Пропускаем 'self'
+        parameters = parameters[1:]
+
+    result: list[tuple[str, Any, Any]] = []
+    for param in parameters:
+        # Пропускаем параметры переменной длины (*args, **kwargs)
+        if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+
+        # Берем тип из type_hints, если он там есть, иначе из param.annotation
+        param_type = type_hints.get(param.name, param.annotation)
+
+        # Внедряем при маркере Inject() или отсутствии значения по умолчанию
+        if isinstance(param.default, InjectMarker) or param.default is inspect.Parameter.empty:
+            if param_type is inspect.Parameter.empty:
+                raise DependencyResolutionError(
+                    f"Невозможно разрешить параметр '{param.name}' для провайдера '{provider}': отсутствует аннотация типа."
+                )
+            result.append((param.name, param_type, None))
+        else:
+            result.append((param.name, _NOT_INJECTED, param.default))
+    return result
+
+
 class Container:
     """
     Легковесный IoC/DI контейнер.
@@ -45,16 +106,11 @@ class Container:
         self._providers: dict[Any, tuple[Callable[..., Any], str]] = {}
         # Кэш инстансов для scope="singleton": {type_or_str: instance}
         self._instances: dict[Any, Any] = {}
+        # Скомпилированные планы разрешения: {запрошенный тип: шаги плана}.
+        # Словарь целиком заменяется при register()/clear().
+        self._plans: dict[Any, tuple[_Step, ...]] = {}
         # Блокировка для обеспечения потокобезопасности
         self._lock = threading.Lock()
-        # Потокобезопасный контекст для стека разрешения зависимостей
-        self._local = threading.local()
-
-    @property
-    def _resolving_stack(self) -> list[Any]:
-        if not hasattr(self._local, "stack"):
-            self._local.stack = []
-        return self._local.stack  # type: ignore[no-any-return]
 
     def _find_provider(self, key: Any) -> tuple[Any, tuple[Callable[..., Any], str]] | None:
         """Вспомогательный метод для поиска зарегистрированного провайдера."""
@@ -118,6 +174,7 @@ class Container:
             self._providers[dependency_type] = (actual_provider, scope)
             # Если объект уже был закэширован, удаляем его для корректного переопределения
             self._instances.pop(dependency_type, None)
+            self._plans = {}
 
     def has_provider(self, dependency_type: type[Any] | str) -> bool:
         """Проверить, зарегистрирован ли провайдер для данного типа/строки.
@@ -134,121 +191,131 @@ class Container:
     def resolve(self, dependency_type: type[T] | str | Any) -> T:
         """Разрешить зависимость (найти провайдер, разрешить его аргументы и вернуть инстанс).
 
+        При первом запросе типа строится план разрешения: провайдеры, сигнатуры и
+        типы параметров всего графа разбираются один раз, а транзитивные зависимости
+        со scope="transient" раскладываются в упорядоченный список вызовов фабрик.
+        Последующие запросы только исполняют план. Планы сбрасываются при
+        register() и clear().
+
         Args:
             dependency_type: Класс/тип/строка запрашиваемой зависимости.
 
         Returns:
             Разрешенный экземпляр запрашиваемой зависимости.
         """
+        plan = self._plans.get(dependency_type)
+        if plan is None:
+            plan = self._compile(dependency_type, [])
+        return self._execute(plan)  # type: ignore[no-any-return]
+
+    def _compile(self, dependency_type: Any, stack: list[Any]) -> tuple[_Step, ...]:
+        """Строит и кэширует план разрешения зависимости; последний шаг — сама зависимость."""
+        plans = self._plans
+        steps: list[_Step] = []
+        self._add_step(dependency_type, stack, steps, root=True)
+        plan = tuple(steps)
+        # План кладётся в словарь, актуальный на момент начала компиляции:
+        # если за это время был вызван register(), план не попадёт в новый кэш.
+        plans[dependency_type] = plan
+        return plan
+
+    def _add_step(self, dependency_type: Any, stack: list[Any], steps: list[_Step], root: bool = False) -> int:
+        """Добавляет в план шаги для зависимости и её транзитивных зависимостей.
+
+        Returns:
+            Индекс шага, результатом которого будет экземпляр зависимости.
+        """
         # Предотвращение циклических зависимостей
-        if dependency_type in self._resolving_stack:
+        if dependency_type in stack:
             cycle = " -> ".join(
                 (cls.__name__ if hasattr(cls, "__name__") else str(cls))
-                for cls in self._resolving_stack + [dependency_type]
+                for cls in stack + [dependency_type]
             )
             raise DependencyResolutionError(
                 f"Обнаружена циклическая зависимость: {cycle}"
             )
 
-        self._resolving_stack.append(dependency_type)
-
-        try:
-            # 1. Получаем провайдер
-            with self._lock:
-                found = self._find_provider(dependency_type)
-
-            # Автоматическая регистрация конкретных классов (Auto-wiring)
-            if found is None:
-                if isinstance(dependency_type, type) and not inspect.isabstract(dependency_type):
-                    # Проверяем, что класс не является стандартным примитивом
-                    if dependency_type.__module__ != "builtins":
-                        self.register(dependency_type)
-                        with self._lock:
-                            found = self._find_provider(dependency_type)
-
-            if found is None:
-                raise DependencyNotFoundError(
-                    f"Зависимость '{dependency_type.__name__ if hasattr(dependency_type, '__name__') else dependency_type}' не зарегистрирована в контейнере."
-                )
-
-            registered_key, (provider, scope) = found
+        # 1. Получаем провайдер
+        with self._lock:
+            found = self._find_provider(dependency_type)
+
+        # Автоматическая регистрация конкретных классов (Auto-wiring)
+        if found is None:
+            if isinstance(dependency_type, type) and not inspect.isabstract(dependency_type):
+                # Проверяем, что класс не является стандартным примитивом
+                if dependency_type.__module__ != "builtins":
+                    self.register(dependency_type)
+                    with self._lock:
+                        found = self._find_provider(dependency_type)
+
+        if found is None:
+            raise DependencyNotFoundError(
+                f"Зависимость '{dependency_type.__name__ if hasattr(dependency_type, '__name__') else dependency_type}' не зарегистрирована в контейнере."
+            )
 
-            # 2. Если singleton, проверяем кэш инстансов
-            if scope == "singleton":
-                with self._lock:
-                    if registered_key in self._instances:
-                        return self._instances[registered_key]  # type: ignore[no-any-return]
+        registered_key, (provider, scope) = found
+        singleton = scope == "singleton"
 
-            # 3. Разрешаем аргументы провайдера
-            resolved_args: dict[str, Any] = {}
+        # 2. Синглтон внутри графа — отдельный шаг со своим планом: его зависимости
+        # не нужно разрешать, когда инстанс уже в кэше. Уже созданный синглтон не разбирается.
+        if singleton and (not root or registered_key in self._instances):
+            if not root and registered_key not in self._instances and registered_key not in self._plans:
+                self._compile(registered_key, stack)
+            steps.append(_Step(registered_key, provider, True, (), not root))
+            return len(steps) - 1
 
-            # Получаем типы параметров с разрешением строковых аннотаций
-            import typing
-            try:
-                if inspect.isclass(provider):
-                    type_hints = typing.get_type_hints(provider.__init__)
+        # 3. Разрешаем аргументы провайдера
+        stack.append(dependency_type)
+        try:
+            args: list[tuple[str, int, Any]] = []
+            for param_name, param_type, default in _provider_parameters(provider):
+                if param_type is _NOT_INJECTED:
+                    args.append((param_name, -1, default))
                 else:
-                    type_hints = typing.get_type_hints(provider)
-            except Exception:
-                type_hints = {}
-
-            # Анализируем сигнатуру
-            if inspect.isclass(provider):
-                # Если провайдер класс, инспектируем __init__
-                sig = inspect.signature(provider.__init__)
-                # Пропускаем 'self'
-                parameters = list(sig.parameters.values())[1:]
-            else:
-                # Если провайдер - функция-фабрика
-                sig = inspect.signature(provider)
-                parameters = list(sig.parameters.values())
-
-            for param in parameters:
-                # Пропускаем параметры переменной длины (*args, **kwargs)
-                if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
-                    continue
-
-                param_name = param.name
-                # Берем тип из type_hints, если он там есть, иначе из param.annotation
-                param_type = type_hints.get(param_name, param.annotation)
-
-                # Проверяем маркер Inject() или отсутствие дефолтного значения
-                is_explicit_inject = isinstance(param.default, InjectMarker)
-                has_no_default = param.default is inspect.Parameter.empty
-
-                if is_explicit_inject or has_no_default:
-                    if param_type is inspect.Parameter.empty:
-                        raise DependencyResolutionError(
-                            f"Невозможно разрешить параметр '{param_name}' для провайдера '{provider}': отсутствует аннотация типа."
-                        )
-                    # Рекурсивно разрешаем параметр
-                    resolved_args[param_name] = self.resolve(param_type)
-                elif param.default is not inspect.Parameter.empty:
-                    # Используем значение по умолчанию
-                    resolved_args[param_name] = param.default
-
-            # 4. Создаем экземпляр
-            if scope == "singleton":
-                with self._lock:
-                    # Double-checked locking
-                    if registered_key in self._instances:
-                        return self._instances[registered_key]  # type: ignore[no-any-return]
-
-                    instance = provider(**resolved_args)
-                    self._instances[registered_key] = instance
-                    return instance  # type: ignore[no-any-return]
-            else:
-                return provider(**resolved_args)  # type: ignore[no-any-return]
-
+                    args.append((param_name, self._add_step(param_type, stack, steps), None))
         finally:
-            self._resolving_stack.pop()
+            stack.pop()
+
+        steps.append(_Step(registered_key, provider, singleton, tuple(args), False))
+        return len(steps) - 1
+
+    def _execute(self, plan: tuple[_Step, ...]) -> Any:
+        """Исполняет план разрешения и возвращает экземпляр зависимости."""
+        root = plan[-1]
+        if root.singleton:
+            instance = self._instances.get(root.key, _MISSING)
+            if instance is not _MISSING:
+                return instance
+
+        values: list[Any] = []
+        for step in plan:
+            if step.separate:
+                values.append(self.resolve(step.key))
+            elif step is not root:
+                values.append(step.provider(**{
+                    name: values[index] if index >= 0 else default for name, index, default in step.args
+                }))
+
+        resolved_args = {name: values[index] if index >= 0 else default for name, index, default in root.args}
+
+        # 4. Создаем экземпляр
+        if root.singleton:
+            with self._lock:
+                # Double-checked locking
+                if root.key in self._instances:
+                    return self._instances[root.key]
+
+                instance = root.provider(**resolved_args)
+                self._instances[root.key] = instance
+                return instance
+        return root.provider(**resolved_args)
 
     def clear(self) -> None:
-        """Очистить все зарегистрированные провайдеры и закэшированные инстансы."""
+        """Очистить все зарегистрированные провайдеры, закэшированные инстансы и планы разрешения."""
         with self._lock:
             self._providers.clear()
             self._instances.clear()
-            self._resolving_stack.clear()
+            self._plans = {}
 
 
 default_container = Container()
@@ -357,29 +424,47 @@ def _make_inject_decorator(target_container: Container) -> Callable[[Callable[..
         if not injectable_params:
             return func
 
+        # Быстрый путь: позиции внедряемых параметров известны заранее, поэтому при вызове
+        # достаточно дописать недостающие зависимости в kwargs без sig.bind_partial().
+        # Позиционно-только параметры в kwargs не передать — для них всегда bind_partial().
+        positions = {
+            name: index for index, (name, param) in enumerate(sig.parameters.items())
+            if param.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+        }
+        fast_path = all(param.kind is not inspect.Parameter.POSITIONAL_ONLY for _, param in injectable_params)
+        injected = tuple((name, positions.get(name, -1), param.annotation) for name, param in injectable_params)
+
+        def inject_arguments(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[tuple[Any, ...], dict[str, Any]]:
+            if fast_path:
+                for name, position, annotation in injected:
+                    value = kwargs.get(name, _MISSING)
+                    if value is _MISSING and 0 <= position < len(args):
+                        if isinstance(args[position], InjectMarker):
+                            # Маркер передан позиционно — заменяем через bind_partial()
+                            break
+                        continue
+                    if value is _MISSING or isinstance(value, InjectMarker):
+                        kwargs[name] = target_container.resolve(annotation)
+                else:
+                    return args, kwargs
+
+            bound = sig.bind_partial(*args, **kwargs)
+            for name, param in injectable_params:
+                # Инъецируем только если аргумент не был передан явно или передан как маркер
+                if name not in bound.arguments or isinstance(bound.arguments[name], InjectMarker):
+                    bound.arguments[name] = target_container.resolve(param.annotation)
+            return bound.args, bound.kwargs
+
         if is_async:
             @functools.wraps(func)
             async def wrapper(*args: Any, **kwargs: Any) -> Any:
-                bound = sig.bind_partial(*args, **kwargs)
-                bound_keys = set(bound.arguments.keys())
-
-                for name, param in injectable_params:
-                    # Инъецируем только если аргумент не был передан явно или передан как маркер
-                    if name not in bound_keys or isinstance(bound.arguments[name], InjectMarker):
-                        bound.arguments[name] = target_container.resolve(param.annotation)
-
-                return await func(*bound.args, **bound.kwargs)
+                args, kwargs = inject_arguments(args, kwargs)
+                return await func(*args, **kwargs)
         else:
             @functools.wraps(func)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
-                bound = sig.bind_partial(*args, **kwargs)
-                bound_keys = set(bound.arguments.keys())
-
-                for name, param in injectable_params:
-                    if name not in bound_keys or isinstance(bound.arguments[name], InjectMarker):
-                        bound.arguments[name] = target_container.resolve(param.annotation)
-
-                return func(*bound.args, **bound.kwargs)
+                args, kwargs = inject_arguments(args, kwargs)
+                return func(*args, **kwargs)
 
         return wrapper
 
@@ -12,6 +12,7 @@ from .core import (
     publish as publish,
     publish_async as publish_async,
 )
+from .dispatch import OverflowPolicy as OverflowPolicy
 
 __all__ = [
     "EventBus",
@@ -19,4 +20,5 @@ __all__ = [
     "subscribe",
     "publish",
     "publish_async",
+    "OverflowPolicy",
 ]
@@ -0,0 +1,38 @@
+"""
+Публикация метрик шины событий в `chutils.metrics`.
+
+`chutils.metrics` импортируется лениво, а ошибки провайдера метрик
+не прерывают публикацию и доставку событий.
+"""
+from __future__ import annotations
+
+
+def increment(name: str, labels: dict[str, str]) -> None:
+    """Увеличивает счётчик на единицу.
+
+    Args:
+        name: Имя счётчика.
+        labels: Метки серии.
+    """
+    try:
+        from chutils.metrics import increment as increment_metric
+
+        increment_metric(name, labels=labels)
+    except Exception:
+        pass
+
+
+def set_gauge(name: str, value: float, labels: dict[str, str]) -> None:
+    """Устанавливает значение gauge.
+
+    Args:
+        name: Имя gauge.
+        value: Новое значение.
+        labels: Метки серии.
+    """
+    try:
+        from chutils.metrics import set_gauge as set_gauge_metric
+
+        set_gauge_metric(name, value, labels=labels)
+    except Exception:
+        pass
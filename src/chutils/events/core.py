@@ -1,16 +1,29 @@
 """Ядро шины событий (In-Memory Event Bus)."""
 
 import asyncio
+import concurrent.futures
+import contextvars
+import functools
 import inspect
+import itertools
 import logging  # chutils: ignore[ChutilsIntegrationRule]
 import threading
 import typing as t
-from collections import defaultdict
 from collections.abc import Callable
 from enum import Enum
 
 from chutils.exceptions import EventBusExceptionGroup
 
+from .dispatch import (
+    _OVERFLOW_POLICIES,
+    OverflowPolicy,
+    _Batcher,
+    _Envelope,
+    _EventQueue,
+    batch_payload,
+)
+from .routing import _EMPTY_PLAN, _DispatchPlan, _Subscription, _TopicTrie, is_pattern
+
 logger = logging.getLogger(__name__)
 
 # Безопасный импорт Pydantic
@@ -27,6 +40,9 @@ _background_thread: threading.Thread | None = None
 """Поток фонового event loop."""
 _loop_lock = threading.Lock()
 
+_PLAN_CACHE_SIZE = 4096
+"""Максимальное число закэшированных таблиц диспетчеризации (по именам событий) в шине."""
+
 def _start_background_loop() -> asyncio.AbstractEventLoop:
     """Лениво запускает фоновый event loop в отдельном демоническом потоке."""
     global _background_loop, _background_thread
@@ -84,31 +100,117 @@ class EventBus:
 
     Обеспечивает регистрацию подписчиков и публикацию событий.
     Потокобезопасна.
+
+    Имя подписки может быть шаблоном с сегментами-подстановками: `orders.*`
+    (ровно один сегмент) или `orders.#` (любое число сегментов). Для каждого
+    публикуемого имени шина один раз строит неизменяемую таблицу обработчиков
+    и использует её без блокировок до следующей подписки или отписки.
+
+    Асинхронные и пакетные (`batch_size`) подписчики, вызванные из `publish`,
+    доставляются в фоне: для каждого имени события создаётся ограниченная
+    очередь на `max_queue_size` событий, которую разбирают `workers` корутин.
+    Поведение при заполненной очереди задаётся политикой `overflow`.
     """
 
-    def __init__(self, error_strategy: ErrorStrategy = ErrorStrategy.IGNORE) -> None:
+    def __init__(
+            self,
+            error_strategy: ErrorStrategy = ErrorStrategy.IGNORE,
+            *,
+            max_queue_size: int = 10_000,
+            workers: int = 4,
+            overflow: OverflowPolicy = "block",
+            block_timeout: float | None = None,
+    ) -> None:
         """Инициализирует шину событий.
 
         Args:
             error_strategy: Стратегия обработки ошибок по умолчанию.
+            max_queue_size: Максимальное число событий в очереди фоновой доставки одного имени события.
+            workers: Число одновременных фоновых доставок на имя события; также размер пула
+                потоков для синхронных обработчиков в `publish_async` и пакетных подписках.
+            overflow: Политика при заполненной очереди: "block" — ждать места, "drop" —
+                отбросить событие, "raise" — выбросить `EventBusQueueFullError`.
+            block_timeout: Максимальное ожидание для "block" в секундах, после которого
+                событие отбрасывается (None — без ограничения).
+
+        Raises:
+            ValueError: Если параметры очереди вне допустимого диапазона.
         """
-        self._subscribers: dict[str, list[Callable[..., t.Any]]] = defaultdict(list)
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {overflow!r}. Допустимые значения: {sorted(_OVERFLOW_POLICIES)}")
+        if max_queue_size < 1:
+            raise ValueError(f"max_queue_size должен быть положительным, получено: {max_queue_size}")
+        if workers < 1:
+            raise ValueError(f"workers должен быть положительным, получено: {workers}")
+        # Значения — неизменяемые кортежи; при изменении подписок заменяются целиком
+        self._subscribers: dict[str, tuple[Callable[..., t.Any], ...]] = {}
+        self._subscriptions: dict[tuple[str, Callable[..., t.Any]], _Subscription] = {}
+        self._patterns = _TopicTrie()
+        self._plans: dict[str, _DispatchPlan] = {}
+        self._seq = itertools.count()
         self._lock = threading.Lock()
         self.error_strategy = error_strategy
-
-    def subscribe(self, event_name: str) -> Callable[[Callable[..., t.Any]], Callable[..., t.Any]]:
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.overflow: OverflowPolicy = overflow
+        self.block_timeout = block_timeout
+        self._queues: dict[str, _EventQueue] = {}
+        # Буферы пачек используются только в фоновом event loop
+        self._batchers: dict[tuple[str, Callable[..., t.Any]], _Batcher] = {}
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    def subscribe(
+            self,
+            event_name: str,
+            *,
+            batch_size: int | None = None,
+            max_wait: float = 0.1,
+    ) -> Callable[[Callable[..., t.Any]], Callable[..., t.Any]]:
         """Декоратор для регистрации обработчика события на данном инстансе шины.
 
+        С `batch_size` обработчик (синхронный или асинхронный) вызывается в фоне
+        со списком полезных нагрузок событий — когда набралось `batch_size`
+        событий или прошло `max_wait` секунд с первого из них. Полезная нагрузка —
+        единственный позиционный аргумент публикации, словарь именованных
+        аргументов или кортеж аргументов.
+
+        Обработчик, подписанный на несколько совпадающих с событием шаблонов,
+        вызывается один раз — по самой ранней подписке.
+
         Args:
-            event_name: Имя события, на которое подписывается обработчик.
+            event_name: Имя события или шаблон с сегментами `*` и `#`.
+            batch_size: Размер пачки; None — обработчик вызывается на каждое событие.
+            max_wait: Максимальное ожидание неполной пачки в секундах.
 
         Returns:
             Декоратор, который регистрирует функцию-обработчик и возвращает её.
+
+        Raises:
+            ValueError: Если `batch_size` или `max_wait` не положительны.
         """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size должен быть положительным, получено: {batch_size}")
+        if max_wait <= 0:
+            raise ValueError(f"max_wait должен быть положительным, получено: {max_wait}")
+
         def decorator(func: Callable[..., t.Any]) -> Callable[..., t.Any]:
+            is_async = is_async_callable(func)
             with self._lock:
-                if func not in self._subscribers[event_name]:
-                    self._subscribers[event_name].append(func)
+                key = (event_name, func)
+                current = self._subscriptions.get(key)
+                self._subscriptions[key] = _Subscription(
+                    event_name,
+                    func,
+                    is_async=is_async,
+                    seq=next(self._seq) if current is None else current.seq,
+                    batch_size=batch_size,
+                    max_wait=max_wait,
+                )
+                if current is None:
+                    self._subscribers[event_name] = (*self._subscribers.get(event_name, ()), func)
+                    if is_pattern(event_name):
+                        self._patterns.add(event_name)
+                self._plans = {}
             return func
         return decorator
 
@@ -120,11 +222,195 @@ class EventBus:
             func: Функция-обработчик, которую нужно отписать.
         """
         with self._lock:
-            if event_name in self._subscribers:
-                try:
-                    self._subscribers[event_name].remove(func)
-                except ValueError:
-                    pass
+            if self._subscriptions.pop((event_name, func), None) is None:
+                return
+            handlers = tuple(handler for handler in self._subscribers[event_name] if handler != func)
+            self._subscribers[event_name] = handlers
+            if not handlers and is_pattern(event_name):
+                self._patterns.discard(event_name)
+            self._plans = {}
+
+    def queue_depths(self) -> dict[str, int]:
+        """Возвращает глубину очередей фоновой доставки.
+
+        Returns:
+            Число событий, ожидающих доставки, по именам событий.
+        """
+        with self._lock:
+            return {name: queue.depth for name, queue in self._queues.items()}
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Ожидает фоновой доставки всех принятых событий, включая неполные пачки.
+
+        Args:
+            timeout: Максимальное ожидание в секундах (None — без ограничения).
+
+        Returns:
+            True, если все события доставлены; False по истечении таймаута.
+
+        Raises:
+            RuntimeError: При вызове из обработчика, выполняющегося в фоновом event loop.
+        """
+        with self._lock:
+            queues = list(self._queues.values())
+        if not queues:
+            return True
+        if threading.current_thread() is _background_thread:
+            raise RuntimeError("EventBus.join() нельзя вызывать из фонового event loop шины.")
+        future = asyncio.run_coroutine_threadsafe(self._drain(queues), _start_background_loop())
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return False
+        return True
+
+    async def _drain(self, queues: list[_EventQueue]) -> None:
+        """Доставляет очереди и буферы пачек до полного опустошения (в фоновом loop)."""
+        while True:
+            for queue in queues:
+                await queue.wait_drained()
+            batchers = [batcher for batcher in self._batchers.values() if batcher.pending]
+            if not batchers and all(queue.unfinished == 0 for queue in queues):
+                return
+            for batcher in batchers:
+                await batcher.flush()
+
+    # --- Таблицы диспетчеризации ---
+
+    def _plan(self, event_name: str) -> _DispatchPlan:
+        """Возвращает таблицу обработчиков события; на повторных публикациях — без блокировки."""
+        plan = self._plans.get(event_name)
+        if plan is not None:
+            return plan
+        with self._lock:
+            plan = self._plans.get(event_name)
+            if plan is None:
+                plan = self._build_plan(event_name)
+                if len(self._plans) >= _PLAN_CACHE_SIZE:
+                    self._plans = {}
+                self._plans[event_name] = plan
+            return plan
+
+    def _build_plan(self, event_name: str) -> _DispatchPlan:
+        """Собирает таблицу из точной подписки и совпавших шаблонов (под блокировкой)."""
+        names = [event_name] if self._subscribers.get(event_name) else []
+        if len(self._patterns):
+            names.extend(pattern for pattern in self._patterns.match(event_name) if pattern != event_name)
+        if not names:
+            return _EMPTY_PLAN
+        return _DispatchPlan.build(
+            self._subscriptions[(name, func)] for name in names for func in self._subscribers[name]
+        )
+
+    # --- Фоновая доставка ---
+
+    def _get_queue(self, event_name: str) -> _EventQueue:
+        """Возвращает (создаёт) очередь фоновой доставки для имени события."""
+        queue = self._queues.get(event_name)
+        if queue is not None:
+            return queue
+        loop = _start_background_loop()
+        with self._lock:
+            queue = self._queues.get(event_name)
+            if queue is None:
+                assert _background_thread is not None  # noqa: S101
+                queue = _EventQueue(
+                    event_name,
+                    maxsize=self.max_queue_size,
+                    workers=self.workers,
+                    loop=loop,
+                    loop_thread=_background_thread,
+                    deliver=self._deliver,
+                )
+                self._queues[event_name] = queue
+            return queue
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Лениво создаёт пул потоков для синхронных обработчиков."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="ChutilsEventBus",
+                    )
+        return self._executor
+
+    async def _deliver(self, event_name: str, envelope: _Envelope) -> None:
+        """Доставляет событие из очереди подписчикам (в фоновом loop)."""
+        for sub in envelope.handlers:
+            if sub.batch_size is None:
+                await self._call_logged(event_name, sub.func, sub.is_async, envelope.args, envelope.kwargs)
+                continue
+            # Пачка копится на подписку: шаблон собирает события всех совпавших тем
+            key = (sub.event_name, sub.func)
+            batcher = self._batchers.get(key)
+            if batcher is None or (batcher.size, batcher.max_wait) != (sub.batch_size, sub.max_wait):
+                if batcher is not None:
+                    await batcher.flush()
+                batcher = _Batcher(
+                    sub,
+                    size=sub.batch_size,
+                    max_wait=sub.max_wait,
+                    loop=asyncio.get_running_loop(),
+                    call=functools.partial(self._call_batch, sub.event_name),
+                )
+                self._batchers[key] = batcher
+            await batcher.add(batch_payload(envelope.args, envelope.kwargs))
+
+    async def _call_batch(self, event_name: str, sub: _Subscription, batch: list[t.Any]) -> None:
+        await self._call_logged(event_name, sub.func, sub.is_async, (batch,), {})
+
+    async def _call_logged(
+            self,
+            event_name: str,
+            func: Callable[..., t.Any],
+            is_async: bool,
+            args: tuple[t.Any, ...],
+            kwargs: dict[str, t.Any],
+    ) -> None:
+        """Вызывает обработчик в фоне; синхронный — в пуле потоков шины. Ошибки логируются."""
+        if is_async:
+            await _run_and_log_errors(func(*args, **kwargs), event_name)
+            return
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        try:
+            await loop.run_in_executor(self._get_executor(), call)
+        except Exception as e:
+            logger.error("Ошибка в синхронном фоновом обработчике события %s: %s", event_name, e, exc_info=True)
+
+    def _enqueue(
+            self,
+            event_name: str,
+            args: tuple[t.Any, ...],
+            kwargs: dict[str, t.Any],
+            handlers: tuple[_Subscription, ...],
+            overflow: OverflowPolicy | None,
+    ) -> None:
+        """Помещает событие в очередь фоновой доставки."""
+        self._get_queue(event_name).put(
+            _Envelope(args, kwargs, handlers), overflow or self.overflow, self.block_timeout,
+        )
+
+    @staticmethod
+    def _run_sync_handlers(
+            event_name: str,
+            handlers: tuple[Callable[..., t.Any], ...],
+            args: tuple[t.Any, ...],
+            kwargs: dict[str, t.Any],
+            fail_fast: bool,
+    ) -> list[Exception]:
+        """Последовательно выполняет синхронные обработчики одного события в потоке пула."""
+        errors: list[Exception] = []
+        for func in handlers:
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                if fail_fast:
+                    raise
+                errors.append(e)
+        return errors
 
     def _resolve_payload(self, args: tuple[t.Any, ...], kwargs: dict[str, t.Any]) -> tuple[tuple[t.Any, ...], dict[str, t.Any]]:
         """Определяет формат переданных аргументов.
@@ -136,44 +422,52 @@ class EventBus:
             return args, kwargs
         return args, kwargs
 
-    def publish(self, event_name: str, *args: t.Any, error_strategy: ErrorStrategy | None = None, **kwargs: t.Any) -> None:
+    def publish(
+            self,
+            event_name: str,
+            *args: t.Any,
+            error_strategy: ErrorStrategy | None = None,
+            overflow: OverflowPolicy | None = None,
+            **kwargs: t.Any,
+    ) -> None:
         """Синхронно публикует событие.
 
         Синхронные обработчики выполняются немедленно в текущем потоке.
-        Асинхронные обработчики запускаются в фоновом режиме в выделенном Event Loop.
+        Асинхронные и пакетные обработчики доставляются в фоне через ограниченную
+        очередь события в выделенном Event Loop.
 
         Args:
             event_name: Имя события.
             *args: Позиционные аргументы для обработчиков.
             error_strategy: Стратегия обработки ошибок для этого вызова.
+            overflow: Политика при заполненной очереди для этого вызова.
             **kwargs: Именованные аргументы для обработчиков.
+
+        Raises:
+            EventBusQueueFullError: Очередь заполнена при политике "raise".
         """
+        plan = self._plan(event_name)
+        if not plan:
+            return
+
         args, kwargs = self._resolve_payload(args, kwargs)
         strategy = error_strategy or self.error_strategy
 
-        with self._lock:
-            subscribers = list(self._subscribers.get(event_name, []))
-
-        if not subscribers:
-            return
+        if plan.queued:
+            self._enqueue(event_name, args, kwargs, plan.queued, overflow)
 
         sync_errors: list[Exception] = []
 
-        for func in subscribers:
-            if is_async_callable(func):
-                loop = _start_background_loop()
-                coro = func(*args, **kwargs)
-                asyncio.run_coroutine_threadsafe(_run_and_log_errors(coro, event_name), loop)
-            else:
-                try:
-                    func(*args, **kwargs)
-                except Exception as e:
-                    if strategy == ErrorStrategy.FAIL_FAST:
-                        raise e
-                    elif strategy == ErrorStrategy.COLLECT:
-                        sync_errors.append(e)
-                    else:  # IGNORE
-                        logger.error("Ошибка в синхронном обработчике события %s: %s", event_name, e, exc_info=True)
+        for func in plan.sync_funcs:
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                if strategy == ErrorStrategy.FAIL_FAST:
+                    raise e
+                elif strategy == ErrorStrategy.COLLECT:
+                    sync_errors.append(e)
+                else:  # IGNORE
+                    logger.error("Ошибка в синхронном обработчике события %s: %s", event_name, e, exc_info=True)
 
         if strategy == ErrorStrategy.COLLECT and sync_errors:
             raise EventBusExceptionGroup(
@@ -181,84 +475,155 @@ class EventBus:
                 sync_errors
             )
 
-    async def publish_async(self, event_name: str, *args: t.Any, error_strategy: ErrorStrategy | None = None, **kwargs: t.Any) -> None:
+    async def publish_async(
+            self,
+            event_name: str,
+            *args: t.Any,
+            error_strategy: ErrorStrategy | None = None,
+            overflow: OverflowPolicy | None = None,
+            **kwargs: t.Any,
+    ) -> None:
         """Асинхронно публикует событие.
 
         Дожидается выполнения всех подписчиков (как синхронных, так и асинхронных).
-        Синхронные обработчики выполняются в пуле потоков через asyncio.to_thread.
+        Синхронные обработчики события выполняются последовательно одной задачей
+        в пуле потоков шины (`workers` потоков). Пакетные подписчики получают
+        событие через очередь фоновой доставки и не ожидаются.
 
         Args:
             event_name: Имя события.
             *args: Позиционные аргументы для обработчиков.
             error_strategy: Стратегия обработки ошибок для этого вызова.
+            overflow: Политика при заполненной очереди пакетных подписчиков для этого вызова.
             **kwargs: Именованные аргументы для обработчиков.
+
+        Raises:
+            EventBusQueueFullError: Очередь заполнена при политике "raise".
         """
+        plan = self._plan(event_name)
+        if not plan:
+            return
+
         args, kwargs = self._resolve_payload(args, kwargs)
         strategy = error_strategy or self.error_strategy
 
-        with self._lock:
-            subscribers = list(self._subscribers.get(event_name, []))
+        if plan.batched:
+            await self._enqueue_async(event_name, args, kwargs, plan.batched, overflow)
+
+        tasks: list[t.Awaitable[t.Any]] = [func(*args, **kwargs) for func in plan.async_funcs]
+        sync_handlers = plan.sync_funcs
+
+        if sync_handlers:
+            call = functools.partial(
+                contextvars.copy_context().run,
+                self._run_sync_handlers,
+                event_name,
+                sync_handlers,
+                args,
+                kwargs,
+                strategy == ErrorStrategy.FAIL_FAST,
+            )
+            tasks.append(asyncio.get_running_loop().run_in_executor(self._get_executor(), call))
 
-        if not subscribers:
+        if not tasks:
             return
 
-        tasks = []
-        for func in subscribers:
-            if is_async_callable(func):
-                tasks.append(func(*args, **kwargs))
-            else:
-                tasks.append(asyncio.to_thread(func, *args, **kwargs))
-
         if strategy == ErrorStrategy.FAIL_FAST:
             # При FAIL_FAST любое исключение немедленно прерывает gather
             await asyncio.gather(*tasks, return_exceptions=False)
+            return
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        sync_result: list[Exception] | BaseException = results.pop() if sync_handlers else []
+        errors = [res for res in results if isinstance(res, Exception)]
+        if isinstance(sync_result, list):
+            errors.extend(sync_result)
+        elif isinstance(sync_result, Exception):
+            errors.append(sync_result)
+
+        if errors:
+            if strategy == ErrorStrategy.COLLECT:
+                raise EventBusExceptionGroup(
+                    f"При асинхронной публикации события '{event_name}' произошли ошибки.",
+                    errors
+                )
+            else:  # IGNORE
+                for err in errors:
+                    logger.error("Ошибка в обработчике события %s: %s", event_name, err, exc_info=True)
+
+    async def _enqueue_async(
+            self,
+            event_name: str,
+            args: tuple[t.Any, ...],
+            kwargs: dict[str, t.Any],
+            handlers: tuple[_Subscription, ...],
+            overflow: OverflowPolicy | None,
+    ) -> None:
+        """Помещает событие в очередь, ожидая места в пуле потоков, чтобы не блокировать event loop."""
+        queue = self._get_queue(event_name)
+        envelope = _Envelope(args, kwargs, handlers)
+        policy = overflow or self.overflow
+        if queue.try_put(envelope):
+            return
+        if policy == "block" and threading.current_thread() is not _background_thread:
+            await asyncio.to_thread(queue.put, envelope, policy, self.block_timeout)
         else:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            errors = [res for res in results if isinstance(res, Exception)]
-
-            if errors:
-                if strategy == ErrorStrategy.COLLECT:
-                    raise EventBusExceptionGroup(
-                        f"При асинхронной публикации события '{event_name}' произошли ошибки.",
-                        errors
-                    )
-                else:  # IGNORE
-                    for err in errors:
-                        logger.error("Ошибка в обработчике события %s: %s", event_name, err, exc_info=True)
+            queue.put(envelope, policy, self.block_timeout)
 
 
 _global_bus = EventBus()
 "Глобальный инстанс шины событий"
 
-def subscribe(event_name: str) -> Callable[[Callable[..., t.Any]], Callable[..., t.Any]]:
+def subscribe(
+        event_name: str,
+        *,
+        batch_size: int | None = None,
+        max_wait: float = 0.1,
+) -> Callable[[Callable[..., t.Any]], Callable[..., t.Any]]:
     """Декоратор для подписки на событие в глобальной шине.
 
     Args:
         event_name: Имя события.
+        batch_size: Размер пачки для пакетной доставки (см. `EventBus.subscribe`).
+        max_wait: Максимальное ожидание неполной пачки в секундах.
 
     Returns:
         Декоратор для функции-обработчика.
     """
-    return _global_bus.subscribe(event_name)
-
-def publish(event_name: str, *args: t.Any, error_strategy: ErrorStrategy | None = None, **kwargs: t.Any) -> None:
+    return _global_bus.subscribe(event_name, batch_size=batch_size, max_wait=max_wait)
+
+def publish(
+        event_name: str,
+        *args: t.Any,
+        error_strategy: ErrorStrategy | None = None,
+        overflow: OverflowPolicy | None = None,
+        **kwargs: t.Any,
+) -> None:
     """Синхронно публикует событие в глобальной шине.
 
     Args:
         event_name: Имя события.
         *args: Позиционные аргументы.
         error_strategy: Стратегия обработки ошибок.
+        overflow: Политика при заполненной очереди фоновой доставки.
         **kwargs: Именованные аргументы.
     """
-    _global_bus.publish(event_name, *args, error_strategy=error_strategy, **kwargs)
-
-async def publish_async(event_name: str, *args: t.Any, error_strategy: ErrorStrategy | None = None, **kwargs: t.Any) -> None:
+    _global_bus.publish(event_name, *args, error_strategy=error_strategy, overflow=overflow, **kwargs)
+
+async def publish_async(
+        event_name: str,
+        *args: t.Any,
+        error_strategy: ErrorStrategy | None = None,
+        overflow: OverflowPolicy | None = None,
+        **kwargs: t.Any,
+) -> None:
     """Асинхронно публикует событие в глобальной шине.
 
     Args:
         event_name: Имя события.
         *args: Позиционные аргументы.
         error_strategy: Стратегия обработки ошибок.
+        overflow: Политика при заполненной очереди фоновой доставки.
         **kwargs: Именованные аргументы.
     """
-    await _global_bus.publish_async(event_name, *args, error_strategy=error_strategy, **kwargs)
+    await _global_bus.publish_async(event_name, *args, error_strategy=error_strategy, overflow=overflow, **kwargs)
@@ -0,0 +1,308 @@
+"""
+Диспетчер фоновой доставки событий шины.
+
+Для каждого имени события шина создаёт ограниченную очередь `_EventQueue`.
+Публикующие потоки кладут в неё конверты событий, а `workers` корутин в
+фоновом event loop шины разбирают очередь и вызывают подписчиков. Всплеск
+публикаций не порождает неограниченное число корутин: в памяти находится
+не более `max_queue_size` событий на имя.
+
+Подписчики с `batch_size` получают события пачками (`_Batcher`): полезная
+нагрузка копится в буфере подписки и передаётся обработчику списком, когда
+набралось `batch_size` элементов или прошло `max_wait` секунд с первого.
+
+Глубина очередей публикуется в метрике `events_queue_depth{event}`,
+отброшенные события — в `events_dropped_total{event, policy}`.
+"""
+
+import asyncio
+import threading
+import time
+import typing as t
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
+
+from chutils.exceptions import EventBusQueueFullError
+
+from . import _metrics
+from .routing import _Subscription
+
+OverflowPolicy = t.Literal["block", "drop", "raise"]
+"""Поведение публикации при заполненной очереди."""
+
+_OVERFLOW_POLICIES: frozenset[str] = frozenset({"block", "drop", "raise"})
+
+_DEPTH_PUBLISH_INTERVAL = 0.5
+"""Минимальный интервал (сек.) между публикациями метрики глубины очереди."""
+
+
+def batch_payload(args: tuple[t.Any, ...], kwargs: dict[str, t.Any]) -> t.Any:
+    """Сворачивает аргументы публикации в элемент пачки.
+
+    Args:
+        args: Позиционные аргументы `publish`.
+        kwargs: Именованные аргументы `publish`.
+
+    Returns:
+        Единственный позиционный аргумент; словарь `kwargs`, если переданы только
+        именованные аргументы; иначе `args` или пара `(args, kwargs)`.
+    """
+    if len(args) == 1 and not kwargs:
+        return args[0]
+    if not args:
+        return kwargs
+    return (args, kwargs) if kwargs else args
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _Envelope:
+    """Опубликованное событие вместе со снимком подписчиков для фоновой доставки."""
+
+    __slots__ = ("args", "handlers", "kwargs")
+
+    def __init__(
+            self,
+            args: tuple[t.Any, ...],
+            kwargs: dict[str, t.Any],
+            handlers: tuple[_Subscription, ...],
+    ) -> None:
+        self.args = args
+        self.kwargs = kwargs
+        self.handlers = handlers
+
+
+class _EventQueue:
+    """Ограниченная очередь одного имени события с пулом корутин-обработчиков.
+
+    `put` вызывается из любого потока; корутины-обработчики и `wait_drained`
+    работают в фоновом event loop шины. Обработчики запускаются по мере
+    поступления событий (не больше `workers` одновременно) и завершаются,
+    когда очередь пуста, поэтому простаивающая очередь не держит задач в loop.
+    """
+
+    def __init__(
+            self,
+            event_name: str,
+            *,
+            maxsize: int,
+            workers: int,
+            loop: asyncio.AbstractEventLoop,
+            loop_thread: threading.Thread,
+            deliver: Callable[[str, _Envelope], Awaitable[None]],
+    ) -> None:
+        self.event_name = event_name
+        self.maxsize = maxsize
+        self.workers = workers
+        self.dropped = 0
+        self._loop = loop
+        self._loop_thread = loop_thread
+        self._deliver = deliver
+        self._items: deque[_Envelope] = deque()
+        self._not_full = threading.Condition(threading.Lock())
+        self._running = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._unfinished = 0
+        self._drain_waiters: list[asyncio.Future[None]] = []
+        self._labels = {"event": event_name}
+        self._depth_published_at = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Число событий, ожидающих доставки."""
+        return len(self._items)
+
+    @property
+    def unfinished(self) -> int:
+        """Число принятых, но ещё не доставленных событий."""
+        return self._unfinished
+
+    def put(self, envelope: _Envelope, overflow: OverflowPolicy, timeout: float | None) -> bool:
+        """Помещает событие в очередь согласно политике переполнения.
+
+        В потоке фонового event loop ожидание невозможно, поэтому политика
+        ``block`` там ведёт себя как ``drop``.
+
+        Args:
+            envelope: Конверт события.
+            overflow: Политика при заполненной очереди.
+            timeout: Максимальное ожидание для политики ``block`` (None — без ограничения).
+
+        Returns:
+            True, если событие принято; False, если отброшено.
+
+        Raises:
+            EventBusQueueFullError: Очередь заполнена и выбрана политика ``raise``.
+        """
+        with self._not_full:
+            if len(self._items) >= self.maxsize and not self._wait_for_room(overflow, timeout):
+                self.dropped += 1
+                spawn = None
+            else:
+                spawn = self._append_locked(envelope)
+            depth = len(self._items)
+        if spawn is None:
+            self._on_drop(overflow)
+            return False
+        self._accepted(spawn, depth)
+        return True
+
+    def try_put(self, envelope: _Envelope) -> bool:
+        """Помещает событие в очередь без ожидания.
+
+        Args:
+            envelope: Событие с полезной нагрузкой.
+
+        Returns:
+            True, если событие принято; False, если очередь заполнена.
+        """
+        with self._not_full:
+            if len(self._items) >= self.maxsize:
+                return False
+            spawn = self._append_locked(envelope)
+            depth = len(self._items)
+        self._accepted(spawn, depth)
+        return True
+
+    async def wait_drained(self) -> None:
+        """Ожидает доставки всех принятых событий (вызывается в фоновом loop)."""
+        with self._not_full:
+            if self._unfinished == 0:
+                return
+            waiter = self._loop.create_future()
+            self._drain_waiters.append(waiter)
+        await waiter
+
+    def _wait_for_room(self, overflow: OverflowPolicy, timeout: float | None) -> bool:
+        """Ждёт места в очереди под блокировкой; возвращает False, если места нет."""
+        if overflow == "raise":
+            raise EventBusQueueFullError(
+                f"Очередь события '{self.event_name}' заполнена.",
+                hint="Увеличьте max_queue_size или workers шины либо выберите overflow='block'.",
+                event_name=self.event_name,
+                max_queue_size=self.maxsize,
+            )
+        if overflow == "drop" or threading.current_thread() is self._loop_thread:
+            return False
+        return self._not_full.wait_for(lambda: len(self._items) < self.maxsize, timeout)
+
+    def _append_locked(self, envelope: _Envelope) -> bool:
+        """Добавляет событие под блокировкой; возвращает True, если нужен ещё один обработчик."""
+        self._items.append(envelope)
+        self._unfinished += 1
+        if self._running < self.workers:
+            self._running += 1
+            return True
+        return False
+
+    def _accepted(self, spawn: bool, depth: int) -> None:
+        if spawn:
+            self._loop.call_soon_threadsafe(self._spawn_worker)
+        self._publish_depth(depth)
+
+    def _spawn_worker(self) -> None:
+        task = self._loop.create_task(self._worker())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _worker(self) -> None:
+        while True:
+            with self._not_full:
+                if not self._items:
+                    self._running -= 1
+                    break
+                envelope = self._items.popleft()
+                self._not_full.notify()
+                depth = len(self._items)
+            if depth == 0:
+                self._publish_depth(0, force=True)
+            try:
+                await self._deliver(self.event_name, envelope)
+            except BaseException:
+                # Отмена (остановка loop): слот обработчика освобождается
+                with self._not_full:
+                    self._running -= 1
+                raise
+            finally:
+                self._task_done()
+
+    def _task_done(self) -> None:
+        with self._not_full:
+            self._unfinished -= 1
+            if self._unfinished or not self._drain_waiters:
+                return
+            waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            _wake(waiter)
+
+    def _publish_depth(self, depth: int, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._depth_published_at < _DEPTH_PUBLISH_INTERVAL:
+            return
+        self._depth_published_at = now
+        _metrics.set_gauge("events_queue_depth", float(depth), self._labels)
+
+    def _on_drop(self, overflow: OverflowPolicy) -> None:
+        _metrics.increment("events_dropped_total", {"event": self.event_name, "policy": overflow})
+
+
+class _Batcher:
+    """Буфер пачки одного подписчика (используется только в фоновом event loop)."""
+
+    def __init__(
+            self,
+            handler: _Subscription,
+            *,
+            size: int,
+            max_wait: float,
+            loop: asyncio.AbstractEventLoop,
+            call: Callable[[_Subscription, list[t.Any]], Coroutine[t.Any, t.Any, None]],
+    ) -> None:
+        self.handler = handler
+        self.size = size
+        self.max_wait = max_wait
+        self._loop = loop
+        self._call = call
+        self._items: list[t.Any] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushing: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending(self) -> bool:
+        """Есть ли недоставленные элементы или выполняющиеся доставки по таймеру."""
+        return bool(self._items or self._flushing)
+
+    async def add(self, item: t.Any) -> None:
+        """Добавляет элемент; при заполнении пачки доставляет её.
+
+        Args:
+            item: Полезная нагрузка события.
+        """
+        self._items.append(item)
+        if len(self._items) >= self.size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self.max_wait, self._on_timer)
+
+    async def flush(self) -> None:
+        """Доставляет накопленную пачку и дожидается доставок по таймеру."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._items = self._items, []
+        if batch:
+            await self._call(self.handler, batch)
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._items:
+            return
+        batch, self._items = self._items, []
+        task = self._loop.create_task(self._call(self.handler, batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
@@ -0,0 +1,204 @@
+"""
+Маршрутизация событий шины: подписки, таблицы диспетчеризации и шаблоны тем.
+
+Имя события делится точками на сегменты (`orders.eu.created`). Подписка на
+шаблон может содержать сегменты-подстановки:
+
+- `*` — ровно один сегмент (`orders.*` совпадает с `orders.created`);
+- `#` — ноль или больше сегментов (`orders.#` совпадает с `orders`,
+  `orders.created` и `orders.eu.created`).
+
+Шаблоны хранятся в префиксном дереве `_TopicTrie`, поэтому поиск подписок
+для темы зависит от её глубины, а не от числа шаблонов. Результат поиска
+сворачивается в неизменяемую `_DispatchPlan` и кэшируется шиной до
+следующего изменения подписок.
+"""
+
+import typing as t
+from collections.abc import Callable, Iterable
+
+WILDCARD_ONE = "*"
+"""Сегмент шаблона, совпадающий ровно с одним сегментом темы."""
+
+WILDCARD_MANY = "#"
+"""Сегмент шаблона, совпадающий с любым числом сегментов темы (включая ноль)."""
+
+_SEPARATOR = "."
+
+
+def is_pattern(event_name: str) -> bool:
+    """Проверяет, содержит ли имя подписки сегменты-подстановки.
+
+    Args:
+        event_name: Имя события или шаблон.
+
+    Returns:
+        True, если хотя бы один сегмент равен `*` или `#`.
+    """
+    if WILDCARD_ONE not in event_name and WILDCARD_MANY not in event_name:
+        return False
+    return any(part in (WILDCARD_ONE, WILDCARD_MANY) for part in event_name.split(_SEPARATOR))
+
+
+class _Subscription:
+    """Подписка обработчика на имя события или шаблон.
+
+    Признак асинхронности вычисляется один раз при подписке, а не при каждой
+    публикации. `seq` задаёт порядок вызова обработчиков из разных подписок.
+    """
+
+    __slots__ = ("batch_size", "event_name", "func", "is_async", "max_wait", "seq")
+
+    def __init__(
+            self,
+            event_name: str,
+            func: Callable[..., t.Any],
+            *,
+            is_async: bool,
+            seq: int,
+            batch_size: int | None = None,
+            max_wait: float = 0.1,
+    ) -> None:
+        self.event_name = event_name
+        self.func = func
+        self.is_async = is_async
+        self.seq = seq
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+
+    @property
+    def queued(self) -> bool:
+        """Доставляется ли подписка через очередь при синхронной публикации."""
+        return self.is_async or self.batch_size is not None
+
+
+class _DispatchPlan:
+    """Неизменяемая таблица обработчиков одной темы, разбитая по способу вызова."""
+
+    __slots__ = ("async_funcs", "batched", "queued", "subscriptions", "sync_funcs")
+
+    def __init__(self, subscriptions: tuple[_Subscription, ...]) -> None:
+        self.subscriptions = subscriptions
+        self.queued = tuple(sub for sub in subscriptions if sub.queued)
+        self.batched = tuple(sub for sub in subscriptions if sub.batch_size is not None)
+        self.async_funcs = tuple(
+            sub.func for sub in subscriptions if sub.is_async and sub.batch_size is None
+        )
+        self.sync_funcs = tuple(sub.func for sub in subscriptions if not sub.queued)
+
+    @classmethod
+    def build(cls, subscriptions: Iterable[_Subscription]) -> "_DispatchPlan":
+        """Собирает план: подписки в порядке регистрации, каждый обработчик — один раз.
+
+        Args:
+            subscriptions: Подписки, совпавшие с темой (в любом порядке).
+
+        Returns:
+            План диспетчеризации темы.
+        """
+        seen: set[Callable[..., t.Any]] = set()
+        ordered: list[_Subscription] = []
+        for sub in sorted(subscriptions, key=lambda item: item.seq):
+            if sub.func not in seen:
+                seen.add(sub.func)
+                ordered.append(sub)
+        return cls(tuple(ordered))
+
+    def __bool__(self) -> bool:
+        return bool(self.subscriptions)
+
+
+_EMPTY_PLAN = _DispatchPlan(())
+
+
+class _TrieNode:
+    """Узел префиксного дерева: дочерние сегменты и шаблон, заканчивающийся в узле."""
+
+    __slots__ = ("children", "pattern")
+
+    def __init__(self) -> None:
+        """Создает пустой узел."""
+        self.children: dict[str, _TrieNode] = {}
+        self.pattern: str | None = None
+
+
+class _TopicTrie:
+    """Префиксное дерево шаблонов тем по сегментам (не потокобезопасно)."""
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str) -> None:
+        """Добавляет шаблон (повторное добавление ничего не меняет).
+
+        Args:
+            pattern: Шаблон темы с сегментами `*` и `#`.
+        """
+        node = self._root
+        for part in pattern.split(_SEPARATOR):
+            node = node.children.setdefault(part, _TrieNode())
+        if node.pattern is None:
+            node.pattern = pattern
+            self._size += 1
+
+    def discard(self, pattern: str) -> None:
+        """Удаляет шаблон и опустевшие ветви дерева.
+
+        Args:
+            pattern: Ранее добавленный шаблон темы.
+        """
+        path = [self._root]
+        parts = pattern.split(_SEPARATOR)
+        for part in parts:
+            child = path[-1].children.get(part)
+            if child is None:
+                return
+            path.append(child)
+        if path[-1].pattern is None:
+            return
+        path[-1].pattern = None
+        self._size -= 1
+        for part, parent, node in zip(reversed(parts), reversed(path[:-1]), reversed(path[1:])):
+            if node.children or node.pattern is not None:
+                break
+            del parent.children[part]
+
+    def match(self, topic: str) -> list[str]:
+        """Возвращает шаблоны, совпадающие с темой.
+
+        Args:
+            topic: Имя публикуемого события.
+
+        Returns:
+            Список совпавших шаблонов без повторов.
+        """
+        parts = topic.split(_SEPARATOR)
+        end = len(parts)
+        found: list[str] = []
+        visited: set[tuple[int, int]] = set()
+        stack = [(self._root, 0)]
+        while stack:
+            node, index = stack.pop()
+            state = (id(node), index)
+            if state in visited:
+                continue
+            visited.add(state)
+            many = node.children.get(WILDCARD_MANY)
+            if many is not None:
+                # `#` поглощает любое число оставшихся сегментов, включая ноль
+                stack.extend((many, position) for position in range(index, end + 1))
+            if index == end:
+                if node.pattern is not None:
+                    found.append(node.pattern)
+                continue
+            exact = node.children.get(parts[index])
+            if exact is not None:
+                stack.append((exact, index + 1))
+            one = node.children.get(WILDCARD_ONE)
+            if one is not None:
+                stack.append((one, index + 1))
+        return found
@@ -20,6 +20,7 @@ from .di import (
 from .events import (
     EventBusError,
     EventBusExceptionGroup,
+    EventBusQueueFullError,
 )
 from .logger import LoggerConfigurationError
 from .resilience import (
@@ -67,6 +68,7 @@ __all__ = [
     "CacheError",
     "EventBusError",
     "EventBusExceptionGroup",
+    "EventBusQueueFullError",
     "RateLimitExceededError",
     "CircuitBreakerOpenError",
     "BulkheadLimitExceeded",
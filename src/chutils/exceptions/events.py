@@ -32,3 +32,9 @@ class EventBusExceptionGroup(_BaseExceptionGroup, EventBusError):
         base_str = EventBusError.__str__(self)
         errors_str = "\n".join(f"  - {type(e).__name__}: {e}" for e in self.exceptions)
         return f"{base_str}\nВозникшие ошибки:\n{errors_str}"
+
+
+class EventBusQueueFullError(EventBusError):
+    """Очередь фоновой доставки события заполнена (политика переполнения ``raise``)."""
+
+    pass
@@ -19,6 +19,11 @@ Standalone-функции:
     from chutils import http
     resp = http.get("https://httpbin.org/get")
 
+Общий пул соединений:
+---------------------
+    from chutils import http
+    http.configure_pool(max_connections=50, keepalive_expiry=30.0)
+
 Async-использование:
 --------------------
     from chutils.http import AsyncHttpClient
@@ -28,9 +33,20 @@ Async-использование:
 """
 from __future__ import annotations
 
-from .api import delete, get, patch, post, put
-from .client import AsyncHttpClient, HttpClient
+from .api import delete, download, get, patch, post, put
+from .client import (
+    AsyncHttpClient,
+    HttpClient,
+    aclose_pool,
+    close_pool,
+    configure_pool,
+    get_shared_async_client,
+    get_shared_client,
+)
+from .download import AsyncStreamingResponse, StreamingResponse
 from .fallback import HttpResponse, UrllibFallbackClient
+from .hedging import RetryBudget
+from .limiter import AdaptiveLimiter
 from .resilience import ResiliencePolicy
 from .streaming import (
     AsyncEventStreamClient,
@@ -45,7 +61,11 @@ __all__ = [
     "HttpClient",
     "AsyncHttpClient",
     "HttpResponse",
+    "StreamingResponse",
+    "AsyncStreamingResponse",
     "ResiliencePolicy",
+    "AdaptiveLimiter",
+    "RetryBudget",
     "UrllibFallbackClient",
     "inject_trace_headers",
     "create_http_span",
@@ -54,10 +74,17 @@ __all__ = [
     "AsyncWebSocketClient",
     "WebSocketClient",
     "ServerSentEvent",
+    # общий пул соединений
+    "configure_pool",
+    "close_pool",
+    "aclose_pool",
+    "get_shared_client",
+    "get_shared_async_client",
     # standalone API
     "get",
     "post",
     "put",
     "delete",
     "patch",
+    "download",
 ]
@@ -2,8 +2,9 @@
 Модуль chutils.http.api — Standalone HTTP API-функции.
 
 Предоставляет удобные функции верхнего уровня для выполнения HTTP-запросов
-без явного создания экземпляра клиента. Под капотом каждый вызов создаёт
-временный `HttpClient` и выполняет запрос.
+без явного создания экземпляра клиента. Под капотом каждый вызов выполняет
+запрос через общий пул соединений процесса (см. `configure_pool()`), так что
+повторные запросы к одному хосту переиспользуют открытые соединения.
 
 Использование:
 --------------
@@ -20,6 +21,8 @@
 """
 from __future__ import annotations
 
+from pathlib import Path
+
 from .client import HttpClient
 from .fallback import HttpResponse
 from .resilience import ResiliencePolicy
@@ -34,7 +37,7 @@ def get(
 ) -> HttpResponse:
     """Выполняет GET-запрос.
 
-    Создаёт временный `HttpClient`, выполняет запрос и возвращает ответ.
+    Запрос выполняется через общий пул соединений процесса.
 
     Args:
         url: Абсолютный URL запроса.
@@ -54,8 +57,7 @@ def get(
         data = resp.json()
         ```
     """
-    with HttpClient(policy=policy) as client:
-        return client.get(url, headers=headers, timeout=timeout)
+    return HttpClient(policy=policy).get(url, headers=headers, timeout=timeout)
 
 
 def post(
@@ -89,8 +91,7 @@ def post(
         resp.raise_for_status()
         ```
     """
-    with HttpClient(policy=policy) as client:
-        return client.post(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
+    return HttpClient(policy=policy).post(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
 
 
 def put(
@@ -115,8 +116,7 @@ def put(
     Returns:
         Объект HttpResponse.
     """
-    with HttpClient(policy=policy) as client:
-        return client.put(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
+    return HttpClient(policy=policy).put(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
 
 
 def delete(
@@ -137,8 +137,7 @@ def delete(
     Returns:
         Объект HttpResponse.
     """
-    with HttpClient(policy=policy) as client:
-        return client.delete(url, headers=headers, timeout=timeout)
+    return HttpClient(policy=policy).delete(url, headers=headers, timeout=timeout)
 
 
 def patch(
@@ -163,5 +162,34 @@ def patch(
     Returns:
         Объект HttpResponse.
     """
-    with HttpClient(policy=policy) as client:
-        return client.patch(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
+    return HttpClient(policy=policy).patch(url, headers=headers, json_data=json_data, data=data, timeout=timeout)
+
+
+def download(
+        url: str,
+        dest: str | Path,
+        *,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        resume: bool = False,
+        policy: ResiliencePolicy | None = None,
+) -> Path:
+    """Скачивает файл по URL, не загружая его в память.
+
+    Args:
+        url: Абсолютный URL файла.
+        dest: Путь к целевому файлу.
+        headers: Дополнительные HTTP-заголовки.
+        timeout: Таймаут запроса в секундах.
+        resume: Докачать файл с размера `<dest>.part` через `Range`-запрос.
+        policy: Политика отказоустойчивости.
+
+    Returns:
+        Путь к скачанному файлу.
+
+    Example:
+        ```python
+        http.download("https://example.com/dump.tar.gz", "data/dump.tar.gz", resume=True)
+        ```
+    """
+    return HttpClient(policy=policy).download(url, dest, headers=headers, timeout=timeout, resume=resume)
@@ -6,17 +6,41 @@
 - `AsyncHttpClient` — асинхронный HTTP-клиент на httpx (требует httpx).
 
 Оба клиента поддерживают:
-- Интеграцию с `ResiliencePolicy` (retry, timeout, semaphore, circuit breaker).
+- Интеграцию с `ResiliencePolicy` (retry, timeout, semaphore, circuit breaker;
+  hedged-запросы для идемпотентных методов).
 - Автоматическое маскирование чувствительных заголовков в логах.
 - Контекстные менеджеры (with / async with).
 - JSON-тело запроса и ответа.
+- Потоковое чтение тела (`stream()`) и загрузку файлов с докачкой (`download()`).
+
+Клиенты, используемые без контекстного менеджера, и standalone-функции
+`chutils.http.get()` и др. выполняют запросы через общий для процесса пул
+соединений (`get_shared_client()` / `get_shared_async_client()`), поэтому
+повторные запросы к тому же хосту не платят за TCP- и TLS-рукопожатие.
+Лимиты пула и HTTP/2 настраиваются через `configure_pool()`.
 """
 from __future__ import annotations
 
+import asyncio
 import importlib.util
+import os
+import threading
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from pathlib import Path
 from typing import Any, TYPE_CHECKING, Optional
 
+from .download import (
+    DEFAULT_CHUNK_SIZE,
+    AsyncStreamingResponse,
+    StreamingResponse,
+    adownload_stream,
+    download_stream,
+)
 from .fallback import HttpResponse, UrllibFallbackClient, _SENSITIVE_HEADERS
+from .hedging import IDEMPOTENT_METHODS
 
 if TYPE_CHECKING:
     from .resilience import ResiliencePolicy
@@ -98,6 +122,188 @@ def _mask_headers(headers: dict[str, str], extra: frozenset[str]) -> dict[str, s
     }
 
 
+# ─── Общий пул соединений ────────────────────────────────────────────────────
+
+_DEFAULT_POOL_OPTIONS: dict[str, Any] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 5.0,
+    "http2": False,
+}
+
+_pool_lock = threading.Lock()
+_pool_options: dict[str, Any] = dict(_DEFAULT_POOL_OPTIONS)
+_pool_pid: int = os.getpid()
+_shared_client: Any = None  # httpx.Client
+_shared_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+
+
+def configure_pool(
+        *,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+) -> None:
+    """Настраивает общий пул соединений процесса.
+
+    Уже созданный синхронный клиент пула закрывается, а асинхронные
+    отбрасываются: следующие запросы откроют пул с новыми параметрами.
+
+    Args:
+        max_connections: Максимальное число одновременных соединений (None — без лимита).
+        max_keepalive_connections: Сколько простаивающих соединений держать открытыми.
+        keepalive_expiry: Через сколько секунд простоя закрывать соединение.
+        http2: Включить HTTP/2 (требует пакет `h2`).
+
+    Raises:
+        ValueError: Если лимиты отрицательны.
+        OptionalDependencyError: Если запрошен HTTP/2, а пакет `h2` не установлен.
+    """
+    for name, value in (
+            ("max_connections", max_connections),
+            ("max_keepalive_connections", max_keepalive_connections),
+            ("keepalive_expiry", keepalive_expiry),
+    ):
+        if value is not None and value < 0:
+            raise ValueError(f"{name} не может быть отрицательным, получено: {value}")
+    if http2 and importlib.util.find_spec("h2") is None:
+        from chutils.exceptions import OptionalDependencyError
+        raise OptionalDependencyError(
+            "HTTP/2 требует пакет h2.",
+            dependency="h2",
+            hint="Установите его: pip install httpx[http2]",
+        )
+    close_pool()
+    with _pool_lock:
+        _pool_options.update(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+        )
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    """Собирает аргументы конструктора httpx-клиента для общего пула.
+
+    Returns:
+        Словарь аргументов `httpx.Client` / `httpx.AsyncClient`.
+    """
+    assert httpx is not None  # noqa: S101
+    return {
+        "limits": httpx.Limits(
+            max_connections=_pool_options["max_connections"],
+            max_keepalive_connections=_pool_options["max_keepalive_connections"],
+            keepalive_expiry=_pool_options["keepalive_expiry"],
+        ),
+        "http2": _pool_options["http2"],
+        # Общий клиент обслуживает несвязанные запросы всего процесса,
+        # поэтому cookie одного ответа не должны уходить в чужие запросы
+        "cookies": CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+    }
+
+
+def _forget_shared_clients() -> None:
+    """Отбрасывает клиенты пула без закрытия (после fork сокеты принадлежат родителю)."""
+    global _pool_lock, _pool_pid, _shared_client
+    _pool_lock = threading.Lock()
+    _pool_pid = os.getpid()
+    _shared_client = None
+    _shared_async_clients.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_shared_clients)
+
+
+def get_shared_client() -> Any:
+    """Возвращает общий для процесса `httpx.Client`.
+
+    Клиент создаётся при первом обращении и пересоздаётся в дочернем
+    процессе после fork. Экземпляр потокобезопасен.
+
+    Returns:
+        Экземпляр httpx.Client.
+
+    Raises:
+        OptionalDependencyError: Если httpx не установлен.
+    """
+    global _shared_client
+    if not HTTPX_AVAILABLE or httpx is None:
+        from chutils.exceptions import OptionalDependencyError
+        raise OptionalDependencyError(
+            "Общий пул соединений требует httpx.",
+            dependency="httpx",
+            hint="Установите его: pip install chutils[http]",
+        )
+    if _pool_pid != os.getpid():
+        _forget_shared_clients()
+    client = _shared_client
+    if client is None:
+        with _pool_lock:
+            client = _shared_client
+            if client is None:
+                client = _shared_client = httpx.Client(**_pool_kwargs())
+    return client
+
+
+def get_shared_async_client() -> Any:
+    """Возвращает общий `httpx.AsyncClient` для текущего event loop.
+
+    Соединения asyncio привязаны к циклу, в котором открыты, поэтому у каждого
+    цикла свой клиент; он отбрасывается вместе с циклом.
+
+    Returns:
+        Экземпляр httpx.AsyncClient.
+
+    Raises:
+        OptionalDependencyError: Если httpx не установлен.
+        RuntimeError: Если вызвана вне запущенного event loop.
+    """
+    if not HTTPX_AVAILABLE or httpx is None:
+        from chutils.exceptions import OptionalDependencyError
+        raise OptionalDependencyError(
+            "Общий пул соединений требует httpx.",
+            dependency="httpx",
+            hint="Установите его: pip install chutils[http]",
+        )
+    if _pool_pid != os.getpid():
+        _forget_shared_clients()
+    loop = asyncio.get_running_loop()
+    client = _shared_async_clients.get(loop)
+    if client is None:
+        client = _shared_async_clients[loop] = httpx.AsyncClient(**_pool_kwargs())
+    return client
+
+
+def close_pool() -> None:
+    """Закрывает синхронный клиент пула и отбрасывает асинхронные.
+
+    Асинхронные клиенты нельзя закрыть вне их event loop — для этого
+    служит `aclose_pool()`.
+    """
+    global _shared_client
+    with _pool_lock:
+        client, _shared_client = _shared_client, None
+        _shared_async_clients.clear()
+    if client is not None:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+async def aclose_pool() -> None:
+    """Закрывает асинхронный клиент пула текущего event loop."""
+    client = _shared_async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception:  # noqa: BLE001
+            pass
+
+
 # ─── HttpClient ───────────────────────────────────────────────────────────────
 
 
@@ -114,6 +320,8 @@ class HttpClient:
         timeout: Таймаут запросов по умолчанию в секундах.
         policy: Политика отказоустойчивости (retry, semaphore и т.д.).
         sensitive_headers: Дополнительные заголовки для маскирования в логах.
+        pooled: Вне контекстного менеджера выполнять запросы через общий пул
+            соединений процесса. При False каждый запрос открывает своё соединение.
 
     Example:
         ```python
@@ -135,6 +343,7 @@ class HttpClient:
             timeout: float | None = 30.0,
             policy: ResiliencePolicy | None = None,
             sensitive_headers: set[str] | None = None,
+            pooled: bool = True,
     ) -> None:
         """Инициализирует HttpClient.
 
@@ -144,6 +353,7 @@ class HttpClient:
             timeout: Таймаут в секундах.
             policy: Политика отказоустойчивости.
             sensitive_headers: Имена заголовков для маскирования в логах.
+            pooled: Использовать общий пул соединений вне контекстного менеджера.
         """
         self.base_url = base_url.rstrip("/")
         self.default_headers: dict[str, str] = default_headers or {}
@@ -152,6 +362,7 @@ class HttpClient:
         self._extra_sensitive: frozenset[str] = frozenset(
             h.lower() for h in (sensitive_headers or set())
         )
+        self.pooled = pooled
         self._fallback: UrllibFallbackClient | None = None
         self._httpx_client: Any = None  # httpx.Client instance
 
@@ -240,8 +451,11 @@ class HttpClient:
 
         def _call() -> HttpResponse:
             assert httpx is not None  # noqa: S101
-            if self._httpx_client is not None:
-                raw = self._httpx_client.request(
+            client = self._httpx_client
+            if client is None and self.pooled:
+                client = get_shared_client()
+            if client is not None:
+                raw = client.request(
                     method.upper(),
                     url,
                     headers=merged_headers,
@@ -261,7 +475,7 @@ class HttpClient:
             return _httpx_to_response(raw)
 
         if self.policy is not None:
-            resp = self.policy.apply_sync(_call)
+            resp = self.policy.apply_sync(_call, hedge=method.upper() in IDEMPOTENT_METHODS)
         else:
             resp = _call()
 
@@ -276,6 +490,136 @@ class HttpClient:
         )
         return resp
 
+    @contextmanager
+    def stream(
+            self,
+            method: str,
+            path: str,
+            *,
+            headers: dict[str, str] | None = None,
+            json_data: object | None = None,
+            data: bytes | str | None = None,
+            timeout: float | None = None,
+    ) -> Iterator[StreamingResponse]:
+        """Выполняет HTTP-запрос, не загружая тело ответа в память.
+
+        Политика отказоустойчивости применяется к открытию соединения и
+        получению заголовков; чтение тела выполняется вызывающим кодом.
+
+        Args:
+            method: HTTP-метод.
+            path: Путь или абсолютный URL.
+            headers: Дополнительные заголовки.
+            json_data: Данные для JSON-тела запроса.
+            data: Сырое тело запроса.
+            timeout: Таймаут для этого конкретного запроса.
+
+        Yields:
+            Потоковый ответ; соединение возвращается в пул при выходе из блока.
+
+        Example:
+            ```python
+            with client.stream("GET", "/export.csv") as resp:
+                resp.raise_for_status()
+                for chunk in resp.iter_bytes(64 * 1024):
+                    sink.write(chunk)
+            ```
+        """
+        if not HTTPX_AVAILABLE or httpx is None:
+            self._emit_fallback_warning()
+            with self._get_fallback_client().stream(
+                    method, path,
+                    headers=headers,
+                    json_data=json_data,
+                    data=data,
+                    timeout=timeout,
+            ) as fallback_resp:
+                yield fallback_resp
+            return
+
+        url = self._build_url(path)
+        effective_timeout = timeout if timeout is not None else self.timeout
+        merged_headers = {**self.default_headers, **(headers or {})}
+
+        _get_log().debug(
+            "→ stream %s %s  headers=%s",
+            method.upper(),
+            url,
+            _mask_headers(merged_headers, self._extra_sensitive),
+        )
+
+        client = self._httpx_client
+        if client is None and self.pooled:
+            client = get_shared_client()
+        owned = client is None
+        if owned:
+            client = httpx.Client(timeout=effective_timeout)
+
+        def _open() -> Any:
+            request = client.build_request(
+                method.upper(),
+                url,
+                headers=merged_headers,
+                json=json_data,
+                content=data if isinstance(data, bytes) else (data.encode() if data else None),
+                timeout=effective_timeout,
+            )
+            return client.send(request, stream=True)
+
+        try:
+            raw = self.policy.apply_sync(_open) if self.policy is not None else _open()
+            raw_any: Any = raw
+            try:
+                yield StreamingResponse(
+                    status_code=raw_any.status_code,
+                    headers=raw_any.headers,
+                    url=str(raw_any.url),
+                    chunks=raw_any.iter_bytes,
+                )
+            finally:
+                raw_any.close()
+        finally:
+            if owned:
+                client.close()
+
+    def download(
+            self,
+            path: str,
+            dest: str | Path,
+            *,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+            resume: bool = False,
+            chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+    ) -> Path:
+        """Скачивает ответ GET-запроса в файл, не загружая его в память.
+
+        Без `resume` файл пишется атомарно через временный файл. С `resume`
+        данные накапливаются в `<dest>.part`, который переживает обрыв,
+        а повторный вызов запрашивает только недостающий диапазон.
+
+        Args:
+            path: Путь или абсолютный URL.
+            dest: Путь к целевому файлу.
+            headers: Дополнительные заголовки.
+            timeout: Таймаут запроса.
+            resume: Докачать файл с размера `<dest>.part` через `Range`-запрос.
+            chunk_size: Размер чанка в байтах.
+
+        Returns:
+            Путь к скачанному файлу.
+
+        Raises:
+            HttpClientError: При статусе 4xx/5xx.
+        """
+        return download_stream(
+            lambda h: self.stream("GET", path, headers=h, timeout=timeout),
+            dest,
+            headers=headers,
+            resume=resume,
+            chunk_size=chunk_size,
+        )
+
     def get(self, path: str, *, headers: dict[str, str] | None = None, timeout: float | None = None) -> HttpResponse:
         """Выполняет GET-запрос.
 
@@ -416,6 +760,8 @@ class AsyncHttpClient:
         timeout: Таймаут запросов в секундах.
         policy: Политика отказоустойчивости.
         sensitive_headers: Дополнительные заголовки для маскирования.
+        pooled: Вне контекстного менеджера выполнять запросы через общий пул
+            соединений текущего event loop.
 
     Example:
         ```python
@@ -436,6 +782,7 @@ class AsyncHttpClient:
             timeout: float | None = 30.0,
             policy: ResiliencePolicy | None = None,
             sensitive_headers: set[str] | None = None,
+            pooled: bool = True,
     ) -> None:
         """Инициализирует AsyncHttpClient.
 
@@ -445,6 +792,7 @@ class AsyncHttpClient:
             timeout: Таймаут в секундах.
             policy: Политика отказоустойчивости.
             sensitive_headers: Имена заголовков для маскирования.
+            pooled: Использовать общий пул соединений вне контекстного менеджера.
 
         Raises:
             OptionalDependencyError: Если httpx не установлен.
@@ -464,6 +812,7 @@ class AsyncHttpClient:
         self._extra_sensitive: frozenset[str] = frozenset(
             h.lower() for h in (sensitive_headers or set())
         )
+        self.pooled = pooled
         self._async_client: Any = None  # httpx.AsyncClient
 
     def _build_url(self, path: str) -> str:
@@ -517,8 +866,11 @@ class AsyncHttpClient:
 
         async def _call() -> HttpResponse:
             assert httpx is not None  # noqa: S101
-            if self._async_client is not None:
-                raw = await self._async_client.request(
+            client = self._async_client
+            if client is None and self.pooled:
+                client = get_shared_async_client()
+            if client is not None:
+                raw = await client.request(
                     method.upper(),
                     url,
                     headers=merged_headers,
@@ -538,7 +890,7 @@ class AsyncHttpClient:
             return _httpx_to_response(raw)
 
         if self.policy is not None:
-            resp = await self.policy.apply_async(_call)
+            resp = await self.policy.apply_async(_call, hedge=method.upper() in IDEMPOTENT_METHODS)
         else:
             resp = await _call()
 
@@ -553,6 +905,111 @@ class AsyncHttpClient:
         )
         return resp
 
+    @asynccontextmanager
+    async def stream(
+            self,
+            method: str,
+            path: str,
+            *,
+            headers: dict[str, str] | None = None,
+            json_data: object | None = None,
+            data: bytes | str | None = None,
+            timeout: float | None = None,
+    ) -> AsyncIterator[AsyncStreamingResponse]:
+        """Выполняет асинхронный HTTP-запрос, не загружая тело ответа в память.
+
+        Args:
+            method: HTTP-метод.
+            path: Путь или абсолютный URL.
+            headers: Дополнительные заголовки.
+            json_data: Данные для JSON-тела.
+            data: Сырое тело запроса.
+            timeout: Таймаут для этого конкретного запроса.
+
+        Yields:
+            Потоковый ответ; соединение возвращается в пул при выходе из блока.
+        """
+        assert httpx is not None  # noqa: S101
+
+        url = self._build_url(path)
+        effective_timeout = timeout if timeout is not None else self.timeout
+        merged_headers = {**self.default_headers, **(headers or {})}
+
+        _get_log().debug(
+            "→ async stream %s %s  headers=%s",
+            method.upper(),
+            url,
+            _mask_headers(merged_headers, self._extra_sensitive),
+        )
+
+        client = self._async_client
+        if client is None and self.pooled:
+            client = get_shared_async_client()
+        owned = client is None
+        if owned:
+            client = httpx.AsyncClient(timeout=effective_timeout)
+
+        async def _open() -> Any:
+            request = client.build_request(
+                method.upper(),
+                url,
+                headers=merged_headers,
+                json=json_data,
+                content=data if isinstance(data, bytes) else (data.encode() if data else None),
+                timeout=effective_timeout,
+            )
+            return await client.send(request, stream=True)
+
+        try:
+            raw = await self.policy.apply_async(_open) if self.policy is not None else await _open()
+            raw_any: Any = raw
+            try:
+                yield AsyncStreamingResponse(
+                    status_code=raw_any.status_code,
+                    headers=raw_any.headers,
+                    url=str(raw_any.url),
+                    chunks=raw_any.aiter_bytes,
+                )
+            finally:
+                await raw_any.aclose()
+        finally:
+            if owned:
+                await client.aclose()
+
+    async def download(
+            self,
+            path: str,
+            dest: str | Path,
+            *,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+            resume: bool = False,
+            chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+    ) -> Path:
+        """Асинхронно скачивает ответ GET-запроса в файл.
+
+        Args:
+            path: Путь или абсолютный URL.
+            dest: Путь к целевому файлу.
+            headers: Дополнительные заголовки.
+            timeout: Таймаут запроса.
+            resume: Докачать файл с размера `<dest>.part` через `Range`-запрос.
+            chunk_size: Размер чанка в байтах.
+
+        Returns:
+            Путь к скачанному файлу.
+
+        Raises:
+            HttpClientError: При статусе 4xx/5xx.
+        """
+        return await adownload_stream(
+            lambda h: self.stream("GET", path, headers=h, timeout=timeout),
+            dest,
+            headers=headers,
+            resume=resume,
+            chunk_size=chunk_size,
+        )
+
     async def get(self, path: str, *, headers: dict[str, str] | None = None,
                   timeout: float | None = None) -> HttpResponse:
         """Выполняет async GET-запрос.
@@ -0,0 +1,409 @@
+"""
+Потоковые ответы и загрузка файлов chutils.http.
+
+Предоставляет:
+- `StreamingResponse` / `AsyncStreamingResponse` — ответ, тело которого читается
+  по частям, не загружаясь целиком в память.
+- `download_stream()` / `adownload_stream()` — запись тела ответа в файл через
+  временный файл с докачкой по `Range`-запросам.
+
+Клиенты (`HttpClient`, `AsyncHttpClient`, `UrllibFallbackClient`) открывают
+потоковые ответы методом `stream()` и скачивают файлы методом `download()`.
+"""
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    contextmanager,
+)
+from pathlib import Path
+from typing import BinaryIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""Размер чанка по умолчанию при записи тела в файл."""
+
+_PART_SUFFIX = ".part"
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)")
+
+
+def _raise_for_status(status_code: int, url: str) -> None:
+    """Вызывает HttpClientError для статус-кодов 4xx / 5xx.
+
+    Args:
+        status_code: HTTP-статус-код.
+        url: URL запроса.
+
+    Raises:
+        HttpClientError: Если статус-код >= 400.
+    """
+    from chutils.exceptions import HttpClientError
+
+    if status_code >= 400:
+        raise HttpClientError(
+            f"HTTP {status_code} для URL: {url}",
+            status_code=status_code,
+            url=url,
+        )
+
+
+# ─── Потоковые ответы ─────────────────────────────────────────────────────────
+
+
+class StreamingResponse:
+    """Ответ HTTP-запроса с потоковым чтением тела.
+
+    Тело не загружается в память: его можно прочитать один раз через
+    `iter_bytes()` или записать в файл через `download_to()`. Заголовки
+    передаются от транспорта без копирования.
+
+    Attributes:
+        status_code: HTTP-статус-код ответа.
+        headers: Заголовки ответа.
+        url: Итоговый URL (с учётом редиректов).
+    """
+
+    def __init__(
+            self,
+            status_code: int,
+            headers: Mapping[str, str],
+            url: str,
+            chunks: Callable[[int | None], Iterator[bytes]],
+    ) -> None:
+        """Инициализирует потоковый ответ.
+
+        Args:
+            status_code: HTTP-статус-код.
+            headers: Заголовки ответа.
+            url: Итоговый URL.
+            chunks: Функция, возвращающая итератор чанков тела заданного размера.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self._chunks = chunks
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        """Итерирует тело ответа по частям.
+
+        Args:
+            chunk_size: Размер чанка в байтах. None — чанки в том виде, в каком их отдаёт транспорт.
+
+        Returns:
+            Итератор байтовых чанков.
+        """
+        return self._chunks(chunk_size)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Итерирует тело ответа чанками транспорта.
+
+        Returns:
+            Итератор байтовых чанков.
+        """
+        return self.iter_bytes()
+
+    def read(self) -> bytes:
+        """Читает оставшееся тело целиком.
+
+        Returns:
+            Тело ответа в байтах.
+        """
+        return b"".join(self.iter_bytes())
+
+    def raise_for_status(self) -> None:
+        """Вызывает исключение, если статус-код указывает на ошибку (4xx / 5xx).
+
+        Raises:
+            HttpClientError: Если статус-код >= 400.
+        """
+        _raise_for_status(self.status_code, self.url)
+
+    def download_to(self, path: str | Path, *, chunk_size: int | None = DEFAULT_CHUNK_SIZE) -> Path:
+        """Атомарно записывает тело ответа в файл.
+
+        Чанки пишутся во временный файл в той же директории, который после
+        успешного чтения заменяет целевой (`os.replace`).
+
+        Args:
+            path: Путь к целевому файлу.
+            chunk_size: Размер чанка в байтах.
+
+        Returns:
+            Путь к записанному файлу.
+
+        Raises:
+            HttpClientError: Если статус-код >= 400.
+            OSError: При ошибках ввода-вывода.
+        """
+        self.raise_for_status()
+        target = Path(path)
+        with _atomic_target(target) as f:
+            f.writelines(self.iter_bytes(chunk_size))
+        return target
+
+
+class AsyncStreamingResponse:
+    """Асинхронный ответ HTTP-запроса с потоковым чтением тела.
+
+    Attributes:
+        status_code: HTTP-статус-код ответа.
+        headers: Заголовки ответа.
+        url: Итоговый URL (с учётом редиректов).
+    """
+
+    def __init__(
+            self,
+            status_code: int,
+            headers: Mapping[str, str],
+            url: str,
+            chunks: Callable[[int | None], AsyncIterator[bytes]],
+    ) -> None:
+        """Инициализирует потоковый ответ.
+
+        Args:
+            status_code: HTTP-статус-код.
+            headers: Заголовки ответа.
+            url: Итоговый URL.
+            chunks: Функция, возвращающая async-итератор чанков тела заданного размера.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.url = url
+        self._chunks = chunks
+
+    def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """Асинхронно итерирует тело ответа по частям.
+
+        Args:
+            chunk_size: Размер чанка в байтах. None — чанки в том виде, в каком их отдаёт транспорт.
+
+        Returns:
+            Async-итератор байтовых чанков.
+        """
+        return self._chunks(chunk_size)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        """Асинхронно итерирует тело ответа чанками транспорта.
+
+        Returns:
+            Async-итератор байтовых чанков.
+        """
+        return self.aiter_bytes()
+
+    async def aread(self) -> bytes:
+        """Читает оставшееся тело целиком.
+
+        Returns:
+            Тело ответа в байтах.
+        """
+        return b"".join([chunk async for chunk in self.aiter_bytes()])
+
+    def raise_for_status(self) -> None:
+        """Вызывает исключение, если статус-код указывает на ошибку (4xx / 5xx).
+
+        Raises:
+            HttpClientError: Если статус-код >= 400.
+        """
+        _raise_for_status(self.status_code, self.url)
+
+    async def download_to(self, path: str | Path, *, chunk_size: int | None = DEFAULT_CHUNK_SIZE) -> Path:
+        """Атомарно записывает тело ответа в файл.
+
+        Args:
+            path: Путь к целевому файлу.
+            chunk_size: Размер чанка в байтах.
+
+        Returns:
+            Путь к записанному файлу.
+
+        Raises:
+            HttpClientError: Если статус-код >= 400.
+            OSError: При ошибках ввода-вывода.
+        """
+        self.raise_for_status()
+        target = Path(path)
+        with _atomic_target(target) as f:
+            # Запись чанка в page cache быстрее, чем передача его в поток executor'а
+            async for chunk in self.aiter_bytes(chunk_size):
+                f.write(chunk)
+        return target
+
+
+@contextmanager
+def _atomic_target(target: Path) -> Iterator[BinaryIO]:
+    """Открывает временный файл рядом с целевым и заменяет им целевой при успехе.
+
+    Args:
+        target: Путь к целевому файлу.
+
+    Yields:
+        Бинарный файл для записи.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)  # chutils: ignore[ChutilsIntegrationRule]
+    fd, temp_path_str = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp")
+    temp_path = Path(temp_path_str)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(temp_path, target)  # chutils: ignore[ChutilsIntegrationRule]
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+# ─── Загрузка с докачкой ──────────────────────────────────────────────────────
+
+
+def _download_headers(headers: Mapping[str, str] | None, offset: int, resume: bool) -> dict[str, str]:
+    """Формирует заголовки запроса загрузки.
+
+    Args:
+        headers: Пользовательские заголовки.
+        offset: Размер уже скачанной части.
+        resume: Включена ли докачка.
+
+    Returns:
+        Заголовки запроса.
+    """
+    merged = dict(headers or {})
+    if resume:
+        # Смещения Range считаются по закодированному телу, поэтому сжатие отключается
+        merged.setdefault("Accept-Encoding", "identity")
+    if offset:
+        merged["Range"] = f"bytes={offset}-"
+    return merged
+
+
+def _open_mode(status_code: int, headers: Mapping[str, str], url: str, offset: int) -> str | None:
+    """Определяет, как записывать тело ответа в частичный файл.
+
+    Args:
+        status_code: HTTP-статус-код ответа.
+        headers: Заголовки ответа.
+        url: URL запроса.
+        offset: Размер уже скачанной части.
+
+    Returns:
+        "ab" — дописать диапазон, "wb" — писать с начала, None — файл уже скачан целиком.
+
+    Raises:
+        HttpClientError: При ошибочном статусе или диапазоне не с той позиции.
+    """
+    from chutils.exceptions import HttpClientError
+
+    if not offset:
+        _raise_for_status(status_code, url)
+        return "wb"
+    match = _CONTENT_RANGE_RE.fullmatch(headers.get("Content-Range", "").strip())
+    if status_code == 416 and match is not None and match.group(2) == str(offset):
+        return None
+    if status_code == 206:
+        if match is None or match.group(1) is None or int(match.group(1)) != offset:
+            raise HttpClientError(
+                f"Сервер вернул диапазон не с позиции {offset}: {headers.get('Content-Range')!r}",
+                status_code=status_code,
+                url=url,
+            )
+        return "ab"
+    _raise_for_status(status_code, url)
+    # Сервер не поддерживает Range — скачиваем заново
+    return "wb"
+
+
+def _prepare(dest: str | Path, resume: bool) -> tuple[Path, Path, int]:
+    """Вычисляет пути и смещение для загрузки.
+
+    Args:
+        dest: Путь к целевому файлу.
+        resume: Включена ли докачка.
+
+    Returns:
+        Кортеж (целевой файл, частичный файл, размер скачанной части).
+    """
+    target = Path(dest)
+    part = target.with_name(target.name + _PART_SUFFIX)
+    offset = part.stat().st_size if resume and part.exists() else 0
+    return target, part, offset
+
+
+def download_stream(
+        open_stream: Callable[[dict[str, str]], AbstractContextManager[StreamingResponse]],
+        dest: str | Path,
+        *,
+        headers: Mapping[str, str] | None = None,
+        resume: bool = False,
+        chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+) -> Path:
+    """Скачивает тело потокового ответа в файл.
+
+    Без докачки тело пишется атомарно через временный файл. С докачкой
+    данные накапливаются в `<dest>.part`, который сохраняется при обрыве;
+    следующий вызов запрашивает только недостающий диапазон (`Range`).
+
+    Args:
+        open_stream: Функция, открывающая потоковый ответ с заданными заголовками.
+        dest: Путь к целевому файлу.
+        headers: Дополнительные заголовки запроса.
+        resume: Продолжить загрузку с размера `<dest>.part`.
+        chunk_size: Размер чанка в байтах.
+
+    Returns:
+        Путь к скачанному файлу.
+
+    Raises:
+        HttpClientError: При ошибочном статусе ответа.
+        OSError: При ошибках ввода-вывода.
+    """
+    target, part, offset = _prepare(dest, resume)
+    with open_stream(_download_headers(headers, offset, resume)) as resp:
+        if not resume:
+            return resp.download_to(target, chunk_size=chunk_size)
+        mode = _open_mode(resp.status_code, resp.headers, resp.url, offset)
+        if mode is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)  # chutils: ignore[ChutilsIntegrationRule]
+            with open(part, mode) as f:
+                f.writelines(resp.iter_bytes(chunk_size))
+    os.replace(part, target)  # chutils: ignore[ChutilsIntegrationRule]
+    return target
+
+
+async def adownload_stream(
+        open_stream: Callable[[dict[str, str]], AbstractAsyncContextManager[AsyncStreamingResponse]],
+        dest: str | Path,
+        *,
+        headers: Mapping[str, str] | None = None,
+        resume: bool = False,
+        chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+) -> Path:
+    """Асинхронно скачивает тело потокового ответа в файл.
+
+    Args:
+        open_stream: Функция, открывающая потоковый ответ с заданными заголовками.
+        dest: Путь к целевому файлу.
+        headers: Дополнительные заголовки запроса.
+        resume: Продолжить загрузку с размера `<dest>.part`.
+        chunk_size: Размер чанка в байтах.
+
+    Returns:
+        Путь к скачанному файлу.
+
+    Raises:
+        HttpClientError: При ошибочном статусе ответа.
+        OSError: При ошибках ввода-вывода.
+    """
+    target, part, offset = _prepare(dest, resume)
+    async with open_stream(_download_headers(headers, offset, resume)) as resp:
+        if not resume:
+            return await resp.download_to(target, chunk_size=chunk_size)
+        mode = _open_mode(resp.status_code, resp.headers, resp.url, offset)
+        if mode is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)  # chutils: ignore[ChutilsIntegrationRule]
+            with open(part, mode) as f:  # noqa: ASYNC230
+                async for chunk in resp.aiter_bytes(chunk_size):
+                    f.write(chunk)
+    os.replace(part, target)  # chutils: ignore[ChutilsIntegrationRule]
+    return target
@@ -8,16 +8,23 @@ Fallback HTTP-клиент на базе стандартной библиоте
 - Передачу тела запроса (JSON / bytes / str)
 - Базовую обработку ошибок (HTTP-статус-коды)
 - Интеграцию с ResiliencePolicy
+- Потоковое чтение тела и загрузку файлов (`stream()`, `download()`)
 """
 from __future__ import annotations
 
+import functools
 import json
 import time
 import urllib.error
 import urllib.request
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from .download import DEFAULT_CHUNK_SIZE, StreamingResponse, download_stream
+from .hedging import IDEMPOTENT_METHODS
 
 if TYPE_CHECKING:
     from .resilience import ResiliencePolicy
@@ -329,7 +336,7 @@ class UrllibFallbackClient:
             )
 
         if self.policy is not None:
-            resp = self.policy.apply_sync(_call)
+            resp = self.policy.apply_sync(_call, hedge=method.upper() in IDEMPOTENT_METHODS)
         else:
             resp = _call()
 
@@ -344,6 +351,120 @@ class UrllibFallbackClient:
         )
         return resp
 
+    @contextmanager
+    def stream(
+            self,
+            method: str,
+            path: str,
+            *,
+            headers: dict[str, str] | None = None,
+            json_data: object | None = None,
+            data: bytes | str | None = None,
+            timeout: float | None = None,
+    ) -> Iterator[StreamingResponse]:
+        """Выполняет HTTP-запрос, не загружая тело ответа в память.
+
+        Политика отказоустойчивости применяется к открытию соединения и
+        получению заголовков; чтение тела выполняется вызывающим кодом.
+
+        Args:
+            method: HTTP-метод.
+            path: Путь или абсолютный URL.
+            headers: Дополнительные заголовки.
+            json_data: Данные для JSON-тела запроса.
+            data: Сырое тело запроса.
+            timeout: Таймаут для этого конкретного запроса.
+
+        Yields:
+            Потоковый ответ; соединение закрывается при выходе из блока.
+
+        Raises:
+            HttpClientError: При сетевой ошибке.
+            ValueError: Если переданы одновременно json_data и data.
+        """
+        from chutils.exceptions import HttpClientError
+
+        if json_data is not None and data is not None:
+            raise ValueError("Нельзя передавать json_data и data одновременно.")
+
+        url = self._build_url(path)
+        effective_timeout = timeout if timeout is not None else self.timeout
+        merged_headers: dict[str, str] = {**self.default_headers, **(headers or {})}
+        body: bytes | None = None
+        if json_data is not None:
+            body = json.dumps(json_data).encode("utf-8")
+            merged_headers.setdefault("Content-Type", "application/json")
+        elif data is not None:
+            body = data.encode("utf-8") if isinstance(data, str) else data
+
+        _get_log().debug("→ stream %s %s  headers=%s", method.upper(), url, self._mask(merged_headers))
+
+        def _open() -> Any:
+            req = urllib.request.Request(url, data=body, headers=merged_headers, method=method.upper())
+            try:
+                return urllib.request.urlopen(req, timeout=effective_timeout)  # noqa: S310
+            except urllib.error.HTTPError as e:
+                # HTTPError сам является ответом: у него есть код, заголовки и тело
+                return e
+            except urllib.error.URLError as e:
+                raise HttpClientError(
+                    f"Сетевая ошибка при запросе {method} {url}: {e.reason}",
+                    url=url,
+                    method=method,
+                ) from e
+
+        raw = self.policy.apply_sync(_open) if self.policy is not None else _open()
+        raw_any: Any = raw
+
+        def _chunks(chunk_size: int | None) -> Iterator[bytes]:
+            if getattr(raw_any, "fp", True) is None:
+                return iter(())
+            return iter(functools.partial(raw_any.read, chunk_size or DEFAULT_CHUNK_SIZE), b"")
+
+        try:
+            yield StreamingResponse(
+                status_code=raw_any.getcode(),
+                headers=dict(raw_any.headers.items()) if raw_any.headers else {},
+                url=raw_any.geturl() or url,
+                chunks=_chunks,
+            )
+        finally:
+            raw_any.close()
+
+    def download(
+            self,
+            path: str,
+            dest: str | Path,
+            *,
+            headers: dict[str, str] | None = None,
+            timeout: float | None = None,
+            resume: bool = False,
+            chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+    ) -> Path:
+        """Скачивает ответ GET-запроса в файл, не загружая его в память.
+
+        Args:
+            path: Путь или абсолютный URL.
+            dest: Путь к целевому файлу.
+            headers: Дополнительные заголовки.
+            timeout: Таймаут запроса.
+            resume: Докачать файл с размера `<dest>.part` через `Range`-запрос.
+            chunk_size: Размер чанка в байтах.
+
+        Returns:
+            Путь к скачанному файлу.
+
+        Raises:
+            HttpClientError: При сетевой ошибке или статусе 4xx/5xx.
+        """
+        return download_stream(
+            lambda h: self.stream("GET", path, headers=h, timeout=timeout),
+            dest,
+            headers=headers,
+            resume=resume,
+            chunk_size=chunk_size,
+        )
+
     def get(self, path: str, *, headers: dict[str, str] | None = None, timeout: float | None = None) -> HttpResponse:
         """Выполняет GET-запрос.
 
@@ -0,0 +1,305 @@
+"""
+Модуль chutils.http.hedging — hedged-запросы и бюджет повторов.
+
+Предоставляет:
+
+- `RetryBudget` — token bucket, ограничивающий повторы и hedged-копии долей
+  от общего трафика: каждый запрос пополняет бюджет на `ratio` токена,
+  каждый повтор расходует один токен. Во время сбоя upstream повторы
+  не умножают нагрузку на него.
+- `hedge_sync` / `hedge_async` — выполнение вызова с дублированием: если
+  первый вызов не завершился за `delay` секунд, запускается копия, и
+  используется первый успешный результат.
+
+Счётчики публикуются через `chutils.metrics`:
+`http_hedged_requests_total{policy}`, `http_hedge_wins_total{policy}` и
+`http_retry_budget_rejections_total{budget}`.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from . import _metrics
+
+T = TypeVar("T")
+
+IDEMPOTENT_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+"""Идемпотентные HTTP-методы (RFC 9110), для которых допустимы hedged-запросы."""
+
+
+# ─── RetryBudget ──────────────────────────────────────────────────────────────
+
+
+class RetryBudget:
+    """
+    Бюджет повторов в виде token bucket.
+
+    Каждый исходный запрос добавляет `ratio` токена (`deposit`), каждый повтор
+    или hedged-копия забирает один токен (`try_withdraw`). Дополнительно бюджет
+    пополняется на `min_retries_per_second` токенов в секунду, чтобы при малом
+    трафике повторы оставались возможными. Запас ограничен `capacity`.
+
+    Один бюджет можно разделить между несколькими политиками и клиентами.
+
+    Example:
+        ```python
+        budget = RetryBudget(ratio=0.1, name="billing")  # не больше ~10% повторов
+        policy = ResiliencePolicy(retries=3, retry_budget=budget)
+        ```
+    """
+
+    def __init__(
+            self,
+            *,
+            ratio: float = 0.1,
+            min_retries_per_second: float = 1.0,
+            capacity: float = 100.0,
+            name: str = "default",
+    ) -> None:
+        """Инициализирует бюджет.
+
+        Args:
+            ratio: Доля повторов относительно числа запросов (0 < ratio <= 1).
+            min_retries_per_second: Повторы в секунду, разрешённые независимо от трафика.
+            capacity: Максимальный запас токенов.
+            name: Значение метки `budget` в метриках.
+
+        Raises:
+            ValueError: Если параметры вне допустимого диапазона.
+        """
+        if not 0 < ratio <= 1:
+            raise ValueError(f"ratio должен быть в (0, 1], получено: {ratio}")
+        if min_retries_per_second < 0:
+            raise ValueError(f"min_retries_per_second не может быть отрицательным, получено: {min_retries_per_second}")
+        if capacity < 1:
+            raise ValueError(f"capacity не может быть меньше 1, получено: {capacity}")
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.capacity = capacity
+        self.name = name
+        self._tokens = min(capacity, max(1.0, min_retries_per_second))
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Текущий запас токенов."""
+        with self._lock:
+            self._refill_locked()
+            return self._tokens
+
+    def deposit(self) -> None:
+        """Учитывает исходный запрос: добавляет `ratio` токена."""
+        with self._lock:
+            self._refill_locked()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Забирает токен на повтор.
+
+        Returns:
+            True, если повтор разрешён; False, если бюджет исчерпан.
+        """
+        with self._lock:
+            self._refill_locked()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+        _metrics.increment("http_retry_budget_rejections_total", {"budget": self.name})
+        return False
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        if self.min_retries_per_second:
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.min_retries_per_second)
+        self._updated = now
+
+
+# ─── Окно задержек ────────────────────────────────────────────────────────────
+
+
+class _LatencyWindow:
+    """Скользящее окно задержек с кэшированным квантилем."""
+
+    _RECOMPUTE_EVERY = 16
+
+    def __init__(self, size: int) -> None:
+        """Инициализирует окно.
+
+        Args:
+            size: Число последних замеров, по которым считается квантиль.
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self._pending = 0
+        self._cached: dict[float, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        """Добавляет замер; кэш квантилей сбрасывается раз в `_RECOMPUTE_EVERY` замеров.
+
+        Args:
+            latency: Задержка вызова в секундах.
+        """
+        with self._lock:
+            self._samples.append(latency)
+            self._pending += 1
+            if self._pending >= self._RECOMPUTE_EVERY:
+                self._pending = 0
+                self._cached.clear()
+
+    def quantile(self, q: float) -> float | None:
+        """Возвращает квантиль окна.
+
+        Args:
+            q: Квантиль в диапазоне [0, 1].
+
+        Returns:
+            Значение квантиля в секундах или None, если замеров нет.
+        """
+        with self._lock:
+            if not self._samples:
+                return None
+            value = self._cached.get(q)
+            if value is None:
+                ordered = sorted(self._samples)
+                value = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+                self._cached[q] = value
+            return value
+
+
+# ─── Выполнение с дублированием ───────────────────────────────────────────────
+
+
+def hedge_sync(
+        call: Callable[[], T],
+        *,
+        delay: float,
+        max_hedges: int,
+        budget: RetryBudget | None,
+        name: str,
+) -> T:
+    """Выполняет синхронный вызов с hedged-копиями.
+
+    Вызовы выполняются в отдельных потоках. Проигравшие копии не прерываются
+    (синхронный вызов нельзя отменить) и завершаются в фоне.
+
+    Args:
+        call: Вызов без аргументов.
+        delay: Задержка в секундах перед запуском каждой следующей копии.
+        max_hedges: Максимальное число дополнительных копий.
+        budget: Бюджет повторов; каждая копия расходует токен.
+        name: Значение метки `policy` в метриках.
+
+    Returns:
+        Первый успешный результат.
+
+    Raises:
+        Exception: Первое полученное исключение, если все копии завершились ошибкой.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=max_hedges + 1, thread_name_prefix="chutils-hedge",
+    )
+    try:
+        primary = executor.submit(call)
+        pending = {primary}
+        hedges = 0
+        first_exc: BaseException | None = None
+        while pending:
+            can_hedge = hedges < max_hedges
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=delay if can_hedge else None,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    if future is not primary:
+                        _metrics.increment("http_hedge_wins_total", {"policy": name})
+                    return future.result()
+                if first_exc is None:
+                    first_exc = exc
+            if not done and can_hedge:
+                if budget is not None and not budget.try_withdraw():
+                    max_hedges = hedges
+                    continue
+                hedges += 1
+                _metrics.increment("http_hedged_requests_total", {"policy": name})
+                pending.add(executor.submit(call))
+        assert first_exc is not None  # noqa: S101
+        raise first_exc
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def hedge_async(
+        call: Callable[[], Awaitable[T]],
+        *,
+        delay: float,
+        max_hedges: int,
+        budget: RetryBudget | None,
+        name: str,
+) -> T:
+    """Выполняет асинхронный вызов с hedged-копиями.
+
+    После получения первого успешного результата оставшиеся копии отменяются.
+
+    Args:
+        call: Фабрика корутины вызова.
+        delay: Задержка в секундах перед запуском каждой следующей копии.
+        max_hedges: Максимальное число дополнительных копий.
+        budget: Бюджет повторов; каждая копия расходует токен.
+        name: Значение метки `policy` в метриках.
+
+    Returns:
+        Первый успешный результат.
+
+    Raises:
+        Exception: Первое полученное исключение, если все копии завершились ошибкой.
+    """
+
+    async def _run() -> T:
+        return await call()
+
+    primary: asyncio.Task[T] = asyncio.ensure_future(_run())
+    pending: set[asyncio.Task[T]] = {primary}
+    hedges = 0
+    first_exc: BaseException | None = None
+    try:
+        while pending:
+            can_hedge = hedges < max_hedges
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=delay if can_hedge else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    if task is not primary:
+                        _metrics.increment("http_hedge_wins_total", {"policy": name})
+                    return task.result()
+                if first_exc is None:
+                    first_exc = exc
+            if not done and can_hedge:
+                if budget is not None and not budget.try_withdraw():
+                    max_hedges = hedges
+                    continue
+                hedges += 1
+                _metrics.increment("http_hedged_requests_total", {"policy": name})
+                pending.add(asyncio.ensure_future(_run()))
+        assert first_exc is not None  # noqa: S101
+        raise first_exc
+    finally:
+        for task in pending:
+            task.cancel()
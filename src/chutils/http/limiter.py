@@ -0,0 +1,254 @@
+"""
+Модуль chutils.http.limiter — адаптивное ограничение конкурентности.
+
+Предоставляет `AdaptiveLimiter`, который подбирает допустимое число
+одновременных вызовов по наблюдаемой задержке и отказам:
+
+- `"aimd"` — аддитивное увеличение при успехах и мультипликативное снижение
+  при отказах или превышении `latency_threshold` (как окно TCP).
+- `"gradient"` — лимит масштабируется отношением долгосрочной задержки
+  к текущей: рост задержки (очередь на стороне сервиса) снижает лимит
+  раньше, чем начнутся ошибки.
+
+Лимитер потокобезопасен и может одновременно использоваться из потоков
+(`acquire`) и из корутин (`aacquire`). Текущий лимит публикуется в метрике
+`http_concurrency_limit{limiter}` через `chutils.metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import Literal
+
+from . import _metrics
+
+LimiterAlgorithm = Literal["aimd", "gradient"]
+"""Алгоритмы адаптивного лимита."""
+
+_ALGORITHMS: frozenset[str] = frozenset({"aimd", "gradient"})
+
+
+class _Waiter:
+    """Ожидающий слот вызов: слот передаётся ему напрямую при освобождении."""
+
+    __slots__ = ("granted", "wake")
+
+    def __init__(self, wake: Callable[[], object]) -> None:
+        self.granted = False
+        self.wake = wake
+
+
+class AdaptiveLimiter:
+    """
+    Адаптивный лимит одновременных вызовов (AIMD или градиентный).
+
+    Каждый вызов захватывает слот (`acquire` / `aacquire`) и освобождает его
+    через `release(latency, dropped=...)`, сообщая задержку и признак отказа.
+    По этим замерам лимит пересчитывается в пределах `[min_limit, max_limit]`.
+    Освободившийся слот передаётся первому ожидающему в порядке очереди.
+
+    Example:
+        ```python
+        limiter = AdaptiveLimiter(algorithm="gradient", max_limit=200, name="billing")
+        policy = ResiliencePolicy(adaptive_concurrency=limiter)
+        ```
+    """
+
+    def __init__(
+            self,
+            *,
+            algorithm: LimiterAlgorithm = "aimd",
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            backoff_ratio: float = 0.9,
+            latency_threshold: float | None = None,
+            tolerance: float = 1.5,
+            smoothing: float = 0.2,
+            long_window: int = 600,
+            name: str = "default",
+    ) -> None:
+        """Инициализирует лимитер.
+
+        Args:
+            algorithm: "aimd" или "gradient".
+            initial_limit: Начальный лимит.
+            min_limit: Нижняя граница лимита.
+            max_limit: Верхняя граница лимита.
+            backoff_ratio: Множитель снижения лимита при отказе (0 < r < 1).
+            latency_threshold: Для AIMD — задержка в секундах, выше которой вызов считается отказом.
+            tolerance: Для gradient — во сколько раз задержка может превысить долгосрочную без снижения лимита.
+            smoothing: Для gradient — доля нового значения при сглаживании лимита (0 < s <= 1).
+            long_window: Для gradient — число замеров в окне долгосрочной задержки.
+            name: Значение метки `limiter` в метриках.
+
+        Raises:
+            ValueError: Если параметры вне допустимого диапазона.
+        """
+        if algorithm not in _ALGORITHMS:
+            raise ValueError(f"Неизвестный алгоритм лимита: {algorithm!r}. Допустимые значения: {sorted(_ALGORITHMS)}")
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Требуется 1 <= min_limit <= max_limit, получено: {min_limit}, {max_limit}")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError(f"backoff_ratio должен быть в (0, 1), получено: {backoff_ratio}")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"smoothing должен быть в (0, 1], получено: {smoothing}")
+        if tolerance < 1:
+            raise ValueError(f"tolerance не может быть меньше 1, получено: {tolerance}")
+        if long_window <= 0:
+            raise ValueError(f"long_window должен быть положительным, получено: {long_window}")
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.long_window = long_window
+        self.name = name
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._published = 0
+        self._long_rtt: float | None = None
+        self._in_flight = 0
+        self._waiters: deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+        self._publish(int(self._limit))
+
+    @property
+    def limit(self) -> int:
+        """Текущий лимит одновременных вызовов."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Число выполняющихся вызовов."""
+        return self._in_flight
+
+    # --- Захват и освобождение слотов ---
+
+    def try_acquire(self) -> bool:
+        """Захватывает слот без ожидания.
+
+        Returns:
+            True, если слот захвачен.
+        """
+        with self._lock:
+            if self._waiters or self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Захватывает слот, ожидая освобождения не дольше `timeout`.
+
+        Args:
+            timeout: Максимальное ожидание в секундах. None — без ограничения.
+
+        Returns:
+            True, если слот захвачен; False по истечении таймаута.
+        """
+        event = threading.Event()
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return True
+            waiter = _Waiter(event.set)
+            self._waiters.append(waiter)
+        if event.wait(timeout):
+            return True
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    async def aacquire(self) -> None:
+        """Асинхронно захватывает слот.
+
+        При отмене ожидания уже переданный слот возвращается лимитеру.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        def _resolve() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        with self._lock:
+            if not self._waiters and self._in_flight < int(self._limit):
+                self._in_flight += 1
+                return
+            waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve))
+            self._waiters.append(waiter)
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._grant_locked()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, *, dropped: bool = False) -> None:
+        """Освобождает слот и учитывает замер в лимите.
+
+        Args:
+            latency: Длительность вызова в секундах.
+            dropped: True, если вызов завершился отказом (ошибка, таймаут, перегрузка).
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            if self.algorithm == "aimd":
+                self._update_aimd(latency, dropped, in_flight)
+            else:
+                self._update_gradient(latency, dropped, in_flight)
+            self._grant_locked()
+            limit = int(self._limit)
+        if limit != self._published:
+            self._publish(limit)
+
+    # --- Алгоритмы ---
+
+    def _update_aimd(self, latency: float, dropped: bool, in_flight: int) -> None:
+        if dropped or (self.latency_threshold is not None and latency > self.latency_threshold):
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif in_flight * 2 >= self._limit:
+            # +1 за «окно» из limit успешных вызовов, пока лимит действительно используется
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _update_gradient(self, latency: float, dropped: bool, in_flight: int) -> None:
+        if dropped:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            return
+        latency = max(latency, 1e-9)
+        if self._long_rtt is None or latency < self._long_rtt:
+            # Базовая задержка быстро опускается к лучшему замеру и медленно растет,
+            # чтобы длительная очередь не становилась новой нормой
+            self._long_rtt = latency if self._long_rtt is None else (self._long_rtt + latency) / 2
+        else:
+            self._long_rtt += (latency - self._long_rtt) / self.long_window
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / latency))
+        if gradient >= 1.0 and in_flight * 2 < self._limit:
+            # Лимит не используется — задержка ничего не говорит о запасе сервиса
+            return
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        smoothed = self._limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self._limit = min(self.max_limit, max(self.min_limit, smoothed))
+
+    def _grant_locked(self) -> None:
+        """Передаёт свободные слоты ожидающим (вызывается под блокировкой)."""
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
+
+    def _publish(self, limit: int) -> None:
+        self._published = limit
+        _metrics.set_gauge("http_concurrency_limit", float(limit), {"limiter": self.name})
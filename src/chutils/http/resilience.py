@@ -2,9 +2,10 @@
 Модуль chutils.http.resilience — Политика отказоустойчивости для HTTP-клиента.
 
 Предоставляет класс `ResiliencePolicy`, который инкапсулирует настройки
-retry, timeout, semaphore (max_concurrency) и circuit_breaker,
-а также методы `apply_sync` и `apply_async` для применения этих политик
-к произвольным вызываемым объектам.
+retry, timeout, semaphore (max_concurrency) или адаптивного лимита
+конкурентности (adaptive_concurrency), circuit_breaker, hedged-запросов (hedging)
+и бюджета повторов (retry_budget), а также методы `apply_sync` и `apply_async`
+для применения этих политик к произвольным вызываемым объектам.
 """
 from __future__ import annotations
 
@@ -12,10 +13,14 @@ import asyncio
 import random
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
+from functools import partial
 from typing import TYPE_CHECKING, Optional
 
+from .hedging import RetryBudget, _LatencyWindow, hedge_async, hedge_sync
+from .limiter import AdaptiveLimiter, LimiterAlgorithm
+
 if TYPE_CHECKING:
     from chutils.logger import ChutilsLogger
 
@@ -35,6 +40,9 @@ def _get_log() -> "ChutilsLogger":
 _UNSET = object()
 """Значение-маркер: статус-код ещё не извлечён."""
 
+_HEDGE_MIN_SAMPLES = 20
+"""Число замеров задержки, после которого включаются hedged-запросы."""
+
 
 # ─── Исключения resilience ────────────────────────────────────────────────────
 
@@ -94,7 +102,7 @@ class _CircuitBreakerState:
 
 
 class ResiliencePolicy:
-    """Политика отказоустойчивости: retry, timeout, semaphore, circuit breaker.
+    """Политика отказоустойчивости: retry, timeout, semaphore, circuit breaker, hedging.
 
     Применяется к произвольным синхронным (`apply_sync`) и асинхронным
     (`apply_async`) вызовам для обеспечения надёжности.
@@ -108,8 +116,16 @@ class ResiliencePolicy:
         retry_on_status_codes: Набор HTTP-статус-кодов, при которых выполняется повтор.
         timeout: Максимальное время выполнения вызова (сек.); None — без ограничения.
         max_concurrency: Максимальное число одновременных вызовов; None — без ограничения.
+            При включённом `adaptive_concurrency` — верхняя граница адаптивного лимита.
         cb_failure_threshold: Порог отказов для размыкания Circuit Breaker.
         cb_recovery_timeout: Время (сек.) до попытки восстановления Circuit Breaker.
+        limiter: Адаптивный лимитер конкурентности или None.
+        hedging: Дублировать ли идемпотентные запросы, не уложившиеся в квантиль задержки.
+        hedge_quantile: Квантиль задержки, после которого запускается копия.
+        hedge_min_delay: Минимальная задержка (сек.) перед запуском копии.
+        max_hedges: Максимальное число копий одного вызова.
+        retry_budget: Бюджет повторов и копий или None.
+        name: Значение метки `policy` в метриках.
 
     Example:
         ```python
@@ -131,6 +147,13 @@ class ResiliencePolicy:
             max_concurrency: int | None = None,
             cb_failure_threshold: int = 5,
             cb_recovery_timeout: float = 30.0,
+            adaptive_concurrency: LimiterAlgorithm | AdaptiveLimiter | None = None,
+            hedging: bool = False,
+            hedge_quantile: float = 0.95,
+            hedge_min_delay: float = 0.005,
+            max_hedges: int = 1,
+            retry_budget: float | RetryBudget | None = None,
+            name: str = "default",
     ) -> None:
         """Инициализирует политику отказоустойчивости.
 
@@ -145,6 +168,22 @@ class ResiliencePolicy:
             max_concurrency: Максимальное число одновременных вызовов.
             cb_failure_threshold: Порог отказов для открытия Circuit Breaker.
             cb_recovery_timeout: Пауза перед попыткой восстановления Circuit Breaker.
+            adaptive_concurrency: Адаптивный лимит конкурентности вместо статического
+                семафора: имя алгоритма ("aimd", "gradient") или готовый `AdaptiveLimiter`
+                (например, общий для нескольких политик).
+            hedging: Если True, вызовы с `hedge=True` (идемпотентные запросы HttpClient)
+                дублируются, когда не завершились за `hedge_quantile` задержки
+                предыдущих вызовов; используется первый успешный ответ.
+            hedge_quantile: Квантиль наблюдаемой задержки для запуска копии (0 < q < 1).
+            hedge_min_delay: Нижняя граница задержки перед запуском копии в секундах.
+            max_hedges: Максимальное число копий одного вызова.
+            retry_budget: Бюджет повторов: доля от числа вызовов (например, 0.1) или
+                готовый `RetryBudget` (например, общий для нескольких политик). Повторы
+                и копии сверх бюджета не выполняются.
+            name: Значение метки `policy` в метриках hedged-запросов.
+
+        Raises:
+            ValueError: Если параметры hedged-запросов вне допустимого диапазона.
         """
         self.retries = retries
         self.retry_delay = retry_delay
@@ -157,9 +196,33 @@ class ResiliencePolicy:
         self.cb_failure_threshold = cb_failure_threshold
         self.cb_recovery_timeout = cb_recovery_timeout
 
-        # Синхронный семафор
+        if isinstance(adaptive_concurrency, str):
+            adaptive_concurrency = AdaptiveLimiter(
+                algorithm=adaptive_concurrency,
+                initial_limit=min(20, max_concurrency) if max_concurrency is not None else 20,
+                max_limit=max_concurrency if max_concurrency is not None else 1000,
+            )
+        self.limiter: AdaptiveLimiter | None = adaptive_concurrency
+
+        if not 0 < hedge_quantile < 1:
+            raise ValueError(f"hedge_quantile должен быть в (0, 1), получено: {hedge_quantile}")
+        if max_hedges < 1:
+            raise ValueError(f"max_hedges должен быть положительным, получено: {max_hedges}")
+        self.hedging = hedging
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_delay = hedge_min_delay
+        self.max_hedges = max_hedges
+        self.name = name
+        self._latencies = _LatencyWindow(1000)
+
+        if isinstance(retry_budget, (int, float)):
+            retry_budget = RetryBudget(ratio=retry_budget, name=name)
+        self.retry_budget: RetryBudget | None = retry_budget
+
+        # Синхронный семафор (адаптивный лимитер его заменяет)
         self._semaphore: threading.Semaphore | None = (
-            threading.Semaphore(max_concurrency) if max_concurrency is not None else None
+            threading.Semaphore(max_concurrency)
+            if max_concurrency is not None and self.limiter is None else None
         )
         # Асинхронный семафор создаётся лениво (в event loop)
         self._async_semaphore: asyncio.Semaphore | None = None
@@ -178,7 +241,7 @@ class ResiliencePolicy:
         Returns:
             Экземпляр asyncio.Semaphore или None, если ограничение не задано.
         """
-        if self.max_concurrency is None:
+        if self.max_concurrency is None or self.limiter is not None:
             return None
         if self._async_semaphore is None:
             self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
@@ -209,6 +272,52 @@ class ResiliencePolicy:
 
         return isinstance(exc, self.retry_exceptions)
 
+    def _hedge_delay(self) -> float | None:
+        """Возвращает задержку перед запуском копии или None, пока замеров мало."""
+        if len(self._latencies) < _HEDGE_MIN_SAMPLES:
+            return None
+        quantile = self._latencies.quantile(self.hedge_quantile)
+        return None if quantile is None else max(self.hedge_min_delay, quantile)
+
+    def _hedged_sync(self, call: Callable[[], object]) -> object:
+        """Выполняет попытку с hedged-копиями и учитывает задержку."""
+
+        def _timed() -> object:
+            started = time.monotonic()
+            result = call()
+            self._latencies.record(time.monotonic() - started)
+            return result
+
+        delay = self._hedge_delay()
+        if delay is None:
+            return _timed()
+        return hedge_sync(
+            _timed, delay=delay, max_hedges=self.max_hedges, budget=self.retry_budget, name=self.name,
+        )
+
+    async def _hedged_async(self, call: Callable[[], Awaitable[object]]) -> object:
+        """Асинхронный вариант `_hedged_sync`."""
+
+        async def _timed() -> object:
+            started = time.monotonic()
+            result = await call()
+            self._latencies.record(time.monotonic() - started)
+            return result
+
+        delay = self._hedge_delay()
+        if delay is None:
+            return await _timed()
+        return await hedge_async(
+            _timed, delay=delay, max_hedges=self.max_hedges, budget=self.retry_budget, name=self.name,
+        )
+
+    def _retry_allowed(self) -> bool:
+        """Проверяет бюджет повторов и забирает из него токен."""
+        if self.retry_budget is None or self.retry_budget.try_withdraw():
+            return True
+        _get_log().debug("Бюджет повторов '%s' исчерпан, повтор отменён.", self.retry_budget.name)
+        return False
+
     def _compute_delay(self, attempt: int, base_delay: float) -> float:
         """Вычисляет задержку перед следующей попыткой.
 
@@ -231,6 +340,7 @@ class ResiliencePolicy:
             func: Callable[..., object],
             *args: object,
             http_error_extractor: Callable[[Exception], int] | None = None,
+            hedge: bool = False,
             **kwargs: object,
     ) -> object:
         """Применяет политику к синхронному вызову.
@@ -243,6 +353,8 @@ class ResiliencePolicy:
             http_error_extractor: Опциональная функция для извлечения
                 HTTP-статус-кода из пойманного исключения. Используется
                 для retry по `retry_on_status_codes`.
+            hedge: Разрешить hedged-копии вызова (только для идемпотентных
+                операций; действует при `hedging=True`).
             **kwargs: Именованные аргументы для `func`.
 
         Returns:
@@ -260,12 +372,26 @@ class ResiliencePolicy:
                 "Circuit Breaker открыт. Запросы временно заблокированы."
             )
 
+        limiter = self.limiter
+        hedge = hedge and self.hedging
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
         last_exc: Exception | None = None
 
         for attempt in range(self.retries + 1):
             sem = self._semaphore
 
             def _call() -> object:
+                if limiter is not None:
+                    limiter.acquire()
+                    started = time.monotonic()
+                    dropped = True
+                    try:
+                        result = func(*args, **kwargs)
+                        dropped = False
+                        return result
+                    finally:
+                        limiter.release(time.monotonic() - started, dropped=dropped)
                 if sem is not None:
                     sem.acquire()
                 try:
@@ -274,11 +400,13 @@ class ResiliencePolicy:
                     if sem is not None:
                         sem.release()
 
+            attempt_call: Callable[[], object] = partial(self._hedged_sync, _call) if hedge else _call
+
             try:
                 if self.timeout is not None:
                     import concurrent.futures
                     with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-                        future = ex.submit(_call)
+                        future = ex.submit(attempt_call)
                         try:
                             result = future.result(timeout=self.timeout)
                         except concurrent.futures.TimeoutError:
@@ -287,7 +415,7 @@ class ResiliencePolicy:
                                 timeout=self.timeout,
                             )
                 else:
-                    result = _call()
+                    result = attempt_call()
 
                 self._cb_state.record_success()
                 return result
@@ -299,7 +427,11 @@ class ResiliencePolicy:
                 last_exc = exc
                 self._cb_state.record_failure()
 
-                if attempt < self.retries and self._should_retry_exception(exc, http_error_extractor):
+                if (
+                        attempt < self.retries
+                        and self._should_retry_exception(exc, http_error_extractor)
+                        and self._retry_allowed()
+                ):
                     delay = self._compute_delay(attempt, self.retry_delay)
                     _get_log().debug(
                         "Попытка %d/%d не удалась (%s). Повтор через %.2f сек.",
@@ -324,6 +456,7 @@ class ResiliencePolicy:
             func: Callable[..., object],
             *args: object,
             http_error_extractor: Callable[[Exception], int] | None = None,
+            hedge: bool = False,
             **kwargs: object,
     ) -> object:
         """Применяет политику к асинхронному вызову.
@@ -335,6 +468,7 @@ class ResiliencePolicy:
             *args: Позиционные аргументы для `func`.
             http_error_extractor: Опциональная функция для извлечения
                 HTTP-статус-кода из пойманного исключения.
+            hedge: Разрешить hedged-копии вызова (см. `apply_sync`).
             **kwargs: Именованные аргументы для `func`.
 
         Returns:
@@ -353,26 +487,44 @@ class ResiliencePolicy:
             )
 
         sem = self._get_async_semaphore()
+        limiter = self.limiter
+        hedge = hedge and self.hedging
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
         last_exc: Exception | None = None
 
         for attempt in range(self.retries + 1):
             async def _call() -> object:
+                if limiter is not None:
+                    await limiter.aacquire()
+                    started = time.monotonic()
+                    dropped = True
+                    try:
+                        result = await func(*args, **kwargs)  # type: ignore[misc]
+                        dropped = False
+                        return result
+                    finally:
+                        limiter.release(time.monotonic() - started, dropped=dropped)
                 if sem is not None:
                     async with sem:
                         return await func(*args, **kwargs)  # type: ignore[misc]
                 return await func(*args, **kwargs)  # type: ignore[misc]
 
+            attempt_call: Callable[[], Awaitable[object]] = (
+                partial(self._hedged_async, _call) if hedge else _call
+            )
+
             try:
                 if self.timeout is not None:
                     try:
-                        result = await asyncio.wait_for(_call(), timeout=self.timeout)
+                        result = await asyncio.wait_for(attempt_call(), timeout=self.timeout)
                     except asyncio.TimeoutError:
                         raise ChutilsTimeoutError(
                             f"Async-вызов превысил timeout={self.timeout}с.",
                             timeout=self.timeout,
                         )
                 else:
-                    result = await _call()
+                    result = await attempt_call()
 
                 self._cb_state.record_success()
                 return result
@@ -384,7 +536,11 @@ class ResiliencePolicy:
                 last_exc = exc
                 self._cb_state.record_failure()
 
-                if attempt < self.retries and self._should_retry_exception(exc, http_error_extractor):
+                if (
+                        attempt < self.retries
+                        and self._should_retry_exception(exc, http_error_extractor)
+                        and self._retry_allowed()
+                ):
                     delay = self._compute_delay(attempt, self.retry_delay)
                     _get_log().debug(
                         "Async попытка %d/%d не удалась (%s). Повтор через %.2f сек.",
@@ -21,10 +21,13 @@ if TYPE_CHECKING:
         MEDIUMDEBUG_LEVEL_NUM as MEDIUMDEBUG_LEVEL_NUM
     )
     from .formatters import ChutilsJsonFormatter as ChutilsJsonFormatter, JSON_LOGGER_AVAILABLE as JSON_LOGGER_AVAILABLE
+    from .formatters import FastJsonFormatter as FastJsonFormatter
     from .handlers import (
         SafeTimedRotatingFileHandler as SafeTimedRotatingFileHandler,
         CompressingRotatingFileHandler as CompressingRotatingFileHandler,
-        CompressingTimedRotatingFileHandler as CompressingTimedRotatingFileHandler
+        CompressingTimedRotatingFileHandler as CompressingTimedRotatingFileHandler,
+        OverflowQueueHandler as OverflowQueueHandler,
+        BatchingQueueListener as BatchingQueueListener,
     )
     from .masking import (
         SecretMaskingFilter as SecretMaskingFilter,
@@ -42,9 +45,12 @@ _LAZY_MAPPING = {
     'MEDIUMDEBUG_LEVEL_NUM': ('.core', 'MEDIUMDEBUG_LEVEL_NUM'),
     'ChutilsJsonFormatter': ('.formatters', 'ChutilsJsonFormatter'),
     'JSON_LOGGER_AVAILABLE': ('.formatters', 'JSON_LOGGER_AVAILABLE'),
+    'FastJsonFormatter': ('.formatters', 'FastJsonFormatter'),
     'SafeTimedRotatingFileHandler': ('.handlers', 'SafeTimedRotatingFileHandler'),
     'CompressingRotatingFileHandler': ('.handlers', 'CompressingRotatingFileHandler'),
     'CompressingTimedRotatingFileHandler': ('.handlers', 'CompressingTimedRotatingFileHandler'),
+    'OverflowQueueHandler': ('.handlers', 'OverflowQueueHandler'),
+    'BatchingQueueListener': ('.handlers', 'BatchingQueueListener'),
     'SecretMaskingFilter': ('.masking', 'SecretMaskingFilter'),
     'register_secret_mask': ('.masking', 'register_secret_mask'),
     'register_pattern_mask': ('.masking', 'register_pattern_mask'),
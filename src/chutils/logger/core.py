@@ -124,7 +124,9 @@ def setup_logger(
 
     ### Асинхронность:
     - Если `use_async=True`, логи записываются в очередь и обрабатываются в отдельном потоке.
-    - Очередь блокирующая, что предотвращает потерю сообщений при переполнении.
+    - Слушатель очереди записывает сообщения пачками (один `write`/`flush` на пачку).
+    - При переполнении очереди поток по умолчанию ждет до `async_block_timeout` секунд;
+      политика задается параметром конфига `async_overflow` (`block`, `drop_new`, `drop_oldest`).
 
     ### Маскирование:
     - Автоматическая замена секретов и паттернов на `[MASKED]`.
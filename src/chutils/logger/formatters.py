@@ -4,10 +4,24 @@
 
 from __future__ import annotations
 
+import json
 import logging  # chutils: ignore[ChutilsIntegrationRule]
+import socket
+import time
+from collections.abc import Callable, Mapping
 from typing import Any, TYPE_CHECKING
 
 from chutils.env import JSON_LOGGER_AVAILABLE
+from .masking import _structured_message
+
+_orjson: Any
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+ORJSON_AVAILABLE = _orjson is not None
+"""Установлен ли пакет orjson (используется `FastJsonFormatter`)."""
 
 _jsonlogger: Any = None
 
@@ -54,6 +68,26 @@ class ChutilsJsonFormatter(_BaseFormatter):
     во вложенный объект 'context', а данные трассировки выносит на верхний уровень.
     """
 
+    def format(self, record: logging.LogRecord) -> str:
+        """Форматирует запись, разворачивая замаскированное сообщение-словарь в поля.
+
+        Args:
+            record: Запись лога.
+
+        Returns:
+            Отформатированная запись.
+        """
+        message = record.msg
+        structured = _structured_message(message)
+        if structured is None or structured is message:
+            return super().format(record)
+        # python-json-logger разворачивает только сообщения типа dict
+        record.msg = structured
+        try:
+            return super().format(record)
+        finally:
+            record.msg = message
+
     def add_fields(self, log_record: dict[str, Any], record: logging.LogRecord, message_dict: dict[str, Any]) -> None:
         """Добавляет кастомные поля в запись JSON-лога.
 
@@ -90,4 +124,148 @@ class ChutilsJsonFormatter(_BaseFormatter):
             log_record['span_id'] = getattr(record, 'span_id')
 
 
-__all__ = ["ChutilsJsonFormatter", "JSON_LOGGER_AVAILABLE"]
+_RESERVED_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message", "asctime", "context", "context_dict", "taskName",
+}
+"""Стандартные и служебные атрибуты LogRecord, не попадающие в дополнительные поля."""
+
+
+def _json_dumps(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+def _orjson_dumps(payload: dict[str, Any]) -> str:
+    return str(_orjson.dumps(payload, default=str, option=_orjson.OPT_NON_STR_KEYS), "utf-8")
+
+
+class FastJsonFormatter(logging.Formatter):
+    """
+    Высокопроизводительный JSON-форматтер без зависимости от python-json-logger.
+
+    Формирует те же поля, что и `ChutilsJsonFormatter` (`asctime`, `name`, `levelname`,
+    `message`, `trace_id`/`span_id` на верхнем уровне, вложенный `context`, дополнительные
+    атрибуты записи, `exc_info`), но:
+
+    - статические поля (сервис, окружение, хост) сериализуются один раз при создании;
+    - сериализует через orjson, если он установлен, иначе через стандартный `json`;
+    - строка времени кэшируется в пределах секунды;
+    - трассировка исключения форматируется один раз на запись (`record.exc_text`)
+      и переиспользуется всеми обработчиками;
+    - атрибуты, продублированные `ContextFilter` (`context`, `context_dict`, ключи контекста),
+      не выводятся повторно.
+
+    Как и `ChutilsJsonFormatter`, сообщение-словарь разворачивается в поля записи,
+    а `message` остается пустой строкой.
+    """
+
+    def __init__(
+            self,
+            static_fields: Mapping[str, Any] | None = None,
+            *,
+            include_host: bool = True,
+            include_extra: bool = True,
+            datefmt: str | None = None,
+            use_orjson: bool | None = None,
+    ) -> None:
+        """Инициализирует форматтер.
+
+        Args:
+            static_fields: Постоянные поля каждой записи (например, `service`, `env`).
+            include_host: Добавлять ли поле `host` с именем хоста.
+            include_extra: Выводить ли нестандартные атрибуты записи (переданные через `extra`).
+            datefmt: Формат времени для `time.strftime`. None — формат `logging` по умолчанию.
+            use_orjson: Использовать ли orjson. None — если установлен.
+        """
+        super().__init__(datefmt=datefmt)
+        static: dict[str, Any] = {}
+        if include_host:
+            static["host"] = socket.gethostname()
+        static.update(static_fields or {})
+        if use_orjson is None:
+            use_orjson = ORJSON_AVAILABLE
+        self._dumps: Callable[[dict[str, Any]], str] = _orjson_dumps if use_orjson and ORJSON_AVAILABLE else _json_dumps
+        self._static_keys = frozenset(static)
+        # Сериализованные статические поля без закрывающей скобки: к ним дописываются динамические
+        self._static_prefix = self._dumps(static)[:-1] if static else ""
+        self._include_extra = include_extra
+        self._time_cache: tuple[int, str | None, str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        """Форматирует время записи, кэшируя строку с точностью до секунды для каждого формата.
+
+        Args:
+            record: Запись лога.
+            datefmt: Формат времени. None — формат форматтера.
+
+        Returns:
+            Строка времени.
+        """
+        datefmt = datefmt or self.datefmt
+        second = int(record.created)
+        cached_second, cached_datefmt, prefix = self._time_cache
+        if cached_second != second or cached_datefmt != datefmt:
+            ct = self.converter(record.created)
+            prefix = time.strftime(datefmt or self.default_time_format, ct)
+            self._time_cache = (second, datefmt, prefix)
+        msec_format = self.default_msec_format
+        if datefmt or not msec_format:
+            return prefix
+        return msec_format % (prefix, record.msecs)
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Сериализует запись лога в JSON-строку.
+
+        Args:
+            record: Запись лога.
+
+        Returns:
+            JSON-объект в одну строку.
+        """
+        structured = _structured_message(record.msg)
+        payload: dict[str, Any] = {
+            "asctime": self.formatTime(record),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": "" if structured is not None else record.getMessage(),
+        }
+
+        ctx = getattr(record, "context_dict", None)
+        if isinstance(ctx, dict) and ctx:
+            context = {k: v for k, v in ctx.items() if k != "trace_id" and k != "span_id"}
+            if "trace_id" in ctx:
+                payload["trace_id"] = ctx["trace_id"]
+            if "span_id" in ctx:
+                payload["span_id"] = ctx["span_id"]
+            if context:
+                payload["context"] = context
+        else:
+            ctx = None
+        if "trace_id" not in payload and hasattr(record, "trace_id"):
+            payload["trace_id"] = record.trace_id
+        if "span_id" not in payload and hasattr(record, "span_id"):
+            payload["span_id"] = record.span_id
+
+        if self._include_extra:
+            for key in record.__dict__.keys() - _RESERVED_ATTRS:
+                if key in payload or key in self._static_keys or (ctx is not None and key in ctx):
+                    continue
+                payload[key] = record.__dict__[key]
+        if structured:
+            payload.update(structured)
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+
+        for key in self._static_keys.intersection(payload):
+            del payload[key]
+        dynamic = self._dumps(payload)
+        if not self._static_prefix:
+            return dynamic
+        return f"{self._static_prefix},{dynamic[1:]}"
+
+
+__all__ = ["JSON_LOGGER_AVAILABLE", "ORJSON_AVAILABLE", "ChutilsJsonFormatter", "FastJsonFormatter"]
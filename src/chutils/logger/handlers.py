@@ -2,8 +2,43 @@
 Кастомные обработчики логов.
 """
 
+import gzip
 import logging.handlers
+import lzma
 import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Literal
+
+from chutils.exceptions import OptionalDependencyError
+
+LogCompressionCodec = Literal["gzip", "zstd", "xz"]
+"""Кодеки сжатия ротированных файлов логов."""
+
+_CODEC_EXTENSIONS: dict[str, str] = {"gzip": ".gz", "zstd": ".zst", "xz": ".xz"}
+
+_COMPRESSION_BACKLOG = 8
+"""Максимальное число задач сжатия, переданных пулу; остальные ждут в очереди отложенных."""
+_COMPRESSION_CHUNK_SIZE = 1024 * 1024
+
+_compression_executor: ThreadPoolExecutor | None = None
+_compression_lock = threading.Lock()
+_compression_running = 0
+_deferred_compression: deque[tuple[Callable[[], None], Future[None]]] = deque()
+
+OverflowPolicy = Literal["block", "drop_new", "drop_oldest"]
+"""Политики поведения асинхронного логирования при переполнении очереди."""
+
+_OVERFLOW_POLICIES = ("block", "drop_new", "drop_oldest")
+
+_QUEUE_SENTINEL: Any = getattr(logging.handlers.QueueListener, "_sentinel", None)
+"""Сигнал остановки `QueueListener`."""
 
 
 class SafeTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
@@ -25,100 +60,646 @@ class SafeTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
         super().doRollover()
 
 
-class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+def _import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise OptionalDependencyError(
+            "Пакет 'zstandard' не установлен.",
+            dependency="zstandard",
+            hint="Установите его через: pip install zstandard или uv add zstandard",
+        ) from e
+    return zstandard
+
+
+def _remove_file(path: str) -> None:
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            if ctypes.windll.kernel32.DeleteFileW(path):
+                return
+        except (ImportError, AttributeError):
+            pass
+    os.remove(path)
+
+
+def _temp_path(dest: str) -> str:
+    # Скрытое имя не совпадает с шаблоном бэкапов и не учитывается при их подсчете и удалении
+    directory, name = os.path.split(dest)
+    return os.path.join(directory, f".{name}.tmp")
+
+
+def _write_archive(source: str, tmp: str, codec: LogCompressionCodec, level: int | None) -> None:
+    """Потоково сжимает файл `source` во временный файл `tmp`."""
+    with open(source, "rb") as f_in:
+        if codec == "gzip":
+            with gzip.open(tmp, "wb", compresslevel=9 if level is None else level) as f_out:
+                shutil.copyfileobj(f_in, f_out, _COMPRESSION_CHUNK_SIZE)
+        elif codec == "xz":
+            with lzma.open(tmp, "wb", preset=6 if level is None else level) as f_out:
+                shutil.copyfileobj(f_in, f_out, _COMPRESSION_CHUNK_SIZE)
+        else:
+            compressor = _import_zstandard().ZstdCompressor(level=3 if level is None else level)
+            with open(tmp, "wb") as f_out:
+                compressor.copy_stream(
+                    f_in, f_out, size=os.path.getsize(source), read_size=_COMPRESSION_CHUNK_SIZE
+                )
+
+
+def _compress_file(source: str, dest: str, codec: LogCompressionCodec, level: int | None) -> None:
+    """Потоково сжимает файл во временный, атомарно переименовывает его в `dest` и удаляет исходный."""
+    tmp = _temp_path(dest)
+    _write_archive(source, tmp, codec, level)
+    os.replace(tmp, dest)
+    _remove_file(source)
+
+
+def _get_compression_executor() -> ThreadPoolExecutor:
+    global _compression_executor
+    if _compression_executor is None:
+        with _compression_lock:
+            if _compression_executor is None:
+                _compression_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="ChutilsLogCompression"
+                )
+    return _compression_executor
+
+
+def _submit_compression(job: Callable[[], None]) -> Future[None]:
+    """Ставит задачу сжатия в фоновый поток, никогда не выполняя ее в вызывающем.
+
+    Пулу передается не больше `_COMPRESSION_BACKLOG` задач; остальные откладываются и
+    запускаются по мере завершения предыдущих в порядке поступления.
     """
-    Обработчик ротации по размеру с поддержкой сжатия (gzip).
+    global _compression_running
+    future: Future[None] = Future()
+    with _compression_lock:
+        if _compression_running >= _COMPRESSION_BACKLOG or _deferred_compression:
+            _deferred_compression.append((job, future))
+            return future
+        _compression_running += 1
+    _start_compression(job, future)
+    return future
+
+
+def _start_compression(job: Callable[[], None], future: Future[None]) -> None:
+    global _compression_running
+    while True:
+        try:
+            _get_compression_executor().submit(_run_compression, job, future)
+            return
+        except RuntimeError:
+            # Интерпретатор завершается: несжатый файл остается на диске и сжимается при следующем запуске
+            future.set_result(None)
+        with _compression_lock:
+            if not _deferred_compression:
+                _compression_running -= 1
+                return
+            job, future = _deferred_compression.popleft()
 
-    Обеспечивает корректную работу с цепочкой сжатых бэкапов.
+
+def _run_compression(job: Callable[[], None], future: Future[None]) -> None:
+    global _compression_running
+    try:
+        job()
+    finally:
+        future.set_result(None)
+        with _compression_lock:
+            deferred = _deferred_compression.popleft() if _deferred_compression else None
+            if deferred is None:
+                _compression_running -= 1
+        if deferred is not None:
+            _start_compression(*deferred)
+
+
+class _BackgroundCompressionMixin(logging.FileHandler):
     """
+    Общая логика фонового сжатия ротированных файлов.
+
+    Сжатие выполняется в отдельном потоке вне блокировки обработчика, поэтому задержка
+    ротации не зависит от размера файла. Пулу передается не больше `_COMPRESSION_BACKLOG`
+    задач; остальные откладываются, и ни одна задача не выполняется под блокировкой обработчика.
+    Несжатые бэкапы, оставшиеся после аварийного завершения, сжимаются при создании обработчика.
+    """
+
+    def _init_compression(self, codec: LogCompressionCodec, level: int | None) -> None:
+        if codec not in _CODEC_EXTENSIONS:
+            raise ValueError(f"Неизвестный кодек сжатия: {codec!r}. Допустимые значения: {sorted(_CODEC_EXTENSIONS)}")
+        if codec == "zstd":
+            _import_zstandard()
+        self.codec = codec
+        self.compression_level = level
+        self.extension = _CODEC_EXTENSIONS[codec]
+        self._pending: set[Future[None]] = set()
+        self._pending_lock = threading.Lock()
+
+    def _compress_in_background(self, source: str, dest: str) -> None:
+        def job() -> None:
+            try:
+                _compress_file(source, dest, self.codec, self.compression_level)
+            except Exception as e:
+                self.handleError(f"Ошибка при сжатии файла {source}: {e}")  # type: ignore[arg-type]
+
+        self._track_compression(_submit_compression(job))
+
+    def _track_compression(self, future: Future[None]) -> None:
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+
+    def _discard_pending(self, future: Future[None]) -> None:
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def _recover(self, sources: list[str]) -> None:
+        """Удаляет недописанные временные архивы и сжимает оставшиеся несжатые бэкапы."""
+        directory, base_name = os.path.split(self.baseFilename)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(f".{base_name}.") and name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+        for source in sources:
+            dest = source + self.extension
+            if os.path.exists(dest):
+                # Архив записывается атомарно, значит сжатие завершилось до сбоя
+                try:
+                    _remove_file(source)
+                except OSError:
+                    pass
+            else:
+                self._compress_in_background(source, dest)
+
+    def wait_for_compression(self, timeout: float | None = None) -> bool:
+        """Ожидает завершения фонового сжатия файлов этого обработчика.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах (None — без ограничения).
+
+        Returns:
+            True, если все задачи сжатия завершены.
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def close(self) -> None:
+        """Дожидается фонового сжатия и закрывает файл."""
+        if hasattr(self, "_pending"):
+            self.wait_for_compression()
+        super().close()
+
+
+class CompressingRotatingFileHandler(_BackgroundCompressionMixin, logging.handlers.RotatingFileHandler):
+    """
+    Обработчик ротации по размеру с фоновым сжатием (gzip, zstd или xz).
+
+    Обеспечивает корректную работу с цепочкой сжатых бэкапов: ротация только переименовывает
+    файл во временное скрытое имя, а фоновая задача сжимает его, сдвигает цепочку и кладет
+    архив в `log.1.gz`. Задачи выполняются по очереди, поэтому порядок бэкапов сохраняется.
+    """
+
+    def __init__(
+            self,
+            *args: Any,
+            codec: LogCompressionCodec = "gzip",
+            compression_level: int | None = None,
+            **kwargs: Any,
+    ) -> None:
+        """Инициализирует обработчик.
+
+        Args:
+            *args: Позиционные аргументы `RotatingFileHandler`.
+            codec: Кодек сжатия бэкапов: "gzip", "zstd" или "xz".
+            compression_level: Уровень сжатия. None — значение по умолчанию для кодека.
+            **kwargs: Именованные аргументы `RotatingFileHandler`.
+
+        Raises:
+            ValueError: Если кодек неизвестен.
+            OptionalDependencyError: Если для "zstd" не установлен пакет `zstandard`.
+        """
+        super().__init__(*args, **kwargs)
+        self._init_compression(codec, compression_level)
+        self._last_rotation_stamp = 0
+        leftover = f"{self.baseFilename}.1"
+        self._recover([leftover] if os.path.exists(leftover) else [])
+        for rotated in self._rotated_files():
+            self._archive_in_background(rotated)
+
+    def _rotated_files(self) -> list[str]:
+        """Возвращает ротированные, но еще не помещенные в цепочку файлы от старых к новым."""
+        directory, base_name = os.path.split(self.baseFilename)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        return [
+            os.path.join(directory, name)
+            for name in sorted(names)
+            if name.startswith(f".{base_name}.") and name.endswith(".rotated")
+        ]
+
+    def _rotated_path(self) -> str:
+        # Скрытое имя с монотонной меткой: не совпадает с шаблоном бэкапов и сортируется по времени ротации
+        stamp = max(time.time_ns(), self._last_rotation_stamp + 1)
+        self._last_rotation_stamp = stamp
+        directory, name = os.path.split(self.baseFilename)
+        return os.path.join(directory, f".{name}.{stamp:020d}.rotated")
+
+    def _archive_in_background(self, rotated: str) -> None:
+        def job() -> None:
+            try:
+                self._place_archive(rotated)
+            except Exception as e:
+                self.handleError(f"Ошибка при сжатии файла {rotated}: {e}")  # type: ignore[arg-type]
+
+        self._track_compression(_submit_compression(job))
+
+    def _place_archive(self, rotated: str) -> None:
+        """Сжимает ротированный файл, сдвигает цепочку архивов и кладет новый архив в `log.1`.
+
+        Выполняется только в фоновом потоке сжатия.
+        """
+        ext = self.extension
+        dest = f"{self.baseFilename}.1{ext}"
+        tmp = _temp_path(dest)
+        _write_archive(rotated, tmp, self.codec, self.compression_level)
+        for i in range(self.backupCount - 1, 0, -1):
+            sfn = f"{self.baseFilename}.{i}{ext}"
+            if os.path.exists(sfn):
+                os.replace(sfn, f"{self.baseFilename}.{i + 1}{ext}")
+        os.replace(tmp, dest)
+        _remove_file(rotated)
 
     def doRollover(self) -> None:
         """
-        Выполняет ротацию логов с последующим сжатием старого файла.
+        Выполняет ротацию логов и ставит сжатие старого файла в фоновую очередь.
 
         Процесс:
         1. Закрытие текущего потока.
-        2. Сдвиг существующих архивов (`log.1.gz` -> `log.2.gz`).
-        3. Переименование текущего лога в `log.1`.
-        4. Открытие нового файла для дальнейшей записи.
-        5. Сжатие переименованного файла в фоне.
+        2. Переименование текущего лога во временное скрытое имя.
+        3. Открытие нового файла для дальнейшей записи.
+        4. Постановка фоновой задачи, которая сжимает файл, сдвигает архивы
+           (`log.1.gz` -> `log.2.gz`) и кладет новый архив в `log.1.gz`.
+
+        Ротация не ждет завершения предыдущих задач сжатия.
         """
         # Закрываем текущий поток
         if self.stream:
             self.stream.close()
             self.stream = None
 
-        # 1. Сдвигаем существующие сжатые бэкапы
-        if self.backupCount > 0:
-            for i in range(self.backupCount - 1, 0, -1):
-                sfn_gz = f"{self.baseFilename}.{i}.gz"
-                dfn_gz = f"{self.baseFilename}.{i + 1}.gz"
-                if os.path.exists(sfn_gz):
-                    if os.path.exists(dfn_gz):
-                        os.remove(dfn_gz)
-                    os.rename(sfn_gz, dfn_gz)
-
-        # 2. Ротируем текущий лог-файл в `basename.1`
-        dfn_uncompressed = f"{self.baseFilename}.1"
-        if os.path.exists(dfn_uncompressed):
-            os.remove(dfn_uncompressed)
-
-        dfn_compressed = f"{dfn_uncompressed}.gz"
-        if os.path.exists(dfn_compressed):
-            os.remove(dfn_compressed)
-
+        rotated = None
         if os.path.exists(self.baseFilename):
-            os.rename(self.baseFilename, dfn_uncompressed)
+            rotated = self._rotated_path()
+            os.rename(self.baseFilename, rotated)
 
-        # 3. Открываем новый поток (создает новый пустой лог-файл)
+        # Открываем новый поток (создает новый пустой лог-файл)
         self.stream = self._open()
 
-        # 4. Сжимаем новый бэкап `basename.1`
-        if os.path.exists(dfn_uncompressed):
+        if rotated is not None:
+            self._archive_in_background(rotated)
+
+
+class CompressingTimedRotatingFileHandler(_BackgroundCompressionMixin, SafeTimedRotatingFileHandler):
+    """
+    Обработчик ротации по времени с фоновым сжатием (gzip, zstd или xz).
+
+    Использует стандартные хуки `namer`/`rotator`: ротированный файл получает расширение
+    кодека и учитывается в `backupCount` наравне с остальными архивами.
+    """
+
+    def __init__(
+            self,
+            *args: Any,
+            codec: LogCompressionCodec = "gzip",
+            compression_level: int | None = None,
+            **kwargs: Any,
+    ) -> None:
+        """Инициализирует обработчик.
+
+        Args:
+            *args: Позиционные аргументы `TimedRotatingFileHandler`.
+            codec: Кодек сжатия бэкапов: "gzip", "zstd" или "xz".
+            compression_level: Уровень сжатия. None — значение по умолчанию для кодека.
+            **kwargs: Именованные аргументы `TimedRotatingFileHandler`.
+
+        Raises:
+            ValueError: Если кодек неизвестен.
+            OptionalDependencyError: Если для "zstd" не установлен пакет `zstandard`.
+        """
+        super().__init__(*args, **kwargs)
+        self._init_compression(codec, compression_level)
+        self.namer = self._compressed_name
+        self.rotator = self._rotate
+        self._recover(self._uncompressed_backups())
+
+    def _compressed_name(self, default_name: str) -> str:
+        return default_name + self.extension
+
+    def _rotate(self, source: str, dest: str) -> None:
+        uncompressed = dest[:-len(self.extension)]
+        if os.path.exists(source):
+            os.rename(source, uncompressed)
+            self._compress_in_background(uncompressed, dest)
+
+    def _uncompressed_backups(self) -> list[str]:
+        directory, base_name = os.path.split(self.baseFilename)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        prefix = base_name + "."
+        return [
+            os.path.join(directory, name)
+            for name in names
+            if name.startswith(prefix)
+            and not name.endswith(tuple(_CODEC_EXTENSIONS.values()))
+            and self.extMatch.match(name[len(prefix):])
+        ]
+
+
+class OverflowQueueHandler(logging.handlers.QueueHandler):
+    """
+    Обработчик, помещающий записи в ограниченную очередь с настраиваемой политикой переполнения.
+
+    Политики:
+    - ``block`` — ждать свободного места не дольше `block_timeout` секунд, затем отбросить запись;
+    - ``drop_new`` — сразу отбросить новую запись;
+    - ``drop_oldest`` — вытеснить самую старую запись из очереди.
+
+    Отброшенные записи учитываются в атрибуте `dropped` и в метрике
+    `log_records_dropped_total{logger, policy}` через `chutils.metrics`.
+    """
+
+    def __init__(
+            self,
+            log_queue: queue.Queue[Any],
+            overflow: OverflowPolicy = "block",
+            block_timeout: float | None = 1.0,
+            name: str = "",
+    ) -> None:
+        """Инициализирует обработчик.
+
+        Args:
+            log_queue: Очередь, которую разбирает `BatchingQueueListener`.
+            overflow: Политика при переполнении очереди.
+            block_timeout: Максимальное ожидание для политики ``block`` в секундах (None — без ограничения).
+            name: Значение метки `logger` в метриках.
+
+        Raises:
+            ValueError: Если политика неизвестна или `block_timeout` отрицателен.
+        """
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Неизвестная политика переполнения: {overflow!r}. Допустимые значения: {_OVERFLOW_POLICIES}")
+        if block_timeout is not None and block_timeout < 0:
+            raise ValueError(f"block_timeout не может быть отрицательным, получено: {block_timeout}")
+        super().__init__(log_queue)
+        self._queue = log_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._drop_lock = threading.Lock()
+        self._metric_labels = {"logger": name, "policy": overflow}
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Помещает запись в очередь согласно политике переполнения.
+
+        Args:
+            record: Подготовленная запись лога.
+        """
+        q = self._queue
+        if self.overflow == "block":
+            try:
+                q.put(record, timeout=self.block_timeout)
+                return
+            except queue.Full:
+                pass
+        elif self.overflow == "drop_new":
             try:
-                import gzip
-                with open(dfn_uncompressed, 'rb') as f_in:
-                    with gzip.open(dfn_compressed, 'wb') as f_out:
-                        f_out.writelines(f_in)
-
-                import sys
-                if sys.platform == "win32":
-                    try:
-                        import ctypes
-                        ctypes.windll.kernel32.DeleteFileW(dfn_uncompressed)
-                    except (ImportError, AttributeError):
-                        os.remove(dfn_uncompressed)
+                q.put_nowait(record)
+                return
+            except queue.Full:
+                pass
+        elif self._put_dropping_oldest(record):
+            return
+        self._on_drop()
+
+    def _put_dropping_oldest(self, record: logging.LogRecord) -> bool:
+        q = self._queue
+        while True:
+            try:
+                q.put_nowait(record)
+                return True
+            except queue.Full:
+                pass
+            try:
+                oldest = q.get_nowait()
+            except queue.Empty:
+                continue
+            q.task_done()
+            if oldest is _QUEUE_SENTINEL:
+                # Сигнал остановки слушателя не вытесняем: возвращаем его, а новую запись отбрасываем
+                q.put(oldest)
+                return False
+            self._on_drop()
+
+    def _on_drop(self) -> None:
+        with self._drop_lock:
+            self.dropped += 1
+        try:
+            from chutils.metrics import increment
+
+            increment("log_records_dropped_total", labels=self._metric_labels)
+        except Exception:
+            pass
+
+
+_BATCHABLE_EMITS = (
+    logging.StreamHandler.emit,
+    logging.FileHandler.emit,
+    logging.handlers.BaseRotatingHandler.emit,
+)
+"""Стандартные реализации `emit`, которые можно заменить пакетной записью без изменения поведения."""
+
+
+def _open_stream(handler: logging.StreamHandler[Any]) -> bool:
+    # Повторяем логику FileHandler.emit для delay=True (см. bpo-42378)
+    if (
+        handler.stream is None
+        and isinstance(handler, logging.FileHandler)
+        and (handler.mode != "w" or not getattr(handler, "_closed", False))
+    ):
+        handler.stream = handler._open()
+    return bool(handler.stream)
+
+
+def _stream_position(handler: logging.StreamHandler[Any]) -> int | None:
+    if not _open_stream(handler):
+        return None
+    handler.stream.seek(0, 2)
+    return int(handler.stream.tell())
+
+
+def _write_pending(handler: logging.StreamHandler[Any], pending: list[str]) -> None:
+    if pending and _open_stream(handler):
+        handler.stream.write("".join(pending))
+        handler.flush()
+
+
+def _write_batch(handler: logging.StreamHandler[Any], records: list[logging.LogRecord]) -> None:
+    """Записывает пачку записей одним вызовом `write` и одним `flush`, соблюдая ротацию файла."""
+    pending: list[str] = []
+    position: int | None = None
+    size_limited = (
+        isinstance(handler, logging.handlers.RotatingFileHandler)
+        and handler.maxBytes > 0
+        # Ротируются только обычные файлы (см. bpo-45401)
+        and not (os.path.exists(handler.baseFilename) and not os.path.isfile(handler.baseFilename))
+    )
+    handler.acquire()
+    try:
+        for record in records:
+            try:
+                text = handler.format(record) + handler.terminator
+                if isinstance(handler, logging.handlers.RotatingFileHandler) and size_limited:
+                    # Позицию отслеживаем сами: stream.tell() сбрасывает буфер на каждой записи
+                    if position is None:
+                        position = _stream_position(handler)
+                    rollover = position is not None and position + len(text) >= handler.maxBytes
+                elif isinstance(handler, logging.handlers.BaseRotatingHandler):
+                    rollover = handler.shouldRollover(record)  # type: ignore[attr-defined]
                 else:
-                    os.remove(dfn_uncompressed)
-            except Exception as e:
-                self.handleError(f"Ошибка при сжатии или удалении {dfn_uncompressed}: {e}")  # type: ignore[arg-type]
+                    rollover = False
+                if rollover:
+                    _write_pending(handler, pending)
+                    pending = []
+                    handler.doRollover()  # type: ignore[attr-defined]
+                    position = _stream_position(handler) if position is not None else None
+                pending.append(text)
+                if position is not None:
+                    position += len(text)
+            except RecursionError:
+                raise
+            except Exception:
+                handler.handleError(record)
+        try:
+            _write_pending(handler, pending)
+        except RecursionError:
+            raise
+        except Exception:
+            handler.handleError(records[-1])
+    finally:
+        handler.release()
 
 
-class CompressingTimedRotatingFileHandler(SafeTimedRotatingFileHandler):
+class BatchingQueueListener(logging.handlers.QueueListener):
     """
-    Обработчик ротации по времени с поддержкой сжатия (gzip).
+    Слушатель очереди логов, разбирающий ее пачками.
+
+    За одно пробуждение забирает до `batch_size` записей. Потоковые и файловые обработчики
+    (включая ротируемые) получают всю пачку одной записью в поток и одним `flush`,
+    остальные — по одной записи. Глубина очереди после каждой пачки публикуется
+    в метрике `log_queue_size{logger}` через `chutils.metrics`.
     """
 
-    def doRollover(self) -> None:
-        """
-        Выполняет временную ротацию и сжимает полученные бэкапы.
+    def __init__(
+            self,
+            log_queue: queue.Queue[Any],
+            *handlers: logging.Handler,
+            respect_handler_level: bool = False,
+            batch_size: int = 100,
+            name: str = "",
+    ) -> None:
+        """Инициализирует слушатель.
+
+        Args:
+            log_queue: Очередь с записями логов.
+            *handlers: Обработчики, которым передаются записи.
+            respect_handler_level: Учитывать ли уровень каждого обработчика.
+            batch_size: Максимальное количество записей в одной пачке.
+            name: Значение метки `logger` в метриках.
+
+        Raises:
+            ValueError: Если `batch_size` не положителен.
         """
-        # Вызываем стандартный doRollover, который переименует файлы
-        super().doRollover()
+        if batch_size <= 0:
+            raise ValueError(f"batch_size должен быть положительным, получено: {batch_size}")
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self._queue = log_queue
+        self.batch_size = batch_size
+        self._metric_labels = {"logger": name}
+
+    def enqueue_sentinel(self) -> None:
+        """Помещает в очередь сигнал остановки, дожидаясь свободного места."""
+        self._queue.put(_QUEUE_SENTINEL)
 
-        # Получаем список всех ротированных файлов, которые знает обработчик
-        files_to_compress = self.getFilesToDelete()
+    def _monitor(self) -> None:
+        q = self._queue
+        stopping = False
+        while not stopping:
+            try:
+                record = self.dequeue(True)
+            except queue.Empty:
+                break
+            taken = 1
+            batch: list[logging.LogRecord] = []
+            while True:
+                if record is _QUEUE_SENTINEL:
+                    stopping = True
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = q.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+            if batch:
+                self.handle_batch(batch)
+            for _ in range(taken):
+                q.task_done()
+            self._report_depth()
 
-        for source_file in files_to_compress:
-            dest_file = f"{source_file}.gz"
+    def handle_batch(self, records: Iterable[logging.LogRecord]) -> None:
+        """Передает пачку записей обработчикам.
 
-            # Если исходный файл существует и сжатого еще нет
-            if os.path.exists(source_file) and not os.path.exists(dest_file):
+        Args:
+            records: Записи из очереди.
+        """
+        prepared = [self.prepare(record) for record in records]
+        for handler in self.handlers:
+            accepted: list[logging.LogRecord] = []
+            for record in prepared:
+                if self.respect_handler_level and record.levelno < handler.level:
+                    continue
+                result: Any = handler.filter(record)
+                if not result:
+                    continue
+                accepted.append(result if isinstance(result, logging.LogRecord) else record)
+            if not accepted:
+                continue
+            if isinstance(handler, logging.StreamHandler) and type(handler).emit in _BATCHABLE_EMITS:
+                _write_batch(handler, accepted)
+                continue
+            for record in accepted:
+                handler.acquire()
                 try:
-                    import gzip
-                    with open(source_file, 'rb') as f_in:
-                        with gzip.open(dest_file, 'wb') as f_out:
-                            f_out.writelines(f_in)
-                    os.remove(source_file)  # Удаляем исходный несжатый файл
-                except Exception as e:
-                    self.handleError(f"Ошибка при сжатии файла {source_file}: {e}")  # type: ignore[arg-type]
+                    handler.emit(record)
+                finally:
+                    handler.release()
+
+    def _report_depth(self) -> None:
+        try:
+            from chutils.metrics import set_gauge
+
+            set_gauge("log_queue_size", float(self._queue.qsize()), labels=self._metric_labels)
+        except Exception:
+            pass
@@ -13,11 +13,14 @@ if TYPE_CHECKING:
 
 from .levels import LogLevel, MEDIUMDEBUG_LEVEL_NUM, DEVDEBUG_LEVEL_NUM
 from .utils import get_log_dir, register_async_listener
-from ..formatters import JSON_LOGGER_AVAILABLE, ChutilsJsonFormatter
+from ..formatters import JSON_LOGGER_AVAILABLE, ChutilsJsonFormatter, FastJsonFormatter
 from ..handlers import (
     SafeTimedRotatingFileHandler,
     CompressingRotatingFileHandler,
-    CompressingTimedRotatingFileHandler
+    CompressingTimedRotatingFileHandler,
+    BatchingQueueListener,
+    OverflowPolicy,
+    OverflowQueueHandler
 )
 from ..masking import (
     SecretMaskingFilter,
@@ -259,6 +262,9 @@ class LoggerBuilder:
             '%(asctime)s - %(name)s - %(levelname)s %(context)s- %(message)s'
 
         if self._should_use_json(json_format):
+            if str(self.settings.get('json_formatter', 'default')).lower() == 'fast':
+                static_fields = self.settings.get('json_static_fields') or {}
+                return FastJsonFormatter(static_fields if isinstance(static_fields, dict) else {})
             if JSON_LOGGER_AVAILABLE:
                 return ChutilsJsonFormatter('%(asctime)s %(name)s %(levelname)s %(message)s')
             self.logger.warning(
@@ -351,11 +357,20 @@ class LoggerBuilder:
             cval = self.settings.get('compress', False)
             compress = cval.lower() in ['true', '1'] if isinstance(cval, str) else bool(cval)
 
+        # Кодек и уровень сжатия передаются только сжимающим обработчикам
+        compression: dict[str, Any] = {}
+        if compress:
+            compression['codec'] = params.get('compress_codec') or self.settings.get('compress_codec', 'gzip')
+            level = params.get('compress_level', self.settings.get('compress_level'))
+            compression['compression_level'] = None if level is None else int(level)
+
         h_class: type[logging.FileHandler]
         if rtype == 'size':
             max_bytes = int(params.get('max_bytes') or self.settings.get('max_bytes', 5 * 1024 * 1024))
             h_class = CompressingRotatingFileHandler if compress else logging.handlers.RotatingFileHandler
-            return h_class(path, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, **self.kwargs)
+            return h_class(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, **compression, **self.kwargs
+            )
 
         # Ротация по времени
         when = params.get('when') or self.settings.get('when', 'D')
@@ -387,16 +402,32 @@ class LoggerBuilder:
         if at_time:
             h_args['atTime'] = at_time
 
-        return h_class(path, **h_args, **self.kwargs)
+        return h_class(path, **h_args, **compression, **self.kwargs)
 
     def _apply_async_logging(self, handlers: list[logging.Handler], **params: Any) -> None:
-        """Настраивает асинхронную обработку логов через очередь."""
+        """Настраивает асинхронную обработку логов через очередь с пакетной записью.
+
+        Параметры конфига: `async_max_queue_size` (размер очереди), `async_overflow`
+        (`block`, `drop_new` или `drop_oldest`), `async_block_timeout` (ожидание для `block`,
+        в секундах) и `async_batch_size` (максимальный размер пачки записи).
+        """
         max_size = int(params.get('async_max_queue_size') or self.settings.get('async_max_queue_size', 10000))
+        overflow = str(params.get('async_overflow') or self.settings.get('async_overflow', 'block')).lower()
+        raw_timeout = params.get('async_block_timeout', self.settings.get('async_block_timeout', 1.0))
+        block_timeout = None if raw_timeout is None or str(raw_timeout).lower() == 'none' else float(raw_timeout)
+        batch_size = int(params.get('async_batch_size') or self.settings.get('async_batch_size', 100))
         log_queue: queue.Queue[logging.LogRecord] = queue.Queue(max_size)
 
-        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self.logger.addHandler(OverflowQueueHandler(
+            log_queue,
+            overflow=cast('OverflowPolicy', overflow),
+            block_timeout=block_timeout,
+            name=self.logger.name,
+        ))
 
-        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener = BatchingQueueListener(
+            log_queue, *handlers, respect_handler_level=True, batch_size=batch_size, name=self.logger.name
+        )
         listener.start()
         register_async_listener(listener)
 
@@ -8,6 +8,7 @@ import logging  # chutils: ignore[ChutilsIntegrationRule]
 import os
 import re
 import threading
+from collections import deque
 from typing import Any
 
 # --- Предустановленные паттерны PII ---
@@ -19,6 +20,116 @@ PREDEFINED_PATTERNS = {
     "ssn": r"\b\d{3}-\d{2}-\d{4}\b",
 }
 
+# --- Поиск литеральных секретов ---
+
+_AUTOMATON_THRESHOLD = 64
+"Число литеральных секретов, начиная с которого вместо альтернации regex используется автомат Ахо-Корасик."
+
+
+class _LiteralMatcher:
+    """
+    Поиск всех вхождений набора литеральных секретов за один проход по тексту.
+
+    Для небольших наборов используется альтернация в regex (быстрее за счет C-реализации),
+    для больших — автомат Ахо-Корасик, время работы которого не зависит от числа секретов.
+    В обоих режимах маскируется объединение всех вхождений, включая перекрывающиеся.
+    """
+
+    __slots__ = ("_fail", "_goto", "_longest", "_regex")
+
+    def __init__(self, literals: set[str]) -> None:
+        """Компилирует набор литералов.
+
+        Args:
+            literals: Непустые строки для поиска.
+        """
+        self._regex: re.Pattern[str] | None = None
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Длина самого длинного литерала, оканчивающегося в узле (с учетом суффиксных ссылок)
+        self._longest: list[int] = [0]
+        if len(literals) < _AUTOMATON_THRESHOLD:
+            # Опережающая проверка находит самое длинное вхождение в каждой позиции,
+            # а не только непересекающиеся
+            alternation = "|".join(re.escape(m) for m in sorted(literals, key=len, reverse=True))
+            self._regex = re.compile(f"(?=({alternation}))")
+        else:
+            self._build(literals)
+
+    def _build(self, literals: set[str]) -> None:
+        goto, longest = self._goto, self._longest
+        for literal in literals:
+            node = 0
+            for ch in literal:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    longest.append(0)
+                    goto[node][ch] = nxt
+                node = nxt
+            longest[node] = max(longest[node], len(literal))
+
+        fail = self._fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                longest[child] = max(longest[child], longest[fail[child]])
+                queue.append(child)
+
+    def _spans(self, text: str) -> list[tuple[int, int]]:
+        if self._regex is not None:
+            return [match.span(1) for match in self._regex.finditer(text)]
+        goto, fail, longest = self._goto, self._fail, self._longest
+        spans: list[tuple[int, int]] = []
+        node = 0
+        for index, ch in enumerate(text):
+            nxt = goto[node].get(ch)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto[node].get(ch)
+            node = nxt or 0
+            length = longest[node]
+            if length:
+                spans.append((index + 1 - length, index + 1))
+        return spans
+
+    def sub(self, repl: str, text: str) -> str:
+        """Заменяет все вхождения литералов на `repl`.
+
+        Args:
+            repl: Строка замены.
+            text: Исходный текст.
+
+        Returns:
+            Текст с замененными вхождениями.
+        """
+        spans = self._spans(text)
+        if not spans:
+            return text
+        # Объединяем пересекающиеся вхождения; соседние остаются раздельными
+        merged: list[list[int]] = []
+        for start, end in sorted(spans):
+            if merged and start < merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        parts: list[str] = []
+        position = 0
+        for start, end in merged:
+            parts.append(text[position:start])
+            parts.append(repl)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
+
 # --- Глобальное состояние для маскирования секретов ---
 
 _GLOBAL_MASKS: set[str] = set()
@@ -26,40 +137,148 @@ _GLOBAL_MASKS: set[str] = set()
 _CUSTOM_PATTERNS: set[str] = set()
 "Глобальный список регулярных выражений для маскирования."
 
+_LITERAL_MATCHER: _LiteralMatcher | None = None
+"Скомпилированный поиск литеральных секретов."
 _MASK_RE: re.Pattern[str] | None = None
-"Скомпилированное регулярное выражение для поиска всех секретов."
+"Скомпилированное регулярное выражение для поиска по пользовательским паттернам."
+_MASKING_DISABLED: bool | None = None
+"Кэш значения CH_DISABLE_LOG_MASKING (None — еще не прочитано)."
 _masks_lock = threading.Lock()
 "Блокировка для обеспечения потокобезопасности при обновлении масок."
 
+_MASK_PLACEHOLDER = "[MASKED]"
+"Строка, которой заменяются найденные секреты."
+
 
 def _update_mask_re() -> None:
     """
-    Обновляет и компилирует регулярное выражение на основе текущих масок и паттернов.
+    Перекомпилирует поиск литеральных секретов и регулярное выражение пользовательских паттернов.
+
+    Также сбрасывает кэш переменной окружения CH_DISABLE_LOG_MASKING.
     """
-    global _MASK_RE
+    global _LITERAL_MATCHER, _MASK_RE, _MASKING_DISABLED
     with _masks_lock:
-        if not _GLOBAL_MASKS and not _CUSTOM_PATTERNS:
-            _MASK_RE = None
-            return
+        literals = {m for m in _GLOBAL_MASKS if m}
+        patterns = [p for p in _CUSTOM_PATTERNS if p]
+        _LITERAL_MATCHER = _LiteralMatcher(literals) if literals else None
+        _MASK_RE = re.compile("|".join(f"({p})" for p in patterns)) if patterns else None
+        _MASKING_DISABLED = None
+
+
+def _masking_disabled() -> bool:
+    global _MASKING_DISABLED
+    disabled = _MASKING_DISABLED
+    if disabled is None:
+        value = os.getenv("CH_DISABLE_LOG_MASKING", "")  # chutils: ignore[ChutilsIntegrationRule]
+        disabled = _MASKING_DISABLED = value.lower() in ("true", "1", "yes", "y")
+    return disabled
+
+
+def _mask(text: str) -> str:
+    """Маскирует в тексте все зарегистрированные секреты и паттерны."""
+    matcher, pattern = _LITERAL_MATCHER, _MASK_RE
+    if matcher is not None:
+        text = matcher.sub(_MASK_PLACEHOLDER, text)
+    if pattern is not None:
+        text = pattern.sub(_MASK_PLACEHOLDER, text)
+    return text
 
-        parts: list[str] = []
 
-        # 1. Добавляем литеральные маски (экранированные)
-        if _GLOBAL_MASKS:
-            sorted_masks = sorted([m for m in _GLOBAL_MASKS if m], key=len, reverse=True)
-            if sorted_masks:
-                parts.append("|".join(re.escape(m) for m in sorted_masks))
+def _mask_value(value: Any) -> Any:
+    """Возвращает копию значения с замаскированными строками.
 
-        # 2. Добавляем кастомные паттерны
-        if _CUSTOM_PATTERNS:
-            parts.extend(list(_CUSTOM_PATTERNS))
+    Словари, списки и кортежи копируются рекурсивно, исходный объект вызывающего
+    кода не изменяется. Ключи словарей и значения других типов не маскируются.
 
-        if not parts:
-            _MASK_RE = None
-            return
+    Args:
+        value: Сообщение записи лога или его вложенное значение.
+
+    Returns:
+        Замаскированная копия значения.
+    """
+    if isinstance(value, str):
+        return _mask(value)
+    if isinstance(value, dict):
+        return {key: _mask_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_mask_value(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_mask_value(item) for item in value)
+    return value
+
+
+_UNSET: Any = object()
+"Признак еще не вычисленной замаскированной копии сообщения."
+
+
+class _MaskedMessage:
+    """
+    Сообщение записи лога, которое форматируется и маскируется при первом обращении.
+
+    Обработчики вызывают `str(record.msg)` только для записей, которые действительно
+    выводятся, поэтому отброшенные по уровню обработчика записи не маскируются.
+    Исходные шаблон и аргументы доступны через атрибуты `msg` и `args`, а сравнение
+    со строкой сравнивает итоговый замаскированный текст. Нестроковые сообщения
+    (словари структурированных логов, списки) оборачиваются так же; JSON-форматтеры
+    получают их замаскированную копию через `_structured_message`.
+    """
+
+    __slots__ = ("_text", "_value", "args", "msg")
+
+    def __init__(self, msg: Any, args: Any) -> None:
+        self.msg = msg
+        self.args = args
+        self._text: str | None = None
+        self._value: Any = _UNSET
 
-        pattern = "|".join(f"({p})" for p in parts)
-        _MASK_RE = re.compile(pattern)
+    def masked_value(self) -> Any:
+        """Возвращает замаскированную копию исходного сообщения того же типа.
+
+        Returns:
+            Копия сообщения; вычисляется при первом вызове.
+        """
+        value = self._value
+        if value is _UNSET:
+            value = self._value = _mask_value(self.msg)
+        return value
+
+    def __str__(self) -> str:
+        text = self._text
+        if text is None:
+            text = str(self.msg)
+            if self.args:
+                text = text % self.args
+            text = self._text = _mask(text)
+        return text
+
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (str, _MaskedMessage)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def _structured_message(msg: Any) -> dict[str, Any] | None:
+    """Возвращает сообщение-словарь структурированного лога.
+
+    Args:
+        msg: `record.msg`, возможно обернутый `SecretMaskingFilter`.
+
+    Returns:
+        Сам словарь, его замаскированная копия для обернутого сообщения или None,
+        если сообщение не словарь.
+    """
+    if isinstance(msg, _MaskedMessage):
+        if not isinstance(msg.msg, dict):
+            return None
+        value: dict[str, Any] = msg.masked_value()
+        return value
+    return msg if isinstance(msg, dict) else None
 
 
 def register_secret_mask(secret: str) -> None:
@@ -96,7 +315,9 @@ class SecretMaskingFilter(logging.Filter):
     Фильтр для автоматического маскирования секретов в сообщениях логов.
 
     Ищет в тексте сообщения и в аргументах все зарегистрированные секреты
-    и паттерны и заменяет их на '[MASKED]'.
+    и паттерны и заменяет их на '[MASKED]'. Литеральные секреты ищутся одним
+    проходом (см. `_LiteralMatcher`), паттерны — отдельным регулярным выражением.
+    Значение CH_DISABLE_LOG_MASKING кэшируется и перечитывается при изменении набора масок.
     """
 
     def __init__(
@@ -127,7 +348,13 @@ class SecretMaskingFilter(logging.Filter):
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
-        Применяет маскирование к записи лога.
+        Подготавливает запись лога к маскированию.
+
+        Маскирование откладывается до форматирования: сообщение заменяется на объект,
+        который при первом `str()` подставляет аргументы и маскирует итоговый текст
+        (включая нестроковые аргументы), а `record.args` очищается. Сообщение-словарь
+        маскируется так же лениво: `ChutilsJsonFormatter` и `FastJsonFormatter` получают
+        его замаскированную копию, а объект вызывающего кода не изменяется.
 
         Args:
             record: Запись лога.
@@ -136,36 +363,12 @@ class SecretMaskingFilter(logging.Filter):
             Всегда True (фильтр не отсеивает записи, а модифицирует их).
         """
         # Если маскирование отключено через окружение, ничего не делаем.
-        if os.getenv("CH_DISABLE_LOG_MASKING", "").lower() in ("true", "1", "yes", "y"):  # chutils: ignore[ChutilsIntegrationRule]
+        if _masking_disabled():
             return True
 
-        if _MASK_RE is None:
+        if (_LITERAL_MATCHER is None and _MASK_RE is None) or isinstance(record.msg, _MaskedMessage):
             return True
 
-        # Маскируем основное сообщение, если оно является строкой.
-        if isinstance(record.msg, str):
-            record.msg = _MASK_RE.sub("[MASKED]", record.msg)
-
-        # Маскируем аргументы, если они являются строками.
-        if record.args:
-            new_args: list[Any] = []
-            # Если record.args это словарь, мы не можем его просто итерировать как список
-            # Но стандартный logging.Filter предполагает что args это кортеж или словарь.
-            # В случае словаря sub() не сработает напрямую.
-            if isinstance(record.args, dict):
-                new_dict_args: dict[Any, Any] = {}
-                for k, v in record.args.items():
-                    if isinstance(v, str):
-                        new_dict_args[k] = _MASK_RE.sub("[MASKED]", v)
-                    else:
-                        new_dict_args[k] = v
-                record.args = new_dict_args
-            else:
-                for arg in record.args:
-                    if isinstance(arg, str):
-                        new_args.append(_MASK_RE.sub("[MASKED]", arg))
-                    else:
-                        new_args.append(arg)
-                record.args = tuple(new_args)
-
+        record.msg = _MaskedMessage(record.msg, record.args)
+        record.args = ()
         return True
@@ -1,4 +1,5 @@
 import logging  # chutils: ignore[ChutilsIntegrationRule]
+import threading
 
 from .base import MetricsProvider
 from .in_memory import InMemoryMetricsProvider
@@ -26,6 +27,9 @@ logger = logging.getLogger(__name__)
 _active_provider: MetricsProvider | None = None
 """Текущий глобально активный провайдер метрик (синглтон)."""
 
+_provider_lock = threading.RLock()
+"""Защищает ленивую инициализацию провайдера от гонки между потоками."""
+
 
 def get_provider() -> MetricsProvider:
     """Получить текущий активный провайдер метрик.
@@ -36,6 +40,15 @@ def get_provider() -> MetricsProvider:
     Returns:
         Текущий активный экземпляр MetricsProvider.
     """
+    provider = _active_provider
+    if provider is not None:
+        return provider
+    with _provider_lock:
+        return _init_provider()
+
+
+def _init_provider() -> MetricsProvider:
+    """Инициализирует провайдер по умолчанию (вызывается под `_provider_lock`)."""
     global _active_provider
     if _active_provider is None:
         # Пытаемся подгрузить плагины метрик
@@ -1,15 +1,99 @@
+import bisect
+import itertools
 import threading
+from collections.abc import Sequence
 from typing import Any
 
 from .base import MetricsProvider
+from .sketch import DDSketch
+
+
+class _HistogramSeries:
+    """Предагрегированная гистограмма одной серии: счетчики фиксированных бакетов, сумма и количество."""
+
+    __slots__ = ("bounds", "count", "counts", "lock", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # Последний элемент — бакет +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Учитывает наблюдение в бакете, сумме и количестве.
+
+        Args:
+            value: Наблюдаемое значение.
+        """
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        """Копирует состояние серии под блокировкой.
+
+        Returns:
+            Накопительные счетчики бакетов (последний — +Inf), сумма и количество наблюдений.
+        """
+        with self.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative: list[int] = []
+        running = 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class _SummarySeries:
+    """Summary одной серии: квантильный скетч, сумма и количество."""
+
+    __slots__ = ("lock", "quantiles", "sketch", "sum")
+
+    def __init__(self, quantiles: tuple[float, ...], relative_accuracy: float) -> None:
+        self.quantiles = quantiles
+        self.sketch = DDSketch(relative_accuracy)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Добавляет наблюдение в скетч и сумму.
+
+        Args:
+            value: Наблюдаемое значение.
+        """
+        with self.lock:
+            self.sketch.add(value)
+            self.sum += value
+
+    def snapshot(self) -> tuple[dict[float, float | None], float, int]:
+        """Вычисляет квантили серии под блокировкой.
+
+        Returns:
+            Значения настроенных квантилей (None для пустой серии), сумма и количество наблюдений.
+        """
+        with self.lock:
+            values = {q: self.sketch.quantile(q) for q in self.quantiles}
+            return values, self.sum, self.sketch.count
 
 
 class InMemoryMetricsProvider(MetricsProvider):
     """
     Потокобезопасный in-memory провайдер метрик.
-    
+
     Не требует внешних зависимостей. Форматирует экспорт в стандартный
     текстовый формат Prometheus для бесшовной интеграции.
+
+    Гистограммы не хранят наблюдения: каждая серия — это счетчики фиксированных
+    бакетов, поэтому память на серию постоянна, а `observe` стоит O(log бакетов).
+    Для отдельных метрик можно задать свои бакеты (`configure_histogram`) или
+    считать квантили вместо бакетов (`configure_summary`). Экспорт копирует
+    состояние серий под короткими блокировками и форматирует текст без них,
+    поэтому не задерживает запись метрик.
     """
 
     # Стандартные бакеты для Histogram (в секундах/величинах)
@@ -17,20 +101,85 @@ class InMemoryMetricsProvider(MetricsProvider):
         0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0
     ]
 
-    def __init__(self) -> None:
-        """Инициализирует InMemoryMetricsProvider."""
+    DEFAULT_QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99)
+    """Квантили summary по умолчанию."""
+
+    def __init__(self, buckets: Sequence[float] | None = None) -> None:
+        """Инициализирует InMemoryMetricsProvider.
+
+        Args:
+            buckets: Границы бакетов гистограмм по умолчанию. None — `DEFAULT_BUCKETS`.
+
+        Raises:
+            ValueError: Если границы не возрастают строго.
+        """
         self._lock = threading.Lock()
         # Структура: {metric_name: {frozenset_labels: value}}
         self._counters: dict[str, dict[frozenset[tuple[str, str]], float]] = {}
         self._gauges: dict[str, dict[frozenset[tuple[str, str]], float]] = {}
-        # Структура: {metric_name: {frozenset_labels: [values]}}
-        self._histograms: dict[str, dict[frozenset[tuple[str, str]], list[float]]] = {}
+        # Структура: {metric_name: {frozenset_labels: серия}}
+        self._histograms: dict[str, dict[frozenset[tuple[str, str]], _HistogramSeries | _SummarySeries]] = {}
+        self._default_bounds = self._validate_buckets(self.DEFAULT_BUCKETS if buckets is None else buckets)
+        self._bucket_overrides: dict[str, tuple[float, ...]] = {}
+        self._summaries: dict[str, tuple[tuple[float, ...], float]] = {}
+
+    @staticmethod
+    def _validate_buckets(buckets: Sequence[float]) -> tuple[float, ...]:
+        bounds = tuple(float(b) for b in buckets if b != float("inf"))
+        if any(a >= b for a, b in itertools.pairwise(bounds)):
+            raise ValueError(f"Границы бакетов должны строго возрастать, получено: {list(buckets)}")
+        return bounds
 
     def _get_labels_key(self, labels: dict[str, str] | None) -> frozenset[tuple[str, str]]:
         if not labels:
             return frozenset()
         return frozenset(labels.items())
 
+    def configure_histogram(self, name: str, buckets: Sequence[float]) -> None:
+        """Задает границы бакетов для конкретной гистограммы.
+
+        Уже накопленные данные этой метрики сбрасываются.
+
+        Args:
+            name: Имя метрики.
+            buckets: Возрастающие границы бакетов (бакет +Inf добавляется автоматически).
+
+        Raises:
+            ValueError: Если границы не возрастают строго.
+        """
+        bounds = self._validate_buckets(buckets)
+        with self._lock:
+            self._bucket_overrides[name] = bounds
+            self._summaries.pop(name, None)
+            self._histograms.pop(name, None)
+
+    def configure_summary(
+            self,
+            name: str,
+            quantiles: Sequence[float] = DEFAULT_QUANTILES,
+            relative_accuracy: float = 0.01,
+    ) -> None:
+        """Переводит метрику в режим summary: вместо бакетов считаются квантили (DDSketch).
+
+        Уже накопленные данные этой метрики сбрасываются.
+
+        Args:
+            name: Имя метрики.
+            quantiles: Экспортируемые квантили (от 0 до 1).
+            relative_accuracy: Относительная погрешность оценки квантилей.
+
+        Raises:
+            ValueError: Если квантиль или погрешность вне допустимого диапазона.
+        """
+        levels = tuple(float(q) for q in quantiles)
+        if any(not 0 <= q <= 1 for q in levels):
+            raise ValueError(f"Квантили должны быть в [0, 1], получено: {list(quantiles)}")
+        DDSketch(relative_accuracy)  # Проверка параметров до изменения состояния
+        with self._lock:
+            self._summaries[name] = (levels, relative_accuracy)
+            self._bucket_overrides.pop(name, None)
+            self._histograms.pop(name, None)
+
     def increment(self, name: str, value: float = 1.0, labels: dict[str, str] | None = None) -> None:
         """Увеличить счетчик (Counter) на заданное значение.
 
@@ -68,12 +217,51 @@ class InMemoryMetricsProvider(MetricsProvider):
             labels: Словарь меток.
         """
         key = self._get_labels_key(labels)
+        # Чтение словарей атомарно под GIL; общая блокировка нужна только для создания серии
+        series = self._histograms.get(name, {}).get(key)
+        if series is None:
+            with self._lock:
+                metric_series = self._histograms.setdefault(name, {})
+                series = metric_series.get(key)
+                if series is None:
+                    series = self._create_series(name)
+                    metric_series[key] = series
+        series.observe(value)
+
+    def _create_series(self, name: str) -> _HistogramSeries | _SummarySeries:
+        summary = self._summaries.get(name)
+        if summary is not None:
+            return _SummarySeries(*summary)
+        return _HistogramSeries(self._bucket_overrides.get(name, self._default_bounds))
+
+    def _snapshot(self) -> tuple[
+        dict[str, dict[frozenset[tuple[str, str]], float]],
+        dict[str, dict[frozenset[tuple[str, str]], float]],
+        dict[str, dict[frozenset[tuple[str, str]], _HistogramSeries | _SummarySeries]],
+    ]:
         with self._lock:
-            if name not in self._histograms:
-                self._histograms[name] = {}
-            if key not in self._histograms[name]:
-                self._histograms[name][key] = []
-            self._histograms[name][key].append(value)
+            return (
+                {name: dict(values) for name, values in self._counters.items()},
+                {name: dict(values) for name, values in self._gauges.items()},
+                {name: dict(series) for name, series in self._histograms.items()},
+            )
+
+    def get_quantile(self, name: str, q: float, labels: dict[str, str] | None = None) -> float | None:
+        """Возвращает оценку квантиля summary-метрики.
+
+        Args:
+            name: Имя метрики, настроенной через `configure_summary`.
+            q: Уровень квантиля от 0 до 1.
+            labels: Словарь меток серии.
+
+        Returns:
+            Оценка квантиля или None, если серия отсутствует или не является summary.
+        """
+        series = self._histograms.get(name, {}).get(self._get_labels_key(labels))
+        if not isinstance(series, _SummarySeries):
+            return None
+        with series.lock:
+            return series.sketch.quantile(q)
 
     def generate_latest(self) -> str:
         """Экспортировать накопленные метрики в текстовом формате.
@@ -82,56 +270,47 @@ class InMemoryMetricsProvider(MetricsProvider):
             Строка с отформатированными метриками.
         """
         lines: list[str] = []
+        counters, gauges, histograms = self._snapshot()
 
-        with self._lock:
-            # 1. Форматируем Counters
-            for name, labels_dict in self._counters.items():
-                lines.append(f"# TYPE {name} counter")
-                for labels_set, value in labels_dict.items():
-                    lbl_str = self._format_labels(labels_set)
-                    lines.append(f"{name}{lbl_str} {value}")
-
-            # 2. Форматируем Gauges
-            for name, labels_dict in self._gauges.items():
-                lines.append(f"# TYPE {name} gauge")
-                for labels_set, value in labels_dict.items():
-                    lbl_str = self._format_labels(labels_set)
-                    lines.append(f"{name}{lbl_str} {value}")
-
-            # 3. Форматируем Histograms
-            for name, hist_dict in self._histograms.items():
-                lines.append(f"# TYPE {name} histogram")
-                for labels_set, values in hist_dict.items():
-                    # Считаем сумму и количество
-                    count = len(values)
-                    total_sum = sum(values)
-
-                    # Считаем бакеты
-                    buckets_counts = {b: 0 for b in self.DEFAULT_BUCKETS}
-                    inf_count = 0
-                    for val in values:
-                        for b in self.DEFAULT_BUCKETS:
-                            if val <= b:
-                                buckets_counts[b] += 1
-                        inf_count += 1
-
-                    # Выводим бакеты в формате Prometheus
-                    for b in self.DEFAULT_BUCKETS:
+        # 1. Форматируем Counters
+        for name, labels_dict in counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for labels_set, value in labels_dict.items():
+                lbl_str = self._format_labels(labels_set)
+                lines.append(f"{name}{lbl_str} {value}")
+
+        # 2. Форматируем Gauges
+        for name, labels_dict in gauges.items():
+            lines.append(f"# TYPE {name} gauge")
+            for labels_set, value in labels_dict.items():
+                lbl_str = self._format_labels(labels_set)
+                lines.append(f"{name}{lbl_str} {value}")
+
+        # 3. Форматируем Histograms и Summaries
+        for name, series_dict in histograms.items():
+            is_summary = any(isinstance(series, _SummarySeries) for series in series_dict.values())
+            lines.append(f"# TYPE {name} {'summary' if is_summary else 'histogram'}")
+            for labels_set, series in series_dict.items():
+                if isinstance(series, _SummarySeries):
+                    quantiles, total_sum, count = series.snapshot()
+                    for q, q_value in quantiles.items():
+                        q_labels = dict(labels_set)
+                        q_labels["quantile"] = str(q)
+                        lbl_str = self._format_labels(frozenset(q_labels.items()))
+                        lines.append(f"{name}{lbl_str} {q_value if q_value is not None else 'NaN'}")
+                else:
+                    cumulative, total_sum, count = series.snapshot()
+                    # Выводим бакеты в формате Prometheus (последний — +Inf)
+                    for bound, bucket_count in zip((*map(str, series.bounds), "+Inf"), cumulative):
                         b_labels = dict(labels_set)
-                        b_labels["le"] = str(b)
+                        b_labels["le"] = bound
                         lbl_str = self._format_labels(frozenset(b_labels.items()))
-                        lines.append(f"{name}_bucket{lbl_str} {buckets_counts[b]}")
+                        lines.append(f"{name}_bucket{lbl_str} {bucket_count}")
 
-                    # Выводим бакет +Inf
-                    inf_labels = dict(labels_set)
-                    inf_labels["le"] = "+Inf"
-                    lbl_str = self._format_labels(frozenset(inf_labels.items()))
-                    lines.append(f"{name}_bucket{lbl_str} {inf_count}")
-
-                    # Выводим _sum и _count
-                    lbl_str = self._format_labels(labels_set)
-                    lines.append(f"{name}_sum{lbl_str} {total_sum}")
-                    lines.append(f"{name}_count{lbl_str} {count}")
+                # Выводим _sum и _count
+                lbl_str = self._format_labels(labels_set)
+                lines.append(f"{name}_sum{lbl_str} {total_sum}")
+                lines.append(f"{name}_count{lbl_str} {count}")
 
         return "\n".join(lines) + "\n" if lines else ""
 
@@ -144,27 +323,40 @@ class InMemoryMetricsProvider(MetricsProvider):
     def get_metrics(self) -> dict[str, Any]:
         """Возвращает сырые накопленные метрики в виде словаря (для отладки и тестов).
 
+        Для гистограмм возвращаются `count`, `sum` и накопительные `buckets`
+        (`{граница: число наблюдений <= границы}`), для summary — `quantiles`.
+
         Returns:
             Словарь с сырыми данными по счетчикам, датчикам и гистограммам.
         """
-        with self._lock:
-            return {
-                "counters": {
-                    name: [{"labels": dict(labels_set), "value": value} for labels_set, value in labels_dict.items()]
-                    for name, labels_dict in self._counters.items()
-                },
-                "gauges": {
-                    name: [{"labels": dict(labels_set), "value": value} for labels_set, value in labels_dict.items()]
-                    for name, labels_dict in self._gauges.items()
-                },
-                "histograms": {
-                    name: [{"labels": dict(labels_set), "values": values} for labels_set, values in hist_dict.items()]
-                    for name, hist_dict in self._histograms.items()
-                }
-            }
+        counters, gauges, histograms = self._snapshot()
+        result_histograms: dict[str, list[dict[str, Any]]] = {}
+        for name, series_dict in histograms.items():
+            entries: list[dict[str, Any]] = []
+            for labels_set, series in series_dict.items():
+                entry: dict[str, Any] = {"labels": dict(labels_set)}
+                if isinstance(series, _SummarySeries):
+                    quantiles, entry["sum"], entry["count"] = series.snapshot()
+                    entry["quantiles"] = quantiles
+                else:
+                    cumulative, entry["sum"], entry["count"] = series.snapshot()
+                    entry["buckets"] = dict(zip((*series.bounds, float("inf")), cumulative))
+                entries.append(entry)
+            result_histograms[name] = entries
+        return {
+            "counters": {
+                name: [{"labels": dict(labels_set), "value": value} for labels_set, value in labels_dict.items()]
+                for name, labels_dict in counters.items()
+            },
+            "gauges": {
+                name: [{"labels": dict(labels_set), "value": value} for labels_set, value in labels_dict.items()]
+                for name, labels_dict in gauges.items()
+            },
+            "histograms": result_histograms,
+        }
 
     def clear(self) -> None:
-        """Очищает все накопленные данные метрик."""
+        """Очищает все накопленные данные метрик (настройки бакетов и summary сохраняются)."""
         with self._lock:
             self._counters.clear()
             self._gauges.clear()
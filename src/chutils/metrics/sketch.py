@@ -0,0 +1,145 @@
+"""
+Квантильный скетч DDSketch для summary-метрик `InMemoryMetricsProvider`.
+
+Значения раскладываются по логарифмическим корзинам с шагом `gamma = (1 + a) / (1 - a)`,
+поэтому любой квантиль оценивается с относительной погрешностью не более `a`,
+а память зависит только от диапазона значений, а не от их количества.
+"""
+from __future__ import annotations
+
+import math
+
+
+class DDSketch:
+    """
+    Скетч для оценки квантилей с гарантированной относительной погрешностью.
+
+    Число корзин ограничено `max_bins`: при переполнении корзины самых малых по модулю
+    значений сливаются в одну, пока их не останется половина, так что точность
+    сохраняется для верхних квантилей.
+    Класс не потокобезопасен и вызывается под блокировкой владельца.
+    """
+
+    __slots__ = ("_gamma_log", "_max_bins", "_negative", "_positive", "_zero", "count", "max", "min")
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048) -> None:
+        """Инициализирует пустой скетч.
+
+        Args:
+            relative_accuracy: Допустимая относительная погрешность квантилей (0 < a < 1).
+            max_bins: Максимальное число корзин для положительных и отрицательных значений.
+
+        Raises:
+            ValueError: Если параметры вне допустимого диапазона.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy должен быть в (0, 1), получено: {relative_accuracy}")
+        if max_bins <= 0:
+            raise ValueError(f"max_bins должен быть положительным, получено: {max_bins}")
+        self._gamma_log = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self._max_bins = max_bins
+        self._positive: dict[int, int] = {}
+        self._negative: dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Добавляет наблюдение.
+
+        Args:
+            value: Наблюдаемое значение.
+        """
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value > 0:
+            self._insert(self._positive, value)
+        elif value < 0:
+            self._insert(self._negative, -value)
+        else:
+            self._zero += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Оценивает квантиль.
+
+        Args:
+            q: Уровень квантиля от 0 до 1.
+
+        Returns:
+            Оценка квантиля или None, если наблюдений не было.
+
+        Raises:
+            ValueError: Если `q` вне диапазона [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Квантиль должен быть в [0, 1], получено: {q}")
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self._negative, reverse=True):
+            seen += self._negative[index]
+            if seen > rank:
+                return self._clamp(-self._value(index))
+        seen += self._zero
+        if seen > rank:
+            return self._clamp(0.0)
+        for index in sorted(self._positive):
+            seen += self._positive[index]
+            if seen > rank:
+                return self._clamp(self._value(index))
+        return self.max
+
+    def _insert(self, bins: dict[int, int], magnitude: float) -> None:
+        """Увеличивает счетчик корзины для модуля значения, при переполнении сливая младшие корзины.
+
+        Args:
+            bins: Корзины положительных или отрицательных значений.
+            magnitude: Модуль наблюдаемого значения (больше нуля).
+        """
+        index = math.ceil(math.log(magnitude) / self._gamma_log)
+        bins[index] = bins.get(index, 0) + 1
+        if len(bins) > self._max_bins:
+            self._collapse(bins)
+
+    def _collapse(self, bins: dict[int, int]) -> None:
+        """Сливает младшие корзины в одну, оставляя не больше половины `max_bins`.
+
+        Слияние сразу освобождает половину корзин, поэтому сортировка выполняется
+        не на каждой вставке, а один раз на `max_bins / 2` новых корзин.
+
+        Args:
+            bins: Переполненные корзины положительных или отрицательных значений.
+        """
+        ordered = sorted(bins)
+        keep = max(self._max_bins // 2, 1)
+        target = ordered[-keep]
+        for index in ordered[:-keep]:
+            bins[target] += bins.pop(index)
+
+    def _value(self, index: int) -> float:
+        """Возвращает представительное значение корзины.
+
+        Это середина интервала (gamma^(i-1), gamma^i] в смысле относительной погрешности.
+
+        Args:
+            index: Индекс корзины.
+
+        Returns:
+            Значение с относительной погрешностью не больше `relative_accuracy`.
+        """
+        gamma = math.exp(self._gamma_log)
+        return 2 * math.exp(self._gamma_log * index) / (gamma + 1)
+
+    def _clamp(self, value: float) -> float:
+        """Ограничивает оценку наблюдавшимися минимумом и максимумом.
+
+        Args:
+            value: Оценка квантиля.
+
+        Returns:
+            Значение в отрезке [min, max].
+        """
+        return min(max(value, self.min), self.max)
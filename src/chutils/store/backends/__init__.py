@@ -6,6 +6,8 @@ from __future__ import annotations
 from .base import BaseStoreBackend as BaseStoreBackend
 from .memcached import MemcachedStore as MemcachedStore
 from .memory import MemoryStore as MemoryStore
+from .redis import RedisInvalidationBus as RedisInvalidationBus
 from .redis import RedisStore as RedisStore
+from .tiered import TieredStore as TieredStore
 
-__all__ = ["BaseStoreBackend", "MemoryStore", "RedisStore", "MemcachedStore"]
+__all__ = ["BaseStoreBackend", "MemoryStore", "RedisStore", "MemcachedStore", "TieredStore", "RedisInvalidationBus"]
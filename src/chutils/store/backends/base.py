@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 
@@ -129,3 +130,92 @@ class BaseStoreBackend(ABC):
             True при успешной очистке.
         """
         raise NotImplementedError
+
+    # --- Пакетные операции (по умолчанию выполняются по одному ключу) ---
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей (синхронно).
+
+        Реализация по умолчанию вызывает `get` для каждого ключа; бэкенды
+        переопределяют ее, чтобы получить все значения за один запрос.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей; отсутствующие и просроченные ключи в него не входят.
+        """
+        found: dict[str, Any] = {}
+        for key in keys:
+            val = self.get(key, default=None)
+            if val is not None:
+                found[key] = val
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений с общим TTL (синхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        results = [self.set(key, value, ttl=ttl) for key, value in items.items()]
+        return all(results)
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей (синхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        return sum(1 for key in keys if self.delete(key))
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей; отсутствующие и просроченные ключи в него не входят.
+        """
+        found: dict[str, Any] = {}
+        for key in keys:
+            val = await self.aget(key, default=None)
+            if val is not None:
+                found[key] = val
+        return found
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений с общим TTL (асинхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        results = [await self.aset(key, value, ttl=ttl) for key, value in items.items()]
+        return all(results)
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        deleted = 0
+        for key in keys:
+            if await self.adelete(key):
+                deleted += 1
+        return deleted
@@ -3,8 +3,10 @@ Memcached бэкенд для chutils.store.
 """
 from __future__ import annotations
 
+import asyncio
 import importlib.util
 import sys
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from chutils.exceptions import OptionalDependencyError
@@ -144,6 +146,57 @@ class MemcachedStore(BaseStoreBackend):
         res = client.flush_all()
         return bool(res)
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей одной командой get (синхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return {}
+        client = self._get_sync_client()
+        return dict(client.get_many(key_list))
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений за один round trip (синхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        if not items:
+            return True
+        client = self._get_sync_client()
+        expire = int(ttl) if ttl is not None else 0
+        failed = client.set_many(dict(items), expire=expire)
+        return not failed
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей за один round trip (синхронно).
+
+        Пакетное удаление в протоколе Memcached не сообщает результат по каждому ключу,
+        поэтому возвращается число запрошенных ключей.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество ключей, отправленных на удаление.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return 0
+        client = self._get_sync_client()
+        client.delete_many(key_list)
+        return len(key_list)
+
     async def aget(self, key: str, default: Any = None) -> Any:
         """Извлекает значение по ключу (асинхронно).
 
@@ -200,6 +253,63 @@ class MemcachedStore(BaseStoreBackend):
         val = await self.aget(key, default=None)
         return val is not None
 
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей одной командой get (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return {}
+        client = self._get_async_client()
+        values = await client.multi_get(*(key.encode("utf-8") for key in key_list))
+        return {key: val for key, val in zip(key_list, values) if val is not None}
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений (асинхронно).
+
+        У aiomemcache нет пакетной записи, поэтому при установленном pymemcache пакет
+        отправляется за один round trip через `set_many` в отдельном потоке. Без него
+        записи отправляются одновременно через пул соединений асинхронного клиента.
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        if not items:
+            return True
+        if is_pymemcache_available():
+            return await asyncio.to_thread(self.set_many, items, ttl)
+        results = await asyncio.gather(*(self.aset(key, value, ttl=ttl) for key, value in items.items()))
+        return all(results)
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей (асинхронно).
+
+        Как и `aset_many`, использует пакетный `delete_many` pymemcache в отдельном потоке,
+        а без него — одновременные удаления через асинхронный клиент.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество ключей, отправленных на удаление (через pymemcache), или удаленных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return 0
+        if is_pymemcache_available():
+            return await asyncio.to_thread(self.delete_many, key_list)
+        results = await asyncio.gather(*(self.adelete(key) for key in key_list))
+        return sum(1 for deleted in results if deleted)
+
     async def aclear(self) -> bool:
         """Очищает сервер Memcached (асинхронно).
 
@@ -5,17 +5,78 @@ from __future__ import annotations
 
 import threading
 import time
+from collections.abc import Iterable, Mapping
 from typing import Any
 
+from chutils.cache.eviction import (
+    EvictionPolicy,
+    EvictionPolicyName,
+    create_eviction_policy,
+)
+from chutils.cache.expiry import ExpiryIndex, ExpiryReaper
+
 from .base import BaseStoreBackend
 
 
 class MemoryStore(BaseStoreBackend):
-    """Потокобезопасный in-memory бэкенд хранилища с поддержкой TTL."""
+    """
+    Потокобезопасный in-memory бэкенд хранилища с поддержкой TTL.
+
+    Сроки жизни ключей хранятся в индексе (min-heap): каждая запись попутно удаляет
+    уже истекшие ключи, а `start_reaper()` запускает фоновую очистку ключей,
+    которые больше никто не читает. С `max_entries` хранилище ограничено
+    по числу записей и вытесняет ключи по политике `eviction`.
+    """
+
+    _EXPIRE_BATCH = 32
+    """Сколько истекших ключей удаляется попутно при одной записи."""
+
+    def __init__(self, max_entries: int | None = None, eviction: EvictionPolicyName = "lru") -> None:
+        """Инициализирует хранилище.
 
-    def __init__(self) -> None:
+        Args:
+            max_entries: Максимальное число записей. None — без ограничения.
+            eviction: Политика вытеснения при достижении лимита: "lru", "lfu" или "tinylfu".
+
+        Raises:
+            ValueError: Если лимит не положителен или политика неизвестна.
+        """
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError(f"max_entries должен быть положительным, получено: {max_entries}")
         self._store: dict[str, tuple[Any, float | None]] = {}
         self._lock = threading.RLock()
+        self._expiry: ExpiryIndex[str] = ExpiryIndex()
+        self._reaper: ExpiryReaper | None = None
+        self._max_entries = max_entries
+        self._policy: EvictionPolicy | None = (
+            create_eviction_policy(eviction, max_entries) if max_entries is not None else None
+        )
+
+    def _remove(self, key: str) -> bool:
+        """Удаляет запись из всех структур (вызывается под блокировкой)."""
+        if self._store.pop(key, None) is None:
+            return False
+        self._expiry.discard(key)
+        if self._policy is not None:
+            self._policy.record_remove(key)
+        return True
+
+    def _put(self, key: str, value: Any, expires_at: float | None) -> None:
+        """Сохраняет запись с учетом лимита (вызывается под блокировкой)."""
+        existed = key in self._store
+        if not existed and self._policy is not None and self._max_entries is not None:
+            while len(self._store) >= self._max_entries:
+                victim = self._policy.select_victim()
+                if victim is None:
+                    break
+                self._remove(str(victim))
+        self._store[key] = (value, expires_at)
+        self._expiry.schedule(key, expires_at)
+        if self._policy is not None:
+            if existed:
+                self._policy.record_access(key)
+            else:
+                self._policy.record_insert(key)
 
     def _is_expired(self, expires_at: float | None) -> bool:
         if expires_at is None:
@@ -37,8 +98,10 @@ class MemoryStore(BaseStoreBackend):
                 return default
             val, expires_at = self._store[key]
             if self._is_expired(expires_at):
-                del self._store[key]
+                self._remove(key)
                 return default
+            if self._policy is not None:
+                self._policy.record_access(key)
             return val
 
     def set(self, key: str, value: Any, ttl: int | float | None = None) -> bool:
@@ -54,7 +117,8 @@ class MemoryStore(BaseStoreBackend):
         """
         expires_at = (time.time() + ttl) if ttl is not None else None
         with self._lock:
-            self._store[key] = (value, expires_at)
+            self._put(key, value, expires_at)
+            self._evict_expired(self._EXPIRE_BATCH)
         return True
 
     def delete(self, key: str) -> bool:
@@ -67,10 +131,7 @@ class MemoryStore(BaseStoreBackend):
             True, если ключ существовал и был удален.
         """
         with self._lock:
-            if key in self._store:
-                del self._store[key]
-                return True
-            return False
+            return self._remove(key)
 
     def exists(self, key: str) -> bool:
         """Проверяет существование ключа (синхронно).
@@ -86,7 +147,7 @@ class MemoryStore(BaseStoreBackend):
                 return False
             _, expires_at = self._store[key]
             if self._is_expired(expires_at):
-                del self._store[key]
+                self._remove(key)
                 return False
             return True
 
@@ -98,8 +159,106 @@ class MemoryStore(BaseStoreBackend):
         """
         with self._lock:
             self._store.clear()
+            self._expiry.clear()
+            if self._policy is not None:
+                self._policy.clear()
         return True
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей за один захват блокировки.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей; отсутствующие и просроченные ключи в него не входят.
+        """
+        now = time.time()
+        found: dict[str, Any] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._store.get(key)
+                if entry is None:
+                    continue
+                val, expires_at = entry
+                if expires_at is not None and now > expires_at:
+                    self._remove(key)
+                    continue
+                if self._policy is not None:
+                    self._policy.record_access(key)
+                found[key] = val
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений с общим TTL за один захват блокировки.
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если записи успешно сохранены.
+        """
+        expires_at = (time.time() + ttl) if ttl is not None else None
+        with self._lock:
+            for key, value in items.items():
+                self._put(key, value, expires_at)
+            self._evict_expired(self._EXPIRE_BATCH)
+        return True
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей за один захват блокировки.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        deleted = 0
+        with self._lock:
+            for key in keys:
+                if self._remove(key):
+                    deleted += 1
+        return deleted
+
+    def _evict_expired(self, limit: int | None) -> int:
+        """Удаляет истекшие ключи из индекса сроков (вызывается под блокировкой)."""
+        expired = self._expiry.pop_expired(time.time(), limit=limit)
+        for key in expired:
+            self._store.pop(key, None)
+            if self._policy is not None:
+                self._policy.record_remove(key)
+        return len(expired)
+
+    def purge_expired(self) -> int:
+        """Удаляет все просроченные записи.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        with self._lock:
+            return self._evict_expired(None)
+
+    def start_reaper(self, interval: float = 1.0) -> None:
+        """Запускает фоновый поток, периодически вызывающий `purge_expired()`.
+
+        Args:
+            interval: Интервал между проходами в секундах.
+        """
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_running:
+                return
+            self._reaper = ExpiryReaper(self.purge_expired, interval, name="ChutilsStoreReaper")
+            self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Останавливает фоновый поток очистки, если он запущен."""
+        with self._lock:
+            reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.stop()
+
     async def aget(self, key: str, default: Any = None) -> Any:
         """Извлекает значение по ключу (асинхронно).
 
@@ -154,3 +313,37 @@ class MemoryStore(BaseStoreBackend):
             True при успешной очистке.
         """
         return self.clear()
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        return self.get_many(keys)
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений с общим TTL (асинхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если записи успешно сохранены.
+        """
+        return self.set_many(items, ttl=ttl)
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        return self.delete_many(keys)
@@ -3,8 +3,10 @@ Redis бэкенд для chutils.store.
 """
 from __future__ import annotations
 
+import asyncio
 import importlib.util
 import sys
+from collections.abc import Callable, Iterable, Mapping
 from typing import Any
 
 from chutils.exceptions import OptionalDependencyError
@@ -125,6 +127,60 @@ class RedisStore(BaseStoreBackend):
         res = client.flushdb()
         return bool(res)
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей одной командой MGET (синхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return {}
+        client = self._get_sync_client()
+        values = client.mget(key_list)
+        return {key: val for key, val in zip(key_list, values) if val is not None}
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений за один round trip (синхронно).
+
+        Без TTL используется MSET, с TTL — конвейер (pipeline) команд SET.
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        if not items:
+            return True
+        client = self._get_sync_client()
+        if ttl is None:
+            return bool(client.mset(dict(items)))
+        ex = int(ttl)
+        pipe = client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ex)
+        return all(pipe.execute())
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей одной командой DEL (синхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return 0
+        client = self._get_sync_client()
+        return int(client.delete(*key_list))
+
     async def aget(self, key: str, default: Any = None) -> Any:
         """Извлекает значение по ключу (асинхронно).
 
@@ -190,3 +246,138 @@ class RedisStore(BaseStoreBackend):
         client = self._get_async_client()
         res = await client.flushdb()
         return bool(res)
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения нескольких ключей одной командой MGET (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return {}
+        client = self._get_async_client()
+        values = await client.mget(key_list)
+        return {key: val for key, val in zip(key_list, values) if val is not None}
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений за один round trip (асинхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        if not items:
+            return True
+        client = self._get_async_client()
+        if ttl is None:
+            return bool(await client.mset(dict(items)))
+        ex = int(ttl)
+        pipe = client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ex)
+        return all(await pipe.execute())
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей одной командой DEL (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        key_list = list(keys)
+        if not key_list:
+            return 0
+        client = self._get_async_client()
+        return int(await client.delete(*key_list))
+
+
+class RedisInvalidationBus:
+    """
+    Канал инвалидаций L1 для `TieredStore` на базе Redis pub/sub.
+
+    Сообщения принимаются в фоновом потоке (`PubSub.run_in_thread`).
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        channel: str = "chutils:store:invalidate",
+        client: Any = None,
+        **kwargs: Any,
+    ) -> None:
+        """Инициализирует канал.
+
+        Args:
+            url: URL сервера Redis (используется, если не передан `client`).
+            channel: Имя канала pub/sub.
+            client: Готовый синхронный клиент Redis.
+            **kwargs: Дополнительные параметры `redis.Redis.from_url`.
+        """
+        self._url = url
+        self._channel = channel
+        self._client = client
+        self._kwargs = kwargs
+        self._pubsub: Any = None
+        self._thread: Any = None
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            if not is_redis_available():
+                raise OptionalDependencyError(
+                    "Пакет 'redis' не установлен.",
+                    dependency="redis",
+                    hint="Установите его через: pip install redis или uv add redis",
+                )
+            import redis
+
+            self._client = redis.Redis.from_url(self._url, **self._kwargs)
+        return self._client
+
+    def publish(self, message: str) -> None:
+        """Публикует сообщение в канал.
+
+        Args:
+            message: Текст сообщения.
+        """
+        self._get_client().publish(self._channel, message)
+
+    async def apublish(self, message: str) -> None:
+        """Публикует сообщение в канал, не блокируя цикл событий.
+
+        Args:
+            message: Текст сообщения.
+        """
+        await asyncio.to_thread(self.publish, message)
+
+    def subscribe(self, handler: Callable[[str], None]) -> None:
+        """Подписывается на канал и запускает фоновый поток приема сообщений.
+
+        Args:
+            handler: Обработчик текста сообщения.
+        """
+
+        def on_message(message: dict[str, Any]) -> None:
+            data = message.get("data")
+            handler(data.decode("utf-8") if isinstance(data, bytes) else str(data))
+
+        self._pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self._channel: on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=0.1, daemon=True)
+
+    def close(self) -> None:
+        """Останавливает фоновый поток и закрывает подписку."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.stop()
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            pubsub.close()
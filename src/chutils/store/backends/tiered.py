@@ -0,0 +1,436 @@
+"""
+Двухуровневый бэкенд chutils.store: локальный L1 в памяти перед удаленным хранилищем.
+"""
+from __future__ import annotations
+
+import json
+import logging  # chutils: ignore[ChutilsIntegrationRule]
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Protocol
+
+from .base import BaseStoreBackend
+from .memory import MemoryStore
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus(Protocol):
+    """Канал рассылки инвалидаций L1 между экземплярами `TieredStore`."""
+
+    def publish(self, message: str) -> None:
+        """Отправляет сообщение всем подписчикам.
+
+        Args:
+            message: Текст сообщения (JSON с ключами инвалидации).
+        """
+        ...
+
+    async def apublish(self, message: str) -> None:
+        """Отправляет сообщение всем подписчикам (асинхронно).
+
+        Args:
+            message: Текст сообщения (JSON с ключами инвалидации).
+        """
+        ...
+
+    def subscribe(self, handler: Callable[[str], None]) -> None:
+        """Регистрирует обработчик входящих сообщений.
+
+        Args:
+            handler: Функция, вызываемая с текстом каждого полученного сообщения.
+        """
+        ...
+
+    def close(self) -> None:
+        """Останавливает подписку."""
+        ...
+
+
+class TieredStore(BaseStoreBackend):
+    """
+    Бэкенд с локальным кэшем L1 (`MemoryStore`) перед удаленным L2 (Redis, Memcached и др.).
+
+    Чтение сначала обращается к L1; при промахе значение читается из L2 и копируется
+    в L1 на `local_ttl` секунд. Запись и удаление выполняются в обоих уровнях.
+    Без канала инвалидации изменения, сделанные другими процессами, становятся видны
+    не позже чем через `local_ttl`; с каналом (например, `RedisInvalidationBus`)
+    остальные экземпляры сбрасывают свои L1 сразу после записи.
+
+    Попадания и промахи каждого уровня учитываются в метрике
+    `store_tier_requests_total{store, tier, status}` через `chutils.metrics`.
+    """
+
+    def __init__(
+        self,
+        remote: BaseStoreBackend,
+        local_ttl: float = 5.0,
+        local_max_entries: int = 10_000,
+        local: MemoryStore | None = None,
+        invalidation: InvalidationBus | None = None,
+        name: str = "tiered",
+    ) -> None:
+        """Инициализирует двухуровневый бэкенд.
+
+        Args:
+            remote: Удаленный бэкенд (L2).
+            local_ttl: Время жизни записей в L1 в секундах.
+            local_max_entries: Лимит числа записей L1 (вытеснение LRU).
+            local: Готовый экземпляр L1. Если задан, `local_max_entries` игнорируется.
+            invalidation: Канал рассылки инвалидаций между процессами.
+            name: Значение метки `store` в метриках.
+
+        Raises:
+            ValueError: Если `local_ttl` не положителен.
+        """
+        if local_ttl <= 0:
+            raise ValueError(f"local_ttl должен быть положительным, получено: {local_ttl}")
+        self._remote = remote
+        self._local = local if local is not None else MemoryStore(max_entries=local_max_entries)
+        self._local_ttl = local_ttl
+        self._name = name
+        self._origin = uuid.uuid4().hex
+        self._invalidation = invalidation
+        if invalidation is not None:
+            invalidation.subscribe(self._on_invalidation)
+
+    @property
+    def local(self) -> MemoryStore:
+        """Локальный уровень L1."""
+        return self._local
+
+    @property
+    def remote(self) -> BaseStoreBackend:
+        """Удаленный уровень L2."""
+        return self._remote
+
+    def close(self) -> None:
+        """Останавливает подписку на инвалидации."""
+        if self._invalidation is not None:
+            self._invalidation.close()
+
+    # --- Служебные методы ---
+
+    def _local_ttl_for(self, ttl: int | float | None) -> float:
+        return self._local_ttl if ttl is None else min(ttl, self._local_ttl)
+
+    def _record(self, tier: str, hits: int, misses: int) -> None:
+        try:
+            from chutils.metrics import increment
+
+            if hits:
+                increment(
+                    "store_tier_requests_total",
+                    value=float(hits),
+                    labels={"store": self._name, "tier": tier, "status": "hit"},
+                )
+            if misses:
+                increment(
+                    "store_tier_requests_total",
+                    value=float(misses),
+                    labels={"store": self._name, "tier": tier, "status": "miss"},
+                )
+        except Exception:
+            pass
+
+    def _message(self, keys: Iterable[str] | None) -> str:
+        if keys is None:
+            return json.dumps({"origin": self._origin, "clear": True})
+        return json.dumps({"origin": self._origin, "keys": list(keys)})
+
+    def _publish(self, keys: Iterable[str] | None) -> None:
+        if self._invalidation is None:
+            return
+        try:
+            self._invalidation.publish(self._message(keys))
+        except Exception as e:
+            logger.warning("Не удалось отправить инвалидацию L1 (%s): %s", self._name, e)
+
+    async def _apublish(self, keys: Iterable[str] | None) -> None:
+        if self._invalidation is None:
+            return
+        try:
+            await self._invalidation.apublish(self._message(keys))
+        except Exception as e:
+            logger.warning("Не удалось отправить инвалидацию L1 (%s): %s", self._name, e)
+
+    def _on_invalidation(self, message: str) -> None:
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            logger.warning("Некорректное сообщение инвалидации L1: %r", message)
+            return
+        if not isinstance(payload, dict) or payload.get("origin") == self._origin:
+            return
+        if payload.get("clear"):
+            self._local.clear()
+        else:
+            self._local.delete_many(str(key) for key in payload.get("keys", ()))
+
+    # --- Синхронные операции ---
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Извлекает значение из L1, а при промахе — из L2 с копированием в L1.
+
+        Args:
+            key: Ключ записи.
+            default: Значение по умолчанию, если ключ не найден.
+
+        Returns:
+            Сохраненное значение или default.
+        """
+        val = self._local.get(key)
+        if val is not None:
+            self._record("l1", 1, 0)
+            return val
+        self._record("l1", 0, 1)
+        val = self._remote.get(key)
+        if val is None:
+            self._record("l2", 0, 1)
+            return default
+        self._record("l2", 1, 0)
+        self._local.set(key, val, ttl=self._local_ttl)
+        return val
+
+    def set(self, key: str, value: Any, ttl: int | float | None = None) -> bool:
+        """Сохраняет значение в L2 и L1 и рассылает инвалидацию.
+
+        Args:
+            key: Ключ записи.
+            value: Сохраняемое значение.
+            ttl: Время жизни записи в секундах.
+
+        Returns:
+            True, если запись сохранена в L2.
+        """
+        res = self._remote.set(key, value, ttl=ttl)
+        if res:
+            self._local.set(key, value, ttl=self._local_ttl_for(ttl))
+        else:
+            self._local.delete(key)
+        self._publish([key])
+        return res
+
+    def delete(self, key: str) -> bool:
+        """Удаляет запись из обоих уровней.
+
+        Args:
+            key: Ключ записи.
+
+        Returns:
+            True, если ключ существовал в L2.
+        """
+        self._local.delete(key)
+        res = self._remote.delete(key)
+        self._publish([key])
+        return res
+
+    def exists(self, key: str) -> bool:
+        """Проверяет существование ключа в L1 или L2.
+
+        Args:
+            key: Ключ записи.
+
+        Returns:
+            True, если ключ существует.
+        """
+        return self._local.exists(key) or self._remote.exists(key)
+
+    def clear(self) -> bool:
+        """Очищает оба уровня.
+
+        Returns:
+            True при успешной очистке L2.
+        """
+        self._local.clear()
+        res = self._remote.clear()
+        self._publish(None)
+        return res
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения: найденные в L1 — локально, остальные — одним запросом к L2.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        found = self._local.get_many(key_list)
+        missing = [key for key in key_list if key not in found]
+        self._record("l1", len(found), len(missing))
+        if missing:
+            remote_found = self._remote.get_many(missing)
+            self._record("l2", len(remote_found), len(missing) - len(remote_found))
+            if remote_found:
+                self._local.set_many(remote_found, ttl=self._local_ttl)
+                found.update(remote_found)
+        return found
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений в L2 и L1 и рассылает инвалидацию.
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи в L2.
+        """
+        res = self._remote.set_many(items, ttl=ttl)
+        if res:
+            self._local.set_many(items, ttl=self._local_ttl_for(ttl))
+        else:
+            self._local.delete_many(items)
+        self._publish(items)
+        return res
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей из обоих уровней.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей в L2.
+        """
+        key_list = list(keys)
+        self._local.delete_many(key_list)
+        res = self._remote.delete_many(key_list)
+        self._publish(key_list)
+        return res
+
+    # --- Асинхронные операции ---
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Извлекает значение из L1, а при промахе — из L2 (асинхронно).
+
+        Args:
+            key: Ключ записи.
+            default: Значение по умолчанию, если ключ не найден.
+
+        Returns:
+            Сохраненное значение или default.
+        """
+        val = self._local.get(key)
+        if val is not None:
+            self._record("l1", 1, 0)
+            return val
+        self._record("l1", 0, 1)
+        val = await self._remote.aget(key)
+        if val is None:
+            self._record("l2", 0, 1)
+            return default
+        self._record("l2", 1, 0)
+        self._local.set(key, val, ttl=self._local_ttl)
+        return val
+
+    async def aset(self, key: str, value: Any, ttl: int | float | None = None) -> bool:
+        """Сохраняет значение в L2 и L1 (асинхронно).
+
+        Args:
+            key: Ключ записи.
+            value: Сохраняемое значение.
+            ttl: Время жизни записи в секундах.
+
+        Returns:
+            True, если запись сохранена в L2.
+        """
+        res = await self._remote.aset(key, value, ttl=ttl)
+        if res:
+            self._local.set(key, value, ttl=self._local_ttl_for(ttl))
+        else:
+            self._local.delete(key)
+        await self._apublish([key])
+        return res
+
+    async def adelete(self, key: str) -> bool:
+        """Удаляет запись из обоих уровней (асинхронно).
+
+        Args:
+            key: Ключ записи.
+
+        Returns:
+            True, если ключ существовал в L2.
+        """
+        self._local.delete(key)
+        res = await self._remote.adelete(key)
+        await self._apublish([key])
+        return res
+
+    async def aexists(self, key: str) -> bool:
+        """Проверяет существование ключа в L1 или L2 (асинхронно).
+
+        Args:
+            key: Ключ записи.
+
+        Returns:
+            True, если ключ существует.
+        """
+        return self._local.exists(key) or await self._remote.aexists(key)
+
+    async def aclear(self) -> bool:
+        """Очищает оба уровня (асинхронно).
+
+        Returns:
+            True при успешной очистке L2.
+        """
+        self._local.clear()
+        res = await self._remote.aclear()
+        await self._apublish(None)
+        return res
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает значения: найденные в L1 — локально, остальные — из L2 (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей.
+        """
+        key_list = list(keys)
+        found = self._local.get_many(key_list)
+        missing = [key for key in key_list if key not in found]
+        self._record("l1", len(found), len(missing))
+        if missing:
+            remote_found = await self._remote.aget_many(missing)
+            self._record("l2", len(remote_found), len(missing) - len(remote_found))
+            if remote_found:
+                self._local.set_many(remote_found, ttl=self._local_ttl)
+                found.update(remote_found)
+        return found
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сохраняет несколько значений в L2 и L1 (асинхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи в L2.
+        """
+        res = await self._remote.aset_many(items, ttl=ttl)
+        if res:
+            self._local.set_many(items, ttl=self._local_ttl_for(ttl))
+        else:
+            self._local.delete_many(items)
+        await self._apublish(items)
+        return res
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей из обоих уровней (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей в L2.
+        """
+        key_list = list(keys)
+        self._local.delete_many(key_list)
+        res = await self._remote.adelete_many(key_list)
+        await self._apublish(key_list)
+        return res
@@ -0,0 +1,156 @@
+"""
+Прозрачное сжатие сериализованных значений chutils.store.
+
+Сжатые значения начинаются с заголовка из двух байт: маркера `0xC1` и идентификатора
+кодека. Байт `0xC1` не встречается в начале значений JSON (невалиден в UTF-8),
+Pickle (протокол 2+ начинается с `0x80`) и msgpack (зарезервирован форматом),
+поэтому значения без заголовка, записанные до включения сжатия или меньше порога,
+читаются как есть.
+"""
+from __future__ import annotations
+
+import zlib
+from collections.abc import Callable
+from typing import Any, Literal
+
+from chutils.exceptions import OptionalDependencyError
+
+CompressionName = Literal["zlib", "zstd", "lz4"]
+"""Имена поддерживаемых кодеков сжатия."""
+
+MAGIC = 0xC1
+"""Первый байт сжатого значения."""
+
+_CODEC_IDS: dict[str, int] = {"zlib": 1, "zstd": 2, "lz4": 3}
+_CODEC_NAMES: dict[int, str] = {codec_id: name for name, codec_id in _CODEC_IDS.items()}
+
+
+def _zlib_codec(level: int | None) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    compress_level = 6 if level is None else level
+    return (lambda data: zlib.compress(data, compress_level)), zlib.decompress
+
+
+def _zstd_codec(level: int | None) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise OptionalDependencyError(
+            "Пакет 'zstandard' не установлен.",
+            dependency="zstandard",
+            hint="Установите его через: pip install zstandard или uv add zstandard",
+        ) from e
+    compress_level = 3 if level is None else level
+    # Экземпляры ZstdCompressor/ZstdDecompressor не потокобезопасны, поэтому используются
+    # функции модуля, создающие контекст на каждый вызов
+    return (lambda data: zstandard.compress(data, compress_level)), zstandard.decompress
+
+
+def _lz4_codec(level: int | None) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    try:
+        import lz4.frame
+    except ImportError as e:
+        raise OptionalDependencyError(
+            "Пакет 'lz4' не установлен.",
+            dependency="lz4",
+            hint="Установите его через: pip install lz4 или uv add lz4",
+        ) from e
+    compression_level = 0 if level is None else level
+    return (lambda data: lz4.frame.compress(data, compression_level=compression_level)), lz4.frame.decompress
+
+
+_CODEC_FACTORIES: dict[str, Callable[[int | None], tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]] = {
+    "zlib": _zlib_codec,
+    "zstd": _zstd_codec,
+    "lz4": _lz4_codec,
+}
+
+
+class CompressingSerializer:
+    """
+    Обертка над сериализатором, сжимающая результаты больше порога.
+
+    Значения меньше `threshold` байт сохраняются без изменений. При чтении кодек
+    определяется по заголовку значения, поэтому данные, сжатые другим кодеком,
+    тоже читаются (если установлен соответствующий пакет).
+    """
+
+    def __init__(
+        self,
+        inner: Any,
+        codec: CompressionName = "zlib",
+        threshold: int = 1024,
+        level: int | None = None,
+    ) -> None:
+        """Инициализирует сериализатор со сжатием.
+
+        Args:
+            inner: Сериализатор с методами `dumps`/`loads`.
+            codec: Кодек сжатия: "zlib", "zstd" или "lz4".
+            threshold: Минимальный размер сериализованного значения в байтах для сжатия.
+            level: Уровень сжатия кодека. None — значение по умолчанию для кодека.
+
+        Raises:
+            ValueError: Если кодек неизвестен или порог отрицателен.
+            OptionalDependencyError: Если пакет выбранного кодека не установлен.
+        """
+        if codec not in _CODEC_IDS:
+            raise ValueError(f"Неизвестный кодек сжатия: {codec!r}. Допустимые значения: {sorted(_CODEC_IDS)}")
+        if threshold < 0:
+            raise ValueError(f"threshold не может быть отрицательным, получено: {threshold}")
+        self._inner = inner
+        self._threshold = threshold
+        self._header = bytes((MAGIC, _CODEC_IDS[codec]))
+        self._compress, _ = _CODEC_FACTORIES[codec](level)
+        self._decompressors: dict[int, Callable[[bytes], bytes]] = {}
+
+    @property
+    def inner(self) -> Any:
+        """Исходный сериализатор."""
+        return self._inner
+
+    def dumps(self, value: Any) -> Any:
+        """Сериализует значение и сжимает его, если размер не меньше порога.
+
+        Args:
+            value: Значение для сериализации.
+
+        Returns:
+            Сжатые байты с заголовком или результат исходного сериализатора.
+        """
+        data = self._inner.dumps(value)
+        if isinstance(data, str):
+            raw = data.encode("utf-8")
+        elif isinstance(data, (bytes, bytearray)):
+            raw = bytes(data)
+        else:
+            return data
+        if len(raw) < self._threshold:
+            return data
+        return self._header + self._compress(raw)
+
+    def loads(self, raw_value: Any) -> Any:
+        """Распаковывает (при наличии заголовка) и десериализует значение.
+
+        Args:
+            raw_value: Сохраненное значение.
+
+        Returns:
+            Десериализованный объект.
+
+        Raises:
+            ValueError: Если заголовок содержит неизвестный идентификатор кодека.
+        """
+        if isinstance(raw_value, (bytes, bytearray)) and len(raw_value) >= 2 and raw_value[0] == MAGIC:
+            decompress = self._get_decompressor(raw_value[1])
+            return self._inner.loads(decompress(bytes(raw_value[2:])))
+        return self._inner.loads(raw_value)
+
+    def _get_decompressor(self, codec_id: int) -> Callable[[bytes], bytes]:
+        decompress = self._decompressors.get(codec_id)
+        if decompress is None:
+            name = _CODEC_NAMES.get(codec_id)
+            if name is None:
+                raise ValueError(f"Неизвестный идентификатор кодека сжатия: {codec_id}")
+            _, decompress = _CODEC_FACTORIES[name](None)
+            self._decompressors[codec_id] = decompress
+        return decompress
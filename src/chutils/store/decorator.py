@@ -5,25 +5,49 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import hashlib
 import inspect
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Literal
 
 from .manager import StoreManager
 
 _default_store = StoreManager()
 
+StoreKeyBuilder = Callable[[str, tuple[Any, ...], dict[str, Any], str], str]
+"""Сигнатура построителя ключа: (func_name, args, kwargs, prefix) -> строковый ключ."""
 
-def _make_key(prefix: str, func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
-    func_name = getattr(func, "__qualname__", func.__name__)
-    raw_args = f"{args}:{sorted(kwargs.items())}"
-    return f"{prefix}{func_name}:{raw_args}"
+
+def _make_key(func_name: str, args: tuple[Any, ...], kwargs: dict[str, Any], prefix: str) -> str:
+    """Строит читаемый ключ из repr аргументов."""
+    if not kwargs:
+        # Без именованных аргументов не нужна сортировка; формат ключа тот же.
+        return f"{prefix}{func_name}:{args}:[]"
+    return f"{prefix}{func_name}:{args}:{sorted(kwargs.items())}"
+
+
+def _make_hashed_key(func_name: str, args: tuple[Any, ...], kwargs: dict[str, Any], prefix: str) -> str:
+    """Строит ключ фиксированной длины: blake2b (16 байт) от repr аргументов.
+
+    Алгоритм фиксирован, а не выбирается по установленным пакетам, как в `digest_key`:
+    ключи хранятся в общем Redis/Memcached, и все хосты должны вычислять их одинаково.
+    """
+    raw = f"{args}:{sorted(kwargs.items())}".encode("utf-8")
+    return f"{prefix}{func_name}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+
+_KEY_BUILDERS: dict[str, StoreKeyBuilder] = {
+    "repr": _make_key,
+    "hash": _make_hashed_key,
+}
 
 
 def store_cache(
     store: StoreManager | None = None,
     ttl: int | float = 60,
     key_prefix: str = "cache:",
+    key_builder: Literal["repr", "hash"] | StoreKeyBuilder = "repr",
+    key: Callable[..., str] | None = None,
 ) -> Callable[..., Any]:
     """Декоратор для кэширования результатов вызова функций через StoreManager.
 
@@ -31,18 +55,47 @@ def store_cache(
         store: Экземпляр StoreManager (по умолчанию локальный in-memory StoreManager).
         ttl: Время жизни кэша в секундах.
         key_prefix: Префикс ключей кэша.
+        key_builder: Способ построения ключа: "repr" (читаемый repr аргументов), "hash"
+            (ключ фиксированной длины — удобно для Memcached с лимитом 250 байт) или собственная
+            функция `(func_name, args, kwargs, prefix) -> str`.
+        key: Вызываемый объект с сигнатурой декорируемой функции, возвращающий строку,
+            однозначно определяющую вызов. Ее значение передается в `key_builder` вместо
+            аргументов вызова.
 
     Returns:
         Обернутая функция с методами инвалидации.
+
+    Raises:
+        ValueError: Если имя построителя ключей неизвестно.
     """
     target_store = store or _default_store
+    if callable(key_builder):
+        build_key = key_builder
+    elif key_builder in _KEY_BUILDERS:
+        build_key = _KEY_BUILDERS[key_builder]
+    else:
+        raise ValueError(
+            f"Неизвестный построитель ключей: {key_builder!r}. Допустимо: {', '.join(_KEY_BUILDERS)}."
+        )
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        func_name = getattr(func, "__qualname__", func.__name__)
+
+        if key is not None:
+            key_func = key
+
+            def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+                # Значение key= проходит через key_builder, как и в cache_with_ttl
+                return build_key(func_name, (key_func(*args, **kwargs),), {}, key_prefix)
+        else:
+            def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+                return build_key(func_name, args, kwargs, key_prefix)
+
         if inspect.iscoroutinefunction(func):
 
             @functools.wraps(func)
             async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
-                cache_key = _make_key(key_prefix, func, args, kwargs)
+                cache_key = make_key(args, kwargs)
                 if await target_store.aexists(cache_key):
                     return await target_store.aget(cache_key)
                 result = await func(*args, **kwargs)
@@ -50,7 +103,7 @@ def store_cache(
                 return result
 
             async def ainvalidate(*args: Any, **kwargs: Any) -> bool:
-                cache_key = _make_key(key_prefix, func, args, kwargs)
+                cache_key = make_key(args, kwargs)
                 return await target_store.adelete(cache_key)
 
             async def aclear() -> bool:
@@ -64,7 +117,7 @@ def store_cache(
 
             @functools.wraps(func)
             def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
-                cache_key = _make_key(key_prefix, func, args, kwargs)
+                cache_key = make_key(args, kwargs)
                 if target_store.exists(cache_key):
                     return target_store.get(cache_key)
                 result = func(*args, **kwargs)
@@ -72,7 +125,7 @@ def store_cache(
                 return result
 
             def invalidate(*args: Any, **kwargs: Any) -> bool:
-                cache_key = _make_key(key_prefix, func, args, kwargs)
+                cache_key = make_key(args, kwargs)
                 return target_store.delete(cache_key)
 
             def clear() -> bool:
@@ -5,11 +5,15 @@ from __future__ import annotations
 
 import json
 import pickle
+from collections.abc import Iterable, Mapping
 from contextlib import nullcontext
-from typing import Any
+from typing import Any, cast
+
+from chutils.exceptions import OptionalDependencyError
 
 from .backends.base import BaseStoreBackend
 from .backends.memory import MemoryStore
+from .compression import CompressingSerializer, CompressionName
 
 
 class JSONSerializer:
@@ -68,6 +72,85 @@ class PickleSerializer:
         return pickle.loads(raw_value)
 
 
+class OrjsonSerializer:
+    """Сериализатор JSON на базе orjson (требует опционального пакета orjson).
+
+    Работает с байтами без промежуточной строки и заметно быстрее стандартного `json`.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError as e:
+            raise OptionalDependencyError(
+                "Пакет 'orjson' не установлен.",
+                dependency="orjson",
+                hint="Установите его через: pip install orjson или uv add orjson",
+            ) from e
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        """Сериализует значение в JSON-байты.
+
+        Args:
+            value: Значение для сериализации.
+
+        Returns:
+            JSON в кодировке UTF-8.
+        """
+        return bytes(self._orjson.dumps(value))
+
+    def loads(self, raw_value: str | bytes) -> Any:
+        """Десериализует JSON значение.
+
+        Args:
+            raw_value: Исходные байты или строка.
+
+        Returns:
+            Десериализованный объект.
+        """
+        return self._orjson.loads(raw_value)
+
+
+class MsgpackSerializer:
+    """Сериализатор в бинарный формат MessagePack (требует опционального пакета msgpack)."""
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as e:
+            raise OptionalDependencyError(
+                "Пакет 'msgpack' не установлен.",
+                dependency="msgpack",
+                hint="Установите его через: pip install msgpack или uv add msgpack",
+            ) from e
+        self._msgpack = msgpack
+
+    def dumps(self, value: Any) -> bytes:
+        """Сериализует значение в байты MessagePack.
+
+        Args:
+            value: Значение для сериализации.
+
+        Returns:
+            Сериализованные байты.
+        """
+        return bytes(self._msgpack.packb(value, use_bin_type=True))
+
+    def loads(self, raw_value: str | bytes) -> Any:
+        """Десериализует значение MessagePack.
+
+        Args:
+            raw_value: Исходные байты.
+
+        Returns:
+            Десериализованный объект.
+        """
+        if isinstance(raw_value, str):
+            raw_value = raw_value.encode("utf-8")
+        return self._msgpack.unpackb(raw_value, raw=False)
+
+
 class RawSerializer:
     """Пасс-через сериализатор без изменений."""
 
@@ -104,6 +187,10 @@ def _get_serializer(serializer_type: str | Any) -> Any:
             return JSONSerializer()
         elif name == "pickle":
             return PickleSerializer()
+        elif name == "orjson":
+            return OrjsonSerializer()
+        elif name == "msgpack":
+            return MsgpackSerializer()
         elif name in ("raw", "none", "passthrough"):
             return RawSerializer()
 
@@ -118,9 +205,30 @@ class StoreManager:
         backend: BaseStoreBackend | None = None,
         serializer: str | Any = "json",
         prefix: str = "",
+        compression: CompressionName | None = None,
+        compression_threshold: int = 1024,
+        compression_level: int | None = None,
     ) -> None:
+        """Инициализирует менеджер хранилища.
+
+        Args:
+            backend: Бэкенд хранилища (по умолчанию MemoryStore).
+            serializer: Имя сериализатора ("json", "orjson", "msgpack", "pickle", "raw")
+                или объект с методами `dumps`/`loads`.
+            prefix: Префикс всех ключей.
+            compression: Кодек сжатия значений ("zlib", "zstd", "lz4"). None — без сжатия.
+            compression_threshold: Минимальный размер сериализованного значения в байтах для сжатия.
+            compression_level: Уровень сжатия. None — значение по умолчанию для кодека.
+
+        Raises:
+            OptionalDependencyError: Если пакет выбранного сериализатора или кодека не установлен.
+        """
         self._backend: BaseStoreBackend = backend or MemoryStore()
         self._serializer = _get_serializer(serializer)
+        if compression is not None:
+            self._serializer = CompressingSerializer(
+                self._serializer, codec=compression, threshold=compression_threshold, level=compression_level
+            )
         self._prefix = prefix
 
     @classmethod
@@ -137,6 +245,8 @@ class StoreManager:
         backend_type = str(cfg.get("backend", "memory")).lower()
         serializer_type = cfg.get("serializer", "json")
         prefix = str(cfg.get("prefix", ""))
+        compression = cfg.get("compression")
+        compression_level = cfg.get("compression_level")
 
         backend: BaseStoreBackend
         if backend_type == "memory":
@@ -155,7 +265,14 @@ class StoreManager:
         else:
             backend = MemoryStore()
 
-        return cls(backend=backend, serializer=serializer_type, prefix=prefix)
+        return cls(
+            backend=backend,
+            serializer=serializer_type,
+            prefix=prefix,
+            compression=cast(CompressionName, str(compression).lower()) if compression else None,
+            compression_threshold=int(cfg.get("compression_threshold", 1024)),
+            compression_level=int(compression_level) if compression_level is not None else None,
+        )
 
     def _format_key(self, key: str) -> str:
         return f"{self._prefix}{key}" if self._prefix else key
@@ -184,6 +301,32 @@ class StoreManager:
         except Exception:
             pass
 
+    def _record_batch_metric(self, op: str, hits: int | None = None, misses: int = 0) -> None:
+        try:
+            from chutils.metrics import increment
+
+            increment("store_operations_total", value=1.0, labels={"op": op})
+            if hits is not None:
+                if hits:
+                    increment("store_requests_total", value=float(hits), labels={"status": "hit"})
+                if misses:
+                    increment("store_requests_total", value=float(misses), labels={"status": "miss"})
+        except Exception:
+            pass
+
+    def _decode_many(self, op: str, full_keys: dict[str, str], raw_values: dict[str, Any]) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        for full_key, raw_val in raw_values.items():
+            key = full_keys.get(full_key)
+            if key is None or raw_val is None:
+                continue
+            try:
+                result[key] = self._serializer.loads(raw_val)
+            except Exception:
+                continue
+        self._record_batch_metric(op, hits=len(result), misses=len(full_keys) - len(result))
+        return result
+
     def get(self, key: str, default: Any = None) -> Any:
         """Извлекает и десериализует значение по ключу.
 
@@ -267,6 +410,51 @@ class StoreManager:
             self._record_metric("clear")
             return res
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает и десериализует значения нескольких ключей за один запрос к бэкенду.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей (ключи без префикса). Отсутствующие ключи
+            и значения, которые не удалось десериализовать, в него не входят.
+        """
+        with self._trace("get_many"):
+            full_keys = {self._format_key(key): key for key in keys}
+            raw_values = self._backend.get_many(full_keys)
+            return self._decode_many("get_many", full_keys, raw_values)
+
+    def set_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сериализует и сохраняет несколько значений за один запрос к бэкенду.
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        with self._trace("set_many"):
+            payload = {self._format_key(key): self._serializer.dumps(value) for key, value in items.items()}
+            res = self._backend.set_many(payload, ttl=ttl)
+            self._record_batch_metric("set_many")
+            return res
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей за один запрос к бэкенду.
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        with self._trace("delete_many"):
+            res = self._backend.delete_many([self._format_key(key) for key in keys])
+            self._record_batch_metric("delete_many")
+            return res
+
     async def aget(self, key: str, default: Any = None) -> Any:
         """Извлекает и десериализует значение по ключу (асинхронно).
 
@@ -349,3 +537,47 @@ class StoreManager:
             res = await self._backend.aclear()
             self._record_metric("aclear")
             return res
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Извлекает и десериализует значения нескольких ключей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Словарь найденных записей (ключи без префикса).
+        """
+        with self._trace("aget_many"):
+            full_keys = {self._format_key(key): key for key in keys}
+            raw_values = await self._backend.aget_many(full_keys)
+            return self._decode_many("aget_many", full_keys, raw_values)
+
+    async def aset_many(self, items: Mapping[str, Any], ttl: int | float | None = None) -> bool:
+        """Сериализует и сохраняет несколько значений (асинхронно).
+
+        Args:
+            items: Словарь ключ -> значение.
+            ttl: Время жизни записей в секундах.
+
+        Returns:
+            True, если сохранены все записи.
+        """
+        with self._trace("aset_many"):
+            payload = {self._format_key(key): self._serializer.dumps(value) for key, value in items.items()}
+            res = await self._backend.aset_many(payload, ttl=ttl)
+            self._record_batch_metric("aset_many")
+            return res
+
+    async def adelete_many(self, keys: Iterable[str]) -> int:
+        """Удаляет несколько записей (асинхронно).
+
+        Args:
+            keys: Ключи записей.
+
+        Returns:
+            Количество удаленных записей.
+        """
+        with self._trace("adelete_many"):
+            res = await self._backend.adelete_many([self._format_key(key) for key in keys])
+            self._record_batch_metric("adelete_many")
+            return res
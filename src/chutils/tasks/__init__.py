@@ -10,6 +10,11 @@ from chutils.tasks.core import (
     start_scheduler,
     stop_scheduler,
 )
+from chutils.tasks.executors import (
+    ExecutorKind,
+    configure_executor,
+    shutdown_executors,
+)
 
 __all__ = [
     "ErrorStrategy",
@@ -19,4 +24,7 @@ __all__ = [
     "clear_tasks_registry",
     "start_scheduler",
     "stop_scheduler",
+    "ExecutorKind",
+    "configure_executor",
+    "shutdown_executors",
 ]
@@ -1,6 +1,8 @@
 from collections.abc import Awaitable
 from enum import Enum
-from typing import Any, Callable
+from typing import Any, Callable, Literal, TypeAlias
+
+ExecutorKind: TypeAlias = Literal["thread", "process"]
 
 
 class ErrorStrategy(str, Enum):
@@ -11,29 +13,44 @@ class ErrorStrategy(str, Enum):
 
 class PeriodicTask:
     func: Callable[[], Any] | Callable[[], Awaitable[Any]]
-    interval_seconds: int | Callable[[], int] | str
+    interval_seconds: int | float | Callable[[], int | float] | str | None
     run_immediately: bool
     overlap: bool
     error_strategy: ErrorStrategy
     name: str
+    cron: str | None
+    jitter: float
+    executor: str | None
+    timeout: float | None
 
     def __init__(
             self,
             func: Callable[[], Any] | Callable[[], Awaitable[Any]],
-            interval_seconds: int | Callable[[], int] | str,
+            interval_seconds: int | float | Callable[[], int | float] | str | None = None,
             run_immediately: bool = False,
             overlap: bool = False,
             error_strategy: ErrorStrategy = ErrorStrategy.IGNORE,
             name: str = "",
+            cron: str | None = None,
+            jitter: float = 0.0,
+            executor: str | None = None,
+            timeout: float | None = None,
     ) -> None: ...
 
+    def get_interval(self) -> int | float: ...
+
 
 def periodic_task(
-        interval_seconds: int | Callable[[], int] | str,
+        interval_seconds: int | float | Callable[[], int | float] | str | None = None,
         run_immediately: bool = False,
         overlap: bool = False,
         error_strategy: ErrorStrategy = ErrorStrategy.IGNORE,
         name: str = "",
+        *,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        executor: str | None = None,
+        timeout: float | None = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]: ...
 
 
@@ -43,7 +60,13 @@ def get_registered_tasks() -> list[PeriodicTask]: ...
 def clear_tasks_registry() -> None: ...
 
 
-def start_scheduler() -> None: ...
+def start_scheduler(max_concurrency: int | None = None) -> None: ...
 
 
 async def stop_scheduler() -> None: ...
+
+
+def configure_executor(name: str, kind: ExecutorKind = "thread", *, max_workers: int | None = None) -> None: ...
+
+
+def shutdown_executors() -> None: ...
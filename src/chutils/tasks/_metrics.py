@@ -0,0 +1,38 @@
+"""
+Публикация метрик планировщика в `chutils.metrics`.
+
+`chutils.metrics` импортируется лениво, а ошибки провайдера метрик
+не прерывают выполнение задач.
+"""
+from __future__ import annotations
+
+
+def observe(name: str, value: float, labels: dict[str, str]) -> None:
+    """Записывает наблюдение гистограммы.
+
+    Args:
+        name: Имя гистограммы.
+        value: Наблюдаемое значение.
+        labels: Метки серии.
+    """
+    try:
+        from chutils.metrics import observe as observe_metric
+
+        observe_metric(name, value, labels=labels)
+    except Exception:
+        pass
+
+
+def increment(name: str, labels: dict[str, str]) -> None:
+    """Увеличивает счётчик на единицу.
+
+    Args:
+        name: Имя счётчика.
+        labels: Метки серии.
+    """
+    try:
+        from chutils.metrics import increment as increment_metric
+
+        increment_metric(name, labels=labels)
+    except Exception:
+        pass
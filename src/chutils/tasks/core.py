@@ -4,19 +4,56 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import functools
+import heapq
 import inspect
+import itertools
 import logging  # chutils: ignore[ChutilsIntegrationRule]
+import random
 import time
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 from typing import Any
 
+from chutils.exceptions import ChutilsTimeoutError
 from chutils.lifecycle import register_cleanup
 
+from . import _metrics
+from .cron import CronSchedule
+from .executors import (
+    TaskExecutor,
+    _process_target,
+    executor_kind,
+    get_executor,
+    shutdown_executors,
+)
+
 logger = logging.getLogger("chutils.tasks")
 
+_config_generation = 0
+"Номер поколения конфигурации; увеличивается при каждой перезагрузке chutils.config"
+
+_config_watch_registered = False
+
+
+def _on_config_change() -> None:
+    global _config_generation
+    _config_generation += 1
+
+
+def _watch_config() -> None:
+    """Один раз подписывается на перезагрузку конфигурации для сброса закэшированных интервалов."""
+    global _config_watch_registered
+    if _config_watch_registered:
+        return
+    from chutils.config import on_config_change
+
+    on_config_change(_on_config_change)
+    _config_watch_registered = True
+
 
 class ErrorStrategy(str, Enum):
     """Стратегии обработки ошибок в периодических задачах."""
@@ -27,22 +64,47 @@ class ErrorStrategy(str, Enum):
 
 @dataclass
 class PeriodicTask:
-    """Метаданные периодической задачи."""
+    """Метаданные периодической задачи.
+
+    Расписание задаётся либо интервалом `interval_seconds`, либо cron-выражением `cron`.
+    `jitter` — верхняя граница случайной задержки (сек.) каждого запуска, не смещающей
+    само расписание. `executor` — имя пула для синхронной задачи (см. `configure_executor`),
+    `timeout` — ограничение времени одного запуска в секундах.
+    """
     func: Callable[..., Any]
-    interval_seconds: int | float | Callable[[], int | float] | str
+    interval_seconds: int | float | Callable[[], int | float] | str | None = None
     run_immediately: bool = False
     overlap: bool = False
     error_strategy: ErrorStrategy = ErrorStrategy.IGNORE
     name: str = ""
+    cron: str | None = None
+    jitter: float = 0.0
+    executor: str | None = None
+    timeout: float | None = None
 
     def __post_init__(self) -> None:
+        if (self.interval_seconds is None) == (self.cron is None):
+            raise ValueError("Укажите ровно одно из interval_seconds или cron")
+        if self.jitter < 0:
+            raise ValueError(f"jitter не может быть отрицательным, получено: {self.jitter}")
         if not self.name:
             self.name = self.func.__name__
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(f"timeout должен быть положительным, получено: {self.timeout}")
         self.is_async = inspect.iscoroutinefunction(self.func)
+        if self.executor is not None:
+            if self.is_async:
+                raise ValueError(f"executor задаётся только для синхронных задач, '{self.name}' асинхронная")
+            if executor_kind(self.executor) == "process":
+                _process_target(self.func)
+        self.cron_schedule = CronSchedule(self.cron) if self.cron is not None else None
+        self._config_interval: tuple[int, int | float] | None = None
 
     def get_interval(self) -> int | float:
         """Вычисляет текущий интервал запуска в секундах (целое или дробное число).
 
+        Интервал из конфигурации кэшируется до следующей перезагрузки `chutils.config`.
+
         Returns:
             Текущий вычисленный интервал выполнения задачи в секундах.
         """
@@ -62,30 +124,41 @@ class PeriodicTask:
                 logger.error("Ошибка при вычислении интервала для задачи '%s': %s. Используется 1 сек.", self.name, e)
                 return 1
         elif isinstance(self.interval_seconds, str):
-            try:
-                from chutils.config import get_config_value
-                # Пытаемся распарсить строку вида 'section.key' или 'key'
-                if "." in self.interval_seconds:
-                    section, key = self.interval_seconds.split(".", 1)
-                    val = get_config_value(section, key, fallback=0)
-                else:
-                    val = get_config_value("default", self.interval_seconds, fallback=0)
-
-                val_num = float(val) if val is not None else 0.0
-                if val_num <= 0:
-                    logger.warning(
-                        "Интервал из конфигурации по ключу '%s' для задачи '%s' не найден или <= 0. Используется 1 сек.",
-                        self.interval_seconds, self.name
-                    )
-                    return 1
-                return val_num
-            except Exception as e:
-                logger.error(
-                    "Ошибка при чтении интервала из конфигурации по ключу '%s' для задачи '%s': %s. Используется 1 сек.",
-                    self.interval_seconds, self.name, e
+            cached = self._config_interval
+            if cached is not None and cached[0] == _config_generation:
+                return cached[1]
+            generation = _config_generation
+            interval = self._read_config_interval(self.interval_seconds)
+            self._config_interval = (generation, interval)
+            return interval
+        else:
+            return 1
+
+    def _read_config_interval(self, key: str) -> int | float:
+        """Читает интервал из chutils.config по ключу 'section.key' или 'key'."""
+        try:
+            from chutils.config import get_config_value
+            _watch_config()
+            # Пытаемся распарсить строку вида 'section.key' или 'key'
+            if "." in key:
+                section, option = key.split(".", 1)
+                val = get_config_value(section, option, fallback=0)
+            else:
+                val = get_config_value("default", key, fallback=0)
+
+            val_num = float(val) if val is not None else 0.0
+            if val_num <= 0:
+                logger.warning(
+                    "Интервал из конфигурации по ключу '%s' для задачи '%s' не найден или <= 0. Используется 1 сек.",
+                    key, self.name
                 )
                 return 1
-        else:
+            return val_num
+        except Exception as e:
+            logger.error(
+                "Ошибка при чтении интервала из конфигурации по ключу '%s' для задачи '%s': %s. Используется 1 сек.",
+                key, self.name, e
+            )
             return 1
 
 
@@ -94,21 +167,26 @@ _tasks_registry: list[PeriodicTask] = []
 
 
 def periodic_task(
-        interval_seconds: int | float | Callable[[], int | float] | str,
+        interval_seconds: int | float | Callable[[], int | float] | str | None = None,
         run_immediately: bool = False,
         overlap: bool = False,
         error_strategy: ErrorStrategy = ErrorStrategy.IGNORE,
         name: str = "",
+        *,
+        cron: str | None = None,
+        jitter: float = 0.0,
+        executor: str | None = None,
+        timeout: float | None = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """Декоратор для привязки функции к расписанию планировщика задач.
 
     Args:
         interval_seconds: Интервал запуска в секундах. Может быть:
             - int / float: Фиксированный интервал (целый или дробный).
-            - callable: Функция без аргументов, возвращающая int или float. Вызывается перед
-              каждым циклом ожидания (поддерживает hot-reload интервалов "на лету").
+            - callable: Функция без аргументов, возвращающая int или float. Вызывается при
+              планировании каждого следующего запуска (поддерживает hot-reload интервалов "на лету").
             - str: Строка вида 'section.key' (или 'key') для чтения значения из chutils.config.
-              Значение перечитывается из конфигурации перед каждым циклом ожидания
+              Значение перечитывается после каждой перезагрузки конфигурации
               (поддерживает hot-reload интервалов "на лету").
 
             В случае ошибок вычисления интервала (неверный тип, отсутствие ключа в конфиге или
@@ -118,12 +196,25 @@ def periodic_task(
         overlap: Если True, задача запускается независимо от предыдущих запусков.
         error_strategy: Стратегия обработки ошибок.
         name: Пользовательское имя задачи.
+        cron: Cron-выражение (`"*/5 * * * *"`, `"@daily"`) вместо `interval_seconds`.
+        jitter: Максимальная случайная задержка каждого запуска в секундах.
+        executor: Пул для синхронной задачи: "thread", "process" или имя из `configure_executor`.
+            None — пул потоков event loop (`asyncio.to_thread`). Задачи для "process" должны
+            быть функциями уровня модуля; это проверяется при регистрации.
+        timeout: Максимальное время одного запуска в секундах; по его истечении запуск
+            считается ошибкой `ChutilsTimeoutError`, а процесс-исполнитель пула процессов
+            принудительно завершается.
 
     Returns:
         Декоратор, который регистрирует задачу в планировщике и оборачивает функцию.
+
+    Raises:
+        ValueError: Если расписание задано некорректно.
     """
     if isinstance(interval_seconds, int) and interval_seconds <= 0:
         raise ValueError("Interval must be a positive integer")
+    if cron is not None:
+        CronSchedule(cron)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         task = PeriodicTask(
@@ -132,7 +223,11 @@ def periodic_task(
             run_immediately=run_immediately,
             overlap=overlap,
             error_strategy=error_strategy,
-            name=name
+            name=name,
+            cron=cron,
+            jitter=jitter,
+            executor=executor,
+            timeout=timeout,
         )
         _tasks_registry.append(task)
 
@@ -169,95 +264,188 @@ class StopSchedulerException(Exception):
     pass
 
 
+class _ScheduleEntry:
+    """Состояние задачи в расписании планировщика."""
+
+    __slots__ = ("base", "cron_at", "executor", "running", "stopped", "target", "task")
+
+    def __init__(self, task: PeriodicTask) -> None:
+        self.task = task
+        self.executor: TaskExecutor | None = None
+        self.target: object = task.func
+        # Плановое время запуска без jitter (loop.time()); от него отсчитывается следующий запуск
+        self.base = 0.0
+        self.cron_at: datetime | None = None
+        self.running = 0
+        self.stopped = False
+
+
 class TaskScheduler:
-    """Асинхронный планировщик фоновых задач."""
+    """Асинхронный планировщик фоновых задач.
 
-    def __init__(self) -> None:
-        """Инициализирует планировщик фоновых задач."""
-        self._running_tasks: dict[str, asyncio.Task[Any]] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
-        self._shutdown_event = asyncio.Event()
-        self._tasks: list[PeriodicTask] = []
+    Все задачи обслуживает один цикл с кучей (heap) абсолютных времён
+    следующего запуска. Следующий запуск отсчитывается от планового времени
+    предыдущего, а не от его завершения, поэтому расписание не смещается на
+    длительность выполнения; пропущенные из-за задержки тики не нагоняются.
+    """
 
-    async def _run_task(self, task: PeriodicTask) -> None:
-        """Внутренний цикл выполнения отдельной периодической задачи."""
-        if not task.run_immediately:
-            try:
-                await asyncio.sleep(task.get_interval())
-            except asyncio.CancelledError:
-                return
+    def __init__(self, max_concurrency: int | None = None) -> None:
+        """Инициализирует планировщик фоновых задач.
+
+        Args:
+            max_concurrency: Максимальное число одновременно выполняющихся запусков всех
+                задач (None — без ограничения). Запуски сверх лимита ждут своей очереди,
+                ожидание учитывается в метрике отставания.
 
+        Raises:
+            ValueError: Если `max_concurrency` меньше 1.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency должен быть положительным, получено: {max_concurrency}")
+        self.max_concurrency = max_concurrency
+        self._shutdown_event = asyncio.Event()
+        self._tasks: list[PeriodicTask] = []
+        self._heap: list[tuple[float, int, _ScheduleEntry]] = []
+        self._seq = itertools.count()
+        self._loop_task: asyncio.Task[None] | None = None
+        self._executions: set[asyncio.Task[None]] = set()
+        self._stop_task: asyncio.Task[None] | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _push(self, entry: _ScheduleEntry, base: float) -> None:
+        """Ставит следующий запуск задачи в кучу с учётом jitter."""
+        entry.base = base
+        jitter = random.uniform(0, entry.task.jitter) if entry.task.jitter else 0.0
+        heapq.heappush(self._heap, (base + jitter, next(self._seq), entry))
+
+    def _next_base(self, entry: _ScheduleEntry, now: float) -> float:
+        """Вычисляет плановое время следующего запуска после `entry.base`."""
+        task = entry.task
+        if task.cron_schedule is not None:
+            wall = datetime.now()
+            if entry.cron_at is not None and entry.cron_at > wall:
+                # Монотонные часы могли разбудить цикл раньше настенных
+                wall = entry.cron_at
+            entry.cron_at = task.cron_schedule.next_after(wall)
+            return now + max(0.0, entry.cron_at.timestamp() - time.time())
+        interval = task.get_interval()
+        base = entry.base + interval
+        if base <= now:
+            # Отставание больше интервала: пропускаем просроченные тики, сохраняя фазу
+            base += ((now - base) // interval + 1) * interval
+        return base
+
+    async def _run_loop(self) -> None:
+        """Единый цикл планировщика: запускает задачи, чьё время наступило."""
+        loop = asyncio.get_running_loop()
         while not self._shutdown_event.is_set():
-            # Проверка перекрытия (overlapping)
-            if not task.overlap:
-                if self._locks[task.name].locked():
-                    logger.warning(
-                        "Запуск задачи '%s' пропущен, так как предыдущее выполнение еще не завершено.",
-                        task.name
-                    )
-                    try:
-                        await asyncio.sleep(task.get_interval())
-                    except asyncio.CancelledError:
-                        break
+            now = loop.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, _, entry = heapq.heappop(self._heap)
+                if entry.stopped:
                     continue
-
-            # Локальная обертка для выполнения
-            async def execute_and_handle_errors() -> None:
+                self._dispatch(entry, due)
+                if not entry.stopped:
+                    self._push(entry, self._next_base(entry, now))
+            if not self._heap:
+                await self._shutdown_event.wait()
+                return
+            await asyncio.sleep(self._heap[0][0] - loop.time())
+
+    def _dispatch(self, entry: _ScheduleEntry, due: float) -> None:
+        """Запускает выполнение задачи, если это допускает политика перекрытия."""
+        task = entry.task
+        if not task.overlap and entry.running:
+            logger.warning(
+                "Запуск задачи '%s' пропущен, так как предыдущее выполнение еще не завершено.",
+                task.name
+            )
+            return
+        entry.running += 1
+        execution = asyncio.create_task(self._execute(entry, due), name=f"scheduler_job_{task.name}")
+        self._executions.add(execution)
+        execution.add_done_callback(self._executions.discard)
+
+    async def _execute(self, entry: _ScheduleEntry, due: float) -> None:
+        """Выполняет один запуск задачи под общим лимитом конкурентности."""
+        task = entry.task
+        labels = {"task": task.name}
+        try:
+            async with self._semaphore or contextlib.nullcontext():
+                _metrics.observe("scheduler_task_lag_seconds", max(0.0, asyncio.get_running_loop().time() - due), labels)
                 logger.info("Задача '%s' запущена.", task.name)
                 start_time = time.perf_counter()
                 try:
-                    if task.is_async:
-                        await task.func()
-                    else:
-                        await asyncio.to_thread(task.func)
+                    await self._call(entry)
                     elapsed = time.perf_counter() - start_time
                     logger.info("Задача '%s' выполнена за %.2f сек.", task.name, elapsed)
                 except Exception as e:
+                    if isinstance(e, ChutilsTimeoutError):
+                        _metrics.increment("scheduler_task_timeouts_total", labels)
                     logger.exception("Ошибка выполнения задачи '%s': %s", task.name, e)
-
-                    if task.error_strategy == ErrorStrategy.STOP_TASK:
-                        logger.error("Задача '%s' исключена из планировщика из-за ошибки.", task.name)
-                        raise StopTaskException()
-                    elif task.error_strategy == ErrorStrategy.STOP_SCHEDULER:
-                        logger.critical("Критическая ошибка в задаче '%s'. Инициируется остановка планировщика.",
-                                        task.name)
-                        raise StopSchedulerException()
-
-            try:
-                if task.overlap:
-                    # Запускаем в фоновом режиме, не блокируя цикл планировщика
-                    asyncio.create_task(execute_and_handle_errors())
-                else:
-                    async with self._locks[task.name]:
-                        await execute_and_handle_errors()
-            except StopTaskException:
-                break
-            except StopSchedulerException:
+                    self._handle_error(entry)
+                finally:
+                    _metrics.observe("scheduler_task_duration_seconds", time.perf_counter() - start_time, labels)
+        finally:
+            entry.running -= 1
+
+    @staticmethod
+    async def _call(entry: _ScheduleEntry) -> None:
+        """Вызывает задачу: корутину — в event loop, синхронную — в пуле задачи или `to_thread`."""
+        task = entry.task
+        if entry.executor is not None:
+            await entry.executor.run(entry.target, task.timeout)
+            return
+        call = task.func() if task.is_async else asyncio.to_thread(task.func)
+        if task.timeout is None:
+            await call
+            return
+        try:
+            await asyncio.wait_for(call, task.timeout)
+        except asyncio.TimeoutError:
+            raise ChutilsTimeoutError(
+                f"Задача '{task.name}' не завершилась за {task.timeout} сек.",
+                task=task.name,
+                timeout=task.timeout,
+            ) from None
+
+    def _handle_error(self, entry: _ScheduleEntry) -> None:
+        """Применяет стратегию обработки ошибок задачи."""
+        task = entry.task
+        if task.error_strategy == ErrorStrategy.STOP_TASK:
+            logger.error("Задача '%s' исключена из планировщика из-за ошибки.", task.name)
+            entry.stopped = True
+        elif task.error_strategy == ErrorStrategy.STOP_SCHEDULER:
+            logger.critical("Критическая ошибка в задаче '%s'. Инициируется остановка планировщика.",
+                            task.name)
+            entry.stopped = True
+            if self._stop_task is None:
                 # Асинхронно останавливаем планировщик
-                asyncio.create_task(stop_scheduler())
-                break
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                pass
-
-            try:
-                await asyncio.sleep(task.get_interval())
-            except asyncio.CancelledError:
-                break
+                self._stop_task = asyncio.create_task(stop_scheduler() if _scheduler is self else self.stop())
 
     async def start(self) -> None:
-        """Запускает все зарегистрированные периодические задачи."""
+        """Запускает все зарегистрированные периодические задачи.
+
+        Raises:
+            ValueError: Если пул задачи не настроен или задачу нельзя выполнить в пуле процессов.
+        """
         self._shutdown_event.clear()
         self._tasks = get_registered_tasks()
+        if self.max_concurrency is not None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        for task in self._tasks:
-            if task.name not in self._locks:
-                self._locks[task.name] = asyncio.Lock()
+        entries = [_ScheduleEntry(task) for task in self._tasks]
+        for entry in entries:
+            if entry.task.executor is not None:
+                entry.executor = get_executor(entry.task.executor)
+                entry.target = entry.executor.prepare(entry.task.func)
 
-            job = asyncio.create_task(self._run_task(task), name=f"scheduler_job_{task.name}")
-            self._running_tasks[task.name] = job
+        now = asyncio.get_running_loop().time()
+        for entry in entries:
+            entry.base = now
+            self._push(entry, now if entry.task.run_immediately else self._next_base(entry, now))
 
+        self._loop_task = asyncio.create_task(self._run_loop(), name="chutils_scheduler")
         logger.info("Планировщик фоновых задач запущен. Задач в работе: %d", len(self._tasks))
 
     async def stop(self) -> None:
@@ -269,16 +457,17 @@ class TaskScheduler:
         logger.info("Остановка планировщика фоновых задач...")
         self._shutdown_event.set()
 
-        for name, job in list(self._running_tasks.items()):
-            if not job.done():
-                logger.debug("Отмена задачи: %s", name)
-                job.cancel()
+        jobs = [job for job in (self._loop_task, *self._executions) if job is not None and not job.done()]
+        for job in jobs:
+            logger.debug("Отмена задачи: %s", job.get_name())
+            job.cancel()
 
-        if self._running_tasks:
-            logger.debug("Ожидание завершения %d задач...", len(self._running_tasks))
-            await asyncio.gather(*self._running_tasks.values(), return_exceptions=True)
+        if jobs:
+            logger.debug("Ожидание завершения %d задач...", len(jobs))
+            await asyncio.gather(*jobs, return_exceptions=True)
 
-        self._running_tasks.clear()
+        self._heap.clear()
+        self._loop_task = None
         logger.info("Планировщик фоновых задач остановлен.")
 
 
@@ -286,9 +475,13 @@ _scheduler: TaskScheduler | None = None
 "Глобальный синглтон планировщика"
 
 
-def start_scheduler() -> None:
+def start_scheduler(max_concurrency: int | None = None) -> None:
     """
     Запускает глобальный планировщик фоновых задач в текущем Event Loop.
+
+    Args:
+        max_concurrency: Максимальное число одновременно выполняющихся запусков задач
+            (None — без ограничения).
     """
     global _scheduler
     if _scheduler is not None:
@@ -301,7 +494,7 @@ def start_scheduler() -> None:
         logger.error("Не удалось запустить планировщик: отсутствует активный Event Loop.")
         raise RuntimeError("No running event loop")
 
-    _scheduler = TaskScheduler()
+    _scheduler = TaskScheduler(max_concurrency=max_concurrency)
 
     # Регистрируем хук в lifecycle для Graceful Shutdown
     register_cleanup(stop_scheduler)
@@ -322,4 +515,5 @@ async def stop_scheduler() -> None:
     logger.debug("Вызов stop_scheduler()...")
     await _scheduler.stop()
     _scheduler = None
+    await asyncio.to_thread(shutdown_executors)
     logger.debug("stop_scheduler() завершен, _scheduler сброшен в None.")
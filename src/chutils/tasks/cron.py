@@ -0,0 +1,141 @@
+"""
+Разбор cron-выражений для планировщика задач.
+
+Поддерживается классический формат из пяти полей
+``минута час день_месяца месяц день_недели`` с конструкциями ``*``, ``a-b``,
+``*/n``, ``a-b/n`` и списками через запятую, имена месяцев (``jan``-``dec``)
+и дней недели (``sun``-``sat``), а также макросы ``@hourly``, ``@daily``,
+``@weekly``, ``@monthly`` и ``@yearly``. Время считается по локальным часам.
+"""
+from __future__ import annotations
+
+import calendar
+from datetime import datetime, timedelta
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTH_NAMES = {name.lower(): index for index, name in enumerate(calendar.month_abbr) if name}
+_DAY_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+
+_SEARCH_LIMIT_DAYS = 366 * 5
+"""Горизонт поиска следующего запуска; выражение без совпадений в нём считается ошибочным."""
+
+
+def _parse_field(
+        field: str,
+        low: int,
+        high: int,
+        names: dict[str, int] | None = None,
+) -> frozenset[int]:
+    """Разбирает одно поле cron-выражения в множество допустимых значений."""
+
+    def value(token: str) -> int:
+        token = token.lower()
+        if names and token in names:
+            return names[token]
+        if not token.isdigit():
+            raise ValueError(f"Некорректное значение cron-поля: {field!r}")
+        return int(token)
+
+    result: set[int] = set()
+    for part in field.split(","):
+        rng, _, step_text = part.partition("/")
+        step = int(step_text) if step_text.isdigit() else 0 if step_text else 1
+        if step < 1:
+            raise ValueError(f"Некорректный шаг cron-поля: {field!r}")
+        if rng == "*":
+            start, end = low, high
+        elif "-" in rng:
+            first, _, last = rng.partition("-")
+            start, end = value(first), value(last)
+        else:
+            start = value(rng)
+            end = high if step_text else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Значение cron-поля {field!r} вне диапазона {low}-{high}")
+        result.update(range(start, end + 1, step))
+    return frozenset(result)
+
+
+class CronSchedule:
+    """Расписание по cron-выражению.
+
+    Attributes:
+        expression: Исходное выражение.
+    """
+
+    __slots__ = ("_dom_any", "_dow_any", "days", "expression", "hours", "minutes", "months", "weekdays")
+
+    def __init__(self, expression: str) -> None:
+        """Разбирает выражение.
+
+        Args:
+            expression: Пять полей через пробел или макрос (``@daily`` и т.п.).
+
+        Raises:
+            ValueError: Если выражение некорректно.
+        """
+        self.expression = expression
+        fields = _MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron-выражение должно содержать 5 полей: {expression!r}")
+        minute, hour, day, month, weekday = fields
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days = _parse_field(day, 1, 31)
+        self.months = _parse_field(month, 1, 12, _MONTH_NAMES)
+        # 7 — тоже воскресенье
+        self.weekdays = frozenset(d % 7 for d in _parse_field(weekday, 0, 7, _DAY_NAMES))
+        self._dom_any = day == "*"
+        self._dow_any = weekday == "*"
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_dom = moment.day in self.days
+        # Воскресенье — 0, как в cron
+        in_dow = (moment.isoweekday() % 7) in self.weekdays
+        if self._dom_any or self._dow_any:
+            return in_dom and in_dow
+        # Если ограничены оба поля, достаточно совпадения любого (как в cron)
+        return in_dom or in_dow
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Возвращает ближайший момент запуска строго после `moment`.
+
+        Args:
+            moment: Точка отсчёта (naive локальное время или aware datetime).
+
+        Returns:
+            Момент следующего запуска с нулевыми секундами.
+
+        Raises:
+            ValueError: Если выражение не совпадает ни с одной датой (например, ``0 0 30 2 *``).
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=_SEARCH_LIMIT_DAYS)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                year = candidate.year + candidate.month // 12
+                candidate = candidate.replace(year=year, month=candidate.month % 12 + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Cron-выражение {self.expression!r} не совпадает ни с одной датой")
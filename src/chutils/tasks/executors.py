@@ -0,0 +1,364 @@
+"""
+Пулы выполнения синхронных периодических задач.
+
+По умолчанию синхронная задача выполняется в пуле потоков event loop
+(`asyncio.to_thread`). Задачи с `executor=...` выполняются в именованном пуле
+ограниченного размера:
+
+- ``"thread"`` — отдельный пул потоков планировщика;
+- ``"process"`` — пул процессов для CPU-bound задач: задача не удерживает GIL
+  основного процесса и не тормозит event loop;
+- любое имя, настроенное через `configure_executor`.
+
+Каждый поток пула процессов обслуживает один долгоживущий процесс-исполнитель.
+Если запуск превысил таймаут, этот процесс принудительно завершается и
+заменяется новым; остальные запуски пула не затрагиваются. В процесс
+передаётся ссылка на функцию (модуль и квалифицированное имя), поэтому
+функция должна быть объявлена на уровне модуля.
+
+Время ожидания свободного исполнителя публикуется в гистограмме
+`scheduler_executor_queue_wait_seconds{executor}`.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import functools
+import importlib
+import inspect
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import typing as t
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+
+from chutils.exceptions import ChutilsTimeoutError
+
+from . import _metrics
+
+ExecutorKind = t.Literal["thread", "process"]
+"""Тип пула выполнения задач."""
+
+_EXECUTOR_KINDS: frozenset[str] = frozenset({"thread", "process"})
+
+_JOIN_TIMEOUT = 1.0
+"""Сколько ждать завершения процесса-исполнителя при остановке, прежде чем убить его."""
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _FunctionRef(t.NamedTuple):
+    """Ссылка на функцию уровня модуля, передаваемая в процесс-исполнитель."""
+
+    module: str
+    qualname: str
+
+
+def _process_target(func: Callable[..., t.Any]) -> object:
+    """Проверяет, что задачу можно выполнить в другом процессе, и возвращает передаваемый объект.
+
+    Args:
+        func: Синхронная функция задачи.
+
+    Returns:
+        Ссылка на функцию уровня модуля или сам вызываемый объект, если он сериализуется pickle.
+
+    Raises:
+        ValueError: Если функция локальная, лямбда или объект не сериализуется pickle.
+    """
+    if inspect.isfunction(func):
+        if "<" in func.__qualname__:
+            raise ValueError(
+                f"Задачу '{func.__qualname__}' нельзя выполнять в пуле процессов: "
+                "функция должна быть объявлена на уровне модуля (не лямбда и не вложенная функция)."
+            )
+        return _FunctionRef(func.__module__, func.__qualname__)
+    try:
+        pickle.dumps(func)
+    except Exception as e:
+        raise ValueError(f"Задачу {func!r} нельзя выполнять в пуле процессов: объект не сериализуется pickle ({e}).") from e
+    return func
+
+
+def _resolve_target(target: object) -> Callable[..., t.Any]:
+    if not isinstance(target, _FunctionRef):
+        return t.cast(Callable[..., t.Any], target)
+    obj: t.Any = importlib.import_module(target.module)
+    for part in target.qualname.split("."):
+        obj = getattr(obj, part)
+    return t.cast(Callable[..., t.Any], obj)
+
+
+def _process_worker_main(conn: Connection) -> None:
+    """Цикл процесса-исполнителя: получает задачу, выполняет её и отправляет None или исключение."""
+    resolved: dict[object, Callable[..., t.Any]] = {}
+    conn.send(None)  # процесс запущен: время старта не входит в таймаут задачи
+    while True:
+        try:
+            target = conn.recv()
+        except (EOFError, OSError):
+            return
+        if target is None:
+            return
+        try:
+            func = resolved.get(target) if isinstance(target, _FunctionRef) else None
+            if func is None:
+                func = _resolve_target(target)
+                if isinstance(target, _FunctionRef):
+                    resolved[target] = func
+            func()
+            conn.send(None)
+        except BaseException as e:
+            try:
+                conn.send(e)
+            except Exception:
+                conn.send(RuntimeError(f"{type(e).__name__}: {e}"))
+
+
+class _ProcessWorker:
+    """Долгоживущий процесс-исполнитель, связанный с родителем каналом."""
+
+    def __init__(self, context: t.Any, name: str) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_process_worker_main, args=(child_conn,), name=name, daemon=True)
+        self.process.start()
+        child_conn.close()
+        try:
+            self.conn.recv()
+        except EOFError:
+            self.process.join(_JOIN_TIMEOUT)
+            raise RuntimeError(f"Процесс-исполнитель '{name}' завершился при запуске (код {self.process.exitcode}).") from None
+
+    def stop(self) -> None:
+        """Просит процесс завершиться и убивает его, если он не успел."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(_JOIN_TIMEOUT)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        """Принудительно завершает процесс."""
+        self.process.kill()
+        self.process.join(_JOIN_TIMEOUT)
+        self.conn.close()
+
+
+class TaskExecutor:
+    """Именованный пул выполнения синхронных задач ограниченного размера.
+
+    Attributes:
+        name: Имя пула.
+        kind: Тип пула: "thread" или "process".
+        max_workers: Максимальное число одновременно выполняемых задач.
+    """
+
+    def __init__(self, name: str, kind: ExecutorKind, max_workers: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._labels = {"executor": name}
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"ChutilsTask-{name}",
+        )
+        self._local = threading.local()
+        self._workers: set[_ProcessWorker] = set()
+        self._workers_lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn") if kind == "process" else None
+
+    def prepare(self, func: Callable[..., t.Any]) -> object:
+        """Проверяет функцию задачи и возвращает объект для `run`.
+
+        Args:
+            func: Синхронная функция задачи.
+
+        Returns:
+            Сама функция для пула потоков или ее переносимая ссылка для пула процессов.
+
+        Raises:
+            ValueError: Для пула процессов — если функцию нельзя передать в другой процесс.
+        """
+        return _process_target(func) if self.kind == "process" else func
+
+    async def run(self, target: object, timeout: float | None = None) -> None:
+        """Выполняет задачу в пуле.
+
+        Args:
+            target: Объект, полученный из `prepare`.
+            timeout: Максимальное время выполнения в секундах (без учёта ожидания в очереди).
+                Процесс-исполнитель по истечении таймаута убивается; поток пула потоков
+                продолжает работу, но его результат больше не ожидается.
+
+        Raises:
+            ChutilsTimeoutError: Если выполнение не уложилось в `timeout`.
+        """
+        submitted = time.perf_counter()
+        if self.kind == "process":
+            await asyncio.wrap_future(self._pool.submit(self._call_in_process, target, submitted, timeout))
+            return
+        loop = asyncio.get_running_loop()
+        started: asyncio.Future[None] = loop.create_future()
+        done = asyncio.wrap_future(
+            self._pool.submit(self._call_in_thread, target, submitted, functools.partial(loop.call_soon_threadsafe, _wake, started))
+        )
+        if timeout is None:
+            await done
+            return
+        # Таймаут отсчитывается от начала выполнения, а не от постановки в очередь
+        await asyncio.wait((started, done), return_when=asyncio.FIRST_COMPLETED)
+        try:
+            await asyncio.wait_for(asyncio.shield(done), timeout)
+        except asyncio.TimeoutError:
+            raise ChutilsTimeoutError(
+                f"Задача в пуле потоков '{self.name}' не завершилась за {timeout} сек.",
+                executor=self.name,
+                timeout=timeout,
+            ) from None
+
+    def shutdown(self) -> None:
+        """Останавливает потоки и процессы пула."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._workers_lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.stop()
+
+    def _call_in_thread(self, target: object, submitted: float, on_start: Callable[[], object]) -> None:
+        _metrics.observe("scheduler_executor_queue_wait_seconds", time.perf_counter() - submitted, self._labels)
+        on_start()
+        t.cast(Callable[..., t.Any], target)()
+
+    def _call_in_process(self, target: object, submitted: float, timeout: float | None) -> None:
+        _metrics.observe("scheduler_executor_queue_wait_seconds", time.perf_counter() - submitted, self._labels)
+        worker: _ProcessWorker | None = getattr(self._local, "worker", None)
+        if worker is None or not worker.process.is_alive():
+            worker = _ProcessWorker(self._context, f"ChutilsTask-{self.name}")
+            self._local.worker = worker
+            with self._workers_lock:
+                self._workers.add(worker)
+        worker.conn.send(target)
+        if not worker.conn.poll(timeout):
+            self._discard(worker)
+            worker.kill()
+            raise ChutilsTimeoutError(
+                f"Задача в пуле процессов '{self.name}' не завершилась за {timeout} сек.; процесс-исполнитель остановлен.",
+                executor=self.name,
+                timeout=timeout,
+            )
+        try:
+            outcome = worker.conn.recv()
+        except EOFError:
+            self._discard(worker)
+            raise RuntimeError(f"Процесс-исполнитель пула '{self.name}' неожиданно завершился.") from None
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+    def _discard(self, worker: _ProcessWorker) -> None:
+        self._local.worker = None
+        with self._workers_lock:
+            self._workers.discard(worker)
+
+
+_executors: dict[str, TaskExecutor] = {}
+_executor_configs: dict[str, tuple[ExecutorKind, int]] = {}
+_executors_lock = threading.Lock()
+
+
+def _default_workers(kind: ExecutorKind) -> int:
+    cpus = os.cpu_count() or 1
+    return cpus if kind == "process" else min(32, cpus + 4)
+
+
+def configure_executor(name: str, kind: ExecutorKind = "thread", *, max_workers: int | None = None) -> None:
+    """Настраивает именованный пул выполнения задач.
+
+    Пул настраивается один раз до первого использования. Встроенные пулы "thread" и
+    "process" можно перенастроить (например, ограничить размер) тем же вызовом.
+
+    Args:
+        name: Имя пула, указываемое в `@periodic_task(executor=...)`.
+        kind: "thread" — пул потоков, "process" — пул процессов.
+        max_workers: Размер пула; по умолчанию число CPU для процессов и min(32, CPU + 4) для потоков.
+
+    Raises:
+        ValueError: Если параметры некорректны или пул с этим именем уже создан либо настроен иначе.
+    """
+    if kind not in _EXECUTOR_KINDS:
+        raise ValueError(f"Неизвестный тип пула: {kind!r}. Допустимые значения: {sorted(_EXECUTOR_KINDS)}")
+    if name in _EXECUTOR_KINDS and kind != name:
+        raise ValueError(f"Встроенный пул '{name}' может иметь только тип '{name}'")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers должен быть положительным, получено: {max_workers}")
+    config = (kind, max_workers or _default_workers(kind))
+    with _executors_lock:
+        if _executor_configs.get(name, config) != config:
+            raise ValueError(f"Пул задач '{name}' уже настроен с другими параметрами")
+        if name in _executors and (_executors[name].kind, _executors[name].max_workers) != config:
+            raise ValueError(f"Пул задач '{name}' уже используется и не может быть перенастроен")
+        _executor_configs[name] = config
+
+
+def executor_kind(name: str) -> ExecutorKind | None:
+    """Возвращает тип пула по имени.
+
+    Args:
+        name: "thread", "process" или имя из `configure_executor`.
+
+    Returns:
+        Тип пула или None, если пул не настроен.
+    """
+    if name in _EXECUTOR_KINDS:
+        return t.cast(ExecutorKind, name)
+    with _executors_lock:
+        config = _executor_configs.get(name)
+    return config[0] if config else None
+
+
+def get_executor(name: str) -> TaskExecutor:
+    """Возвращает (создаёт при первом обращении) именованный пул.
+
+    Args:
+        name: "thread", "process" или имя из `configure_executor`.
+
+    Returns:
+        Пул задач.
+
+    Raises:
+        ValueError: Если пул с таким именем не настроен.
+    """
+    executor = _executors.get(name)
+    if executor is not None:
+        return executor
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            config = _executor_configs.get(name)
+            if config is None:
+                if name not in _EXECUTOR_KINDS:
+                    raise ValueError(f"Пул задач '{name}' не настроен; вызовите configure_executor('{name}', ...)")
+                kind = t.cast(ExecutorKind, name)
+                config = (kind, _default_workers(kind))
+            executor = TaskExecutor(name, *config)
+            _executors[name] = executor
+        return executor
+
+
+def shutdown_executors() -> None:
+    """Останавливает все созданные пулы (потоки и процессы-исполнители).
+
+    Настройки пулов сохраняются: при следующем обращении пул будет создан заново.
+    """
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown()
@@ -1,11 +1,17 @@
 import asyncio
+import gc
 import threading
 import time
 
 import pytest
 
 from chutils.cache import InMemoryCacheBackend, cache_with_ttl
-from chutils.cache.utils import generate_cache_key
+from chutils.cache.singleflight import AsyncSingleFlight, SingleFlight
+from chutils.cache.utils import (
+    AsyncLockManager,
+    LockManager,
+    generate_cache_key,
+)
 
 
 def test_key_generation():
@@ -282,3 +288,529 @@ def test_cache_tagging_dynamic():
     assert get_user_data(2) == {"id": 2, "data": "info"}
     assert call_count == 3  # user_2 остался в кэше
 
+
+
+def test_bounded_lru_eviction():
+    """LRU вытесняет ключ, к которому дольше всего не обращались."""
+    backend = InMemoryCacheBackend(max_entries=2, eviction="lru")
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1  # "b" становится самым старым
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.get("c") == 3
+    assert backend.stats().evictions == 1
+
+
+def test_bounded_lfu_eviction():
+    """LFU вытесняет наименее часто используемый ключ."""
+    backend = InMemoryCacheBackend(max_entries=2, eviction="lfu")
+    backend.set("a", 1)
+    backend.set("b", 2)
+    for _ in range(3):
+        backend.get("a")
+    backend.get("b")
+    backend.set("c", 3)
+
+    assert backend.exists("a") is True
+    assert backend.exists("b") is False
+    assert backend.exists("c") is True
+
+
+def test_bounded_tinylfu_protects_hot_keys():
+    """W-TinyLFU не дает однократному сканированию вымыть горячие ключи."""
+    backend = InMemoryCacheBackend(max_entries=100, eviction="tinylfu")
+    for i in range(100):
+        backend.set(f"hot_{i}", i)
+    for _ in range(5):
+        for i in range(100):
+            backend.get(f"hot_{i}")
+
+    for i in range(1000):
+        backend.set(f"scan_{i}", i)
+
+    survivors = sum(backend.exists(f"hot_{i}") for i in range(100))
+    assert survivors >= 90
+    assert backend.stats().entries == 100
+
+
+def test_bounded_max_bytes():
+    """Лимит по байтам вытесняет записи, пока сумма размеров не уложится в лимит."""
+    backend = InMemoryCacheBackend(max_bytes=30, sizeof=len)
+    backend.set("a", "x" * 10)
+    backend.set("b", "y" * 10)
+    backend.set("c", "z" * 15)
+
+    assert backend.exists("a") is False
+    assert backend.stats().size_bytes == 25
+
+    # Значение больше всего кэша не сохраняется
+    backend.set("huge", "h" * 31)
+    assert backend.exists("huge") is False
+
+
+def test_bounded_eviction_keeps_tag_index_consistent():
+    """Вытесненные записи удаляются из индекса тегов."""
+    backend = InMemoryCacheBackend(max_entries=1)
+    backend.set("a", 1, tags=["t1"])
+    backend.set("b", 2, tags=["t2"])
+
+    assert "a" not in backend._key_to_tags
+    assert "t1" not in backend._tag_to_keys
+    backend.invalidate_tag("t2")
+    assert backend.exists("b") is False
+    assert backend._tag_to_keys == {}
+
+
+def test_cache_stats_counters():
+    """Счетчики попаданий и промахов."""
+    backend = InMemoryCacheBackend()
+    backend.set("a", 1)
+    backend.get("a")
+    backend.get("missing")
+    backend.exists("a")
+
+    stats = backend.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+
+def test_configure_shrinks_existing_cache():
+    """configure() применяет новые лимиты к уже заполненному кэшу."""
+    backend = InMemoryCacheBackend()
+    for i in range(10):
+        backend.set(f"k{i}", i)
+    backend.configure(max_entries=3)
+
+    assert backend.stats().entries == 3
+    assert backend.exists("k9") is True
+    assert backend.exists("k0") is False
+
+
+def test_invalid_eviction_policy():
+    """Неизвестная политика и неположительные лимиты отклоняются."""
+    with pytest.raises(ValueError):
+        InMemoryCacheBackend(max_entries=10, eviction="fifo")
+    with pytest.raises(ValueError):
+        InMemoryCacheBackend(max_entries=0)
+
+
+def test_expiry_index_skips_stale_entries():
+    """Индекс сроков учитывает перенос срока и удаление ключа."""
+    from chutils.cache.expiry import ExpiryIndex
+
+    index = ExpiryIndex()
+    index.schedule("a", 10.0)
+    index.schedule("b", 20.0)
+    index.schedule("a", 30.0)  # перенос срока
+    index.schedule("c", 5.0)
+    index.discard("c")
+
+    assert index.next_expiry() == 20.0
+    assert index.pop_expired(now=25.0) == ["b"]
+    assert index.pop_expired(now=35.0) == ["a"]
+    assert len(index) == 0
+
+
+def test_expired_keys_released_without_reads():
+    """Истекшие записи удаляются при записи и фоновым потоком без обращений к ним."""
+    backend = InMemoryCacheBackend()
+    for i in range(100):
+        backend.set(f"k{i}", i, ttl=0.01, tags=["t"])
+    time.sleep(0.02)
+    assert backend.purge_expired() == 100
+    assert backend.stats().entries == 0
+    assert backend._tag_to_keys == {}
+
+    backend.start_reaper(interval=0.02)
+    try:
+        backend.set("temp", 1, ttl=0.01)
+        time.sleep(0.1)
+        assert backend.stats().entries == 0
+        assert backend.stats().expirations == 101
+    finally:
+        backend.stop_reaper()
+
+
+def test_sharded_backend_basic_and_tags():
+    """Шардированный бэкенд: базовые операции и инвалидация тегов во всех сегментах."""
+    from chutils.cache import ShardedInMemoryCacheBackend
+
+    backend = ShardedInMemoryCacheBackend(shards=8)
+    for i in range(100):
+        backend.set(f"k{i}", i, ttl=10, tags=["all", f"group_{i % 2}"])
+
+    assert backend.get("k5") == 5
+    assert backend.exists("k5") is True
+    backend.delete("k5")
+    assert backend.get("k5") is None
+
+    backend.invalidate_tag("group_0")
+    assert all(backend.get(f"k{i}") is None for i in range(0, 100, 2))
+    assert backend.get("k1") == 1
+
+    backend.invalidate_tag("all")
+    assert backend.stats().entries == 0
+
+
+def test_sharded_backend_bounded_and_stats():
+    """Лимит делится между сегментами, статистика агрегируется."""
+    from chutils.cache import ShardedInMemoryCacheBackend
+
+    backend = ShardedInMemoryCacheBackend(shards=4, max_entries=40)
+    for i in range(400):
+        backend.set(f"k{i}", i)
+    stats = backend.stats()
+    assert stats.entries <= 40
+    assert stats.evictions >= 360
+
+    backend.get("k399")
+    backend.get("missing")
+    stats = backend.stats()
+    assert stats.hits >= 1
+    assert stats.misses >= 1
+
+
+def test_sharded_backend_lock_free_read_respects_ttl():
+    """Быстрый путь чтения не возвращает просроченные значения."""
+    from chutils.cache import ShardedInMemoryCacheBackend
+
+    backend = ShardedInMemoryCacheBackend(shards=2)
+    backend.set("a", 1, ttl=0.05)
+    assert backend.get("a") == 1
+    time.sleep(0.1)
+    assert backend.get("a") is None
+    assert backend.stats().expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_sharded_backend_with_decorator():
+    """ShardedInMemoryCacheBackend совместим с cache_with_ttl."""
+    from chutils.cache import ShardedInMemoryCacheBackend
+
+    call_count = 0
+    backend = ShardedInMemoryCacheBackend(shards=4)
+
+    @cache_with_ttl(ttl=10, backend=backend, tags=["t"])
+    async def func(x):
+        nonlocal call_count
+        call_count += 1
+        return x
+
+    assert await func(1) == 1
+    assert await func(1) == 1
+    assert call_count == 1
+    await func.ainvalidate_tag("t")
+    assert await func(1) == 1
+    assert call_count == 2
+
+
+def test_tuple_key_builder_fast_path_and_fallback():
+    """Кортежные ключи для примитивов и хеш-ключ для остальных аргументов."""
+    from chutils.cache.utils import generate_tuple_key
+
+    assert generate_tuple_key("f", (1, "a", None), {}) == ("", "f", (1, "a", None))
+    assert generate_tuple_key("f", (1,), {"b": 2, "a": 1}) == ("", "f", (1,), (("a", 1), ("b", 2)))
+    # bool и float не смешиваются с int
+    assert generate_tuple_key("f", (True,), {}) != generate_tuple_key("f", (1,), {})
+    assert generate_tuple_key("f", ([1, 2],), {}) == generate_cache_key("f", ([1, 2],), {})
+
+
+def test_decorator_tuple_key_builder_and_custom_key():
+    """cache_with_ttl с key_builder="tuple" и пользовательским key=."""
+    backend = InMemoryCacheBackend()
+    calls = []
+
+    @cache_with_ttl(ttl=10, backend=backend, key_builder="tuple")
+    def add(a, b=0):
+        calls.append((a, b))
+        return a + b
+
+    @cache_with_ttl(ttl=10, backend=backend, key=lambda user, **_: user["id"])
+    def load(user, verbose=False):
+        calls.append(user["id"])
+        return user["id"]
+
+    assert add(1, b=2) == 3
+    assert add(1, b=2) == 3
+    assert add([1][0], 2.0) == 3.0  # float -> хеш-ключ
+    assert load({"id": 5}) == 5
+    assert load({"id": 5, "extra": True}, verbose=True) == 5
+    assert calls == [(1, 2), (1, 2.0), 5]
+
+    add.invalidate(1, b=2)
+    assert add(1, b=2) == 3
+    assert len(calls) == 4
+
+    with pytest.raises(ValueError):
+        cache_with_ttl(key_builder="md5")
+
+
+def test_custom_key_passes_through_key_builder():
+    """Значение key= проходит через key_builder: со строковым построителем ключ остается строкой."""
+    hashed = InMemoryCacheBackend()
+    tupled = InMemoryCacheBackend()
+
+    @cache_with_ttl(ttl=10, backend=hashed, key=lambda user, **_: user["id"])
+    def load_hashed(user, verbose=False):
+        return user["id"]
+
+    @cache_with_ttl(ttl=10, backend=tupled, key_builder="tuple", key=lambda user, **_: user["id"])
+    def load_tupled(user, verbose=False):
+        return user["id"]
+
+    load_hashed({"id": 7})
+    load_tupled({"id": 7})
+    assert [type(k) for k in hashed._cache] == [str]
+    assert list(tupled._cache) == [("", f"{__name__}.load_tupled", (7,))]
+
+
+def test_lock_manager_reclaims_idle_locks():
+    """Блокировки неиспользуемых ключей не накапливаются в таблице."""
+    manager = LockManager(stripes=4)
+    held = manager.get_lock("held")
+    assert manager.get_lock("held") is held
+
+    for i in range(1000):
+        with manager.get_lock(f"key:{i}"):
+            pass
+    gc.collect()
+
+    assert len(manager) == 1
+    del held
+    gc.collect()
+    assert len(manager) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_lock_manager_reclaims_idle_locks():
+    """Асинхронные блокировки освобождаются после использования и общие для ожидающих."""
+    manager = AsyncLockManager()
+    order = []
+
+    async def worker(n):
+        async with manager.get_lock("shared"):
+            order.append(n)
+            await asyncio.sleep(0.01)
+            order.append(n)
+
+    await asyncio.gather(*(worker(n) for n in range(3)))
+    gc.collect()
+
+    assert order[0] == order[1] and order[2] == order[3]
+    assert len(manager) == 0
+
+
+def test_single_flight_shares_result_and_exception():
+    """Одновременные вызовы SingleFlight выполняют функцию один раз."""
+    flight = SingleFlight()
+    calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(1)
+        return calls
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+    leader.start()
+    started.wait(1)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert calls == 1
+    assert results == [1] * 5
+    assert len(flight) == 0
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_shares_result_and_survives_leader_cancel():
+    """Ожидающие AsyncSingleFlight получают общий результат и переживают отмену ведущего."""
+    flight = AsyncSingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    results = await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+    assert results == ["ok"] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+    leader = asyncio.create_task(flight.do("c", compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("c", compute))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == "ok"
+    assert calls == 3
+
+
+def test_decorator_stampede_propagates_error_once():
+    """Ошибка вычисления передается всем одновременным вызовам без повторного запуска функции."""
+    calls = 0
+    backend = InMemoryCacheBackend()
+
+    @cache_with_ttl(ttl=10, backend=backend)
+    def failing():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        raise RuntimeError("fail")
+
+    errors = []
+
+    def target():
+        try:
+            failing()
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=target) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 5
+    assert calls == 1
+
+
+def test_in_memory_touch_extends_ttl_without_rewriting_tags():
+    """touch продлевает срок записи, сохраняя значение и теги."""
+    backend = InMemoryCacheBackend()
+    backend.set("k", "v", ttl=1, tags=["t"])
+
+    assert backend.touch("k", ttl=10) is True
+    assert backend.touch("missing", ttl=10) is False
+    time.sleep(1.1)
+
+    assert backend.get("k") == "v"
+    backend.invalidate_tag("t")
+    assert backend.get("k") is None
+
+
+def test_sliding_hit_touches_instead_of_set(monkeypatch):
+    """Скользящий TTL при попадании не перезаписывает запись через set."""
+    backend = InMemoryCacheBackend()
+    set_calls = 0
+    original_set = backend.set
+
+    def counting_set(*args, **kwargs):
+        nonlocal set_calls
+        set_calls += 1
+        original_set(*args, **kwargs)
+
+    monkeypatch.setattr(backend, "set", counting_set)
+
+    @cache_with_ttl(ttl=10, backend=backend, tags=["users"])
+    def get_user(user_id):
+        return {"id": user_id}
+
+    for _ in range(5):
+        assert get_user(1) == {"id": 1}
+
+    assert set_calls == 1
+    get_user.invalidate_tag("users")
+    assert backend.stats().entries == 0
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_stale_while_revalidate_sync():
+    """Устаревшее значение отдается сразу, а пересчет идет в фоновом потоке."""
+    backend = InMemoryCacheBackend()
+    calls = 0
+
+    @cache_with_ttl(ttl=1, stale_ttl=10, backend=backend)
+    def version():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return calls
+
+    assert version() == 1
+    time.sleep(1.05)
+
+    started = time.perf_counter()
+    assert version() == 1
+    assert time.perf_counter() - started < 0.05
+    assert _wait_for(lambda: version() == 2)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_async():
+    """Для корутин фоновое обновление выполняется в отдельной задаче."""
+    backend = InMemoryCacheBackend()
+    calls = 0
+
+    @cache_with_ttl(ttl=1, stale_ttl=10, backend=backend)
+    async def version():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    assert await version() == 1
+    await asyncio.sleep(1.05)
+
+    results = await asyncio.gather(*(version() for _ in range(5)))
+    assert results == [1] * 5
+    await asyncio.sleep(0.1)
+
+    assert await version() == 2
+    assert calls == 2
+
+
+def test_refresh_ahead_refreshes_before_expiry():
+    """XFetch с большим beta запускает обновление задолго до истечения ttl."""
+    backend = InMemoryCacheBackend()
+    calls = 0
+
+    @cache_with_ttl(ttl=60, refresh_ahead=1e9, backend=backend)
+    def compute():
+        nonlocal calls
+        calls += 1
+        time.sleep(0.01)
+        return calls
+
+    assert compute() == 1
+    assert compute() == 1
+    assert _wait_for(lambda: calls == 2)
+
+
+def test_stale_modes_validate_arguments():
+    """Некорректные stale_ttl и refresh_ahead отклоняются."""
+    with pytest.raises(ValueError):
+        cache_with_ttl(stale_ttl=-1)
+    with pytest.raises(ValueError):
+        cache_with_ttl(refresh_ahead=0)
@@ -0,0 +1,212 @@
+"""
+Тесты скомпилированных планов разрешения и быстрого пути @inject.
+
+Покрывает:
+- Однократный разбор сигнатур провайдеров при повторных resolve().
+- Сброс планов при register() и clear().
+- Семантику scope внутри плана: новые transient-зависимости на каждый вызов,
+  общий синглтон, циклы через синглтоны.
+- Быстрый путь @inject без bind_partial() и откат на него для маркеров и
+  позиционно-только параметров.
+"""
+import inspect
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from chutils.di import Container, Inject, inject
+from chutils.di import container as container_module
+from chutils.exceptions import DependencyResolutionError
+
+
+class Leaf:
+    pass
+
+
+class Middle:
+    def __init__(self, leaf: Leaf) -> None:
+        self.leaf = leaf
+
+
+class Root:
+    def __init__(self, middle: Middle, leaf: Leaf, retries: int = 3) -> None:
+        self.middle = middle
+        self.leaf = leaf
+        self.retries = retries
+
+
+class SingletonCycleA:
+    def __init__(self, b: "SingletonCycleB") -> None:
+        self.b = b
+
+
+class SingletonCycleB:
+    def __init__(self, a: SingletonCycleA) -> None:
+        self.a = a
+
+
+@pytest.fixture
+def parameters_spy(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    spy = MagicMock(wraps=container_module._provider_parameters)
+    monkeypatch.setattr(container_module, "_provider_parameters", spy)
+    return spy
+
+
+@pytest.fixture
+def bind_partial_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    original = inspect.Signature.bind_partial
+
+    def bind_partial(self: inspect.Signature, *args: Any, **kwargs: Any) -> inspect.BoundArguments:
+        calls.append(str(self))
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(inspect.Signature, "bind_partial", bind_partial)
+    return calls
+
+
+class TestResolutionPlans:
+    """Компиляция, исполнение и сброс планов разрешения."""
+
+    def test_signatures_parsed_once(self, parameters_spy: MagicMock) -> None:
+        """Сигнатуры всего графа разбираются только при первом resolve()."""
+        container = Container()
+        for cls in (Leaf, Middle, Root):
+            container.register(cls, scope="transient")
+
+        first = container.resolve(Root)
+        for _ in range(5):
+            container.resolve(Root)
+
+        # Root, Middle и два вхождения Leaf — по одному разу при компиляции плана
+        assert parameters_spy.call_count == 4
+        assert isinstance(first.middle.leaf, Leaf)
+        assert first.retries == 3
+
+    def test_transient_dependencies_are_fresh(self) -> None:
+        """Каждое исполнение плана создаёт новые transient-зависимости."""
+        container = Container()
+        for cls in (Leaf, Middle, Root):
+            container.register(cls, scope="transient")
+
+        first, second = container.resolve(Root), container.resolve(Root)
+        assert first is not second
+        assert first.middle is not second.middle
+        assert first.leaf is not first.middle.leaf
+
+    def test_singleton_inside_transient_graph(self, parameters_spy: MagicMock) -> None:
+        """Синглтон внутри графа создаётся один раз и разрешается своим планом."""
+        container = Container()
+        factory = MagicMock(side_effect=Leaf)
+        container.register(Leaf, provider=factory)
+        container.register(Middle, scope="transient")
+        container.register(Root, scope="transient")
+
+        roots = [container.resolve(Root) for _ in range(3)]
+        assert factory.call_count == 1
+        assert all(root.leaf is roots[0].leaf is root.middle.leaf for root in roots)
+        assert len({id(root.middle) for root in roots}) == 3
+        assert parameters_spy.call_count == 3
+
+    def test_register_invalidates_plans(self, parameters_spy: MagicMock) -> None:
+        """После register() план строится заново и использует новый провайдер."""
+        container = Container()
+        container.register(Leaf, scope="transient")
+        container.register(Middle, scope="transient")
+        assert type(container.resolve(Middle).leaf) is Leaf
+
+        class FakeLeaf(Leaf):
+            pass
+
+        container.register(Leaf, provider=FakeLeaf, scope="transient")
+        assert type(container.resolve(Middle).leaf) is FakeLeaf
+        assert parameters_spy.call_count == 4
+
+    def test_clear_invalidates_plans(self) -> None:
+        """После clear() старые планы не используются."""
+        container = Container()
+        container.register("greeting", lambda: "hello", scope="transient")
+        assert container.resolve("greeting") == "hello"
+
+        container.clear()
+        container.register("greeting", lambda: "bye", scope="transient")
+        assert container.resolve("greeting") == "bye"
+
+    def test_singleton_cycle_detected(self) -> None:
+        """Цикл через синглтоны, разрешаемые отдельными планами, обнаруживается."""
+        container = Container()
+        container.register(SingletonCycleA)
+        container.register(SingletonCycleB)
+
+        with pytest.raises(DependencyResolutionError, match="циклическая зависимость"):
+            container.resolve(SingletonCycleA)
+
+    def test_cached_singleton_not_inspected(self, parameters_spy: MagicMock) -> None:
+        """Уже созданный синглтон возвращается без разбора его сигнатуры."""
+        container = Container()
+        leaf = container.resolve(Leaf)
+        container.register("unrelated", lambda: 1)
+        parameters_spy.reset_mock()
+
+        assert container.resolve(Leaf) is leaf
+        parameters_spy.assert_not_called()
+
+
+class TestInjectFastPath:
+    """Подстановка зависимостей @inject без bind_partial()."""
+
+    def test_kwargs_path(self, bind_partial_calls: list[str]) -> None:
+        """Позиционные, именованные и keyword-only аргументы обходятся без bind_partial()."""
+        container = Container()
+        container.register(Leaf)
+
+        @inject(container=container)
+        def handler(prefix: str, leaf: Leaf = Inject(), *, other: Middle = Inject()) -> tuple[str, Leaf, Middle]:
+            return prefix, leaf, other
+
+        custom = Leaf()
+        prefix, leaf, other = handler("a")
+        assert prefix == "a" and leaf is container.resolve(Leaf) and other.leaf is leaf
+        assert handler("b", custom)[1] is custom
+        assert handler(prefix="c", leaf=custom)[1] is custom
+        assert handler("d", leaf=Inject())[1] is leaf
+        assert bind_partial_calls == []
+
+    def test_positional_marker_falls_back(self, bind_partial_calls: list[str]) -> None:
+        """Маркер Inject(), переданный позиционно, заменяется через bind_partial()."""
+        container = Container()
+        container.register(Leaf)
+
+        @inject(container=container)
+        def handler(leaf: Leaf = Inject()) -> Leaf:
+            return leaf
+
+        assert handler(Inject()) is container.resolve(Leaf)
+        assert len(bind_partial_calls) == 1
+
+    def test_positional_only_parameter(self, bind_partial_calls: list[str]) -> None:
+        """Позиционно-только параметры внедряются через bind_partial()."""
+        container = Container()
+        container.register(Leaf)
+
+        @inject(container=container)
+        def handler(leaf: Leaf = Inject(), /) -> Leaf:
+            return leaf
+
+        assert handler() is container.resolve(Leaf)
+        assert bind_partial_calls
+
+    @pytest.mark.asyncio
+    async def test_async_kwargs_path(self, bind_partial_calls: list[str]) -> None:
+        """Асинхронная обёртка использует тот же быстрый путь."""
+        container = Container()
+        container.register(Leaf, scope="transient")
+
+        @inject(container=container)
+        async def handler(leaf: Leaf = Inject()) -> Leaf:
+            return leaf
+
+        first, second = await handler(), await handler()
+        assert isinstance(first, Leaf) and first is not second
+        assert bind_partial_calls == []
@@ -0,0 +1,217 @@
+"""
+Тесты фоновой доставки событий EventBus.
+
+Проверяет:
+- Ограничение числа одновременных фоновых доставок (`workers`)
+- Политики переполнения очереди: block, drop, raise и переопределение в publish
+- Пакетную доставку (`batch_size`, `max_wait`) и сброс неполных пачек в join()
+- Выполнение синхронных обработчиков publish_async в пуле потоков шины
+- Метрики глубины очереди и отброшенных событий
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from chutils import metrics
+from chutils.events import EventBus
+from chutils.exceptions import EventBusQueueFullError
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+
+
+@pytest.fixture
+def provider():
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+def _blocked_bus(**kwargs):
+    """Шина с одним фоновым обработчиком, который ждёт открытия `gate`."""
+    bus = EventBus(workers=1, max_queue_size=2, **kwargs)
+    gate = threading.Event()
+    started = threading.Event()
+    received = []
+
+    @bus.subscribe("job")
+    async def handler(n):
+        started.set()
+        await asyncio.get_running_loop().run_in_executor(None, gate.wait)
+        received.append(n)
+
+    return bus, gate, started, received
+
+
+def test_bus_validates_arguments():
+    with pytest.raises(ValueError, match="политика"):
+        EventBus(overflow="spill")
+    with pytest.raises(ValueError, match="workers"):
+        EventBus(workers=0)
+    with pytest.raises(ValueError, match="batch_size"):
+        EventBus().subscribe("e", batch_size=0)
+
+
+def test_async_handlers_limited_by_workers():
+    bus = EventBus(workers=3)
+    active = 0
+    peak = 0
+    received = []
+
+    @bus.subscribe("tick")
+    async def handler(n):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        received.append(n)
+
+    for n in range(200):
+        bus.publish("tick", n)
+
+    assert bus.join(timeout=5)
+    assert sorted(received) == list(range(200))
+    assert peak == 3
+    assert bus.queue_depths() == {"tick": 0}
+
+
+def test_overflow_drop(provider):
+    bus, gate, started, received = _blocked_bus(overflow="drop")
+    bus.publish("job", 0)
+    assert started.wait(1)
+    for n in range(1, 6):
+        bus.publish("job", n)
+
+    assert bus.queue_depths() == {"job": 2}
+    gate.set()
+    assert bus.join(timeout=2)
+    assert received == [0, 1, 2]
+    dropped = provider.get_metrics()["counters"]["events_dropped_total"]
+    assert dropped == [{"labels": {"event": "job", "policy": "drop"}, "value": 3.0}]
+
+
+def test_overflow_raise_and_per_call_override():
+    bus, gate, started, received = _blocked_bus(overflow="raise")
+    bus.publish("job", 0)
+    assert started.wait(1)
+    bus.publish("job", 1)
+    bus.publish("job", 2)
+
+    with pytest.raises(EventBusQueueFullError) as excinfo:
+        bus.publish("job", 3)
+    assert excinfo.value.context["event_name"] == "job"
+    bus.publish("job", 4, overflow="drop")
+
+    gate.set()
+    assert bus.join(timeout=2)
+    assert received == [0, 1, 2]
+
+
+def test_overflow_block_waits_for_room():
+    bus, gate, started, received = _blocked_bus(overflow="block", block_timeout=5)
+    bus.publish("job", 0)
+    assert started.wait(1)
+    bus.publish("job", 1)
+    bus.publish("job", 2)
+
+    published = threading.Event()
+    publisher = threading.Thread(target=lambda: (bus.publish("job", 3), published.set()))
+    publisher.start()
+    assert not published.wait(0.05)
+
+    gate.set()
+    assert published.wait(2)
+    publisher.join()
+    assert bus.join(timeout=2)
+    assert received == [0, 1, 2, 3]
+
+
+def test_overflow_block_timeout_drops():
+    bus, gate, started, received = _blocked_bus(overflow="block", block_timeout=0.05)
+    bus.publish("job", 0)
+    assert started.wait(1)
+    bus.publish("job", 1)
+    bus.publish("job", 2)
+
+    started_at = time.monotonic()
+    bus.publish("job", 3)
+    assert time.monotonic() - started_at >= 0.04
+
+    gate.set()
+    assert bus.join(timeout=2)
+    assert received == [0, 1, 2]
+
+
+def test_batched_delivery_by_size_and_wait():
+    bus = EventBus()
+    batches = []
+
+    @bus.subscribe("row", batch_size=3, max_wait=0.05)
+    def handler(rows):
+        batches.append(rows)
+
+    for n in range(7):
+        bus.publish("row", n)
+
+    deadline = time.monotonic() + 2
+    while sum(map(len, batches)) < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_join_flushes_partial_batch():
+    bus = EventBus()
+    batches = []
+
+    @bus.subscribe("row", batch_size=100, max_wait=60)
+    async def handler(rows):
+        batches.append(rows)
+
+    bus.publish("row", id=1)
+    bus.publish("row", id=2)
+    assert bus.join(timeout=2)
+    assert batches == [[{"id": 1}, {"id": 2}]]
+
+
+@pytest.mark.asyncio
+async def test_publish_async_runs_sync_handlers_in_bus_pool():
+    bus = EventBus(workers=2)
+    threads = []
+    batches = []
+
+    @bus.subscribe("evt")
+    def first(n):
+        threads.append(threading.current_thread().name)
+
+    @bus.subscribe("evt")
+    def second(n):
+        threads.append(threading.current_thread().name)
+
+    @bus.subscribe("evt", batch_size=2)
+    def batched(items):
+        batches.append(items)
+
+    await bus.publish_async("evt", 1)
+    await bus.publish_async("evt", 2)
+
+    assert len(threads) == 4
+    assert all(name.startswith("ChutilsEventBus") for name in threads)
+    # Синхронные обработчики одного события выполняются одной задачей пула
+    assert threads[0] == threads[1] and threads[2] == threads[3]
+    assert await asyncio.to_thread(bus.join, 2)
+    assert batches == [[1, 2]]
+
+
+def test_queue_depth_metric(provider):
+    bus, gate, started, _ = _blocked_bus(overflow="drop")
+    bus.publish("job", 0)
+    assert started.wait(1)
+    bus.publish("job", 1)
+    assert bus.queue_depths() == {"job": 1}
+    gate.set()
+    assert bus.join(timeout=2)
+    # После опустошения очереди глубина публикуется сразу, без ожидания интервала
+    gauges = provider.get_metrics()["gauges"]["events_queue_depth"]
+    assert gauges == [{"labels": {"event": "job"}, "value": 0.0}]
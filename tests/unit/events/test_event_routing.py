@@ -0,0 +1,162 @@
+"""
+Тесты маршрутизации событий EventBus.
+
+Проверяет:
+- Дерево шаблонов тем: подстановки `*` и `#`, удаление шаблонов
+- Подписку на шаблоны и порядок вызова обработчиков из разных подписок
+- Однократный вызов обработчика, совпавшего с несколькими шаблонами
+- Кэширование таблиц диспетчеризации и их сброс при подписке/отписке
+- Однократное определение асинхронности обработчика
+"""
+import asyncio
+
+import pytest
+
+from chutils.events import EventBus, core
+from chutils.events.routing import _TopicTrie, is_pattern
+
+
+@pytest.mark.parametrize(
+    ("pattern", "topic", "matches"),
+    [
+        ("orders.*", "orders.created", True),
+        ("orders.*", "orders", False),
+        ("orders.*", "orders.eu.created", False),
+        ("orders.#", "orders", True),
+        ("orders.#", "orders.eu.created", True),
+        ("#", "anything.at.all", True),
+        ("*.created", "users.created", True),
+        ("orders.#.created", "orders.created", True),
+        ("orders.#.created", "orders.eu.de.created", True),
+        ("orders.#.created", "orders.eu.deleted", False),
+        ("orders.*", "users.created", False),
+    ],
+)
+def test_trie_matching(pattern, topic, matches):
+    trie = _TopicTrie()
+    trie.add(pattern)
+    assert (trie.match(topic) == [pattern]) is matches
+
+
+def test_trie_discard_prunes_branches():
+    trie = _TopicTrie()
+    trie.add("a.*.c")
+    trie.add("a.#")
+    trie.discard("a.*.c")
+    assert len(trie) == 1
+    assert trie.match("a.b.c") == ["a.#"]
+    trie.discard("a.#")
+    trie.discard("a.#")
+    assert len(trie) == 0
+    assert trie._root.children == {}
+
+
+def test_is_pattern():
+    assert is_pattern("orders.*")
+    assert is_pattern("#")
+    assert not is_pattern("orders.created")
+    assert not is_pattern("price*2")
+
+
+def test_wildcard_subscriptions_in_registration_order():
+    bus = EventBus()
+    calls = []
+
+    bus.subscribe("orders.#")(lambda **kw: calls.append(("all", kw["id"])))
+    bus.subscribe("orders.created")(lambda **kw: calls.append(("exact", kw["id"])))
+    bus.subscribe("orders.*")(lambda **kw: calls.append(("one", kw["id"])))
+    bus.subscribe("users.*")(lambda **kw: calls.append(("users", kw["id"])))
+
+    bus.publish("orders.created", id=1)
+    bus.publish("orders.eu.created", id=2)
+
+    assert calls == [("all", 1), ("exact", 1), ("one", 1), ("all", 2)]
+
+
+def test_handler_matching_several_patterns_called_once():
+    bus = EventBus()
+    calls = []
+
+    def handler(n):
+        calls.append(n)
+
+    bus.subscribe("orders.*")(handler)
+    bus.subscribe("orders.#")(handler)
+    bus.subscribe("orders.created")(handler)
+
+    bus.publish("orders.created", 1)
+    assert calls == [1]
+
+    bus.unsubscribe("orders.*", handler)
+    bus.unsubscribe("orders.created", handler)
+    bus.publish("orders.created", 2)
+    assert calls == [1, 2]
+
+
+def test_plan_cache_invalidated_on_subscription_changes():
+    bus = EventBus()
+    calls = []
+
+    bus.publish("orders.created", 0)
+    assert not bus._plans["orders.created"]
+
+    def handler(n):
+        calls.append(n)
+
+    bus.subscribe("orders.*")(handler)
+    bus.publish("orders.created", 1)
+    plan = bus._plans["orders.created"]
+    bus.publish("orders.created", 2)
+    assert bus._plans["orders.created"] is plan
+
+    bus.unsubscribe("orders.*", handler)
+    bus.publish("orders.created", 3)
+    assert calls == [1, 2]
+    assert len(bus._patterns) == 0
+
+
+def test_plan_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(core, "_PLAN_CACHE_SIZE", 8)
+    bus = EventBus()
+    for n in range(20):
+        bus.publish(f"event_{n}")
+    assert len(bus._plans) <= 8
+
+
+def test_async_classification_cached(monkeypatch):
+    bus = EventBus()
+    received = []
+
+    @bus.subscribe("metrics.*")
+    async def handler(n):
+        received.append(n)
+
+    checks = []
+    original = core.is_async_callable
+    monkeypatch.setattr(core, "is_async_callable", lambda obj: checks.append(obj) or original(obj))
+
+    async def run():
+        for n in range(5):
+            await bus.publish_async("metrics.cpu", n)
+
+    asyncio.run(run())
+    assert received == [0, 1, 2, 3, 4]
+    assert checks == []
+
+
+def test_wildcard_batched_subscription_collects_all_topics():
+    bus = EventBus()
+    batches = []
+
+    @bus.subscribe("orders.#", batch_size=3, max_wait=60)
+    def handler(items):
+        batches.append(items)
+
+    bus.publish("orders.created", 1)
+    bus.publish("orders.paid", 2)
+    bus.publish("orders.eu.shipped", 3)
+    bus.publish("orders.created", 4)
+    assert bus.join(timeout=2)
+    # Темы доставляются разными очередями, порядок внутри пачки не гарантирован
+    assert sorted(item for batch in batches for item in batch) == [1, 2, 3, 4]
+    assert [len(batch) for batch in batches] == [3, 1]
@@ -0,0 +1,146 @@
+import io
+import logging
+import logging.handlers
+import queue
+
+import pytest
+
+import chutils.metrics as metrics
+from chutils.logger import BatchingQueueListener, OverflowQueueHandler
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+
+
+def make_record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name="app", level=level, pathname="", lineno=0, msg=msg, args=(), exc_info=None)
+
+
+class CountingStream(io.StringIO):
+    """Поток, считающий вызовы write и flush."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+@pytest.fixture
+def provider():
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+def queued_messages(q: queue.Queue) -> list[str]:
+    return [q.get_nowait().getMessage() for _ in range(q.qsize())]
+
+
+def test_overflow_drop_new(provider):
+    """drop_new отбрасывает новые записи и считает их."""
+    q: queue.Queue = queue.Queue(2)
+    handler = OverflowQueueHandler(q, overflow="drop_new", name="app")
+    for i in range(5):
+        handler.handle(make_record(f"m{i}"))
+
+    assert queued_messages(q) == ["m0", "m1"]
+    assert handler.dropped == 3
+    dropped = provider.get_metrics()["counters"]["log_records_dropped_total"][0]
+    assert dropped == {"labels": {"logger": "app", "policy": "drop_new"}, "value": 3.0}
+
+
+def test_overflow_drop_oldest():
+    """drop_oldest вытесняет самые старые записи."""
+    q: queue.Queue = queue.Queue(2)
+    handler = OverflowQueueHandler(q, overflow="drop_oldest")
+    for i in range(5):
+        handler.handle(make_record(f"m{i}"))
+
+    assert queued_messages(q) == ["m3", "m4"]
+    assert handler.dropped == 3
+
+
+def test_overflow_block_with_timeout():
+    """block ждет не дольше block_timeout и затем отбрасывает запись."""
+    q: queue.Queue = queue.Queue(1)
+    handler = OverflowQueueHandler(q, overflow="block", block_timeout=0.01)
+    handler.handle(make_record("m0"))
+    handler.handle(make_record("m1"))
+
+    assert queued_messages(q) == ["m0"]
+    assert handler.dropped == 1
+
+
+def test_overflow_invalid_arguments():
+    with pytest.raises(ValueError):
+        OverflowQueueHandler(queue.Queue(), overflow="drop_all")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        OverflowQueueHandler(queue.Queue(), block_timeout=-1)
+    with pytest.raises(ValueError):
+        BatchingQueueListener(queue.Queue(), batch_size=0)
+
+
+def test_listener_writes_batch_with_single_flush(provider):
+    """Накопленные записи пишутся в поток одним write и одним flush; уровень обработчика учитывается."""
+    q: queue.Queue = queue.Queue()
+    stream = CountingStream()
+    handler = logging.StreamHandler(stream)
+    handler.setLevel(logging.INFO)
+    for i in range(50):
+        q.put_nowait(make_record(f"m{i}"))
+    q.put_nowait(make_record("debug", level=logging.DEBUG))
+
+    listener = BatchingQueueListener(q, handler, respect_handler_level=True, batch_size=100, name="app")
+    listener.start()
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == [f"m{i}" for i in range(50)]
+    assert stream.writes == 1
+    assert stream.flushes == 1
+    gauge = provider.get_metrics()["gauges"]["log_queue_size"][0]
+    assert gauge == {"labels": {"logger": "app"}, "value": 0.0}
+
+
+def test_listener_batch_respects_size_rotation(tmp_path):
+    """Пакетная запись выполняет ротацию по размеру так же, как обычная."""
+    log_file = tmp_path / "app.log"
+    handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=100, backupCount=10, encoding="utf-8")
+    q: queue.Queue = queue.Queue()
+    for i in range(20):
+        q.put_nowait(make_record(f"message-{i:02d}"))
+
+    listener = BatchingQueueListener(q, handler, batch_size=100)
+    listener.start()
+    listener.stop()
+    handler.close()
+
+    files = sorted(tmp_path.iterdir())
+    assert len(files) > 1
+    assert all(path.stat().st_size <= 100 for path in files)
+    lines = [line for path in files for line in path.read_text(encoding="utf-8").splitlines()]
+    assert sorted(lines) == [f"message-{i:02d}" for i in range(20)]
+
+
+def test_listener_falls_back_for_custom_emit():
+    """Обработчики со своим emit получают записи по одной."""
+    received = []
+
+    class ListHandler(logging.StreamHandler):
+        def emit(self, record):
+            received.append(record.getMessage())
+
+    q: queue.Queue = queue.Queue()
+    for i in range(3):
+        q.put_nowait(make_record(f"m{i}"))
+    listener = BatchingQueueListener(q, ListHandler())
+    listener.start()
+    listener.stop()
+
+    assert received == ["m0", "m1", "m2"]
@@ -0,0 +1,136 @@
+import gzip
+import logging
+import lzma
+import threading
+import time
+
+import pytest
+
+from chutils.logger import handlers as log_handlers
+from chutils.logger.handlers import CompressingRotatingFileHandler, CompressingTimedRotatingFileHandler
+
+
+def write_record(handler: logging.Handler, msg: str) -> None:
+    handler.handle(logging.LogRecord("app", logging.INFO, "", 0, msg, (), None))
+
+
+def test_rollover_does_not_wait_for_compression(tmp_path, monkeypatch):
+    """Ротация возвращается сразу, а сжатие и сдвиг цепочки выполняются в фоновом потоке."""
+    release = threading.Event()
+    original = log_handlers._write_archive
+
+    def slow_write(*args, **kwargs):
+        assert release.wait(5)
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(log_handlers, "_write_archive", slow_write)
+    log_file = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(str(log_file), maxBytes=1000, backupCount=3, encoding="utf-8")
+    write_record(handler, "first file")
+
+    handler.doRollover()
+    assert [p.name for p in tmp_path.glob(".app.log.*.rotated")]
+    assert not (tmp_path / "app.log.1.gz").exists()
+
+    release.set()
+    assert handler.wait_for_compression(timeout=5)
+    handler.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz"]
+    assert gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()) == b"first file\n"
+
+
+def test_emit_during_slow_compression_returns_promptly(tmp_path, monkeypatch):
+    """emit не ждет медленного сжатия, даже когда число ротаций превышает лимит очереди."""
+    release = threading.Event()
+    original = log_handlers._write_archive
+
+    def slow_write(*args, **kwargs):
+        assert release.wait(10)
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(log_handlers, "_write_archive", slow_write)
+    handler = CompressingRotatingFileHandler(str(tmp_path / "app.log"), maxBytes=10, backupCount=3, encoding="utf-8")
+    rotations = log_handlers._COMPRESSION_BACKLOG + 4
+    try:
+        for i in range(rotations + 1):
+            started = time.perf_counter()
+            write_record(handler, f"record {i:02d}")
+            assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+    assert handler.wait_for_compression(timeout=10)
+    handler.close()
+
+    for n in range(1, 4):
+        archive = tmp_path / f"app.log.{n}.gz"
+        assert gzip.decompress(archive.read_bytes()) == f"record {rotations - n:02d}\n".encode()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz", "app.log.2.gz", "app.log.3.gz"]
+
+
+@pytest.mark.parametrize("codec", ["xz", "zstd"])
+def test_rotating_handler_codecs(tmp_path, codec):
+    """Бэкапы сжимаются выбранным кодеком и сдвигаются по цепочке."""
+    if codec == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        decompress = zstandard.decompress
+        ext = ".zst"
+    else:
+        decompress = lzma.decompress
+        ext = ".xz"
+    log_file = tmp_path / "app.log"
+    handler = CompressingRotatingFileHandler(str(log_file), maxBytes=1000, backupCount=3, codec=codec)
+    for i in range(3):
+        write_record(handler, f"file {i}")
+        handler.doRollover()
+    handler.close()
+
+    assert decompress((tmp_path / f"app.log.1{ext}").read_bytes()) == b"file 2\n"
+    assert decompress((tmp_path / f"app.log.3{ext}").read_bytes()) == b"file 0\n"
+    assert not list(tmp_path.glob("app.log.[0-9]"))
+
+
+def test_rotating_handler_recovers_leftovers(tmp_path):
+    """Несжатый `.1` и недописанный временный архив после сбоя обрабатываются при старте."""
+    (tmp_path / "app.log.1").write_bytes(b"left behind\n")
+    (tmp_path / ".app.log.1.gz.tmp").write_bytes(b"partial")
+
+    handler = CompressingRotatingFileHandler(str(tmp_path / "app.log"), maxBytes=1000, backupCount=3)
+    handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz"]
+    assert gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()) == b"left behind\n"
+
+
+def test_rotating_handler_recovers_rotated_files(tmp_path):
+    """Ротированные, но не помещенные в цепочку файлы сжимаются при старте от старых к новым."""
+    (tmp_path / "app.log.1.gz").write_bytes(gzip.compress(b"archived\n"))
+    (tmp_path / f".app.log.{1:020d}.rotated").write_bytes(b"older\n")
+    (tmp_path / f".app.log.{2:020d}.rotated").write_bytes(b"newer\n")
+
+    handler = CompressingRotatingFileHandler(str(tmp_path / "app.log"), maxBytes=1000, backupCount=3)
+    handler.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["app.log", "app.log.1.gz", "app.log.2.gz", "app.log.3.gz"]
+    assert gzip.decompress((tmp_path / "app.log.1.gz").read_bytes()) == b"newer\n"
+    assert gzip.decompress((tmp_path / "app.log.3.gz").read_bytes()) == b"archived\n"
+
+
+def test_timed_handler_compresses_in_background(tmp_path):
+    """Ротация по времени сжимает бэкап и восстанавливает оставшиеся несжатые файлы."""
+    (tmp_path / "app.log.2024-01-01_00-00-00").write_bytes(b"old\n")
+
+    handler = CompressingTimedRotatingFileHandler(str(tmp_path / "app.log"), when="S", backupCount=5)
+    write_record(handler, "current")
+    handler.doRollover()
+    handler.close()
+
+    archives = sorted(tmp_path.glob("app.log.*.gz"))
+    assert len(archives) == 2
+    assert gzip.decompress(archives[0].read_bytes()) == b"old\n"
+    assert gzip.decompress(archives[1].read_bytes()) == b"current\n"
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith(".gz")) == ["app.log"]
+
+
+def test_unknown_codec(tmp_path):
+    with pytest.raises(ValueError):
+        CompressingRotatingFileHandler(str(tmp_path / "app.log"), codec="brotli")  # type: ignore[arg-type]
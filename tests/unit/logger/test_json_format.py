@@ -120,3 +120,115 @@ Logging:
 
     captured = capsys.readouterr()
     assert "Неверный формат времени" in captured.err
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_fast_json_formatter_fields(use_orjson):
+    """FastJsonFormatter выводит те же поля, что и основной JSON-форматтер, без дублей контекста."""
+    import logging
+    import sys
+
+    from chutils.logger import FastJsonFormatter
+    from chutils.logger.formatters import ORJSON_AVAILABLE
+
+    if use_orjson and not ORJSON_AVAILABLE:
+        pytest.skip("orjson не установлен")
+
+    formatter = FastJsonFormatter({"service": "api", "env": "prod"}, include_host=False, use_orjson=use_orjson)
+    record = logging.LogRecord("app", logging.INFO, "", 0, "user %s", ("alice",), None)
+    record.context_dict = {"trace_id": "t1", "request_id": "r1"}
+    record.request_id = "r1"
+    record.context = "[trace_id=t1 request_id=r1] "
+    record.order_id = 42
+
+    line = formatter.format(record)
+    data = json.loads(line)
+    assert list(data)[:2] == ["service", "env"]
+    assert data == {
+        "service": "api",
+        "env": "prod",
+        "asctime": formatter.formatTime(record),
+        "name": "app",
+        "levelname": "INFO",
+        "message": "user alice",
+        "trace_id": "t1",
+        "context": {"request_id": "r1"},
+        "order_id": 42,
+    }
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        error = logging.LogRecord("app", logging.ERROR, "", 0, "failed", (), sys.exc_info())
+    data = json.loads(formatter.format(error))
+    assert "ValueError: boom" in data["exc_info"]
+    assert error.exc_text == data["exc_info"]
+
+
+def test_fast_json_formatter_dict_message():
+    """Сообщение-словарь разворачивается в поля, как в ChutilsJsonFormatter."""
+    import logging
+
+    from chutils.logger import FastJsonFormatter
+
+    formatter = FastJsonFormatter(include_host=False)
+    record = logging.LogRecord("app", logging.INFO, "", 0, {"event": "login", "user": "alice"}, (), None)
+    data = json.loads(formatter.format(record))
+    assert data["message"] == ""
+    assert data["event"] == "login"
+    assert data["user"] == "alice"
+
+
+def test_fast_json_formatter_time_cache():
+    """Кэш времени не смешивает разные секунды и сохраняет миллисекунды."""
+    import logging
+
+    from chutils.logger import FastJsonFormatter
+
+    formatter = FastJsonFormatter(include_host=False)
+    reference = logging.Formatter()
+    for created in (1700000000.123, 1700000000.999, 1700000001.5):
+        record = logging.LogRecord("app", logging.INFO, "", 0, "m", (), None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        assert formatter.formatTime(record) == reference.formatTime(record)
+
+
+def test_fast_json_formatter_time_cache_respects_datefmt():
+    """Явный datefmt в пределах одной секунды не получает строку из кэша другого формата."""
+    import logging
+
+    from chutils.logger import FastJsonFormatter
+
+    formatter = FastJsonFormatter(include_host=False)
+    reference = logging.Formatter()
+    record = logging.LogRecord("app", logging.INFO, "", 0, "m", (), None)
+    record.created = 1700000000.5
+    record.msecs = 500.0
+
+    assert formatter.formatTime(record) == reference.formatTime(record)
+    assert formatter.formatTime(record, "%Y") == reference.formatTime(record, "%Y")
+    assert formatter.formatTime(record) == reference.formatTime(record)
+
+
+def test_fast_json_formatter_from_config(config_fs, capsys):
+    """Параметр json_formatter: fast включает FastJsonFormatter со статическими полями."""
+    fs, project_root = config_fs
+    yaml_content = """
+Logging:
+  json_format: true
+  json_formatter: fast
+  json_static_fields:
+    service: billing
+"""
+    fs.create_file(project_root / "config.yml", contents=yaml_content)
+    from chutils import config as chutils_config
+    chutils_config._cm._reset()
+
+    logger = setup_logger(name="fast_json_config_test", force_reconfigure=True)
+    logger.info("Fast JSON message")
+
+    log_json = json.loads(capsys.readouterr().err.strip().split('\n')[-1])
+    assert log_json["service"] == "billing"
+    assert log_json["message"] == "Fast JSON message"
+    assert "host" in log_json
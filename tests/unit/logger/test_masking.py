@@ -76,3 +76,131 @@ def test_secret_masking_filter_direct():
     assert record2.msg == "Data: [MASKED]"
     clear_masks()
 
+
+
+def test_literal_matcher_automaton_and_regex_agree():
+    """Автомат Ахо-Корасик и regex-режим маскируют одинаково, включая перекрывающиеся секреты."""
+    from chutils.logger.masking import _AUTOMATON_THRESHOLD, _LiteralMatcher
+
+    secrets = {"abcd", "bcdef", "xy", "token-123"}
+    filler = {f"unused-secret-{i}" for i in range(_AUTOMATON_THRESHOLD)}
+    small = _LiteralMatcher(secrets)
+    large = _LiteralMatcher(secrets | filler)
+    assert small._regex is not None
+    assert large._regex is None
+
+    text = "abcdef | xyxy | key=token-1234 | abc"
+    expected = "[MASKED] | [MASKED][MASKED] | key=[MASKED]4 | abc"
+    assert small.sub("[MASKED]", text) == expected
+    assert large.sub("[MASKED]", text) == expected
+    assert large.sub("[MASKED]", "unused-secret-6 and unused-secret-63") == "[MASKED] and [MASKED]"
+
+
+def test_masking_is_lazy_and_covers_formatted_args(monkeypatch):
+    """Маскирование выполняется при форматировании, по итоговому тексту и один раз на запись."""
+    from chutils.logger import SecretMaskingFilter, clear_masks
+    from chutils.logger import masking
+
+    clear_masks()
+    calls = []
+    original_mask = masking._mask
+    monkeypatch.setattr(masking, "_mask", lambda text: calls.append(text) or original_mask(text))
+
+    filter_obj = SecretMaskingFilter(secrets=["s3cr3t"])
+    record = logging.LogRecord(
+        name="app", level=logging.INFO, pathname="", lineno=0,
+        msg="token=%s, payload=%r", args=("s3cr3t", {"key": "s3cr3t"}), exc_info=None
+    )
+    filter_obj.filter(record)
+    assert calls == []
+    assert record.args == ()
+
+    assert record.getMessage() == "token=[MASKED], payload={'key': '[MASKED]'}"
+    assert record.getMessage() == "token=[MASKED], payload={'key': '[MASKED]'}"
+    assert len(calls) == 1
+    clear_masks()
+
+
+def test_masking_env_toggle_is_cached(monkeypatch):
+    """Переменная CH_DISABLE_LOG_MASKING читается один раз и перечитывается при изменении масок."""
+    from chutils.logger import SecretMaskingFilter, clear_masks, register_secret_mask
+
+    clear_masks()
+    register_secret_mask("cached-secret")
+    filter_obj = SecretMaskingFilter()
+
+    def make_record():
+        record = logging.LogRecord(
+            name="app", level=logging.INFO, pathname="", lineno=0,
+            msg="value cached-secret", args=(), exc_info=None
+        )
+        filter_obj.filter(record)
+        return record.getMessage()
+
+    assert make_record() == "value [MASKED]"
+    monkeypatch.setenv("CH_DISABLE_LOG_MASKING", "true")
+    assert make_record() == "value [MASKED]"
+
+    register_secret_mask("other-secret")
+    assert make_record() == "value cached-secret"
+    clear_masks()
+
+
+def test_dict_message_keeps_type_for_json_formatter():
+    """Словарь-сообщение остается словарем: ChutilsJsonFormatter разворачивает поля, значения маскируются."""
+    import json
+
+    import pytest
+
+    pytest.importorskip("pythonjsonlogger")
+    from chutils.logger import ChutilsJsonFormatter, SecretMaskingFilter, clear_masks
+
+    clear_masks()
+    filter_obj = SecretMaskingFilter(secrets=["hunter2"])
+    payload = {"event": "login", "pw": "hunter2", "nested": {"token": "hunter2"}}
+    record = logging.LogRecord(
+        name="app", level=logging.INFO, pathname="", lineno=0,
+        msg=payload, args=(), exc_info=None
+    )
+    filter_obj.filter(record)
+
+    output = json.loads(ChutilsJsonFormatter().format(record))
+    assert output["message"] == ""
+    assert output["event"] == "login"
+    assert output["pw"] == "[MASKED]"
+    assert output["nested"] == {"token": "[MASKED]"}
+    assert "hunter2" not in record.getMessage()
+    clear_masks()
+
+
+def test_structured_message_is_not_mutated(monkeypatch):
+    """Маскирование вложенного словаря и списка не меняет объекты вызывающего кода и откладывается до вывода."""
+    import json
+
+    from chutils.logger import FastJsonFormatter, SecretMaskingFilter, clear_masks
+    from chutils.logger import masking
+
+    clear_masks()
+    calls = []
+    original_mask = masking._mask
+    monkeypatch.setattr(masking, "_mask", lambda text: calls.append(text) or original_mask(text))
+
+    filter_obj = SecretMaskingFilter(secrets=["hunter2"])
+    cfg = {"db": {"password": "hunter2"}, "items": ["hunter2"]}
+    items = ["hunter2", {"token": "hunter2"}]
+    records = []
+    for msg in (cfg, items):
+        record = logging.LogRecord(name="app", level=logging.INFO, pathname="", lineno=0, msg=msg, args=(), exc_info=None)
+        filter_obj.filter(record)
+        records.append(record)
+    assert calls == []
+
+    assert "hunter2" not in records[0].getMessage()
+    assert "hunter2" not in records[1].getMessage()
+    output = json.loads(FastJsonFormatter(include_host=False).format(records[0]))
+    assert output["db"] == {"password": "[MASKED]"}
+    assert output["items"] == ["[MASKED]"]
+    assert cfg == {"db": {"password": "hunter2"}, "items": ["hunter2"]}
+    assert items == ["hunter2", {"token": "hunter2"}]
+    clear_masks()
+
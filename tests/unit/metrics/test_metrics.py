@@ -107,7 +107,8 @@ def test_timer_context_and_decorator_sync():
     raw = provider.get_metrics()
     assert len(raw["histograms"]["block_duration"]) == 1
     assert raw["histograms"]["block_duration"][0]["labels"] == {"step": "1"}
-    assert raw["histograms"]["block_duration"][0]["values"][0] >= 0.01
+    assert raw["histograms"]["block_duration"][0]["count"] == 1
+    assert raw["histograms"]["block_duration"][0]["sum"] >= 0.01
 
     # 2. Декоратор
     @metrics.timer("func_duration", {"func": "test"})
@@ -134,7 +135,8 @@ async def test_timer_decorator_async():
     raw = provider.get_metrics()
     assert len(raw["histograms"]["async_func_duration"]) == 1
     assert raw["histograms"]["async_func_duration"][0]["labels"] == {"func": "async_test"}
-    assert raw["histograms"]["async_func_duration"][0]["values"][0] >= 0.01
+    assert raw["histograms"]["async_func_duration"][0]["count"] == 1
+    assert raw["histograms"]["async_func_duration"][0]["sum"] >= 0.01
 
 
 def test_facade_auto_switch():
@@ -183,3 +185,84 @@ def test_metrics_no_dependency_fallback():
         assert "prometheus_client" in str(exc_info.value)
         assert exc_info.value.context["dependency"] == "prometheus_client"
         assert exc_info.value.hint is not None
+
+
+def test_in_memory_histogram_buckets_are_pre_aggregated():
+    """Гистограмма хранит счетчики бакетов, а не сами наблюдения; граница бакета включительна."""
+    provider = InMemoryMetricsProvider(buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 1.0, 5.0):
+        provider.observe("latency", value)
+
+    entry = provider.get_metrics()["histograms"]["latency"][0]
+    assert entry["count"] == 5
+    assert entry["sum"] == pytest.approx(6.65)
+    assert entry["buckets"] == {0.1: 2, 1.0: 4, float("inf"): 5}
+
+    output = provider.generate_latest()
+    assert 'latency_bucket{le="0.1"} 2' in output
+    assert 'latency_bucket{le="1.0"} 4' in output
+    assert 'latency_bucket{le="+Inf"} 5' in output
+    assert "latency_count 5" in output
+
+    series = provider._histograms["latency"][frozenset()]
+    for _ in range(10_000):
+        provider.observe("latency", 0.2)
+    assert provider._histograms["latency"][frozenset()] is series
+    assert len(series.counts) == 3
+
+
+def test_in_memory_configure_histogram():
+    """Для отдельной метрики можно задать свои бакеты; неупорядоченные границы отклоняются."""
+    provider = InMemoryMetricsProvider()
+    provider.observe("size", 1.0)
+    provider.configure_histogram("size", [10, 100])
+    provider.observe("size", 50)
+    provider.observe("other", 50)
+
+    raw = provider.get_metrics()["histograms"]
+    assert raw["size"][0]["buckets"] == {10.0: 0, 100.0: 1, float("inf"): 1}
+    assert raw["size"][0]["count"] == 1
+    assert len(raw["other"][0]["buckets"]) == len(InMemoryMetricsProvider.DEFAULT_BUCKETS) + 1
+
+    with pytest.raises(ValueError):
+        provider.configure_histogram("size", [1.0, 0.5])
+    with pytest.raises(ValueError):
+        InMemoryMetricsProvider(buckets=[1.0, 1.0])
+
+
+def test_in_memory_summary_quantiles():
+    """Summary оценивает квантили с заданной относительной погрешностью."""
+    provider = InMemoryMetricsProvider()
+    provider.configure_summary("rt", quantiles=(0.5, 0.99), relative_accuracy=0.01)
+    for i in range(1, 10_001):
+        provider.observe("rt", i / 1000, {"route": "/"})
+
+    assert provider.get_quantile("rt", 0.5, {"route": "/"}) == pytest.approx(5.0, rel=0.02)
+    assert provider.get_quantile("rt", 0.99, {"route": "/"}) == pytest.approx(9.9, rel=0.02)
+    assert provider.get_quantile("rt", 0.5) is None
+
+    entry = provider.get_metrics()["histograms"]["rt"][0]
+    assert entry["count"] == 10_000
+    assert set(entry["quantiles"]) == {0.5, 0.99}
+
+    output = provider.generate_latest()
+    assert "# TYPE rt summary" in output
+    assert 'rt{quantile="0.99",route="/"}' in output
+    assert 'rt_count{route="/"} 10000' in output
+    assert "rt_bucket" not in output
+
+    with pytest.raises(ValueError):
+        provider.configure_summary("rt", quantiles=(1.5,))
+
+
+def test_sketch_collapses_low_bins_in_bulk():
+    """При переполнении младшие корзины сливаются сразу до половины лимита, верхние квантили не теряют точности."""
+    from chutils.metrics.sketch import DDSketch
+
+    sketch = DDSketch(relative_accuracy=0.01, max_bins=64)
+    for i in range(1, 10_001):
+        sketch.add(i / 1000)
+
+    assert 32 <= len(sketch._positive) <= 64
+    assert sum(sketch._positive.values()) == 10_000
+    assert sketch.quantile(0.99) == pytest.approx(9.9, rel=0.02)
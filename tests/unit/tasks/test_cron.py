@@ -0,0 +1,49 @@
+"""
+Тесты разбора cron-выражений планировщика.
+
+Проверяет:
+- Поля со звёздочкой, диапазонами, шагами и списками
+- Имена месяцев и дней недели, макросы
+- Семантику «день месяца ИЛИ день недели», когда ограничены оба поля
+- Ошибки разбора и выражения без совпадений
+"""
+from datetime import datetime
+
+import pytest
+
+from chutils.tasks.cron import CronSchedule
+
+
+@pytest.mark.parametrize(
+    ("expression", "moment", "expected"),
+    [
+        ("* * * * *", datetime(2024, 1, 1, 10, 0, 30), datetime(2024, 1, 1, 10, 1)),
+        ("*/15 * * * *", datetime(2024, 1, 1, 10, 7), datetime(2024, 1, 1, 10, 15)),
+        ("*/15 * * * *", datetime(2024, 1, 1, 10, 45), datetime(2024, 1, 1, 11, 0)),
+        ("0 9-17/4 * * *", datetime(2024, 1, 1, 13, 0), datetime(2024, 1, 1, 17, 0)),
+        ("30 2 * * mon,fri", datetime(2024, 1, 2, 0, 0), datetime(2024, 1, 5, 2, 30)),
+        ("0 0 1 feb *", datetime(2024, 3, 1, 0, 0), datetime(2025, 2, 1, 0, 0)),
+        ("0 0 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29)),
+        ("0 12 * * 7", datetime(2024, 1, 1), datetime(2024, 1, 7, 12, 0)),
+        ("@hourly", datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 11, 0)),
+        ("@daily", datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 0, 0)),
+        # Ограничены оба поля дня: достаточно совпадения любого
+        ("0 0 13 * fri", datetime(2024, 1, 1), datetime(2024, 1, 5)),
+    ],
+)
+def test_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["* * * *", "61 * * * *", "*/0 * * * *", "a * * * *", "5-1 * * * *", "* * * foo *"],
+)
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_expression_without_matches():
+    with pytest.raises(ValueError, match="не совпадает"):
+        CronSchedule("0 0 30 2 *").next_after(datetime(2024, 1, 1))
@@ -0,0 +1,184 @@
+"""
+Тесты расписания TaskScheduler.
+
+Проверяет:
+- Запуски без дрейфа: интервал отсчитывается от планового времени, а не от завершения
+- Пропуск просроченных тиков без «нагона»
+- Случайную задержку запуска (jitter)
+- Общий лимит одновременных запусков (max_concurrency)
+- Метрики длительности и отставания запусков
+- Кэширование интервала из конфигурации до её перезагрузки
+- Задачи с cron-расписанием
+"""
+import asyncio
+import itertools
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from chutils import metrics
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+from chutils.tasks import clear_tasks_registry, core, periodic_task
+from chutils.tasks.core import PeriodicTask, TaskScheduler
+
+
+@pytest.fixture(autouse=True)
+def cleanup_registry():
+    clear_tasks_registry()
+    yield
+    clear_tasks_registry()
+
+
+@pytest.fixture
+def provider():
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+async def _run(duration, **kwargs):
+    scheduler = TaskScheduler(**kwargs)
+    await scheduler.start()
+    await asyncio.sleep(duration)
+    await scheduler.stop()
+    return scheduler
+
+
+def test_schedule_validation():
+    def dummy():
+        pass
+
+    with pytest.raises(ValueError, match="ровно одно"):
+        PeriodicTask(func=dummy)
+    with pytest.raises(ValueError, match="ровно одно"):
+        PeriodicTask(func=dummy, interval_seconds=1, cron="* * * * *")
+    with pytest.raises(ValueError, match="jitter"):
+        PeriodicTask(func=dummy, interval_seconds=1, jitter=-1)
+    with pytest.raises(ValueError):
+        periodic_task(cron="not a cron")
+    with pytest.raises(ValueError, match="max_concurrency"):
+        TaskScheduler(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_intervals_do_not_drift_by_runtime():
+    starts = []
+
+    @periodic_task(interval_seconds=0.1, run_immediately=True)
+    async def slow():
+        starts.append(time.monotonic())
+        await asyncio.sleep(0.06)
+
+    await _run(0.45)
+    assert len(starts) == 5
+    gaps = [b - a for a, b in itertools.pairwise(starts)]
+    # При отсчёте от завершения промежутки были бы ~0.16 с
+    assert all(0.08 < gap < 0.13 for gap in gaps)
+    assert starts[-1] - starts[0] < 0.45
+
+
+@pytest.mark.asyncio
+async def test_missed_ticks_are_skipped_not_replayed():
+    starts = []
+
+    @periodic_task(interval_seconds=0.05, run_immediately=True)
+    def blocking():
+        starts.append(time.monotonic())
+
+    scheduler = TaskScheduler()
+    await scheduler.start()
+    await asyncio.sleep(0.01)
+    time.sleep(0.2)  # noqa: ASYNC251 - блокируем event loop на 4 интервала
+    await asyncio.sleep(0.03)
+    await scheduler.stop()
+    # Первый запуск и один запуск после разблокировки, без серии пропущенных
+    assert len(starts) == 2
+
+
+@pytest.mark.asyncio
+async def test_jitter_delays_start_within_bound():
+    starts = []
+    started_at = time.monotonic()
+
+    for n in range(10):
+        periodic_task(interval_seconds=10, run_immediately=True, jitter=0.1, name=f"job_{n}")(
+            lambda: starts.append(time.monotonic())
+        )
+
+    await _run(0.2)
+    assert len(starts) == 10
+    delays = [start - started_at for start in starts]
+    assert max(delays) < 0.2
+    # Запуски разнесены, а не выполнены одновременно
+    assert max(delays) - min(delays) > 0.01
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_caps_all_tasks(provider):
+    active = 0
+    peak = 0
+
+    async def job():
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+
+    for n in range(6):
+        periodic_task(interval_seconds=10, run_immediately=True, name=f"job_{n}")(job)
+
+    await _run(0.25, max_concurrency=2)
+    assert peak == 2
+    lags = provider.get_metrics()["histograms"]["scheduler_task_lag_seconds"]
+    assert len(lags) == 6
+    # Последние запуски ждали освобождения слота
+    assert max(item["sum"] for item in lags) >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_duration_metric(provider):
+    @periodic_task(interval_seconds=10, run_immediately=True, name="report")
+    async def report():
+        await asyncio.sleep(0.03)
+
+    await _run(0.1)
+    durations = provider.get_metrics()["histograms"]["scheduler_task_duration_seconds"]
+    assert durations[0]["labels"] == {"task": "report"}
+    assert durations[0]["count"] == 1
+    assert durations[0]["sum"] >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_config_interval_cached_until_reload(mocker):
+    read = mocker.patch("chutils.config.get_config_value", return_value="0.05")
+    task = PeriodicTask(func=lambda: None, interval_seconds="scheduler.fast")
+
+    assert task.get_interval() == 0.05
+    assert task.get_interval() == 0.05
+    assert read.call_count == 1
+
+    read.return_value = "2"
+    core._on_config_change()
+    assert task.get_interval() == 2.0
+    assert read.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cron_task_scheduled_at_next_match(mocker):
+    calls = []
+
+    @periodic_task(cron="* * * * *", name="every_minute")
+    def every_minute():
+        calls.append(1)
+
+    # Ближайшая «минута» наступает через 50 мс
+    mocker.patch.object(
+        core.CronSchedule,
+        "next_after",
+        lambda self, moment: datetime.now() + timedelta(milliseconds=50),
+    )
+    await _run(0.12)
+    assert len(calls) == 2
@@ -0,0 +1,168 @@
+"""
+Тесты пулов выполнения периодических задач.
+
+Проверяет:
+- Настройку именованных пулов и ошибки конфигурации
+- Проверку задач для пула процессов при регистрации
+- Выполнение в отдельном процессе и передачу исключений
+- Таймаут, принудительно завершающий процесс-исполнитель
+- Таймаут пула потоков, отсчитываемый от начала выполнения
+- Метрику ожидания свободного исполнителя
+- Запуск задач планировщиком в пулах и метрику таймаутов
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from chutils import metrics
+from chutils.exceptions import ChutilsTimeoutError
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+from chutils.tasks import (
+    clear_tasks_registry,
+    configure_executor,
+    periodic_task,
+    shutdown_executors,
+)
+from chutils.tasks.core import TaskScheduler
+from chutils.tasks.executors import _FunctionRef, _process_target, get_executor
+
+
+def _fail_with_pid():
+    raise RuntimeError(str(os.getpid()))
+
+
+def _sleep_forever():
+    time.sleep(30)
+
+
+@pytest.fixture(autouse=True)
+def cleanup():
+    clear_tasks_registry()
+    yield
+    clear_tasks_registry()
+    shutdown_executors()
+
+
+@pytest.fixture
+def provider():
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+def test_configure_executor_validation():
+    with pytest.raises(ValueError, match="Неизвестный тип"):
+        configure_executor("gpu", "fiber")
+    with pytest.raises(ValueError, match="Встроенный"):
+        configure_executor("thread", "process")
+    with pytest.raises(ValueError, match="max_workers"):
+        configure_executor("io", max_workers=0)
+    with pytest.raises(ValueError, match="не настроен"):
+        get_executor("missing")
+
+    configure_executor("reports", max_workers=2)
+    configure_executor("reports", max_workers=2)
+    with pytest.raises(ValueError, match="другими параметрами"):
+        configure_executor("reports", max_workers=3)
+    assert get_executor("reports").max_workers == 2
+
+
+def test_process_tasks_validated_at_registration():
+    configure_executor("cpu_check", "process", max_workers=1)
+
+    def local():
+        pass
+
+    with pytest.raises(ValueError, match="уровне модуля"):
+        periodic_task(interval_seconds=1, executor="cpu_check")(local)
+    with pytest.raises(ValueError, match="уровне модуля"):
+        periodic_task(interval_seconds=1, executor="process")(lambda: None)
+    with pytest.raises(ValueError, match="синхронных"):
+        @periodic_task(interval_seconds=1, executor="thread")
+        async def coroutine():
+            pass
+
+    with pytest.raises(ValueError, match="timeout"):
+        periodic_task(interval_seconds=1, timeout=0)(_fail_with_pid)
+
+    periodic_task(interval_seconds=1, executor="process")(_fail_with_pid)
+    assert _process_target(_fail_with_pid) == _FunctionRef(__name__, "_fail_with_pid")
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_in_other_process():
+    configure_executor("cpu_pid", "process", max_workers=1)
+    executor = get_executor("cpu_pid")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        await executor.run(executor.prepare(_fail_with_pid))
+    assert int(str(exc_info.value)) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_process_timeout_kills_worker():
+    configure_executor("cpu_timeout", "process", max_workers=1)
+    executor = get_executor("cpu_timeout")
+
+    started = time.monotonic()
+    with pytest.raises(ChutilsTimeoutError):
+        await executor.run(executor.prepare(_sleep_forever), timeout=0.3)
+    assert time.monotonic() - started < 10
+    alive = [p for p in multiprocessing.active_children() if p.name == "ChutilsTask-cpu_timeout"]
+    assert alive == []
+
+    # Вместо убитого исполнителя запускается новый
+    with pytest.raises(RuntimeError):
+        await executor.run(executor.prepare(_fail_with_pid), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_thread_timeout_counts_from_start(provider):
+    configure_executor("narrow", max_workers=1)
+    executor = get_executor("narrow")
+
+    # Вторая задача ждёт в очереди 0.1 с, но таймаут начинает отсчёт только с её запуска
+    await asyncio.gather(*(executor.run(lambda: time.sleep(0.1), timeout=0.15) for _ in range(2)))
+    waits = provider.get_metrics()["histograms"]["scheduler_executor_queue_wait_seconds"]
+    assert waits[0]["labels"] == {"executor": "narrow"}
+    assert waits[0]["count"] == 2
+    assert waits[0]["sum"] >= 0.09
+
+    with pytest.raises(ChutilsTimeoutError):
+        await executor.run(lambda: time.sleep(0.2), timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_tasks_in_executors(provider):
+    configure_executor("jobs", max_workers=2)
+    threads = []
+
+    @periodic_task(interval_seconds=10, run_immediately=True, executor="jobs")
+    def in_pool():
+        threads.append(threading.current_thread().name)
+
+    @periodic_task(interval_seconds=10, run_immediately=True, timeout=0.05)
+    async def too_slow():
+        await asyncio.sleep(1)
+
+    scheduler = TaskScheduler()
+    await scheduler.start()
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+
+    assert threads and threads[0].startswith("ChutilsTask-jobs")
+    timeouts = provider.get_metrics()["counters"]["scheduler_task_timeouts_total"]
+    assert timeouts == [{"labels": {"task": "too_slow"}, "value": 1}]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_unconfigured_executor():
+    periodic_task(interval_seconds=10, executor="unknown_pool")(_fail_with_pid)
+
+    with pytest.raises(ValueError, match="не настроен"):
+        await TaskScheduler().start()
@@ -0,0 +1,306 @@
+"""
+Тесты кэша последнего хэша и групповой фиксации бэкендов аудита.
+
+Покрывает:
+- FileBackend: чтение последнего хэша с конца файла, продолжение цепочки новым экземпляром.
+- Групповую фиксацию: запись пачкой, сброс по таймеру, flush/close, fsync на пачку.
+- Ошибку сохранения пачки: цепочка продолжается с фактически сохранённой записи.
+- SqliteBackend: постоянное соединение в режиме WAL, одна транзакция на пачку.
+- PostgresBackend: executemany и commit на пачку.
+- Несколько писателей в одно хранилище: сверка последнего хэша при записи.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from chutils.audit.backends import file as file_module
+from chutils.audit.backends.file import FileBackend
+from chutils.audit.backends.postgres import PostgresBackend
+from chutils.audit.backends.sqlite import SqliteBackend
+
+
+def _lines(path: Path) -> list[dict[str, object]]:
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _sqlite_count(path: Path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_batch_settings_validated(tmp_path: Path) -> None:
+    """Некорректные batch_size и flush_interval отклоняются."""
+    with pytest.raises(ValueError, match="batch_size"):
+        FileBackend(tmp_path / "audit.jsonl", batch_size=0)
+    with pytest.raises(ValueError, match="flush_interval"):
+        SqliteBackend(tmp_path / "audit.db", flush_interval=0)
+
+
+class TestFileLastHash:
+    """Последний хэш FileBackend читается с конца файла и кэшируется."""
+
+    def test_new_instance_continues_chain(self, tmp_path: Path) -> None:
+        """Новый экземпляр продолжает цепочку, записанную предыдущим."""
+        path = tmp_path / "audit.jsonl"
+        FileBackend(path).log("first", "u")
+        backend = FileBackend(path)
+        backend.log("second", "u")
+        first, second = _lines(path)
+        assert second["prev_hash"] == first["hash"]
+        assert backend.verify_integrity() is True
+
+    def test_last_line_longer_than_chunk(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Последняя строка длиннее блока чтения и файл с пустыми строками в конце."""
+        monkeypatch.setattr(file_module, "_TAIL_CHUNK", 16)
+        path = tmp_path / "audit.jsonl"
+        FileBackend(path).log("first", "u", details={"payload": "x" * 100})
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n\n")
+        backend = FileBackend(path)
+        backend.log("second", "u")
+        assert backend.verify_integrity() is True
+
+    def test_file_read_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Файл не перечитывается на каждую запись."""
+        path = tmp_path / "audit.jsonl"
+        FileBackend(path).log("seed", "u")
+        reads = MagicMock(wraps=file_module._read_last_line)
+        monkeypatch.setattr(file_module, "_read_last_line", reads)
+        backend = FileBackend(path)
+        for i in range(5):
+            backend.log(f"action.{i}", "u")
+        assert reads.call_count == 1
+
+
+class TestGroupCommit:
+    """Групповая фиксация записей."""
+
+    def test_file_writes_full_batches(self, tmp_path: Path) -> None:
+        """Записи сохраняются только при заполнении пачки, цепочка не нарушена."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, batch_size=3, flush_interval=60)
+        backend.log("a", "u")
+        backend.log("b", "u")
+        assert _lines(path) == []
+        backend.log("c", "u")
+        records = _lines(path)
+        assert [r["action"] for r in records] == ["a", "b", "c"]
+        assert records[1]["prev_hash"] == records[0]["hash"]
+        backend.log("d", "u")
+        # verify_integrity сначала сохраняет буфер
+        assert backend.verify_integrity() is True
+        assert len(_lines(path)) == 4
+
+    def test_flush_interval(self, tmp_path: Path) -> None:
+        """Неполная пачка сохраняется по таймеру."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, batch_size=100, flush_interval=0.05)
+        backend.log("a", "u")
+        deadline = time.monotonic() + 2
+        while not _lines(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(_lines(path)) == 1
+
+    def test_fsync_per_batch(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """fsync вызывается один раз на пачку."""
+        fsync = MagicMock()
+        monkeypatch.setattr(file_module.os, "fsync", fsync)
+        backend = FileBackend(tmp_path / "audit.jsonl", batch_size=5, flush_interval=60, fsync=True)
+        for i in range(10):
+            backend.log(f"action.{i}", "u")
+        assert fsync.call_count == 2
+
+    def test_failed_batch_does_not_break_chain(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """После ошибки сохранения цепочка продолжается с последней сохранённой записи."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, batch_size=2, flush_interval=60)
+        backend.log("a", "u")
+        backend.log("b", "u")
+
+        original = backend._write
+        monkeypatch.setattr(backend, "_write", MagicMock(side_effect=OSError("disk full")))
+        backend.log("lost.1", "u")
+        with pytest.raises(OSError, match="disk full"):
+            backend.log("lost.2", "u")
+
+        monkeypatch.setattr(backend, "_write", original)
+        backend.log("c", "u")
+        backend.flush()
+        assert [r["action"] for r in _lines(path)] == ["a", "b", "c"]
+        assert backend.verify_integrity() is True
+
+    def test_concurrent_writers(self, tmp_path: Path) -> None:
+        """Параллельная запись пачками из нескольких потоков не ломает цепочку."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path, batch_size=7, flush_interval=60)
+
+        def writer() -> None:
+            for _ in range(25):
+                backend.log("concurrent", "thread")
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        backend.close()
+        assert _sqlite_count(path) == 100
+        assert SqliteBackend(path).verify_integrity() is True
+
+
+class TestSqliteConnection:
+    """Постоянное соединение и транзакции SqliteBackend."""
+
+    def test_persistent_wal_connection(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Все записи идут через одно соединение в режиме WAL."""
+        connect = MagicMock(wraps=sqlite3.connect)
+        monkeypatch.setattr(sqlite3, "connect", connect)
+        backend = SqliteBackend(tmp_path / "audit.db")
+        for i in range(5):
+            backend.log(f"action.{i}", "u")
+        assert connect.call_count == 1
+        assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        backend.close()
+
+    def test_batch_committed_in_one_transaction(self, tmp_path: Path) -> None:
+        """Пачка видна другим соединениям только после фиксации."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path, batch_size=5, flush_interval=60)
+        for i in range(4):
+            backend.log(f"action.{i}", "u")
+        assert _sqlite_count(path) == 0
+        backend.close()
+        assert _sqlite_count(path) == 4
+
+    def test_reopened_backend_continues_chain(self, tmp_path: Path) -> None:
+        """Новый экземпляр продолжает цепочку из БД."""
+        path = tmp_path / "audit.db"
+        first = SqliteBackend(path)
+        first.log("a", "u")
+        first.close()
+        second = SqliteBackend(path)
+        second.log("b", "u")
+        assert second.verify_integrity() is True
+
+
+class TestPostgresBatching:
+    """Групповая фиксация PostgresBackend (mock-соединение)."""
+
+    def _make(self, **kwargs: object) -> tuple[PostgresBackend, MagicMock, MagicMock]:
+        conn = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        return PostgresBackend(connection=conn, **kwargs), conn, cursor  # type: ignore[arg-type]
+
+    def test_batch_uses_executemany_and_commit(self) -> None:
+        """Пачка вставляется одним executemany и фиксируется одним commit."""
+        backend, conn, cursor = self._make(batch_size=3, flush_interval=60)
+        for i in range(3):
+            backend.log(f"action.{i}", "u")
+        assert cursor.executemany.call_count == 1
+        rows = cursor.executemany.call_args[0][1]
+        assert [row[3] for row in rows] == ["action.0", "action.1", "action.2"]
+        assert rows[1][8] == rows[0][9]
+        conn.commit.assert_called_once()
+        # Последний хэш запрошен из БД только один раз
+        assert cursor.fetchone.call_count == 1
+
+    def test_write_through_leaves_commit_to_application(self) -> None:
+        """Без группировки commit не вызывается, как и раньше."""
+        backend, conn, cursor = self._make()
+        backend.log("a", "u")
+        backend.log("b", "u")
+        assert cursor.executemany.call_count == 0
+        conn.commit.assert_not_called()
+
+
+class TestSharedStorage:
+    """Несколько экземпляров бэкенда пишут в одно хранилище, не разрывая цепочку."""
+
+    def test_sqlite_two_instances(self, tmp_path: Path) -> None:
+        """Два экземпляра SqliteBackend поочерёдно пишут в один файл БД."""
+        path = tmp_path / "audit.db"
+        first, second = SqliteBackend(path), SqliteBackend(path)
+        for i in range(5):
+            first.log(f"first.{i}", "u")
+            second.log(f"second.{i}", "u")
+        assert _sqlite_count(path) == 10
+        assert first.verify_integrity() is True
+        first.close()
+        second.close()
+
+    def test_sqlite_interleaved_batches(self, tmp_path: Path) -> None:
+        """Пачки разных экземпляров, накопленные одновременно, связываются при фиксации."""
+        path = tmp_path / "audit.db"
+        first = SqliteBackend(path, batch_size=3, flush_interval=60)
+        second = SqliteBackend(path, batch_size=3, flush_interval=60)
+        for i in range(3):
+            first.log(f"first.{i}", "u")
+            second.log(f"second.{i}", "u")
+        first.log("first.tail", "u")
+        first.close()
+        second.close()
+        assert _sqlite_count(path) == 7
+        assert SqliteBackend(path).verify_integrity() is True
+
+    def test_file_two_instances(self, tmp_path: Path) -> None:
+        """Два экземпляра FileBackend поочерёдно дописывают один журнал."""
+        path = tmp_path / "audit.jsonl"
+        first, second = FileBackend(path), FileBackend(path, batch_size=2, flush_interval=60)
+        for i in range(4):
+            first.log(f"first.{i}", "u")
+            second.log(f"second.{i}", "u")
+        second.flush()
+        records = _lines(path)
+        assert len(records) == 8
+        assert all(b["prev_hash"] == a["hash"] for a, b in zip(records, records[1:]))
+        assert first.verify_integrity() is True
+
+    def test_postgres_rechains_from_stored_hash(self) -> None:
+        """Вставка продолжает последний хэш таблицы, а не кэш экземпляра (другой писатель, откат)."""
+        conn = MagicMock()
+        cursor = MagicMock()
+        cursor.fetchone.side_effect = [None, ("other-writer",)]
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        backend = PostgresBackend(connection=conn)  # type: ignore[arg-type]
+        backend.log("a", "u")
+        backend.log("b", "u")
+
+        sql = [str(c.args[0]) for c in cursor.execute.call_args_list]
+        assert sum("pg_advisory_xact_lock" in q for q in sql) == 2
+        inserts = [c.args[1] for c in cursor.execute.call_args_list if "INSERT" in str(c.args[0])]
+        assert inserts[0][8] == ""
+        assert inserts[1][8] == "other-writer"
+
+    def test_postgres_autocommit_uses_own_transaction(self) -> None:
+        """В режиме autocommit блокировка и вставка выполняются в одной явной транзакции."""
+        conn = MagicMock()
+        conn.autocommit = True
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+        conn.cursor.return_value.__enter__ = MagicMock(return_value=cursor)
+        conn.cursor.return_value.__exit__ = MagicMock(return_value=False)
+        backend = PostgresBackend(connection=conn, batch_size=2, flush_interval=60)  # type: ignore[arg-type]
+        backend.log("a", "u")
+        backend.log("b", "u")
+
+        sql = [str(c.args[0]).strip() for c in cursor.execute.call_args_list]
+        begin = sql.index("BEGIN")
+        assert "pg_advisory_xact_lock" in sql[begin + 1]
+        assert sql[-1] == "COMMIT"
+        conn.commit.assert_not_called()
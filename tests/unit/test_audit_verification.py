@@ -0,0 +1,213 @@
+"""
+Тесты потоковой, параллельной и инкрементальной проверки журнала аудита.
+
+Покрывает:
+- Проверку пачками: обнаружение подмены записи и разрыва цепочки на границе пачек.
+- Пересчёт хэшей в пуле процессов.
+- Подписанные отметки проверки FileBackend и SqliteBackend: проверка только хвоста,
+  обнаружение подделки отметки, изменения или удаления отмеченной записи.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from chutils.audit import _verify
+from chutils.audit.backends import file as file_module
+from chutils.audit.backends import sqlite as sqlite_module
+from chutils.audit.backends.file import FileBackend
+from chutils.audit.backends.sqlite import SqliteBackend
+from chutils.exceptions import AuditIntegrityError
+
+KEY = "checkpoint-secret"
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_verify, "_CHUNK_SIZE", 3)
+
+
+def _fill(backend: FileBackend | SqliteBackend, count: int, start: int = 0) -> None:
+    for i in range(start, start + count):
+        backend.log(f"action.{i}", "actor")
+
+
+def _rewrite_line(path: Path, index: int, **changes: object) -> None:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    record = json.loads(lines[index])
+    record.update(changes)
+    lines[index] = json.dumps(record)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _sqlite_execute(path: Path, query: str) -> None:
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(query)
+    conn.close()
+
+
+class TestStreamingVerification:
+    """Проверка пачками в текущем процессе и в пуле процессов."""
+
+    def test_tampered_record_reported(self, tmp_path: Path) -> None:
+        """Подмена записи в середине журнала обнаруживается с её id."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path)
+        _fill(backend, 10)
+        assert backend.verify_integrity() is True
+
+        record_id = json.loads(path.read_text().splitlines()[7])["id"]
+        _rewrite_line(path, 7, actor="hacker")
+        with pytest.raises(AuditIntegrityError) as exc_info:
+            backend.verify_integrity()
+        assert exc_info.value.context["record_id"] == record_id
+
+    def test_deleted_record_breaks_chain(self, tmp_path: Path) -> None:
+        """Удаление записи на границе пачек нарушает связность цепочки."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path)
+        _fill(backend, 10)
+        _sqlite_execute(path, "DELETE FROM audit_log WHERE rowid = 4")
+        with pytest.raises(AuditIntegrityError, match="prev_hash"):
+            backend.verify_integrity()
+
+    @pytest.mark.parametrize("suffix", ["jsonl", "db"])
+    def test_parallel_workers(self, tmp_path: Path, suffix: str) -> None:
+        """Хэши пересчитываются в пуле процессов, связность проверяется после."""
+        path = tmp_path / f"audit.{suffix}"
+        backend = FileBackend(path) if suffix == "jsonl" else SqliteBackend(path)
+        _fill(backend, 20)
+        assert backend.verify_integrity(workers=2) is True
+
+        if suffix == "jsonl":
+            _rewrite_line(path, 15, status="failed")
+        else:
+            _sqlite_execute(path, "UPDATE audit_log SET status = 'failed' WHERE rowid = 16")
+        with pytest.raises(AuditIntegrityError, match="hash не совпадает"):
+            backend.verify_integrity(workers=2)
+
+    def test_invalid_workers(self, tmp_path: Path) -> None:
+        """workers должен быть положительным."""
+        backend = FileBackend(tmp_path / "audit.jsonl")
+        backend.log("a", "u")
+        with pytest.raises(ValueError, match="workers"):
+            backend.verify_integrity(workers=0)
+
+
+class TestFileCheckpoint:
+    """Подписанные отметки проверки FileBackend."""
+
+    def test_only_tail_rechecked(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Повторная проверка читает только записи после отметки."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, checkpoint_key=KEY)
+        _fill(backend, 8)
+        assert backend.verify_integrity() is True
+        marker = json.loads((tmp_path / "audit.jsonl.checkpoint").read_text())
+        assert marker["offset"] == path.stat().st_size
+
+        _fill(backend, 3, start=8)
+        decode = MagicMock(wraps=_verify.decode_jsonl)
+        monkeypatch.setattr(file_module, "decode_jsonl", decode)
+        assert backend.verify_integrity() is True
+        # Три новые записи плюс отмеченная запись
+        assert decode.call_count == 4
+
+    def test_full_check_ignores_checkpoint(self, tmp_path: Path) -> None:
+        """Изменение до отметки видно только при полной проверке."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, checkpoint_key=KEY)
+        _fill(backend, 5)
+        backend.verify_integrity()
+        # Замена той же длины не сдвигает отметку
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        lines[1] = lines[1].replace('"actor":"actor"', '"actor":"hackr"')
+        path.write_text("".join(lines), encoding="utf-8")
+
+        assert backend.verify_integrity() is True
+        with pytest.raises(AuditIntegrityError):
+            backend.verify_integrity(full=True)
+
+    def test_forged_checkpoint_rejected(self, tmp_path: Path) -> None:
+        """Отметка с неверной подписью или другим ключом отклоняется."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, checkpoint_key=KEY)
+        _fill(backend, 5)
+        backend.verify_integrity()
+
+        with pytest.raises(AuditIntegrityError, match="подпись"):
+            FileBackend(path, checkpoint_key="other-key").verify_integrity()
+
+        checkpoint = tmp_path / "audit.jsonl.checkpoint"
+        marker = json.loads(checkpoint.read_text())
+        marker["offset"] += 1
+        checkpoint.write_text(json.dumps(marker))
+        with pytest.raises(AuditIntegrityError, match="подпись"):
+            backend.verify_integrity()
+
+        checkpoint.write_text("not json")
+        with pytest.raises(AuditIntegrityError, match="повреждён"):
+            backend.verify_integrity()
+
+    def test_checkpointed_record_changed(self, tmp_path: Path) -> None:
+        """Изменение или усечение отмеченной записи обнаруживается."""
+        path = tmp_path / "audit.jsonl"
+        backend = FileBackend(path, checkpoint_key=KEY)
+        _fill(backend, 4)
+        backend.verify_integrity()
+        content = path.read_bytes()
+
+        _rewrite_line(path, 3, actor="hacker")
+        with pytest.raises(AuditIntegrityError, match="прошлая проверка"):
+            backend.verify_integrity()
+
+        path.write_bytes(content[: len(content) // 2])
+        with pytest.raises(AuditIntegrityError, match="прошлая проверка"):
+            backend.verify_integrity()
+
+
+class TestSqliteCheckpoint:
+    """Подписанные отметки проверки SqliteBackend."""
+
+    def test_only_tail_rechecked(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Повторная проверка читает только строки после отмеченного rowid."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path, checkpoint_key=KEY)
+        _fill(backend, 6)
+        assert backend.verify_integrity() is True
+
+        _fill(backend, 2, start=6)
+        decode = MagicMock(wraps=_verify.decode_row)
+        monkeypatch.setattr(sqlite_module, "decode_row", decode)
+        assert backend.verify_integrity() is True
+        assert decode.call_count == 3
+
+        conn = sqlite3.connect(path)
+        position = conn.execute("SELECT position FROM audit_checkpoint").fetchone()[0]
+        conn.close()
+        assert position == 8
+
+    def test_checkpointed_row_deleted(self, tmp_path: Path) -> None:
+        """Удаление отмеченной строки обнаруживается."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path, checkpoint_key=KEY)
+        _fill(backend, 3)
+        backend.verify_integrity()
+        _sqlite_execute(path, "DELETE FROM audit_log WHERE rowid = 3")
+        with pytest.raises(AuditIntegrityError, match="прошлая проверка"):
+            backend.verify_integrity()
+
+    def test_forged_checkpoint_rejected(self, tmp_path: Path) -> None:
+        """Перенос отметки вперёд без ключа обнаруживается."""
+        path = tmp_path / "audit.db"
+        backend = SqliteBackend(path, checkpoint_key=KEY)
+        _fill(backend, 5)
+        backend.verify_integrity()
+        _sqlite_execute(path, "UPDATE audit_checkpoint SET position = 4")
+        with pytest.raises(AuditIntegrityError, match="подпись"):
+            backend.verify_integrity()
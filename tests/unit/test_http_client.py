@@ -21,6 +21,15 @@ from chutils.http.fallback import HttpResponse
 from chutils.http.resilience import ResiliencePolicy
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_pool() -> Any:
+    """Сбрасывает общий пул, чтобы мок httpx не переживал тест."""
+    from chutils.http import close_pool
+
+    yield
+    close_pool()
+
+
 # ─── Вспомогательные фабрики ─────────────────────────────────────────────────
 
 
@@ -0,0 +1,210 @@
+"""
+Тесты потоковых ответов и загрузки файлов chutils.http.
+
+Проверяет:
+- stream() у HttpClient, AsyncHttpClient и UrllibFallbackClient
+- Атомарную запись download() и отсутствие файла при ошибке
+- Докачку через Range: 206, игнорирование Range сервером (200), 416 для полного файла
+- Сохранение .part при обрыве соединения
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from chutils import http
+from chutils.exceptions import HttpClientError
+from chutils.http import UrllibFallbackClient
+
+PAYLOAD = bytes(range(256)) * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        server: Any = self.server
+        server.ranges.append(self.headers.get("Range"))
+        if self.path == "/missing":
+            self._send(404, b"not found")
+            return
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        if match is None or not server.support_range:
+            self._send(200, PAYLOAD, truncate=server.truncate)
+            return
+        start = int(match.group(1))
+        if start >= len(PAYLOAD):
+            self._send(416, b"", extra={"Content-Range": f"bytes */{len(PAYLOAD)}"})
+            return
+        self._send(
+            206,
+            PAYLOAD[start:],
+            extra={"Content-Range": f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}"},
+        )
+
+    def _send(self, status: int, body: bytes, *, extra: dict[str, str] | None = None, truncate: int = 0) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if truncate:
+            self.wfile.write(body[:truncate])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[Any]:
+    srv: Any = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.ranges = []
+    srv.support_range = True
+    srv.truncate = 0
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}/file.bin"
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    http.close_pool()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_stream_iterates_body_in_chunks(server: Any) -> None:
+    """stream() отдаёт тело чанками заданного размера."""
+    with http.HttpClient().stream("GET", server.url) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-length"] == str(len(PAYLOAD))
+        chunks = list(resp.iter_bytes(4096))
+    assert b"".join(chunks) == PAYLOAD
+    assert all(len(chunk) == 4096 for chunk in chunks[:-1])
+
+
+def test_download_writes_file_atomically(server: Any, tmp_path: Path) -> None:
+    """download() записывает файл и не оставляет временных файлов."""
+    dest = tmp_path / "sub" / "file.bin"
+    assert http.download(server.url, dest) == dest
+    assert dest.read_bytes() == PAYLOAD
+    assert [p.name for p in dest.parent.iterdir()] == ["file.bin"]
+
+
+def test_download_error_status_leaves_no_file(server: Any, tmp_path: Path) -> None:
+    """При 404 файл не создаётся, временные файлы удаляются."""
+    url = server.url.replace("/file.bin", "/missing")
+    with pytest.raises(HttpClientError):
+        http.HttpClient().download(url, tmp_path / "file.bin")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_resume_requests_missing_range(server: Any, tmp_path: Path) -> None:
+    """С resume=True запрашивается только недостающий диапазон."""
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD[:1000])
+
+    http.HttpClient().download(server.url, dest, resume=True)
+
+    assert server.ranges == ["bytes=1000-"]
+    assert dest.read_bytes() == PAYLOAD
+    assert not (tmp_path / "file.bin.part").exists()
+
+
+def test_download_resume_restarts_when_range_ignored(server: Any, tmp_path: Path) -> None:
+    """Если сервер отвечает 200 на Range, файл скачивается заново."""
+    server.support_range = False
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(b"stale")
+
+    http.HttpClient().download(server.url, dest, resume=True)
+
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_download_resume_completed_part(server: Any, tmp_path: Path) -> None:
+    """416 с размером, равным .part, означает, что файл уже скачан."""
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD)
+
+    http.HttpClient().download(server.url, dest, resume=True)
+
+    assert dest.read_bytes() == PAYLOAD
+
+
+def test_download_interrupted_keeps_part_for_resume(server: Any, tmp_path: Path) -> None:
+    """При обрыве .part сохраняется, а повторный вызов докачивает файл."""
+    dest = tmp_path / "file.bin"
+    server.truncate = 100_000
+    with pytest.raises(Exception):  # noqa: B017
+        http.HttpClient(pooled=False).download(server.url, dest, resume=True)
+    assert not dest.exists()
+    # Незавершённый чанк до обрыва может быть отброшен транспортом
+    kept = (tmp_path / "file.bin.part").stat().st_size
+    assert 0 < kept <= 100_000
+
+    server.truncate = 0
+    http.HttpClient(pooled=False).download(server.url, dest, resume=True)
+    assert dest.read_bytes() == PAYLOAD
+    assert server.ranges[-1] == f"bytes={kept}-"
+
+
+def test_fallback_client_stream_and_resume(server: Any, tmp_path: Path) -> None:
+    """UrllibFallbackClient поддерживает stream() и докачку."""
+    client = UrllibFallbackClient()
+    with client.stream("GET", server.url) as resp:
+        assert resp.read() == PAYLOAD
+
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD[:5000])
+    client.download(server.url, dest, resume=True)
+    assert dest.read_bytes() == PAYLOAD
+    assert server.ranges[-1] == "bytes=5000-"
+
+
+def test_fallback_client_stream_error_status(server: Any) -> None:
+    """4xx в stream() у fallback-клиента возвращается как ответ, а не исключение."""
+    url = server.url.replace("/file.bin", "/missing")
+    with UrllibFallbackClient().stream("GET", url) as resp:
+        assert resp.status_code == 404
+        assert resp.read() == b"not found"
+        with pytest.raises(HttpClientError):
+            resp.raise_for_status()
+
+
+def test_http_client_stream_uses_fallback_without_httpx(server: Any) -> None:
+    """Без httpx HttpClient.stream() делегирует urllib-клиенту."""
+    with (
+        patch("chutils.http.client.HTTPX_AVAILABLE", False),
+        http.HttpClient().stream("GET", server.url) as resp,
+    ):
+        assert resp.read() == PAYLOAD
+
+
+def test_async_stream_and_download(server: Any, tmp_path: Path) -> None:
+    """AsyncHttpClient поддерживает stream() и докачку."""
+    dest = tmp_path / "file.bin"
+    (tmp_path / "file.bin.part").write_bytes(PAYLOAD[:2048])
+
+    async def run() -> bytes:
+        client = http.AsyncHttpClient()
+        async with client.stream("GET", server.url) as resp:
+            body = b"".join([chunk async for chunk in resp.aiter_bytes(8192)])
+        await client.download(server.url, dest, resume=True)
+        await http.aclose_pool()
+        return body
+
+    assert asyncio.run(run()) == PAYLOAD
+    assert dest.read_bytes() == PAYLOAD
+    assert server.ranges[-1] == "bytes=2048-"
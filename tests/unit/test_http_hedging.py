@@ -0,0 +1,313 @@
+"""
+Тесты hedged-запросов и бюджета повторов chutils.http.
+
+Проверяет:
+- RetryBudget: пополнение долей от запросов и по времени, отказ при исчерпании
+- Ограничение повторов ResiliencePolicy бюджетом (sync и async)
+- Hedged-вызовы: копия после квантиля задержки, первый успешный результат,
+  отмена проигравших async-копий, отсутствие копий без hedge=True
+- Интеграцию с HttpClient и AsyncHttpClient: копии только для идемпотентных методов
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from chutils import http, metrics
+from chutils.http import ResiliencePolicy, RetryBudget
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+
+
+@pytest.fixture
+def provider() -> Iterator[InMemoryMetricsProvider]:
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+def _counter(provider: InMemoryMetricsProvider, name: str) -> float:
+    return sum(item["value"] for item in provider.get_metrics()["counters"].get(name, []))
+
+
+def _warm_up(policy: ResiliencePolicy, latency: float = 0.0) -> None:
+    """Набирает замеры задержки, после которых включаются копии."""
+    for _ in range(20):
+        policy._latencies.record(latency)
+
+
+# ─── RetryBudget ─────────────────────────────────────────────────────────────
+
+
+def test_budget_validates_arguments() -> None:
+    """Некорректные параметры отклоняются."""
+    with pytest.raises(ValueError, match="ratio"):
+        RetryBudget(ratio=0)
+    with pytest.raises(ValueError, match="capacity"):
+        RetryBudget(capacity=0.5)
+
+
+def test_budget_allows_ratio_of_traffic(provider: InMemoryMetricsProvider) -> None:
+    """Без пополнения по времени повторов не больше ratio от запросов."""
+    budget = RetryBudget(ratio=0.25, min_retries_per_second=0, name="api")
+    assert budget.try_withdraw()  # стартовый токен
+    assert not budget.try_withdraw()
+    for _ in range(8):
+        budget.deposit()
+    assert budget.try_withdraw()
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+    rejections = provider.get_metrics()["counters"]["http_retry_budget_rejections_total"]
+    assert rejections == [{"labels": {"budget": "api"}, "value": 2.0}]
+
+
+def test_budget_refills_over_time() -> None:
+    """min_retries_per_second пополняет бюджет без трафика."""
+    budget = RetryBudget(min_retries_per_second=50.0, capacity=1.0)
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+    time.sleep(0.05)
+    assert budget.try_withdraw()
+
+
+def test_policy_retries_limited_by_budget() -> None:
+    """Исчерпанный бюджет прекращает повторы и пробрасывает исключение."""
+    budget = RetryBudget(ratio=0.1, min_retries_per_second=0)
+    policy = ResiliencePolicy(retries=5, retry_delay=0, retry_budget=budget, cb_failure_threshold=100)
+    calls = 0
+
+    def fail() -> None:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        policy.apply_sync(fail)
+    # Стартовый токен + 0.1 от вызова: ровно один повтор
+    assert calls == 2
+    with pytest.raises(ConnectionError):
+        policy.apply_sync(fail)
+    assert calls == 3
+
+
+def test_policy_retry_budget_ratio_async() -> None:
+    """Число в retry_budget создаёт бюджет с этой долей; async-повторы тоже ограничены."""
+    policy = ResiliencePolicy(retries=3, retry_delay=0, retry_budget=0.5, cb_failure_threshold=100)
+    assert policy.retry_budget is not None
+    assert policy.retry_budget.ratio == 0.5
+    calls = 0
+
+    async def fail() -> None:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("down")
+
+    async def run() -> None:
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                await policy.apply_async(fail)
+
+    asyncio.run(run())
+    # 4 исходных вызова + 1 стартовый токен + 4 * 0.5 токена
+    assert calls == 4 + 3
+
+
+# ─── Hedged-вызовы ───────────────────────────────────────────────────────────
+
+
+def test_policy_validates_hedge_arguments() -> None:
+    """Некорректные параметры hedging отклоняются."""
+    with pytest.raises(ValueError, match="hedge_quantile"):
+        ResiliencePolicy(hedging=True, hedge_quantile=1.0)
+    with pytest.raises(ValueError, match="max_hedges"):
+        ResiliencePolicy(hedging=True, max_hedges=0)
+
+
+def test_hedge_sync_returns_first_success(provider: InMemoryMetricsProvider) -> None:
+    """Медленный первый вызов дублируется, используется результат копии."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.01, name="users")
+    _warm_up(policy)
+    calls = 0
+    lock = threading.Lock()
+
+    def call() -> str:
+        nonlocal calls
+        with lock:
+            calls += 1
+            number = calls
+        if number == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    started = time.monotonic()
+    assert policy.apply_sync(call, hedge=True) == "fast"
+    assert time.monotonic() - started < 0.4
+    assert _counter(provider, "http_hedged_requests_total") == 1
+    assert _counter(provider, "http_hedge_wins_total") == 1
+
+
+def test_hedge_sync_falls_back_to_other_copy_on_error() -> None:
+    """Ошибка одной копии не прерывает ожидание другой."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.01)
+    _warm_up(policy)
+    calls = 0
+    lock = threading.Lock()
+
+    def call() -> str:
+        nonlocal calls
+        with lock:
+            calls += 1
+            number = calls
+        if number == 1:
+            time.sleep(0.05)
+            return "primary"
+        raise ConnectionError("hedge failed")
+
+    assert policy.apply_sync(call, hedge=True) == "primary"
+
+
+def test_no_hedge_without_flag_or_samples(provider: InMemoryMetricsProvider) -> None:
+    """Без hedge=True или до набора замеров копии не запускаются."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.001)
+
+    def call() -> str:
+        time.sleep(0.02)
+        return "ok"
+
+    assert policy.apply_sync(call, hedge=True) == "ok"  # замеров ещё нет
+    _warm_up(policy)
+    assert policy.apply_sync(call) == "ok"  # hedge=False
+    assert _counter(provider, "http_hedged_requests_total") == 0
+
+
+def test_hedges_consume_retry_budget(provider: InMemoryMetricsProvider) -> None:
+    """Копия не запускается, если бюджет повторов исчерпан."""
+    budget = RetryBudget(min_retries_per_second=0)
+    assert budget.try_withdraw()
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.001, retry_budget=budget)
+    _warm_up(policy)
+
+    def call() -> str:
+        time.sleep(0.05)
+        return "ok"
+
+    assert policy.apply_sync(call, hedge=True) == "ok"
+    assert _counter(provider, "http_hedged_requests_total") == 0
+    assert _counter(provider, "http_retry_budget_rejections_total") == 1
+
+
+def test_hedge_async_cancels_losers(provider: InMemoryMetricsProvider) -> None:
+    """Async: выигравшая копия возвращается, проигравшая отменяется."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.01, max_hedges=2)
+    _warm_up(policy)
+    calls = 0
+    cancelled = 0
+
+    async def call() -> int:
+        nonlocal calls, cancelled
+        calls += 1
+        number = calls
+        try:
+            await asyncio.sleep(1.0 if number == 1 else 0.001)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return number
+
+    async def run() -> object:
+        result = await policy.apply_async(call, hedge=True)
+        await asyncio.sleep(0)
+        return result
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == 2
+    assert time.monotonic() - started < 0.5
+    assert cancelled == 1
+    assert _counter(provider, "http_hedged_requests_total") == 1
+
+
+# ─── Интеграция с клиентами ──────────────────────────────────────────────────
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _handle(self) -> None:
+        server: Any = self.server
+        with server.lock:
+            server.count += 1
+            number = server.count
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if number == server.slow_request:
+            time.sleep(0.5)
+        body = str(number).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Клиент закрыл соединение проигравшей копии
+            self.close_connection = True
+
+    do_GET = _handle
+    do_POST = _handle
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[Any]:
+    pytest.importorskip("httpx")
+    srv: Any = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.lock = threading.Lock()
+    srv.count = 0
+    srv.slow_request = 1
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}/"
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    http.close_pool()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_http_client_hedges_idempotent_requests(server: Any, provider: InMemoryMetricsProvider) -> None:
+    """GET дублируется, POST — нет."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.02)
+    _warm_up(policy)
+    client = http.HttpClient(policy=policy)
+
+    started = time.monotonic()
+    assert client.get(server.url).text == "2"
+    assert time.monotonic() - started < 0.4
+    assert _counter(provider, "http_hedged_requests_total") == 1
+
+    server.slow_request = server.count + 1
+    assert client.post(server.url, data=b"x").status_code == 200
+    assert _counter(provider, "http_hedged_requests_total") == 1
+
+
+def test_async_http_client_hedges_get(server: Any, provider: InMemoryMetricsProvider) -> None:
+    """AsyncHttpClient дублирует медленный GET."""
+    policy = ResiliencePolicy(retries=0, hedging=True, hedge_min_delay=0.02)
+    _warm_up(policy)
+
+    async def run() -> str:
+        resp = await http.AsyncHttpClient(policy=policy).get(server.url)
+        await http.aclose_pool()
+        return resp.text
+
+    assert asyncio.run(run()) == "2"
+    assert _counter(provider, "http_hedge_wins_total") == 1
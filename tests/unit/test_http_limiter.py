@@ -0,0 +1,181 @@
+"""
+Тесты адаптивного лимита конкурентности chutils.http.limiter.
+
+Проверяет:
+- AIMD: рост при загрузке лимита, снижение при отказе и превышении latency_threshold
+- Gradient: снижение лимита при росте задержки, отсутствие роста без загрузки
+- Передачу слотов ожидающим (sync и async), таймаут и отмену ожидания
+- Интеграцию с ResiliencePolicy (apply_sync / apply_async) и метрику лимита
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from chutils import metrics
+from chutils.http import AdaptiveLimiter, ResiliencePolicy
+from chutils.metrics.in_memory import InMemoryMetricsProvider
+
+
+@pytest.fixture
+def provider():
+    provider = InMemoryMetricsProvider()
+    metrics.set_provider(provider)
+    yield provider
+    metrics.set_provider(None)
+
+
+def _run(limiter: AdaptiveLimiter, latency: float, *, dropped: bool = False, concurrent: int = 1) -> None:
+    """Проводит один раунд из `concurrent` одновременных вызовов."""
+    for _ in range(concurrent):
+        assert limiter.try_acquire()
+    for _ in range(concurrent):
+        limiter.release(latency, dropped=dropped)
+
+
+def test_limiter_validates_arguments() -> None:
+    """Некорректные параметры отклоняются."""
+    with pytest.raises(ValueError, match="алгоритм"):
+        AdaptiveLimiter(algorithm="vegas")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="min_limit"):
+        AdaptiveLimiter(min_limit=10, max_limit=5)
+    with pytest.raises(ValueError, match="backoff_ratio"):
+        AdaptiveLimiter(backoff_ratio=1.0)
+
+
+def test_aimd_grows_when_limit_is_used() -> None:
+    """AIMD увеличивает лимит не быстрее чем на 1 за окно успешных вызовов."""
+    limiter = AdaptiveLimiter(initial_limit=4)
+    for _ in range(10):
+        _run(limiter, 0.01, concurrent=limiter.limit)
+    assert 6 <= limiter.limit <= 14
+
+
+def test_aimd_does_not_grow_when_underused() -> None:
+    """Если используется меньше половины лимита, он не растёт."""
+    limiter = AdaptiveLimiter(initial_limit=10)
+    for _ in range(50):
+        _run(limiter, 0.01)
+    assert limiter.limit == 10
+
+
+def test_aimd_backs_off_on_drop_and_slow_call() -> None:
+    """Отказ и превышение latency_threshold снижают лимит мультипликативно."""
+    limiter = AdaptiveLimiter(initial_limit=20, backoff_ratio=0.5, latency_threshold=0.1)
+    _run(limiter, 0.01, dropped=True)
+    assert limiter.limit == 10
+    _run(limiter, 0.5)
+    assert limiter.limit == 5
+
+
+def test_aimd_respects_bounds() -> None:
+    """Лимит остаётся в пределах [min_limit, max_limit]."""
+    limiter = AdaptiveLimiter(initial_limit=3, min_limit=2, max_limit=4, backoff_ratio=0.1)
+    _run(limiter, 0.01, dropped=True)
+    assert limiter.limit == 2
+    for _ in range(50):
+        _run(limiter, 0.01, concurrent=limiter.limit)
+    assert limiter.limit == 4
+
+
+def test_gradient_shrinks_when_latency_grows() -> None:
+    """Рост задержки относительно долгосрочной снижает лимит."""
+    limiter = AdaptiveLimiter(algorithm="gradient", initial_limit=50, long_window=1000)
+    for _ in range(20):
+        _run(limiter, 0.01, concurrent=25)
+    before = limiter.limit
+    for _ in range(10):
+        _run(limiter, 0.1, concurrent=min(limiter.limit, 25))
+    assert limiter.limit < before / 2
+
+
+def test_gradient_grows_under_stable_latency() -> None:
+    """При стабильной задержке и загрузке лимит растёт."""
+    limiter = AdaptiveLimiter(algorithm="gradient", initial_limit=10)
+    for _ in range(10):
+        _run(limiter, 0.01, concurrent=limiter.limit)
+    assert limiter.limit > 10
+
+
+def test_acquire_blocks_until_release() -> None:
+    """При исчерпании лимита acquire ждёт и получает освобождённый слот."""
+    limiter = AdaptiveLimiter(initial_limit=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.01)
+
+    acquired = threading.Event()
+    thread = threading.Thread(target=lambda: limiter.acquire() and acquired.set())
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    limiter.release(0.01)
+    thread.join(1)
+    assert acquired.is_set()
+    assert limiter.in_flight == 1
+
+
+def test_aacquire_waits_and_cancellation_returns_slot() -> None:
+    """Отменённое async-ожидание не занимает слот."""
+
+    async def run() -> None:
+        limiter = AdaptiveLimiter(initial_limit=1)
+        await limiter.aacquire()
+        waiter = asyncio.create_task(limiter.aacquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+        await asyncio.wait_for(limiter.aacquire(), 1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_policy_with_adaptive_limit_sync() -> None:
+    """apply_sync захватывает слот лимитера и сообщает об отказах."""
+    policy = ResiliencePolicy(retries=0, adaptive_concurrency="aimd", max_concurrency=8)
+    assert policy.limiter is not None
+    assert policy.limiter.limit == 8
+
+    assert policy.apply_sync(lambda: policy.limiter.in_flight) == 1  # type: ignore[union-attr]
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        policy.apply_sync(fail)
+    assert policy.limiter.in_flight == 0
+    assert policy.limiter.limit == 7
+
+
+def test_policy_with_adaptive_limit_async() -> None:
+    """apply_async не пускает больше вызовов, чем разрешает лимит."""
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    policy = ResiliencePolicy(retries=0, adaptive_concurrency=limiter)
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*(policy.apply_async(call) for _ in range(10)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_limit_published_as_gauge(provider: InMemoryMetricsProvider) -> None:
+    """Текущий лимит публикуется в http_concurrency_limit."""
+    limiter = AdaptiveLimiter(initial_limit=10, backoff_ratio=0.5, name="billing")
+    _run(limiter, 0.01, dropped=True)
+    gauge = provider.get_metrics()["gauges"]["http_concurrency_limit"][0]
+    assert gauge == {"labels": {"limiter": "billing"}, "value": 5.0}
@@ -0,0 +1,144 @@
+"""
+Тесты общего пула соединений chutils.http.
+
+Проверяет:
+- Переиспользование соединений standalone-функциями и HttpClient вне `with`
+- Отключение пула через pooled=False
+- Отдельный async-клиент на каждый event loop
+- Сброс пула после fork и при изменении настроек
+- Изоляцию cookie между запросами через общий клиент
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from chutils import http
+from chutils.http import client as client_module
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        server: Any = self.server
+        server.peers.add(self.client_address)
+        server.cookies.append(self.headers.get("Cookie"))
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=secret; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[Any]:
+    srv: Any = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.peers = set()
+    srv.cookies = []
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}/"
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    http.close_pool()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_standalone_helpers_reuse_connection(server: Any) -> None:
+    """Повторные http.get() идут через одно keep-alive соединение."""
+    for _ in range(5):
+        assert http.get(server.url).status_code == 200
+    assert len(server.peers) == 1
+
+
+def test_http_client_without_context_uses_pool(server: Any) -> None:
+    """Разные экземпляры HttpClient вне `with` делят общий пул."""
+    http.HttpClient().get(server.url)
+    http.HttpClient(timeout=5.0).get(server.url)
+    assert len(server.peers) == 1
+
+
+def test_pooled_false_opens_connection_per_request(server: Any) -> None:
+    """При pooled=False каждый запрос открывает своё соединение."""
+    client = http.HttpClient(pooled=False)
+    for _ in range(3):
+        client.get(server.url)
+    assert len(server.peers) == 3
+
+
+def test_shared_client_does_not_keep_cookies(server: Any) -> None:
+    """Cookie из ответа не уходят в последующие запросы через общий пул."""
+    http.get(server.url)
+    http.get(server.url)
+    assert server.cookies == [None, None]
+
+
+def test_shared_client_recreated_after_fork() -> None:
+    """В дочернем процессе (другой pid) создаётся новый клиент пула."""
+    first = http.get_shared_client()
+    assert http.get_shared_client() is first
+    client_module._pool_pid = -1
+    try:
+        assert http.get_shared_client() is not first
+    finally:
+        http.close_pool()
+        first.close()
+
+
+def test_configure_pool_resets_client() -> None:
+    """configure_pool() закрывает клиент пула и применяет новые лимиты."""
+    first = http.get_shared_client()
+    try:
+        http.configure_pool(max_connections=2, max_keepalive_connections=1, keepalive_expiry=1.0)
+        second = http.get_shared_client()
+        assert second is not first
+        assert first.is_closed
+        assert client_module._pool_options["max_connections"] == 2
+    finally:
+        http.configure_pool()
+
+
+def test_configure_pool_validates_limits() -> None:
+    """Отрицательные лимиты отклоняются."""
+    with pytest.raises(ValueError, match="max_connections"):
+        http.configure_pool(max_connections=-1)
+
+
+def test_configure_pool_http2_requires_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    """HTTP/2 без пакета h2 даёт OptionalDependencyError."""
+    from chutils.exceptions import OptionalDependencyError
+
+    monkeypatch.setattr(client_module.importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(OptionalDependencyError):
+        http.configure_pool(http2=True)
+
+
+def test_async_pool_per_event_loop(server: Any) -> None:
+    """Async-клиент пула общий внутри цикла и отдельный для разных циклов."""
+
+    async def run() -> Any:
+        client = http.AsyncHttpClient()
+        await client.get(server.url)
+        await http.AsyncHttpClient().get(server.url)
+        shared = http.get_shared_async_client()
+        await http.aclose_pool()
+        return shared
+
+    first = asyncio.run(run())
+    assert len(server.peers) == 1
+    second = asyncio.run(run())
+    assert second is not first
+    assert len(server.peers) == 2
@@ -115,3 +115,146 @@ def test_memcached_store_sync_operations() -> None:
         assert store.delete("mk")
         assert store.exists("mk")
         assert store.clear()
+
+
+def test_redis_store_batch_operations() -> None:
+    """Проверяет, что пакетные операции RedisStore используют MGET, MSET, pipeline и DEL."""
+    mock_pipeline = MagicMock()
+    mock_pipeline.execute.return_value = [True, True]
+    mock_redis_client = MagicMock()
+    mock_redis_client.mget.return_value = [b"v1", None]
+    mock_redis_client.mset.return_value = True
+    mock_redis_client.pipeline.return_value = mock_pipeline
+    mock_redis_client.delete.return_value = 2
+
+    mock_redis_module = MagicMock()
+    mock_redis_module.Redis.from_url.return_value = mock_redis_client
+
+    with patch.dict("sys.modules", {"redis": mock_redis_module}), patch(
+        "chutils.store.backends.redis.is_redis_available", return_value=True
+    ):
+        store = RedisStore()
+
+        assert store.get_many(["k1", "k2"]) == {"k1": b"v1"}
+        mock_redis_client.mget.assert_called_once_with(["k1", "k2"])
+
+        assert store.set_many({"k1": "a", "k2": "b"})
+        mock_redis_client.mset.assert_called_once_with({"k1": "a", "k2": "b"})
+
+        assert store.set_many({"k1": "a", "k2": "b"}, ttl=30)
+        mock_redis_client.pipeline.assert_called_once_with(transaction=False)
+        mock_pipeline.set.assert_any_call("k2", "b", ex=30)
+        mock_pipeline.execute.assert_called_once()
+
+        assert store.delete_many(["k1", "k2"]) == 2
+        mock_redis_client.delete.assert_called_once_with("k1", "k2")
+        assert store.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_store_async_batch_operations() -> None:
+    """Проверяет асинхронные пакетные операции RedisStore."""
+    mock_pipeline = MagicMock()
+    mock_pipeline.execute = AsyncMock(return_value=[True])
+    mock_async_redis = MagicMock()
+    mock_async_redis.mget = AsyncMock(return_value=[None, b"v2"])
+    mock_async_redis.pipeline.return_value = mock_pipeline
+    mock_async_redis.delete = AsyncMock(return_value=1)
+
+    mock_redis = MagicMock()
+    mock_redis.asyncio.Redis.from_url.return_value = mock_async_redis
+
+    with patch.dict("sys.modules", {"redis": mock_redis, "redis.asyncio": mock_redis.asyncio}), patch(
+        "chutils.store.backends.redis.is_redis_available", return_value=True
+    ):
+        store = RedisStore()
+
+        assert await store.aget_many(["k1", "k2"]) == {"k2": b"v2"}
+        assert await store.aset_many({"k1": "a"}, ttl=5)
+        mock_pipeline.set.assert_called_once_with("k1", "a", ex=5)
+        assert await store.adelete_many(["k1"]) == 1
+
+
+def test_memcached_store_batch_operations() -> None:
+    """Проверяет, что пакетные операции MemcachedStore используют get_many/set_many/delete_many."""
+    mock_client = MagicMock()
+    mock_client.get_many.return_value = {"k1": b"v1"}
+    mock_client.set_many.return_value = []
+    mock_client.delete_many.return_value = True
+
+    mock_pymemcache = MagicMock()
+    mock_pymemcache.client.base.Client.return_value = mock_client
+
+    with patch.dict(
+        "sys.modules",
+        {"pymemcache": mock_pymemcache, "pymemcache.client.base": mock_pymemcache.client.base},
+    ), patch("chutils.store.backends.memcached.is_pymemcache_available", return_value=True):
+        store = MemcachedStore()
+
+        assert store.get_many(["k1", "k2"]) == {"k1": b"v1"}
+        mock_client.get_many.assert_called_once_with(["k1", "k2"])
+
+        assert store.set_many({"k1": "a"}, ttl=10)
+        mock_client.set_many.assert_called_once_with({"k1": "a"}, expire=10)
+
+        mock_client.set_many.return_value = ["k1"]
+        assert not store.set_many({"k1": "a"})
+
+        assert store.delete_many(["k1", "k2"]) == 2
+        mock_client.delete_many.assert_called_once_with(["k1", "k2"])
+
+
+@pytest.mark.asyncio
+async def test_memcached_store_async_batch_operations() -> None:
+    """Проверяет асинхронные пакетные операции MemcachedStore: multi_get и пакет pymemcache в потоке."""
+    mock_async_client = MagicMock()
+    mock_async_client.multi_get = AsyncMock(return_value=(b"v1", None))
+    mock_aiomemcache = MagicMock()
+    mock_aiomemcache.Client.return_value = mock_async_client
+
+    mock_client = MagicMock()
+    mock_client.set_many.return_value = []
+    mock_pymemcache = MagicMock()
+    mock_pymemcache.client.base.Client.return_value = mock_client
+
+    with patch.dict(
+        "sys.modules",
+        {
+            "aiomemcache": mock_aiomemcache,
+            "pymemcache": mock_pymemcache,
+            "pymemcache.client.base": mock_pymemcache.client.base,
+        },
+    ), patch("chutils.store.backends.memcached.is_aiomemcache_available", return_value=True), patch(
+        "chutils.store.backends.memcached.is_pymemcache_available", return_value=True
+    ):
+        store = MemcachedStore()
+
+        assert await store.aget_many(["k1", "k2"]) == {"k1": b"v1"}
+        mock_async_client.multi_get.assert_awaited_once_with(b"k1", b"k2")
+        assert await store.aget_many([]) == {}
+
+        assert await store.aset_many({"k1": "a", "k2": "b"}, ttl=10)
+        mock_client.set_many.assert_called_once_with({"k1": "a", "k2": "b"}, expire=10)
+
+        assert await store.adelete_many(["k1", "k2"]) == 2
+        mock_client.delete_many.assert_called_once_with(["k1", "k2"])
+
+
+@pytest.mark.asyncio
+async def test_memcached_store_async_batch_without_pymemcache() -> None:
+    """Без pymemcache пакетные запись и удаление идут одновременно через асинхронный клиент."""
+    mock_async_client = MagicMock()
+    mock_async_client.set = AsyncMock(return_value=True)
+    mock_async_client.delete = AsyncMock(side_effect=[True, False])
+    mock_aiomemcache = MagicMock()
+    mock_aiomemcache.Client.return_value = mock_async_client
+
+    with patch.dict("sys.modules", {"aiomemcache": mock_aiomemcache}), patch(
+        "chutils.store.backends.memcached.is_aiomemcache_available", return_value=True
+    ), patch("chutils.store.backends.memcached.is_pymemcache_available", return_value=False):
+        store = MemcachedStore()
+
+        assert await store.aset_many({"k1": "a", "k2": b"b"}, ttl=5)
+        mock_async_client.set.assert_any_await(b"k1", b"a", exptime=5)
+        mock_async_client.set.assert_any_await(b"k2", b"b", exptime=5)
+        assert await store.adelete_many(["k1", "k2"]) == 1
@@ -85,3 +85,52 @@ async def test_store_cache_decorator_async() -> None:
     res3 = await async_compute(4)
     assert res3 == 12
     assert call_count == 2
+
+
+def test_store_cache_key_builders() -> None:
+    """Проверяет построители ключей "hash" и пользовательский key= для @store_cache."""
+    backend = MemoryStore()
+    manager = StoreManager(backend=backend)
+
+    @store_cache(store=manager, ttl=60, key_builder="hash", key_prefix="h:")
+    def hashed(payload: dict[str, int]) -> int:
+        return sum(payload.values())
+
+    @store_cache(store=manager, ttl=60, key_prefix="k:", key=lambda user, **_: str(user["id"]))
+    def by_id(user: dict[str, int], verbose: bool = False) -> int:
+        return user["id"]
+
+    assert hashed({"a": 1, "b": 2}) == 3
+    assert by_id({"id": 7}, verbose=True) == 7
+    assert by_id({"id": 7, "other": 1}) == 7  # тот же ключ — значение из кэша
+
+    keys = list(backend._store)
+    hashed_key = next(k for k in keys if k.startswith("h:"))
+    assert len(hashed_key.rsplit(":", 1)[1]) == 32
+    assert "k:test_store_cache_key_builders.<locals>.by_id:('7',):[]" in keys
+
+    with pytest.raises(ValueError):
+        store_cache(store=manager, key_builder="md5")  # type: ignore[arg-type]
+
+
+def test_store_hashed_key_independent_of_xxhash(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ключ "hash" не зависит от наличия xxhash, а key= проходит через построитель."""
+    import hashlib
+
+    from chutils.cache import utils as cache_utils
+    from chutils.store.decorator import _make_hashed_key
+
+    with_xxhash = _make_hashed_key("f", (1, "a"), {"b": 2}, "p:")
+    monkeypatch.setattr(cache_utils, "xxhash", None)
+    assert _make_hashed_key("f", (1, "a"), {"b": 2}, "p:") == with_xxhash
+    expected = hashlib.blake2b(b"(1, 'a'):[('b', 2)]", digest_size=16).hexdigest()
+    assert with_xxhash == f"p:f:{expected}"
+
+    backend = MemoryStore()
+
+    @store_cache(store=StoreManager(backend=backend), key_builder="hash", key_prefix="h:", key=lambda n: f"id-{n}")
+    def load(n: int) -> int:
+        return n
+
+    assert load(3) == 3
+    assert list(backend._store) == [_make_hashed_key(load.__qualname__, ("id-3",), {}, "h:")]
@@ -3,9 +3,14 @@
 """
 from __future__ import annotations
 
+import importlib.util
+from unittest.mock import patch
+
 import pytest
 
+from chutils.exceptions import OptionalDependencyError
 from chutils.store.backends.memory import MemoryStore
+from chutils.store.compression import CompressingSerializer
 from chutils.store.manager import StoreManager
 
 
@@ -74,3 +79,121 @@ async def test_store_manager_async_methods() -> None:
 
     assert await manager.adelete("async_key")
     assert not await manager.aexists("async_key")
+
+
+def test_store_manager_batch_operations() -> None:
+    """Проверяет пакетные операции StoreManager с префиксом ключей."""
+    backend = MemoryStore()
+    manager = StoreManager(backend=backend, serializer="json", prefix="batch:")
+
+    assert manager.set_many({"a": 1, "b": {"x": 2}}, ttl=60)
+    assert backend.exists("batch:a")
+    backend.set("batch:broken", "{not json")
+
+    assert manager.get_many(["a", "b", "missing", "broken"]) == {"a": 1, "b": {"x": 2}}
+    assert manager.delete_many(["a", "missing"]) == 1
+    assert manager.get_many(["a", "b"]) == {"b": {"x": 2}}
+
+
+def test_store_manager_batch_records_one_metric_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Пакетное чтение записывает одну операцию и суммарные попадания/промахи."""
+    calls: list[tuple[str, float, dict[str, str]]] = []
+
+    def fake_increment(name: str, value: float = 1.0, labels: dict[str, str] | None = None) -> None:
+        calls.append((name, value, labels or {}))
+
+    monkeypatch.setattr("chutils.metrics.increment", fake_increment)
+    manager = StoreManager(backend=MemoryStore())
+    manager.set_many({f"k{i}": i for i in range(10)})
+    calls.clear()
+
+    manager.get_many([f"k{i}" for i in range(12)])
+
+    assert calls == [
+        ("store_operations_total", 1.0, {"op": "get_many"}),
+        ("store_requests_total", 10.0, {"status": "hit"}),
+        ("store_requests_total", 2.0, {"status": "miss"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_manager_async_batch_operations() -> None:
+    """Проверяет асинхронные пакетные операции StoreManager."""
+    manager = StoreManager(backend=MemoryStore(), serializer="json")
+
+    assert await manager.aset_many({"a": 1, "b": 2})
+    assert await manager.aget_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert await manager.adelete_many(["a", "b"]) == 2
+    assert await manager.aget_many(["a", "b"]) == {}
+
+
+@pytest.mark.parametrize("serializer", ["orjson", "msgpack"])
+def test_store_manager_binary_serializers(serializer: str) -> None:
+    """Проверяет сериализаторы orjson и msgpack, включая выбор через from_config."""
+    pytest.importorskip(serializer)
+    manager = StoreManager.from_config({"serializer": serializer, "prefix": "bin:"})
+
+    data = {"id": 1, "tags": ["a", "b"], "nested": {"ok": True}}
+    assert manager.set("data", data)
+    assert manager.get("data") == data
+    assert isinstance(manager._backend.get("bin:data"), bytes)
+
+
+def test_store_manager_missing_serializer_dependency() -> None:
+    """Отсутствие пакета сериализатора приводит к OptionalDependencyError."""
+    with patch.dict("sys.modules", {"msgpack": None}), pytest.raises(OptionalDependencyError):
+        StoreManager(serializer="msgpack")
+
+
+def test_store_manager_compression_threshold_and_header() -> None:
+    """Сжимаются только значения не меньше порога; сжатые значения начинаются с заголовка."""
+    backend = MemoryStore()
+    manager = StoreManager(backend=backend, compression="zlib", compression_threshold=100)
+
+    manager.set("small", {"a": 1})
+    manager.set("large", {"items": list(range(500))})
+
+    assert backend.get("small") == '{"a": 1}'
+    raw_large = backend.get("large")
+    assert isinstance(raw_large, bytes)
+    assert raw_large[:2] == bytes((0xC1, 1))
+    assert len(raw_large) < len(str(list(range(500))))
+
+    assert manager.get("small") == {"a": 1}
+    assert manager.get("large") == {"items": list(range(500))}
+
+
+def test_store_manager_compression_reads_legacy_and_other_codecs() -> None:
+    """Значения без сжатия и сжатые другим кодеком читаются прозрачно."""
+    backend = MemoryStore()
+    StoreManager(backend=backend, serializer="pickle").set("legacy", {"v": 1})
+    StoreManager(backend=backend, serializer="pickle", compression="zlib", compression_threshold=0).set(
+        "zlib", {"v": 2}
+    )
+
+    codec = "zstd" if importlib.util.find_spec("zstandard") is not None else "zlib"
+    manager = StoreManager(backend=backend, serializer="pickle", compression=codec)  # type: ignore[arg-type]
+
+    assert manager.get_many(["legacy", "zlib"]) == {"legacy": {"v": 1}, "zlib": {"v": 2}}
+
+
+@pytest.mark.parametrize(("codec", "module"), [("zstd", "zstandard"), ("lz4", "lz4")])
+def test_compressing_serializer_optional_codecs(codec: str, module: str) -> None:
+    """Проверяет кодеки zstd и lz4 при наличии пакетов."""
+    pytest.importorskip(module)
+    serializer = CompressingSerializer(StoreManager()._serializer, codec=codec, threshold=10)  # type: ignore[arg-type]
+
+    payload = {"text": "x" * 1000}
+    raw = serializer.dumps(payload)
+    assert raw[0] == 0xC1
+    assert serializer.loads(raw) == payload
+
+
+def test_store_manager_compression_from_config() -> None:
+    """Проверяет настройку сжатия через from_config и валидацию кодека."""
+    manager = StoreManager.from_config({"compression": "zlib", "compression_threshold": 0, "compression_level": 9})
+    assert manager.set("k", "v" * 10)
+    assert manager.get("k") == "v" * 10
+
+    with pytest.raises(ValueError):
+        StoreManager(compression="brotli")  # type: ignore[arg-type]
@@ -78,3 +78,60 @@ async def test_memory_store_async_operations() -> None:
     await store.aclear()
     assert not await store.aexists("k1")
     assert not await store.aexists("k2")
+
+
+def test_memory_store_releases_unread_expired_keys() -> None:
+    """Истекшие ключи удаляются при записи и через purge_expired, даже если их не читают."""
+    store = MemoryStore()
+    for i in range(10):
+        store.set(f"old_{i}", i, ttl=0.01)
+    store.set("forever", 1)
+    time.sleep(0.02)
+
+    store.set("trigger", 2)
+    assert not any(key.startswith("old_") for key in store._store)
+
+    store.set("late", 3, ttl=0.01)
+    time.sleep(0.02)
+    assert store.purge_expired() == 1
+    assert set(store._store) == {"forever", "trigger"}
+
+
+def test_memory_store_reaper() -> None:
+    """Фоновый поток очищает просроченные ключи."""
+    store = MemoryStore()
+    store.start_reaper(interval=0.02)
+    try:
+        store.set("temp", 1, ttl=0.01)
+        time.sleep(0.1)
+        assert "temp" not in store._store
+    finally:
+        store.stop_reaper()
+
+
+def test_memory_store_batch_operations_skip_expired() -> None:
+    """Пакетное чтение пропускает просроченные ключи и удаляет их."""
+    store = MemoryStore()
+    store.set_many({"a": 1, "b": 2}, ttl=0.05)
+    store.set("c", 3)
+    time.sleep(0.1)
+
+    assert store.get_many(["a", "b", "c", "d"]) == {"c": 3}
+    assert len(store._store) == 1
+    assert store.delete_many(["c", "d"]) == 1
+
+
+def test_memory_store_max_entries_evicts_lru() -> None:
+    """С max_entries хранилище вытесняет давно не читавшиеся ключи."""
+    store = MemoryStore(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+
+    assert store.get("a") == 1
+    assert store.get("b") is None
+    assert store.get("c") == 3
+
+    with pytest.raises(ValueError):
+        MemoryStore(max_entries=0)
@@ -0,0 +1,178 @@
+"""
+Юнит-тесты для TieredStore и RedisInvalidationBus.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from typing import Any
+
+import pytest
+
+from chutils.store.backends.memory import MemoryStore
+from chutils.store.backends.redis import RedisInvalidationBus
+from chutils.store.backends.tiered import TieredStore
+from chutils.store.manager import StoreManager
+
+
+class CountingStore(MemoryStore):
+    """MemoryStore, считающий обращения к удаленному уровню."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.calls["get"] += 1
+        return super().get(key, default)
+
+    def get_many(self, keys: Any) -> dict[str, Any]:
+        self.calls["get_many"] += 1
+        return super().get_many(keys)
+
+
+class FakePubSub:
+    def __init__(self, broker: FakeRedis) -> None:
+        self._broker = broker
+        self.closed = False
+
+    def subscribe(self, **handlers: Any) -> None:
+        for channel, handler in handlers.items():
+            self._broker.handlers.setdefault(channel, []).append(handler)
+
+    def run_in_thread(self, sleep_time: float, daemon: bool) -> Any:
+        return self
+
+    def stop(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeRedis:
+    """Синхронная доставка pub/sub сообщений всем подписчикам."""
+
+    def __init__(self) -> None:
+        self.handlers: dict[str, list[Any]] = {}
+
+    def publish(self, channel: str, message: str) -> int:
+        for handler in self.handlers.get(channel, []):
+            handler({"type": "message", "channel": channel, "data": message.encode("utf-8")})
+        return len(self.handlers.get(channel, []))
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+
+def test_tiered_store_promotes_l2_hits_into_l1() -> None:
+    """Промах L1 читает L2 один раз и копирует значение в L1."""
+    remote = CountingStore()
+    remote.set("flag", b"on")
+    store = TieredStore(remote, local_ttl=60)
+
+    assert store.get("flag") == b"on"
+    assert store.get("flag") == b"on"
+    assert store.get("missing", default="x") == "x"
+
+    assert remote.calls["get"] == 2
+    assert store.local.get("flag") == b"on"
+
+
+def test_tiered_store_local_ttl_and_bound() -> None:
+    """Записи L1 живут не дольше local_ttl, а размер L1 ограничен."""
+    remote = CountingStore()
+    store = TieredStore(remote, local_ttl=0.05, local_max_entries=2)
+
+    store.set_many({"a": 1, "b": 2, "c": 3})
+    assert len(store.local._store) == 2
+
+    time.sleep(0.1)
+    assert store.get("a") == 1
+    assert remote.calls["get"] == 1
+
+
+def test_tiered_store_write_and_delete_through() -> None:
+    """Запись и удаление применяются к обоим уровням."""
+    remote = MemoryStore()
+    store = TieredStore(remote)
+
+    assert store.set("k", "v", ttl=30)
+    assert remote.get("k") == "v"
+    assert store.local.get("k") == "v"
+
+    assert store.delete("k")
+    assert not store.exists("k")
+    assert store.local.get("k") is None
+
+
+def test_tiered_store_get_many_fetches_only_missing_keys() -> None:
+    """Пакетное чтение запрашивает в L2 только ключи, отсутствующие в L1."""
+    remote = CountingStore()
+    remote.set_many({"a": 1, "b": 2})
+    store = TieredStore(remote)
+    store.get("a")
+
+    assert store.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert store.get_many(["a", "b"]) == {"a": 1, "b": 2}
+    assert remote.calls["get_many"] == 1
+
+
+def test_tiered_store_records_per_tier_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Попадания и промахи учитываются отдельно для L1 и L2."""
+    totals: Counter[tuple[str, str]] = Counter()
+
+    def fake_increment(name: str, value: float = 1.0, labels: dict[str, str] | None = None) -> None:
+        if name == "store_tier_requests_total" and labels:
+            totals[(labels["tier"], labels["status"])] += value
+
+    monkeypatch.setattr("chutils.metrics.increment", fake_increment)
+    remote = MemoryStore()
+    remote.set("a", 1)
+    store = TieredStore(remote)
+
+    store.get("a")
+    store.get("a")
+    store.get("b")
+
+    assert totals == {("l1", "hit"): 1, ("l1", "miss"): 2, ("l2", "hit"): 1, ("l2", "miss"): 1}
+
+
+def test_tiered_store_pubsub_invalidation_between_instances() -> None:
+    """Запись в одном экземпляре сбрасывает L1 других экземпляров, но не свой."""
+    redis = FakeRedis()
+    remote = MemoryStore()
+    first = TieredStore(remote, local_ttl=60, invalidation=RedisInvalidationBus(client=redis))
+    second = TieredStore(remote, local_ttl=60, invalidation=RedisInvalidationBus(client=redis))
+
+    first.set("cfg", "v1")
+    assert second.get("cfg") == "v1"
+
+    first.set("cfg", "v2")
+    assert first.local.get("cfg") == "v2"
+    assert second.local.get("cfg") is None
+    assert second.get("cfg") == "v2"
+
+    first.clear()
+    assert second.local.get("cfg") is None
+
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_store_async_operations_with_manager() -> None:
+    """TieredStore работает как обычный бэкенд StoreManager в асинхронном режиме."""
+    redis = FakeRedis()
+    remote = MemoryStore()
+    other = TieredStore(remote, invalidation=RedisInvalidationBus(client=redis))
+    manager = StoreManager(backend=TieredStore(remote, invalidation=RedisInvalidationBus(client=redis)))
+
+    other.set("user:1", '{"name": "old"}')
+    assert other.local.get("user:1") is not None
+
+    await manager.aset("user:1", {"name": "Анна"})
+    assert other.local.get("user:1") is None
+    assert await manager.aget("user:1") == {"name": "Анна"}
+    assert await manager.aget_many(["user:1", "user:2"]) == {"user:1": {"name": "Анна"}}
+    assert await manager.adelete("user:1")
+    assert not await manager.aexists("user:1")